@@ -1,32 +1,23 @@
-import pandas as pd
 import os
+import sys
 
-def process_folder(folder_path, output_name, quantity_file):
-    # Collect all CSV files in the folder
-    csv_files = [f for f in os.listdir(folder_path) if f.lower().endswith('.csv')]
-    dfs = []
-    for file in csv_files:
-        df = pd.read_csv(os.path.join(folder_path, file))
-        dfs.append(df)
-    combined_df = pd.concat(dfs, ignore_index=True)
-
-    # Group by ProductNumber and ProductDescription, summing QtyShip and ExtendedPrice
-    grouped_df = combined_df.groupby(['ProductNumber', 'ProductDescription'], as_index=False).agg({
-        'QtyShip': 'sum',
-        'ExtendedPrice': 'sum'
-    })
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "Restaurant Management"))
+from invoice_aggregator import aggregate_folder, with_units
 
-    # Load quantity data and merge
-    quantity_df = pd.read_csv(quantity_file)
-    merged_df = pd.merge(grouped_df, quantity_df[['ProductNumber', 'Quantity']], on='ProductNumber', how='left')
+def process_folder(folder_path, output_name, quantity_file):
+    # Sum QtyShip and ExtendedPrice by ProductNumber and ProductDescription over every CSV
+    # in the folder; invoices folded in on an earlier run come from the folder's cache
+    grouped_df, stats = aggregate_folder(folder_path)
+    for error in stats['errors']:
+        print(f"Skipped {error}")
 
-    # Calculate Units
-    merged_df['Units'] = merged_df['QtyShip'] * merged_df['Quantity']
+    # Load quantity data, merge and calculate Units
+    merged_df = with_units(grouped_df, quantity_file)
 
     # Save to output file
     output_file = f'/Users/arnoldoramirezjr/Documents/AIO Python/PDFOrderSorter/{output_name}_with_units.csv'
     merged_df.to_csv(output_file, index=False)
-    print(f"{output_file} created.")
+    print(f"{output_file} created ({stats['read']} new, {stats['cached']} cached invoice files).")
 
 # Paths
 quantity_file = '/Users/arnoldoramirezjr/Documents/AIO Python/PDFOrderSorter/quantity_data.csv'
@@ -1,39 +1,16 @@
 
 import pandas as pd
-from collections import defaultdict
 import sys
 import os
 
-# Category mapping based on vendor/payroll names
-CATEGORY_MAP = {
-	"Food Expense": [
-		"Big House Burgers Kingsville", "CC Produce", "Corpus Christi Produce",
-		"M&M Ramos Distribution", "MCM Bread and Sweets", "US Foods",
-		"Cash & Carry", "Pepsi Cola", "Pepsi-Cola"
-	],
-	"Beer Expense": [
-		"Andrew’s Distributors", "L&F Distributors"
-	],
-	"Liquor Expenses": [
-		"The Jigger", "Jigger", "Discount Liquor"
-	],
-	"Payroll Expense": [
-		"Hourly Regular", "Hourly OT", "Manager Salary", "Assistant Manager",
-		"Admin", "Vacation", "Bonus"
-	],
-	"Utility Expense": [
-		"Centerpoint", "Center Point", "Constellation", "Directv", "Jim Wells",
-		"Jim wells County Appraisal District", "NuCo2", "STGR", "Spectrum",
-		"Toast", "Easy", "City of Kingsville"
-	]
-}
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+from expense_categories import load_category_map, get_matcher
+
+# Category mapping based on vendor/payroll names (Restaurant Management/category_map.csv)
+CATEGORY_MAP = load_category_map()
 
 def get_category(name, payroll_name):
-	for category, keywords in CATEGORY_MAP.items():
-		for keyword in keywords:
-			if keyword.lower() in (str(name) or '').lower() or keyword.lower() in (str(payroll_name) or '').lower():
-				return category
-	return "Other"
+	return get_matcher(CATEGORY_MAP)(name, payroll_name, default="Other")
 
 
 def breakdown_budget_excel(excel_file, output_file):
@@ -60,21 +37,15 @@ def breakdown_budget_excel(excel_file, output_file):
 	if not amount_col:
 		amount_col = columns[-2]  # fallback
 
-	budget = defaultdict(float)
-	for _, row in df.iterrows():
-		name = row.get(name_col, '')
-		payroll_name = row.get(payroll_col, '')
-		try:
-			amount = float(row.get(amount_col, 0) or 0)
-		except Exception:
-			amount = 0
-		category = get_category(name, payroll_name)
-		budget[category] += amount
+	# Categorize the whole ledger in one pass, then total by category
+	amounts = pd.to_numeric(df[amount_col], errors='coerce').fillna(0.0).astype(float)
+	categories = get_matcher(CATEGORY_MAP).categorize(df[name_col], df[payroll_col], default="Other")
+	budget = amounts.groupby(categories, sort=False).sum()
 
 	# Create a summary DataFrame sorted by Total (descending)
 	summary = pd.DataFrame({
-		'Category': list(budget.keys()),
-		'Total': [round(budget[k], 2) for k in budget.keys()]
+		'Category': budget.index,
+		'Total': budget.round(2).to_numpy()
 	})
 	summary = summary.sort_values('Total', ascending=False).reset_index(drop=True)
 	
@@ -0,0 +1,203 @@
+"""
+Versioned change tracking for the Inventory Control APIs
+
+A ChangeTracker gives a keyed collection (the product list, the saved
+inventories) a monotonically increasing version. After each mutation the
+app calls sync() with the current rows; rows whose content changed get the
+new version, removed keys are remembered as deletions and a changed row
+order is noted, so a client holding version V can ask for only what
+changed since V.
+
+Versions start from the server's start time in milliseconds, so they keep
+increasing across restarts; a client whose version predates the running
+server (or is ahead of it) simply gets a full response.
+
+With several worker processes, pass the app's SharedState: versions are
+then numbered by one counter in its SQLite file (<name>_version, seeded
+with the time in milliseconds), so every worker hands out the same
+versions and ETags. Each worker still diffs its own rows, and records a
+change it picks up from another worker under a new number. The version a
+worker reports is the counter as read by seen() just before it picked up
+the other workers' changes. Every change numbered up to that is already
+in its data, so a since= from any worker gives a correct delta.
+
+A tracker is shared by every request thread, so each method holds its
+lock; delta() returns the version together with the changes computed at
+that version.
+
+Also holds the query helpers shared by the list endpoints: ETag / 304
+checks, filtering, sorting and pagination.
+"""
+import json
+import time
+import threading
+
+from flask import Response, request
+
+DEFAULT_PAGE_SIZE = 100
+MAX_PAGE_SIZE = 1000
+
+
+def _fingerprint(row):
+    return hash(json.dumps(row, sort_keys=True, default=str))
+
+
+class ChangeTracker:
+    """Row versions for a keyed collection, found by diffing snapshots
+
+    shared, a SharedState, numbers the versions for every worker process.
+    """
+
+    def __init__(self, name, shared=None):
+        self.name = name
+        self.shared = shared
+        self._counter = f"{name}_version"
+        start = int(time.time() * 1000)
+        self.base = self.version = shared.start(self._counter, start) if shared else start
+        self.order_version = self.base
+        self._rows = {}       # key -> (fingerprint, version)
+        self._deleted = {}    # key -> version it was removed at
+        self._order = []
+        self._lock = threading.RLock()
+
+    def _next_version(self):
+        """Number for a new change (caller holds the lock)"""
+        if self.shared is None:
+            self.version += 1
+            return self.version
+        return self.shared.bump(self._counter)
+
+    def seen(self, generations):
+        """This process has picked up every change numbered up to generations[<name>_version]
+
+        generations must be read before picking up the other workers' changes.
+        """
+        if self.shared is None:
+            return
+        with self._lock:
+            self.version = max(self.version, generations.get(self._counter, 0))
+
+    def sync(self, items):
+        """Record the collection's current (key, row) pairs; returns the version"""
+        items = list(items)
+        keys = [key for key, _row in items]
+        fingerprints = [(key, _fingerprint(row)) for key, row in items]
+        with self._lock:
+            changed = [(key, fp) for key, fp in fingerprints if self._rows.get(key, (None,))[0] != fp]
+            removed = set(self._rows) - set(keys)
+            if not changed and not removed and keys == self._order:
+                return self.version
+
+            version = self._next_version()
+            for key, fp in changed:
+                self._rows[key] = (fp, version)
+                self._deleted.pop(key, None)
+            for key in removed:
+                del self._rows[key]
+                self._deleted[key] = version
+            if keys != self._order:
+                self._order = keys
+                self.order_version = version
+            return self.version
+
+    def update(self, key, row):
+        """Record one changed row without diffing the whole collection; returns the version"""
+        fp = _fingerprint(row)
+        with self._lock:
+            if self._rows.get(key, (None,))[0] == fp:
+                return self.version
+            version = self._next_version()
+            if key not in self._rows:
+                self._order.append(key)
+                self.order_version = version
+            self._rows[key] = (fp, version)
+            self._deleted.pop(key, None)
+            return self.version
+
+    def row_version(self, key):
+        """Version a row last changed at (None if unknown)"""
+        with self._lock:
+            entry = self._rows.get(key)
+        return entry[1] if entry else None
+
+    @property
+    def etag(self):
+        return f"{self.name}-{self.version}"
+
+    def is_current(self, since):
+        """True if since is a version this tracker can compute a delta from"""
+        with self._lock:
+            return since is not None and self.base <= since <= self.version
+
+    def changed_since(self, since):
+        """(changed keys, deleted keys, order or None) since a version; everything if since is unusable"""
+        return self.delta(since)[2:]
+
+    def delta(self, since):
+        """(version, full, changed keys, deleted keys, order or None), all taken at one version"""
+        with self._lock:
+            if not self.is_current(since):
+                return self.version, True, list(self._order), [], list(self._order)
+            changed = [key for key in self._order if self._rows[key][1] > since]
+            deleted = [key for key, version in self._deleted.items() if version > since]
+            order = list(self._order) if self.order_version > since else None
+            return self.version, False, changed, deleted, order
+
+
+# ==================== QUERY HELPERS ====================
+
+def not_modified(etag):
+    """304 response when the request's If-None-Match already has etag, else None"""
+    if request.if_none_match.contains_weak(etag):
+        response = Response(status=304)
+        response.set_etag(etag)
+        return response
+    return None
+
+
+def with_version(response, tracker, version=None):
+    """Tag a JSON response with the collection's version (the current one unless given);
+    clients revalidate instead of caching"""
+    version = tracker.version if version is None else version
+    response.set_etag(f"{tracker.name}-{version}")
+    response.headers['X-Version'] = str(version)
+    response.headers['Cache-Control'] = 'no-cache'
+    return response
+
+
+def int_arg(name, default=None):
+    try:
+        return int(request.args[name])
+    except (KeyError, ValueError):
+        return default
+
+
+def _sort_key(value):
+    """Numbers before text, numbers numerically, text case-insensitively"""
+    if isinstance(value, (int, float)) and not isinstance(value, bool):
+        return (0, value, '')
+    return (1, 0, '' if value is None else str(value).lower())
+
+
+def query_rows(rows, search_fields=(), filters=None, default_sort=None):
+    """Filter, sort and page rows from ?q=, field filters, ?sort=[-]field, ?page= and ?per_page=
+
+    Returns (page of rows, total matching, page, per_page).
+    """
+    q = (request.args.get('q') or '').strip().lower()
+    if q:
+        rows = [r for r in rows if any(q in str(r.get(f, '')).lower() for f in search_fields)]
+    for arg, field in (filters or {}).items():
+        value = request.args.get(arg)
+        if value:
+            rows = [r for r in rows if str(r.get(field, '')).lower() == value.lower()]
+
+    sort = request.args.get('sort') or default_sort
+    if sort:
+        field = sort.lstrip('-')
+        rows = sorted(rows, key=lambda r: _sort_key(r.get(field)), reverse=sort.startswith('-'))
+
+    per_page = min(max(int_arg('per_page', DEFAULT_PAGE_SIZE), 1), MAX_PAGE_SIZE)
+    page = max(int_arg('page', 1), 1)
+    start = (page - 1) * per_page
+    return rows[start:start + per_page], len(rows), page, per_page
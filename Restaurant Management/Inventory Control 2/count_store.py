@@ -0,0 +1,361 @@
+"""
+Durable per-item inventory counts
+
+Counting one product no longer rewrites the whole inventory database:
+
+- set_count() changes one product's count for a location and date and
+  appends that single change to data/inventory_counts.log. Appends from
+  every request arriving within a few milliseconds are written and fsynced
+  together (group commit), and each request returns only once its change
+  is on disk, so a save costs one small append however large the database.
+- Every counted product carries a version. A client sends the version it
+  last saw; if someone else has saved that product since, the change is
+  refused with the current count instead of silently overwriting it.
+- checkpoint() writes inventory_database.json (same format as before) and
+  inventory_versions.json, then starts a new, empty log. It runs after
+  whole-inventory saves and automatically once the log grows past
+  COMPACT_EVERY entries. load() reads the database and replays the log.
+
+Request threads never touch data directly while saves are being applied:
+they read through snapshot() / counts(), copies made under the store's
+lock, and replace or delete whole inventories through put().
+
+Several worker processes can share one data folder. Appends and
+checkpoints hold an exclusive lock on the log; before appending, a worker
+first applies what the others logged, so version checks always see every
+saved count. Each log starts with a header line carrying a unique id, so
+refresh() can tell when another worker replaced it: refresh() reads that
+line and the size on every call, the new log lines when the log grew, and
+everything when another worker checkpointed.
+"""
+import os
+import sys
+import json
+import time
+import uuid
+import logging
+import threading
+from contextlib import nullcontext
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+from shared_storage import FileLock, write_json, atomic_write
+
+FLUSH_INTERVAL = 0.02   # Seconds to gather concurrent saves into one fsync
+COMPACT_EVERY = 2000    # Log entries before the database is rewritten
+
+log = logging.getLogger(__name__)
+
+
+def _header_id(line):
+    """Log id from a log's first line (None for a missing or header-less log)"""
+    try:
+        header = json.loads(line)
+    except ValueError:
+        return None
+    return header.get('log') if isinstance(header, dict) else None
+
+
+class CountConflict(Exception):
+    """The product's count changed since the version the client holds"""
+
+    def __init__(self, quantity, version):
+        super().__init__(f"count is at version {version}")
+        self.quantity = quantity
+        self.version = version
+
+
+class CountStore:
+    """Inventory counts (location -> date -> product -> quantity) with per-item versions
+
+    writer, if given, is held while compacting so a checkpoint never runs in
+    the middle of another worker's whole-inventory change.
+    """
+
+    def __init__(self, data_dir, writer=None):
+        self.db_path = os.path.join(data_dir, 'inventory_database.json')
+        self.versions_path = os.path.join(data_dir, 'inventory_versions.json')
+        self.log_path = os.path.join(data_dir, 'inventory_counts.log')
+        self.log_lock = FileLock(self.log_path)
+        self.writer = writer
+        self.data = {}
+        self._versions = {}       # location -> date -> product -> version
+        self._known = {}          # (location, date) -> product -> quantity as saved
+        self._lock = threading.Lock()           # everything in memory
+        self._flushed = threading.Condition(self._lock)
+        self._io_lock = threading.Lock()        # this process's file work
+        self._pending = []
+        self._log_id = None       # Header id of the log read so far
+        self._log_offset = 0
+        self._log_entries = 0
+        self._reloaded = False    # Reported by the next refresh()
+        self._touched = set()
+        self._flusher = None
+
+    # ==================== LOADING ====================
+
+    def load(self):
+        """Database plus any logged changes not yet checkpointed; returns the data dict"""
+        with self._io_lock, self.log_lock(shared=True):
+            self._load_locked()
+        return self.data
+
+    def _load_locked(self, truncate=False):
+        data, versions = {}, {}
+        if os.path.exists(self.db_path):
+            with open(self.db_path, 'r') as f:
+                data = json.load(f)
+        if os.path.exists(self.versions_path):
+            with open(self.versions_path, 'r') as f:
+                versions = json.load(f)
+        with self._lock:
+            # Same dict object throughout, so references to data stay current
+            self.data.clear()
+            self.data.update(data)
+            self._versions = versions
+            self._log_id, self._log_offset, self._log_entries = None, 0, 0
+            self._remember_all()
+            self._read_log(truncate)
+            self._reloaded = True
+
+    def _read_log(self, truncate=False):
+        """Apply the log entries past the offset already read"""
+        try:
+            f = open(self.log_path, 'rb')
+        except FileNotFoundError:
+            return
+        with f:
+            if self._log_offset == 0:
+                first = f.readline()
+                self._log_id = _header_id(first)
+                if self._log_id is not None:
+                    self._log_offset = len(first)
+            f.seek(self._log_offset)
+            for line in f:
+                if not line.endswith(b'\n'):
+                    break
+                try:
+                    entry = json.loads(line)
+                except ValueError:
+                    break
+                self._log_offset += len(line)
+                self._log_entries += 1
+                self._replay(entry)
+            torn = self._log_offset < os.fstat(f.fileno()).st_size
+        if torn and truncate:
+            # Torn final line from a crash mid-write; drop it so new entries start on a fresh line
+            os.truncate(self.log_path, self._log_offset)
+
+    def _replay(self, entry):
+        location, date, product = entry['location'], entry['date'], entry['product']
+        versions = self._versions.setdefault(location, {}).setdefault(date, {})
+        if entry['version'] <= versions.get(product, 0):
+            return  # Already in the database
+        versions[product] = entry['version']
+        self._apply(location, date, product, entry['quantity'])
+        self._touched.add((location, date))
+
+    def _apply(self, location, date, product, quantity):
+        counts = self.data.setdefault(location, {}).setdefault(date, {})
+        known = self._known.setdefault((location, date), {})
+        if quantity is None:
+            counts.pop(product, None)
+            known.pop(product, None)
+        else:
+            counts[product] = known[product] = quantity
+
+    def _remember_all(self):
+        self._known = {(location, date): dict(counts)
+                       for location, dates in self.data.items() for date, counts in dates.items()}
+
+    def _log_state(self):
+        """(header id, size) of the log on disk"""
+        try:
+            with open(self.log_path, 'rb') as f:
+                return _header_id(f.readline()), os.fstat(f.fileno()).st_size
+        except FileNotFoundError:
+            return None, 0
+
+    def _catch_up(self, truncate=False):
+        """Apply what other processes logged (caller holds the log lock)"""
+        log_id, size = self._log_state()
+        if log_id != self._log_id:
+            self._load_locked(truncate)
+        elif size != self._log_offset:
+            with self._lock:
+                self._read_log(truncate)
+
+    def _new_log(self):
+        """Replace the log with an empty one (caller holds the log lock exclusively)"""
+        log_id = uuid.uuid4().hex
+        header = json.dumps({'log': log_id}).encode() + b'\n'
+        # A new file with a new id, so other workers see the log was replaced
+        with atomic_write(self.log_path, 'wb') as f:
+            f.write(header)
+        with self._lock:
+            self._log_id, self._log_offset, self._log_entries = log_id, len(header), 0
+
+    def refresh(self):
+        """Pick up counts saved by other processes
+
+        Returns (reloaded, touched): whether everything was reloaded, and
+        the (location, date) pairs whose counts changed otherwise.
+        """
+        log_id, size = self._log_state()
+        if log_id != self._log_id or size != self._log_offset:
+            with self._io_lock, self.log_lock(shared=True):
+                self._catch_up()
+        with self._lock:
+            reloaded, touched = self._reloaded, self._touched
+            self._reloaded, self._touched = False, set()
+        return reloaded, set() if reloaded else touched
+
+    # ==================== READING ====================
+
+    def snapshot(self, location=None):
+        """Copy of every location's inventories, or of one location's (date -> counts)"""
+        with self._lock:
+            if location is not None:
+                return {date: dict(counts) for date, counts in self.data.get(location, {}).items()}
+            return {location: {date: dict(counts) for date, counts in dates.items()}
+                    for location, dates in self.data.items()}
+
+    def counts(self, location, date):
+        """Copy of one inventory's counts (None if it was never saved)"""
+        with self._lock:
+            counts = self.data.get(location, {}).get(date)
+            return None if counts is None else dict(counts)
+
+    def put(self, location, date, counts):
+        """Replace one whole inventory in memory (None deletes it); checkpoint() saves it"""
+        with self._lock:
+            if counts is None:
+                self.data.get(location, {}).pop(date, None)
+            else:
+                self.data.setdefault(location, {})[date] = counts
+
+    # ==================== PER-ITEM COUNTS ====================
+
+    def versions(self, location, date):
+        """product -> version for one inventory"""
+        with self._lock:
+            return dict(self._versions.get(location, {}).get(date, {}))
+
+    def set_count(self, location, date, product, quantity, expected_version=None):
+        """Save one product's count (None or <= 0 clears it); returns its new version
+
+        Raises CountConflict when expected_version is given and the product
+        has been saved since. Returns after the change is on disk.
+        """
+        if quantity is not None and quantity <= 0:
+            quantity = None
+        change = {'location': location, 'date': date, 'product': product,
+                  'quantity': quantity, 'expected': expected_version, 'done': False}
+        with self._lock:
+            self._pending.append(change)
+            if self._flusher is None or not self._flusher.is_alive():
+                self._flusher = threading.Thread(target=self._flush_loop, name='count-store-flush', daemon=True)
+                self._flusher.start()
+            self._flushed.notify_all()
+            while not change['done']:
+                self._flushed.wait()
+        if 'error' in change:
+            raise change['error']
+        return change['version']
+
+    def _resolve(self, change):
+        """Check one change against the saved version; returns its log entry (None if nothing to write)"""
+        location, date, product = change['location'], change['date'], change['product']
+        current = self._versions.get(location, {}).get(date, {}).get(product, 0)
+        counts = self.data.get(location, {}).get(date, {})
+        if change['expected'] is not None and change['expected'] != current:
+            change['error'] = CountConflict(counts.get(product), current)
+            return None
+        if current and counts.get(product) == change['quantity']:
+            change['version'] = current
+            return None
+        change['version'] = self._versions.setdefault(location, {}).setdefault(date, {})[product] = current + 1
+        self._apply(location, date, product, change['quantity'])
+        return {'location': location, 'date': date, 'product': product,
+                'quantity': change['quantity'], 'version': change['version'], 'ts': time.time()}
+
+    def _flush_loop(self):
+        while True:
+            with self._lock:
+                while not self._pending:
+                    self._flushed.wait()
+            time.sleep(FLUSH_INTERVAL)  # Let concurrent saves join this write
+            with self._io_lock:
+                with self._lock:
+                    batch, self._pending = self._pending, []
+                try:
+                    with self.log_lock:
+                        self._catch_up(truncate=True)
+                        if self._log_id is None and self._log_offset == 0:
+                            self._new_log()
+                        with self._lock:
+                            entries = [entry for entry in map(self._resolve, batch) if entry]
+                        if entries:
+                            try:
+                                with open(self.log_path, 'ab') as f:
+                                    f.write(b''.join(json.dumps(e).encode() + b'\n' for e in entries))
+                                    f.flush()
+                                    os.fsync(f.fileno())
+                                    offset = f.tell()
+                            except OSError:
+                                self._load_locked()  # Forget the changes that did not reach the disk
+                                raise
+                            with self._lock:
+                                self._log_offset = offset
+                                self._log_entries += len(entries)
+                except OSError as e:
+                    for change in batch:
+                        change.setdefault('error', e)
+                with self._lock:
+                    for change in batch:
+                        change['done'] = True
+                    compact = self._log_entries >= COMPACT_EVERY
+                    self._flushed.notify_all()
+            if compact:
+                try:
+                    with self.writer or nullcontext():
+                        self.checkpoint()
+                except OSError as e:
+                    log.error("Error compacting inventory log: %s", e)
+
+    # ==================== CHECKPOINT ====================
+
+    def checkpoint(self):
+        """Write the whole database and start an empty log
+
+        Products changed in memory since the last save (whole-inventory
+        saves, uploads, deletions) get new versions first.
+        """
+        with self._io_lock, self.log_lock:
+            self._catch_up(truncate=True)
+            with self._lock:
+                self._bump_changed()
+                data = json.loads(json.dumps(self.data))
+                versions = json.loads(json.dumps(self._versions))
+            write_json(self.db_path, data, indent=2)
+            write_json(self.versions_path, versions)
+            self._new_log()
+
+    def _bump_changed(self):
+        for location, dates in self.data.items():
+            for date, counts in dates.items():
+                known = self._known.get((location, date), {})
+                if known == counts:
+                    continue
+                versions = self._versions.setdefault(location, {}).setdefault(date, {})
+                for product in set(known) | set(counts):
+                    if known.get(product) != counts.get(product):
+                        versions[product] = versions.get(product, 0) + 1
+        # Versions of deleted inventories go with them
+        for location in list(self._versions):
+            dates = self.data.get(location, {})
+            for date in list(self._versions[location]):
+                if date not in dates:
+                    del self._versions[location][date]
+            if not self._versions[location]:
+                del self._versions[location]
+        self._remember_all()
@@ -0,0 +1,185 @@
+"""
+Front-end delivery for the Inventory Control web app
+
+- Pages are rendered from templates/ once and kept as bytes (re-rendered
+  only when the template file changes), with gzip / brotli copies made once.
+- Files under static/ are served from /assets/<name>.<hash>.<ext>: the hash
+  is the file's content fingerprint, so those URLs can be cached for a year
+  and a changed file simply gets a new URL.
+- Every other compressible response (the JSON APIs) is gzip / brotli
+  encoded when the client accepts it.
+- GET responses carry an ETag; a matching If-None-Match gets a 304 with no
+  body, so a repeat visit only re-validates the page.
+
+Brotli is used when the brotli package is installed, gzip otherwise.
+"""
+import os
+import gzip
+import hashlib
+import mimetypes
+
+from flask import Response, render_template, request
+
+try:
+    import brotli
+except ImportError:  # Optional; gzip covers every browser
+    brotli = None
+
+ASSET_URL_PREFIX = '/assets'
+ASSET_MAX_AGE = 365 * 24 * 3600
+MIN_COMPRESS_SIZE = 1024
+COMPRESSIBLE_TYPES = ('text/', 'application/json', 'application/javascript', 'image/svg+xml')
+
+
+# ==================== COMPRESSION ====================
+
+def compress_variants(data):
+    """encoding -> compressed bytes for every encoding this server can produce"""
+    variants = {'gzip': gzip.compress(data, compresslevel=6, mtime=0)}
+    if brotli is not None:
+        variants['br'] = brotli.compress(data)
+    return variants
+
+
+def choose_encoding(variants):
+    """Best encoding in variants that the request accepts (None for identity)"""
+    accepted = request.accept_encodings
+    for encoding in ('br', 'gzip'):
+        if encoding in variants and accepted[encoding]:
+            return encoding
+    return None
+
+
+def _fingerprint(data):
+    return hashlib.md5(data).hexdigest()[:12]
+
+
+def _cached_response(data, variants, etag, mimetype, cache_control):
+    """Conditional, content-negotiated response for bytes prepared ahead of time"""
+    encoding = choose_encoding(variants)
+    response = Response(variants[encoding] if encoding else data, mimetype=mimetype)
+    response.headers['Cache-Control'] = cache_control
+    response.headers['Vary'] = 'Accept-Encoding'
+    if encoding:
+        response.headers['Content-Encoding'] = encoding
+    # Weak for encoded bodies: same content, different bytes
+    response.set_etag(etag, weak=bool(encoding))
+    return response.make_conditional(request)
+
+
+# ==================== STATIC ASSETS ====================
+
+class StaticAssets:
+    """Fingerprinted, precompressed copies of the files under static_dir"""
+
+    def __init__(self, static_dir):
+        self.static_dir = static_dir
+        self._entries = {}
+
+    def _entry(self, name):
+        path = os.path.join(self.static_dir, name)
+        mtime = os.stat(path).st_mtime_ns
+        entry = self._entries.get(name)
+        if entry is None or entry['mtime'] != mtime:
+            with open(path, 'rb') as f:
+                data = f.read()
+            mimetype = mimetypes.guess_type(name)[0] or 'application/octet-stream'
+            entry = self._entries[name] = {
+                'mtime': mtime,
+                'data': data,
+                'hash': _fingerprint(data),
+                'mimetype': mimetype,
+                'variants': compress_variants(data) if mimetype.startswith(COMPRESSIBLE_TYPES) else {},
+            }
+        return entry
+
+    def url(self, name):
+        """Fingerprinted URL for static/<name>, e.g. /assets/js/app.3f2a9c1b7d4e.js"""
+        stem, ext = os.path.splitext(name)
+        return f"{ASSET_URL_PREFIX}/{stem}.{self._entry(name)['hash']}{ext}"
+
+    def response(self, filename):
+        """Serve /assets/<filename>; an out-of-date hash still gets the current file, uncached"""
+        stem, ext = os.path.splitext(filename)
+        name, _, digest = stem.rpartition('.')
+        name = os.path.normpath(name + ext)
+        if not name or name.startswith(('..', os.sep)):
+            return Response(status=404)
+        try:
+            entry = self._entry(name)
+        except OSError:
+            return Response(status=404)
+        cache_control = (f'public, max-age={ASSET_MAX_AGE}, immutable' if digest == entry['hash']
+                         else 'no-cache')
+        return _cached_response(entry['data'], entry['variants'], entry['hash'], entry['mimetype'], cache_control)
+
+
+# ==================== PAGES ====================
+
+class PageCache:
+    """Pages rendered once per template version and served as prepared bytes"""
+
+    def __init__(self, app):
+        self.app = app
+        self._pages = {}
+
+    def _template_mtime(self, template):
+        path = os.path.join(self.app.root_path, self.app.template_folder, template)
+        try:
+            return os.stat(path).st_mtime_ns
+        except OSError:
+            return None
+
+    def response(self, template, **context):
+        mtime = self._template_mtime(template)
+        page = self._pages.get(template)
+        if page is None or page['mtime'] != mtime:
+            data = render_template(template, **context).encode('utf-8')
+            page = self._pages[template] = {
+                'mtime': mtime,
+                'data': data,
+                'hash': _fingerprint(data),
+                'variants': compress_variants(data),
+            }
+        # Revalidate on every visit (cheap: a 304 when nothing changed)
+        return _cached_response(page['data'], page['variants'], page['hash'], 'text/html', 'no-cache')
+
+
+# ==================== DYNAMIC RESPONSES ====================
+
+def finalize_response(response):
+    """ETag / 304 for GET responses and compression for the rest of the compressible bodies"""
+    if (response.direct_passthrough or response.is_streamed or 'Content-Encoding' in response.headers
+            or response.status_code != 200):
+        return response
+    if request.method == 'GET' and not response.get_etag()[0]:
+        response.add_etag()
+        response = response.make_conditional(request)
+        if response.status_code == 304:
+            return response
+    if not (response.mimetype or '').startswith(COMPRESSIBLE_TYPES):
+        return response
+    data = response.get_data()
+    if len(data) < MIN_COMPRESS_SIZE:
+        return response
+    encoding = 'br' if brotli is not None and request.accept_encodings['br'] else \
+        'gzip' if request.accept_encodings['gzip'] else None
+    response.vary.add('Accept-Encoding')
+    if encoding is None:
+        return response
+    response.set_data(brotli.compress(data) if encoding == 'br' else gzip.compress(data, compresslevel=6, mtime=0))
+    response.headers['Content-Encoding'] = encoding
+    etag, weak = response.get_etag()
+    if etag and not weak:
+        response.set_etag(etag, weak=True)
+    return response
+
+
+def init_app(app, static_dir=None):
+    """Register /assets, the asset_url() template helper and response finalizing; returns the page cache"""
+    assets = StaticAssets(static_dir or app.static_folder)
+    app.add_url_rule(f'{ASSET_URL_PREFIX}/<path:filename>', 'assets', assets.response)
+    app.jinja_env.globals['asset_url'] = assets.url
+    app.after_request(finalize_response)
+    app.extensions['delivery'] = assets
+    return PageCache(app)
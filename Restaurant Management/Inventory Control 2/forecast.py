@@ -0,0 +1,262 @@
+"""
+Usage-based order forecasting for Inventory Control 2
+
+The saved counts and received orders of one location become a products x
+days usage matrix, built once with NumPy / pandas and kept until a count,
+an invoice or the product list changes:
+
+    usage between two counts = earlier count + received in between - later count
+
+spread evenly over the days in between (negative usage, a miscount, counts
+as none). From that matrix, for every product at once:
+
+- average daily usage over the last window_days
+- day-of-week factors: each weekday's usage against the product's overall
+  average, used once there are two weeks of history
+- forecast usage over the lead time plus the days until the next order,
+  weighted by the weekdays those days fall on
+- safety stock = z(service level) x daily usage std x sqrt(those days)
+- suggested order = forecast + safety stock - on hand, rounded up to whole cases
+
+On hand is the count on the inventory date plus what was received from then
+until the next count.
+Quantities are in the units the app stores: units for most products,
+cases for case-count products (whose case pack is therefore 1).
+
+Batch usage:
+    python forecast.py Kingsville
+    python forecast.py Kingsville --lead-time 3 --review-days 7 --inventory-date 2026-01-26
+"""
+import os
+import sys
+import json
+import time
+import argparse
+import threading
+from statistics import NormalDist
+
+import numpy as np
+import pandas as pd
+
+DEFAULT_LEAD_TIME = 2        # Days from placing an order to its delivery
+DEFAULT_REVIEW_DAYS = 7      # Days until the next order arrives
+DEFAULT_WINDOW = 28          # Days of history the average usage is taken over
+DEFAULT_SERVICE_LEVEL = 0.95
+MIN_SEASONAL_DAYS = 14       # History needed before weekday factors are used
+
+
+def _to_days(dates):
+    """'YYYY-MM-DD' strings -> day numbers (days since 1970-01-01) as floats, NaN where unparseable"""
+    parsed = pd.to_datetime(pd.Index(list(dates), dtype=object), format='%Y-%m-%d', errors='coerce')
+    days = parsed.values.astype('datetime64[D]').astype(np.int64).astype(float)
+    days[parsed.isna()] = np.nan
+    return days
+
+
+def _weekdays(days):
+    """Monday = 0 for day numbers (1970-01-01 was a Thursday)"""
+    return (days + 3) % 7
+
+
+def _quantity_matrix(snapshots, products):
+    """{date: {product: qty}} -> (sorted day numbers, products x days array); missing = 0"""
+    dates = list(snapshots)
+    entries = [snapshots[d] or {} for d in dates]
+    days = _to_days(dates)
+    row = pd.Index(products).get_indexer([str(n) for counts in entries for n in counts])
+    qty = pd.to_numeric(pd.Series([q for counts in entries for q in counts.values()], dtype=object),
+                        errors='coerce').to_numpy(dtype=float)
+    entry_days = np.repeat(days, [len(counts) for counts in entries])
+    unique_days = np.unique(days[~np.isnan(days)])
+    keep = (row >= 0) & ~np.isnan(entry_days) & ~np.isnan(qty)
+    matrix = np.zeros((len(products), len(unique_days)))
+    # Repeated dates (none in practice) add up
+    np.add.at(matrix, (row[keep], np.searchsorted(unique_days, entry_days[keep])), qty[keep])
+    return unique_days.astype(np.int64), matrix
+
+
+def case_packs(package_sizes, case_count):
+    """Units per case from package sizes like '6/4LB' (1 when unknown or counted in cases)"""
+    packs = pd.to_numeric(pd.Series(package_sizes, dtype=object).astype(str).str.extract(r'^\s*(\d+)\s*/')[0],
+                          errors='coerce').to_numpy(dtype=float, copy=True)
+    packs[~(packs > 0) | np.asarray(case_count, dtype=bool)] = 1.0
+    return packs
+
+
+class UsageMatrix:
+    """Daily usage of every product at one location, derived from its counts and orders"""
+
+    def __init__(self, inventories, orders, products, case_count_products=()):
+        """inventories / orders: {date: {product number: quantity}}; products: the catalog rows"""
+        numbers = [str(p.get('Product Number', '')) for p in products]
+        history = {str(n) for snapshot in (*inventories.values(), *orders.values()) for n in snapshot or ()}
+        self.products = pd.unique(np.array(numbers + sorted(history - set(numbers)), dtype=object))
+        catalog = {str(p.get('Product Number', '')): p for p in products}
+        rows = [catalog.get(n, {}) for n in self.products]
+        case_count = [str(r.get('Case Count Type', 'No')).upper() == 'YES' or n in case_count_products
+                      for n, r in zip(self.products, rows)]
+        self.case_pack = case_packs([r.get('Product Package Size', '') for r in rows], case_count)
+
+        self.count_days, self.counts = _quantity_matrix(inventories, self.products)
+        self.received_days, self.received = _quantity_matrix(orders, self.products)
+        order_days = self.received_days
+
+        # A delivery on a count day arrives after that count: interval k covers [count k-1, count k)
+        n = len(self.count_days)
+        interval = np.searchsorted(self.count_days, order_days, side='right')
+        by_interval = self.received @ np.eye(n + 1)[interval] if len(order_days) else np.zeros((len(self.products), n + 1))
+        if n >= 2:
+            usage = np.clip(self.counts[:, :-1] + by_interval[:, 1:n] - self.counts[:, 1:], 0, None)
+            spans = np.diff(self.count_days)
+            self.daily = np.repeat(usage / spans, spans, axis=1)
+            self.days = np.arange(self.count_days[0], self.count_days[-1])
+        else:
+            self.daily = np.zeros((len(self.products), 0))
+            self.days = np.zeros(0, dtype=np.int64)
+        self.seasonal = self._weekday_factors()
+
+    def _weekday_factors(self):
+        """products x 7 ratios of each weekday's usage to the product's average (all 1 without enough history)"""
+        factors = np.ones((len(self.products), 7))
+        if len(self.days) < MIN_SEASONAL_DAYS:
+            return factors
+        onehot = np.eye(7)[_weekdays(self.days)]
+        weekday_mean = (self.daily @ onehot) / np.maximum(onehot.sum(axis=0), 1)
+        overall = self.daily.mean(axis=1, keepdims=True)
+        np.divide(weekday_mean, overall, out=factors, where=overall > 0)
+        return factors
+
+    @property
+    def history_days(self):
+        return len(self.days)
+
+    @property
+    def last_count_date(self):
+        """'YYYY-MM-DD' of the latest count (None without counts)"""
+        if not len(self.count_days):
+            return None
+        return str(np.datetime64(int(self.count_days[-1]), 'D'))
+
+    def on_hand(self, inventory_date=None):
+        """(day number of the count used, products' count there plus what was received since)"""
+        if not len(self.count_days):
+            return None, np.zeros(len(self.products))
+        if inventory_date is None:
+            k = len(self.count_days) - 1
+        else:
+            day = _to_days([inventory_date])[0]
+            k = int(np.searchsorted(self.count_days, day)) if not np.isnan(day) else len(self.count_days)
+            if k >= len(self.count_days) or self.count_days[k] != day:
+                raise ValueError(f"No inventory count on {inventory_date}")
+        snapshot = self.count_days[k]
+        # Deliveries after the next count are already in that count
+        until = self.count_days[k + 1] if k + 1 < len(self.count_days) else np.inf
+        since = self.received[:, (self.received_days >= snapshot) & (self.received_days < until)].sum(axis=1)
+        return snapshot, self.counts[:, k] + since
+
+    def suggest(self, inventory_date=None, lead_time=DEFAULT_LEAD_TIME, review_days=DEFAULT_REVIEW_DAYS,
+                window=DEFAULT_WINDOW, service_level=DEFAULT_SERVICE_LEVEL):
+        """Suggested order for every product as a DataFrame (one row per product)"""
+        snapshot, on_hand = self.on_hand(inventory_date)
+        recent = self.daily[:, -window:] if window > 0 else self.daily
+        if recent.shape[1]:
+            average, spread = recent.mean(axis=1), recent.std(axis=1)
+        else:
+            average = spread = np.zeros(len(self.products))
+
+        # The days after the count that this order has to cover
+        horizon = lead_time + review_days
+        start = (snapshot if snapshot is not None else int(np.datetime64('today', 'D').astype(np.int64))) + 1
+        weekday_days = np.bincount(_weekdays(np.arange(start, start + horizon)), minlength=7)
+        forecast = average * (self.seasonal @ weekday_days)
+        safety = NormalDist().inv_cdf(service_level) * spread * np.sqrt(horizon)
+
+        need = np.clip(forecast + safety - on_hand, 0, None)
+        cases = np.ceil(np.clip(need / self.case_pack - 1e-9, 0, None))
+        return pd.DataFrame({
+            'product_number': self.products,
+            'on_hand': on_hand,
+            'avg_daily_usage': average,
+            'forecast_usage': forecast,
+            'safety_stock': safety,
+            'case_pack': self.case_pack,
+            'suggested_cases': cases,
+            'suggested_qty': cases * self.case_pack,
+        })
+
+
+# ==================== CACHE ====================
+
+class ForecastCache:
+    """One UsageMatrix per location, rebuilt when its stamp changes or after invalidate()"""
+
+    def __init__(self):
+        self._matrices = {}     # location -> (stamp, UsageMatrix)
+        self._generation = 0
+        self._lock = threading.Lock()
+
+    def invalidate(self):
+        with self._lock:
+            self._generation += 1
+            self._matrices.clear()
+
+    def get(self, location, stamp, build):
+        """Cached matrix for location, or build() when it is missing or its stamp differs"""
+        with self._lock:
+            entry = self._matrices.get(location)
+            if entry is not None and entry[0] == stamp:
+                return entry[1]
+            generation = self._generation
+        matrix = build()
+        with self._lock:
+            # Not kept if the data changed while it was being built
+            if generation == self._generation:
+                self._matrices[location] = (stamp, matrix)
+        return matrix
+
+
+def suggestion_rows(frame, decimals=2):
+    """JSON-ready rows of a suggest() frame"""
+    return frame.round(decimals).to_dict('records')
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Suggested orders from saved counts and invoices')
+    parser.add_argument('location')
+    parser.add_argument('--data', default=os.path.join(os.path.dirname(os.path.abspath(__file__)), 'data'),
+                        help='Folder with inventory_database.json and orders_database.json')
+    parser.add_argument('--products', default=None, help='Product list CSV (for case packs)')
+    parser.add_argument('--inventory-date', default=None, help='Count to start from (default: the latest)')
+    parser.add_argument('--lead-time', type=int, default=DEFAULT_LEAD_TIME)
+    parser.add_argument('--review-days', type=int, default=DEFAULT_REVIEW_DAYS)
+    parser.add_argument('--window', type=int, default=DEFAULT_WINDOW)
+    parser.add_argument('--service-level', type=float, default=DEFAULT_SERVICE_LEVEL)
+    args = parser.parse_args(argv)
+
+    def read(name):
+        path = os.path.join(args.data, name)
+        if not os.path.exists(path):
+            return {}
+        with open(path, 'r') as f:
+            return json.load(f).get(args.location, {})
+
+    products = pd.read_csv(args.products, dtype=str).fillna('').to_dict('records') if args.products else []
+    began = time.perf_counter()
+    matrix = UsageMatrix(read('inventory_database.json'), read('orders_database.json'), products)
+    built = time.perf_counter()
+    try:
+        frame = matrix.suggest(args.inventory_date, args.lead_time, args.review_days, args.window, args.service_level)
+    except ValueError as e:
+        print(f"Error: {e}")
+        return 1
+    done = time.perf_counter()
+
+    ordering = frame[frame['suggested_qty'] > 0]
+    print(ordering.round(2).to_string(index=False) if len(ordering) else "Nothing to order")
+    print(f"\n{len(matrix.products)} products, {matrix.history_days} days of usage; "
+          f"matrix {(built - began) * 1000:.1f} ms, suggestions {(done - built) * 1000:.1f} ms")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
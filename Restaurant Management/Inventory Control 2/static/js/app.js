@@ -0,0 +1,1811 @@
+let currentProducts = [];
+let productsVersion = null;   // Catalog version the client holds
+let productsByKey = {};       // Product key -> product
+let productOrder = [];        // Product keys in list order
+let countVersions = {};       // Product number -> version of its saved count
+let countContext = null;      // 'location/date' the versions belong to
+const countTimers = {};       // Product number -> pending save timer
+let allInventories = [];
+let lastCalculatedOrder = null;
+
+// Initialize
+document.addEventListener('DOMContentLoaded', function() {
+    setToday();
+    loadProducts();
+    loadInventoriesList();
+    // Each count is saved on its own shortly after it is typed
+    document.getElementById('categoriesContainer').addEventListener('input', function(e) {
+        if (e.target.classList.contains('quantity-input')) {
+            scheduleCountSave(e.target.id.substring('qty_'.length));
+        }
+    });
+});
+
+function showTab(tabName) {
+    // Hide all tabs
+    document.querySelectorAll('.tab-content').forEach(tab => {
+        tab.classList.remove('active');
+    });
+    document.querySelectorAll('.tab').forEach(tab => {
+        tab.classList.remove('active');
+    });
+
+    // Show selected tab
+    document.getElementById(tabName).classList.add('active');
+    event.target.classList.add('active');
+
+    // Load data if needed
+    if (tabName === 'saved') {
+        loadInventoriesList();
+    } else if (tabName === 'products') {
+        displayProductList();
+    }
+}
+
+function setToday() {
+    const today = new Date().toISOString().split('T')[0];
+    document.getElementById('inventoryDate').value = today;
+}
+
+function getSelectedLocation() {
+    return document.querySelector('input[name="location"]:checked').value;
+}
+
+// Fetch only what changed since the version we hold and merge it into currentProducts
+function syncProducts() {
+    const url = productsVersion === null ? '/api/products?since=0' : '/api/products?since=' + productsVersion;
+    return fetch(url)
+        .then(response => response.json())
+        .then(data => {
+            if (data.full) {
+                productsByKey = {};
+            }
+            Object.assign(productsByKey, data.products);
+            data.deleted.forEach(key => delete productsByKey[key]);
+            if (data.order) {
+                productOrder = data.order;
+            }
+            productsVersion = data.version;
+            currentProducts = productOrder.filter(key => key in productsByKey).map(key => productsByKey[key]);
+            return currentProducts;
+        });
+}
+
+function loadProducts() {
+    console.log('Loading products...');
+    syncProducts()
+        .then(data => {
+            console.log('Products loaded:', data.length, 'items');
+            console.log('First 3 products:', data.slice(0, 3));
+            displayProducts();
+        })
+        .catch(error => {
+            console.error('Error loading products:', error);
+            const container = document.getElementById('categoriesContainer');
+            if (container) {
+                container.innerHTML = '<div style="text-align: center; padding: 40px; color: #dc3545;"><h3>Error Loading Products</h3><p>' + error + '</p></div>';
+            }
+        });
+}
+
+function displayProducts() {
+    const container = document.getElementById('categoriesContainer');
+    if (!container) {
+        console.error('Categories container not found!');
+        return;
+    }
+
+    container.innerHTML = '';
+
+    if (!currentProducts || currentProducts.length === 0) {
+        container.innerHTML = '<div style="text-align: center; padding: 40px; color: #6c757d;"><h3>No products loaded</h3><p>Please add products or upload a CSV file in the Manage Products tab.</p></div>';
+        return;
+    }
+
+    console.log('Displaying products, total:', currentProducts.length);
+    console.log('Last product:', currentProducts[currentProducts.length - 1]);
+
+    const viewMode = document.getElementById('viewMode').value;
+    const sortBy = document.getElementById('sortBy').value;
+    const showEdit = document.getElementById('showEditButtons').checked;
+
+    console.log('View Mode:', viewMode, 'Sort By:', sortBy);
+
+    if (viewMode === 'list') {
+        displayAsList(sortBy, showEdit);
+    } else {
+        displayAsCategorized(sortBy, showEdit);
+    }
+}
+
+function displayAsCategorized(sortBy, showEdit) {
+    const container = document.getElementById('categoriesContainer');
+
+    // Preserve CSV order - track order of first appearance for each category
+    const categoryOrder = [];
+    const categories = {};
+
+    currentProducts.forEach(product => {
+        const groupName = product['Group Name'] || 'OTHER';
+        if (!categories[groupName]) {
+            categories[groupName] = [];
+            categoryOrder.push(groupName); // Track order as we encounter categories
+        }
+        categories[groupName].push(product);
+    });
+
+    console.log('Categories found:', Object.keys(categories));
+
+    // Only sort products within each category if user chose a sort option
+    if (sortBy === 'product-name') {
+        Object.keys(categories).forEach(categoryName => {
+            categories[categoryName].sort((a, b) => 
+                (a['Product Description'] || '').localeCompare(b['Product Description'] || '')
+            );
+        });
+    } else if (sortBy === 'product-number') {
+        Object.keys(categories).forEach(categoryName => {
+            categories[categoryName].sort((a, b) => 
+                (a['Product Number'] || '').localeCompare(b['Product Number'] || '')
+            );
+        });
+    }
+    // If sortBy is 'category' (default), maintain CSV order - no sorting needed
+
+    // Display each category in the order they appear in CSV
+    categoryOrder.forEach(categoryName => {
+        const categoryProducts = categories[categoryName];
+
+        const categoryDiv = document.createElement('div');
+        categoryDiv.className = 'category-section';
+
+        let tableHTML = '<div class="category-header">' + categoryName.toUpperCase() + '</div>';
+        tableHTML += '<table class="category-table">';
+        tableHTML += '<thead><tr>';
+        tableHTML += '<th style="width: 35%">Item</th>';
+        tableHTML += '<th style="width: 25%">Product Size</th>';
+        tableHTML += '<th style="width: 15%">Inventory</th>';
+        if (showEdit) {
+            tableHTML += '<th style="width: 25%">Actions</th>';
+        }
+        tableHTML += '</tr></thead><tbody>';
+
+        categoryProducts.forEach(product => {
+            tableHTML += '<tr>';
+            tableHTML += '<td>' + product['Product Description'] + '</td>';
+            tableHTML += '<td>' + product['Product Package Size'] + '</td>';
+            tableHTML += '<td><input type="number" class="quantity-input" ';
+            tableHTML += 'id="qty_' + product['Product Number'] + '" ';
+            tableHTML += 'value="0" min="0" step="0.25" /></td>';
+
+            if (showEdit) {
+                tableHTML += '<td class="row-controls">';
+                tableHTML += '<button class="edit-btn quick-edit-btn" data-product-id="' + product['Product Number'] + '">&#9999; Edit</button>';
+                tableHTML += '<span style="font-size: 0.75em; color: #6c757d;">ID: ' + product['Product Number'] + '</span>';;
+                tableHTML += '</td>';
+            }
+
+            tableHTML += '</tr>';
+        });
+
+        tableHTML += '</tbody></table>';
+        categoryDiv.innerHTML = tableHTML;
+        container.appendChild(categoryDiv);
+    });
+
+    // Add event delegation for edit buttons
+    container.addEventListener('click', function(e) {
+        if (e.target.classList.contains('quick-edit-btn')) {
+            const productId = e.target.getAttribute('data-product-id');
+            quickEditProduct(productId);
+        }
+    });
+}
+
+function displayAsList(sortBy, showEdit) {
+    const container = document.getElementById('categoriesContainer');
+
+    // Create a copy and sort (or keep original order)
+    let sortedProducts = [...currentProducts];
+
+    console.log('displayAsList - sortBy:', sortBy, 'Original count:', currentProducts.length);
+
+    if (sortBy === 'product-name') {
+        sortedProducts.sort((a, b) => 
+            (a['Product Description'] || '').localeCompare(b['Product Description'] || '')
+        );
+    } else if (sortBy === 'product-number') {
+        sortedProducts.sort((a, b) => 
+            (a['Product Number'] || '').localeCompare(b['Product Number'] || '')
+        );
+    } else if (sortBy === 'category') {
+        sortedProducts.sort((a, b) => {
+            const catCompare = (a['Group Name'] || 'OTHER').localeCompare(b['Group Name'] || 'OTHER');
+            if (catCompare !== 0) return catCompare;
+            return (a['Product Description'] || '').localeCompare(b['Product Description'] || '');
+        });
+    }
+    // else if sortBy === 'csv-order', keep original order (no sorting)
+
+    console.log('After sorting, count:', sortedProducts.length, 'Last item:', sortedProducts[sortedProducts.length - 1]);
+
+    const categoryDiv = document.createElement('div');
+    categoryDiv.className = 'category-section';
+
+    let tableHTML = '<div class="category-header">ALL PRODUCTS</div>';
+    tableHTML += '<table class="category-table">';
+    tableHTML += '<thead><tr>';
+    tableHTML += '<th style="width: 20%">Category</th>';
+    tableHTML += '<th style="width: 30%">Item</th>';
+    tableHTML += '<th style="width: 20%">Product Size</th>';
+    tableHTML += '<th style="width: 10%">Inventory</th>';
+    if (showEdit) {
+        tableHTML += '<th style="width: 20%">Actions</th>';
+    }
+    tableHTML += '</tr></thead><tbody>';
+
+    sortedProducts.forEach(product => {
+        tableHTML += '<tr>';
+        tableHTML += '<td><span style="background: #e9ecef; padding: 2px 6px; border-radius: 3px; font-size: 0.75em;">' + (product['Group Name'] || 'OTHER') + '</span></td>';
+        tableHTML += '<td>' + product['Product Description'] + '</td>';
+        tableHTML += '<td>' + product['Product Package Size'] + '</td>';
+        tableHTML += '<td><input type="number" class="quantity-input" ';
+        tableHTML += 'id="qty_' + product['Product Number'] + '" ';
+        tableHTML += 'value="0" min="0" step="0.25" /></td>';
+
+        if (showEdit) {
+            tableHTML += '<td class="row-controls">';
+            tableHTML += '<button class="edit-btn quick-edit-btn" data-product-id="' + product['Product Number'] + '">&#9999; Edit</button>';
+            tableHTML += '<span style="font-size: 0.75em; color: #6c757d;">ID: ' + product['Product Number'] + '</span>';
+            tableHTML += '</td>';
+        }
+
+        tableHTML += '</tr>';
+    });
+
+    tableHTML += '</tbody></table>';
+    categoryDiv.innerHTML = tableHTML;
+    container.appendChild(categoryDiv);
+
+    // Add event delegation for edit buttons
+    container.addEventListener('click', function(e) {
+        if (e.target.classList.contains('quick-edit-btn')) {
+            const productId = e.target.getAttribute('data-product-id');
+            quickEditProduct(productId);
+        }
+    });
+}
+
+function applySortAndDisplay() {
+    displayProducts();
+}
+
+function toggleEditButtons() {
+    displayProducts();
+}
+
+function quickEditProduct(productNum) {
+    const product = currentProducts.find(p => p['Product Number'] === productNum);
+    if (!product) {
+        alert('Product not found');
+        return;
+    }
+
+    const newDesc = prompt('Edit Description:', product['Product Description']);
+    if (newDesc === null) return;
+
+    const newBrand = prompt('Edit Brand:', product['Product Brand']);
+    if (newBrand === null) return;
+
+    const newSize = prompt('Edit Package Size:', product['Product Package Size']);
+    if (newSize === null) return;
+
+    const newGroup = prompt('Edit Category/Group:', product['Group Name']);
+    if (newGroup === null) return;
+
+    fetch('/api/products/update', {
+        method: 'POST',
+        headers: {'Content-Type': 'application/json'},
+        body: JSON.stringify({
+            product_number: productNum,
+            description: newDesc,
+            brand: newBrand,
+            package_size: newSize,
+            group_name: newGroup
+        })
+    })
+    .then(response => response.json())
+    .then(result => {
+        if (result.success) {
+            loadProducts();
+            showMessage('Product updated successfully', 'success');
+        } else {
+            alert('Error: ' + result.message);
+        }
+    })
+    .catch(error => console.error('Error updating product:', error));
+}
+
+function filterProducts() {
+    const searchTerm = document.getElementById('searchBox').value.toLowerCase();
+    const sections = document.querySelectorAll('.category-section');
+
+    sections.forEach(section => {
+        const rows = section.querySelectorAll('tbody tr');
+        let hasVisibleRows = false;
+
+        rows.forEach(row => {
+            const text = row.textContent.toLowerCase();
+            const isVisible = text.includes(searchTerm);
+            row.style.display = isVisible ? '' : 'none';
+            if (isVisible) hasVisibleRows = true;
+        });
+
+        // Hide entire category if no rows match
+        section.style.display = hasVisibleRows ? '' : 'none';
+    });
+}
+
+function printInventory() {
+    const location = getSelectedLocation();
+    const date = document.getElementById('inventoryDate').value || 'Not Set';
+
+    // Update print header
+    document.getElementById('printLocation').textContent = location;
+    document.getElementById('printDate').textContent = date;
+
+    // Trigger print dialog
+    window.print();
+}
+
+function saveInventory() {
+    const location = getSelectedLocation();
+    const date = document.getElementById('inventoryDate').value;
+
+    if (!date) {
+        showMessage('Please select a date', 'error');
+        return;
+    }
+
+    const inventory = {};
+    currentProducts.forEach(product => {
+        const qty = document.getElementById('qty_' + product['Product Number']).value;
+        if (qty > 0) {
+            inventory[product['Product Number']] = parseInt(qty);
+        }
+    });
+
+    fetch('/api/inventory/save', {
+        method: 'POST',
+        headers: {'Content-Type': 'application/json'},
+        body: JSON.stringify({location, date, inventory})
+    })
+    .then(response => response.json())
+    .then(data => {
+        showMessage(data.message, 'success');
+        // The whole save gave changed products new versions
+        return fetch('/api/inventory/' + location + '/' + date + '/counts')
+            .then(response => response.json())
+            .then(result => {
+                countVersions = result.versions;
+                countContext = location + '/' + date;
+            });
+    })
+    .catch(error => {
+        showMessage('Error saving inventory', 'error');
+    });
+}
+
+function scheduleCountSave(productNum) {
+    clearTimeout(countTimers[productNum]);
+    countTimers[productNum] = setTimeout(() => {
+        delete countTimers[productNum];
+        saveCount(productNum);
+    }, 500);
+}
+
+function saveCount(productNum) {
+    const location = getSelectedLocation();
+    const date = document.getElementById('inventoryDate').value;
+    const input = document.getElementById('qty_' + productNum);
+    if (!date || !input) {
+        return;
+    }
+    const context = location + '/' + date;
+    if (countContext !== context) {
+        countVersions = {};
+        countContext = context;
+    }
+
+    const qty = parseFloat(input.value);
+    const body = {quantity: qty > 0 ? qty : null};
+    if (productNum in countVersions) {
+        body.version = countVersions[productNum];
+    }
+
+    fetch('/api/inventory/' + encodeURIComponent(location) + '/' + encodeURIComponent(date) +
+          '/counts/' + encodeURIComponent(productNum), {
+        method: 'PATCH',
+        headers: {'Content-Type': 'application/json'},
+        body: JSON.stringify(body)
+    })
+    .then(response => response.json().then(data => ({status: response.status, data})))
+    .then(({status, data}) => {
+        if (countContext !== context) {
+            return;
+        }
+        if (status === 409) {
+            // Someone else saved this product first: show their count
+            countVersions[productNum] = data.version;
+            input.value = data.quantity || 0;
+            showMessage('Count for ' + productNum + ' was changed by someone else and has been refreshed', 'error');
+        } else if (data.success) {
+            countVersions[productNum] = data.version;
+        } else {
+            showMessage('Error saving count: ' + data.message, 'error');
+        }
+    })
+    .catch(error => {
+        showMessage('Error saving count', 'error');
+    });
+}
+
+function loadInventory() {
+    const location = getSelectedLocation();
+    const date = document.getElementById('inventoryDate').value;
+
+    if (!date) {
+        showMessage('Please select a date', 'error');
+        return;
+    }
+
+    fetch('/api/inventory/' + location + '/' + date + '/counts')
+        .then(response => response.json())
+        .then(result => {
+            const data = result.counts;
+            countVersions = result.versions;
+            countContext = location + '/' + date;
+
+            // Reset all quantities
+            currentProducts.forEach(product => {
+                document.getElementById('qty_' + product['Product Number']).value = 0;
+            });
+
+            // Set loaded quantities
+            for (let productNum in data) {
+                const input = document.getElementById('qty_' + productNum);
+                if (input) {
+                    input.value = data[productNum];
+                }
+            }
+
+            showMessage('Inventory loaded successfully', 'success');
+        })
+        .catch(error => {
+            showMessage('Error loading inventory', 'error');
+        });
+}
+
+function loadInventoriesList() {
+    fetch('/api/inventory/list')
+        .then(response => response.json())
+        .then(data => {
+            allInventories = data;
+            displayInventories(data);
+        })
+        .catch(error => console.error('Error loading inventories:', error));
+}
+
+function displayInventories(inventories) {
+    const container = document.getElementById('inventoriesList');
+    container.innerHTML = '';
+
+    if (inventories.length === 0) {
+        container.innerHTML = '<p style="text-align: center; color: #6c757d; padding: 40px;">No saved inventories found</p>';
+        return;
+    }
+
+    // Group inventories by location
+    const byLocation = {};
+    inventories.forEach(inv => {
+        if (!byLocation[inv.location]) {
+            byLocation[inv.location] = [];
+        }
+        byLocation[inv.location].push(inv);
+    });
+
+    // Sort dates within each location (newest first)
+    Object.keys(byLocation).forEach(location => {
+        byLocation[location].sort((a, b) => new Date(b.date) - new Date(a.date));
+    });
+
+    // Create sections for each location
+    Object.keys(byLocation).sort().forEach(location => {
+        const section = document.createElement('div');
+        section.className = 'location-section';
+
+        // Location header
+        const header = document.createElement('div');
+        header.className = 'location-header';
+        header.innerHTML = '<h3>&#128205; ' + location + '</h3>' +
+            '<span class="location-badge">' + byLocation[location].length + ' inventories</span>';
+        header.onclick = () => toggleLocationSection(location);
+
+        // Items list
+        const itemsList = document.createElement('div');
+        itemsList.className = 'inventory-items-list';
+        itemsList.id = 'location-' + location.replace(/\s+/g, '-');
+
+        byLocation[location].forEach(inv => {
+            const item = document.createElement('div');
+            item.className = 'inventory-item';
+            item.innerHTML = '<div class="inventory-info">' +
+                '<div class="inventory-date">&#128197; ' + inv.date + '</div>' +
+                '<div class="inventory-meta">' + inv.item_count + ' items</div>' +
+                '</div>' +
+                '<div class="inventory-actions">' +
+                '<button class="btn btn-primary view-inv-btn" onclick="viewInventory(&quot;' + inv.location + '&quot;, &quot;' + inv.date + '&quot;)">&#128065; View</button>' +
+                '<button class="btn btn-success export-inv-btn" onclick="exportInventory(&quot;' + inv.location + '&quot;, &quot;' + inv.date + '&quot;)">&#128229; Export</button>' +
+                '<button class="btn btn-danger delete-inv-btn" onclick="deleteInventoryConfirm(&quot;' + inv.location + '&quot;, &quot;' + inv.date + '&quot;)">&#128465;</button>' +
+                '</div>';
+            itemsList.appendChild(item);
+        });
+
+        section.appendChild(header);
+        section.appendChild(itemsList);
+        container.appendChild(section);
+    });
+}
+
+function toggleLocationSection(location) {
+    const itemsList = document.getElementById('location-' + location.replace(/\s+/g, '-'));
+    itemsList.classList.toggle('expanded');
+}
+
+function toggleAllLocations() {
+    const allLists = document.querySelectorAll('.inventory-items-list');
+    const anyExpanded = Array.from(allLists).some(list => list.classList.contains('expanded'));
+
+    allLists.forEach(list => {
+        if (anyExpanded) {
+            list.classList.remove('expanded');
+        } else {
+            list.classList.add('expanded');
+        }
+    });
+}
+
+function deleteInventoryConfirm(location, date) {
+    if (!confirm('Delete inventory for ' + location + ' on ' + date + '?')) return;
+    deleteInventory(location, date);
+}
+
+function viewInventory(location, date) {
+    // Switch to inventory tab and load
+    document.querySelector('input[value="' + location + '"]').checked = true;
+    document.getElementById('inventoryDate').value = date;
+    showTab('inventory');
+    loadInventory();
+}
+
+function exportInventory(location, date) {
+    window.location.href = '/api/inventory/export/' + location + '/' + date;
+}
+
+function deleteInventory(location, date) {
+    if (!confirm('Delete inventory for ' + location + ' on ' + date + '?')) return;
+
+    fetch('/api/inventory/delete', {
+        method: 'POST',
+        headers: {'Content-Type': 'application/json'},
+        body: JSON.stringify({location, date})
+    })
+    .then(response => response.json())
+    .then(data => {
+        if (data.success) {
+            loadInventoriesList();
+            showMessage(data.message, 'success');
+        }
+    })
+    .catch(error => console.error('Error deleting inventory:', error));
+}
+
+function generateSummaryReport() {
+    fetch('/api/reports/summary')
+        .then(response => response.json())
+        .then(data => {
+            let html = '<div style="background: #f8f9fa; padding: 20px; border-radius: 10px;">';
+            html += '<h3>Inventory Summary by Location</h3>';
+
+            for (let location in data) {
+                html += '<div style="margin: 20px 0; padding: 15px; background: white; border-radius: 8px;">';
+                html += '<h4>' + location + '</h4>';
+                html += '<p><strong>Total Inventories:</strong> ' + data[location].total_inventories + '</p>';
+                html += '<p><strong>Dates:</strong> ' + data[location].dates.join(', ') + '</p>';
+                html += '</div>';
+            }
+
+            html += '</div>';
+            document.getElementById('reportContent').innerHTML = html;
+        })
+        .catch(error => console.error('Error generating report:', error));
+}
+
+let currentReportData = null;
+
+function generateProductActivityReport() {
+    const location = document.getElementById('reportLocation').value;
+    const startDate = document.getElementById('reportStartDate').value;
+    const endDate = document.getElementById('reportEndDate').value;
+
+    if (!startDate || !endDate) {
+        alert('Please select start and end dates');
+        return;
+    }
+
+    if (startDate > endDate) {
+        alert('Start date must be before end date');
+        return;
+    }
+
+    fetch(`/api/reports/product-activity?location=${location}&start_date=${startDate}&end_date=${endDate}`)
+        .then(response => response.json())
+        .then(data => {
+            if (!data.success) {
+                alert('Error: ' + data.message);
+                return;
+            }
+
+            currentReportData = data;
+            displayProductActivityReport(data);
+            document.getElementById('exportReportBtn').style.display = 'inline-block';
+        })
+        .catch(error => {
+            console.error('Error generating report:', error);
+            alert('Error generating report');
+        });
+}
+
+function displayProductActivityReport(data) {
+    let html = '<div style="background: #f8f9fa; padding: 20px; border-radius: 10px;">';
+    html += '<h3>Product Activity Report</h3>';
+    html += '<p><strong>Date Range:</strong> ' + data.date_range.start + ' to ' + data.date_range.end + '</p>';
+    html += '<p><strong>Location:</strong> ' + (data.location === 'all' ? 'All Locations' : data.location) + '</p>';
+    html += '<p><strong>Total Products:</strong> ' + data.total_products + '</p>';
+
+    // Legend for colors
+    html += '<div style="display: flex; gap: 20px; margin-top: 15px; padding: 10px; background: white; border-radius: 5px;">';
+    html += '<div><span style="display: inline-block; width: 20px; height: 20px; background: #e3f2fd; border: 1px solid #90caf9; vertical-align: middle;"></span> <strong>Inventory Count</strong></div>';
+    html += '<div><span style="display: inline-block; width: 20px; height: 20px; background: #fff3e0; border: 1px solid #ffb74d; vertical-align: middle;"></span> <strong>Order/Delivery</strong></div>';
+    html += '</div>';
+
+    if (data.products.length === 0) {
+        html += '<p style="color: #6c757d; margin-top: 20px;">No activity found for the selected date range.</p>';
+    } else {
+        // Keep products in CSV order (no sorting)
+
+        // Collect all unique dates and locations from both inventory and orders
+        let allDates = new Map(); // Map of date -> {location -> type (inventory/order)}
+
+        data.products.forEach(product => {
+            if (product.inventory_dates) {
+                product.inventory_dates.forEach(inv => {
+                    if (!allDates.has(inv.date)) {
+                        allDates.set(inv.date, new Map());
+                    }
+                    if (!allDates.get(inv.date).has(inv.location)) {
+                        allDates.get(inv.date).set(inv.location, new Set());
+                    }
+                    allDates.get(inv.date).get(inv.location).add('inventory');
+                });
+            }
+            if (product.order_dates) {
+                product.order_dates.forEach(ord => {
+                    if (!allDates.has(ord.date)) {
+                        allDates.set(ord.date, new Map());
+                    }
+                    if (!allDates.get(ord.date).has(ord.location)) {
+                        allDates.get(ord.date).set(ord.location, new Set());
+                    }
+                    allDates.get(ord.date).get(ord.location).add('order');
+                });
+            }
+        });
+
+        // Sort dates
+        let sortedDates = Array.from(allDates.keys()).sort();
+
+        html += '<div style="overflow-x: auto; margin-top: 20px;">';
+        html += '<table style="width: 100%; border-collapse: collapse; background: white;">';
+        html += '<thead><tr style="background: #6f42c1; color: white;">';
+        html += '<th style="padding: 12px; text-align: left; border: 1px solid #dee2e6;">Product #</th>';
+        html += '<th style="padding: 12px; text-align: left; border: 1px solid #dee2e6;">Description</th>';
+        html += '<th style="padding: 12px; text-align: left; border: 1px solid #dee2e6;">Brand</th>';
+        html += '<th style="padding: 12px; text-align: left; border: 1px solid #dee2e6;">Package Size</th>';
+        html += '<th style="padding: 12px; text-align: center; border: 1px solid #dee2e6; background: #28a745;" title="Beginning Inventory">Begin Inv</th>';
+        html += '<th style="padding: 12px; text-align: center; border: 1px solid #dee2e6; background: #ffc107;" title="Total Orders">Total Orders</th>';
+        html += '<th style="padding: 12px; text-align: center; border: 1px solid #dee2e6; background: #dc3545;" title="Ending Inventory">End Inv</th>';
+        html += '<th style="padding: 12px; text-align: center; border: 1px solid #dee2e6; background: #007bff; font-weight: bold;" title="Usage = Begin + Orders - End">USAGE</th>';
+        html += '<th style="padding: 12px; text-align: center; border: 1px solid #dee2e6; background: #6f42c1; color: white; font-weight: bold;" title="Cases Required (Usage ÷ Package Size)">Cases Required</th>';
+
+        // Add column for each date/location combo
+        sortedDates.forEach(date => {
+            let locationTypes = allDates.get(date);
+            let locations = Array.from(locationTypes.keys()).sort();
+            locations.forEach(loc => {
+                let types = locationTypes.get(loc);
+                let isOrder = types.has('order');
+                let isInventory = types.has('inventory');
+                let label = isInventory && isOrder ? 'INV+ORD' : isOrder ? 'ORDER' : 'INV';
+                html += '<th style="padding: 12px; text-align: center; border: 1px solid #dee2e6; background: #8e70c7;">' + date + '<br>(' + loc + ')<br><small>' + label + '</small></th>';
+            });
+        });
+
+        html += '</tr></thead><tbody>';
+
+        data.products.forEach(product => {
+            html += '<tr style="border-bottom: 1px solid #dee2e6;">';
+            html += '<td style="padding: 10px; border: 1px solid #dee2e6;">' + product.product_number;
+            // Add Case Count badge if applicable
+            if (product.case_count_type && product.case_count_type.toUpperCase() === 'YES') {
+                html += '<br><span style="background: #ffc107; color: #000; padding: 2px 6px; border-radius: 3px; font-size: 0.75em; font-weight: bold;">CASE COUNT</span>';
+            }
+            html += '</td>';
+            html += '<td style="padding: 10px; border: 1px solid #dee2e6;">' + product.description + '</td>';
+            html += '<td style="padding: 10px; border: 1px solid #dee2e6;">' + product.brand + '</td>';
+            html += '<td style="padding: 10px; border: 1px solid #dee2e6;">' + product.package_size + '</td>';
+
+            // Add usage calculation columns
+            html += '<td style="padding: 10px; border: 1px solid #dee2e6; text-align: center; background: #d4edda; font-weight: bold;">' + 
+                (product.beginning_inventory || 0) + '</td>';
+            html += '<td style="padding: 10px; border: 1px solid #dee2e6; text-align: center; background: #fff3cd; font-weight: bold;">' + 
+                (product.total_orders || 0) + '</td>';
+            html += '<td style="padding: 10px; border: 1px solid #dee2e6; text-align: center; background: #f8d7da; font-weight: bold;">' + 
+                (product.ending_inventory || 0) + '</td>';
+            html += '<td style="padding: 10px; border: 1px solid #dee2e6; text-align: center; background: #cce5ff; font-weight: bold; font-size: 1.1em;">' + 
+                (product.usage || 0) + '</td>';
+            html += '<td style="padding: 10px; border: 1px solid #dee2e6; text-align: center; background: #e9d5ff; font-weight: bold; font-size: 1.1em;">' + 
+                (product.cases_required || 0) + '</td>';
+
+            // Create maps for inventory and orders
+            let productInventory = new Map();
+            let productOrders = new Map();
+
+            if (product.inventory_dates) {
+                product.inventory_dates.forEach(inv => {
+                    let key = inv.date + '|' + inv.location;
+                    productInventory.set(key, inv.quantity);
+                });
+            }
+
+            if (product.order_dates) {
+                product.order_dates.forEach(ord => {
+                    let key = ord.date + '|' + ord.location;
+                    productOrders.set(key, ord.quantity);
+                });
+            }
+
+            // Fill in quantities for each date/location
+            sortedDates.forEach(date => {
+                let locationTypes = allDates.get(date);
+                let locations = Array.from(locationTypes.keys()).sort();
+                locations.forEach(loc => {
+                    let key = date + '|' + loc;
+                    let types = locationTypes.get(loc);
+
+                    let invQty = productInventory.get(key);
+                    let ordQty = productOrders.get(key);
+
+                    // Determine background color based on what data we have
+                    let bgColor = '#fff';
+                    let displayValue = '0';
+
+                    if (types.has('inventory') && types.has('order')) {
+                        // Both inventory and order on same date
+                        bgColor = '#f0e5ff'; // Light purple blend
+                        displayValue = '<strong>' + (invQty || 0) + '</strong> / <strong style="color: #ff6f00;">' + (ordQty || 0) + '</strong>';
+                    } else if (types.has('order')) {
+                        // Order only
+                        bgColor = '#fff3e0'; // Light orange
+                        displayValue = '<strong style="color: #ff6f00;">' + (ordQty || 0) + '</strong>';
+                    } else {
+                        // Inventory only
+                        bgColor = '#e3f2fd'; // Light blue
+                        displayValue = '<strong>' + (invQty || 0) + '</strong>';
+                    }
+
+                    html += '<td style="padding: 10px; text-align: center; border: 1px solid #dee2e6; background: ' + bgColor + ';">';
+                    html += displayValue;
+                    html += '</td>';
+                });
+            });
+
+            html += '</tr>';
+        });
+
+        html += '</tbody></table></div>';
+    }
+
+    html += '</div>';
+    document.getElementById('reportContent').innerHTML = html;
+}
+
+function exportReportToCSV() {
+    if (!currentReportData || !currentReportData.products) {
+        alert('No report data to export');
+        return;
+    }
+
+    // Keep products in CSV order (no sorting)
+    const products = currentReportData.products;
+
+    // Collect all unique dates and locations from both inventory and orders
+    let allDates = new Map();
+    products.forEach(product => {
+        if (product.inventory_dates) {
+            product.inventory_dates.forEach(inv => {
+                if (!allDates.has(inv.date)) {
+                    allDates.set(inv.date, new Map());
+                }
+                if (!allDates.get(inv.date).has(inv.location)) {
+                    allDates.get(inv.date).set(inv.location, new Set());
+                }
+                allDates.get(inv.date).get(inv.location).add('inventory');
+            });
+        }
+        if (product.order_dates) {
+            product.order_dates.forEach(ord => {
+                if (!allDates.has(ord.date)) {
+                    allDates.set(ord.date, new Map());
+                }
+                if (!allDates.get(ord.date).has(ord.location)) {
+                    allDates.get(ord.date).set(ord.location, new Set());
+                }
+                allDates.get(ord.date).get(ord.location).add('order');
+            });
+        }
+    });
+
+    // Sort dates
+    let sortedDates = Array.from(allDates.keys()).sort();
+
+    // Build CSV header
+    let csv = 'Product Number,Description,Brand,Package Size,Group,Beginning Inventory,Total Orders,Ending Inventory,USAGE,Cases Required';
+    sortedDates.forEach(date => {
+        let locationTypes = allDates.get(date);
+        let locations = Array.from(locationTypes.keys()).sort();
+        locations.forEach(loc => {
+            let types = locationTypes.get(loc);
+            let label = types.has('inventory') && types.has('order') ? 'INV+ORD' : types.has('order') ? 'ORDER' : 'INV';
+            csv += `,"${date} (${loc}) ${label}"`;
+        });
+    });
+    csv += '\n';
+
+    // Package size exceptions list
+    const packageSizeExceptions = ['2725042', '2720977', '2725661', '5314208', '3408822', 
+                                  '4558003', '2571705', '6911663', '1552124', '6083968', '7979586'];
+
+    // Build CSV rows
+    products.forEach(product => {
+        // Check if product is in exception list
+        const packageSize = packageSizeExceptions.includes(String(product.product_number)) 
+                          ? '1 unit' 
+                          : product.package_size;
+
+        csv += `"${product.product_number}",`;
+        csv += `"${product.description}",`;
+        csv += `"${product.brand}",`;
+        csv += `"${packageSize}",`;
+        csv += `"${product.group}",`;
+        csv += `"${product.beginning_inventory || 0}",`;
+        csv += `"${product.total_orders || 0}",`;
+        csv += `"${product.ending_inventory || 0}",`;
+        csv += `"${product.usage || 0}",`;
+        csv += `"${product.cases_required || 0}"`;
+
+        // Create maps for inventory and orders
+        let productInventory = new Map();
+        let productOrders = new Map();
+
+        if (product.inventory_dates) {
+            product.inventory_dates.forEach(inv => {
+                let key = inv.date + '|' + inv.location;
+                productInventory.set(key, inv.quantity);
+            });
+        }
+
+        if (product.order_dates) {
+            product.order_dates.forEach(ord => {
+                let key = ord.date + '|' + ord.location;
+                productOrders.set(key, ord.quantity);
+            });
+        }
+
+        // Fill in quantities for each date/location
+        sortedDates.forEach(date => {
+            let locationTypes = allDates.get(date);
+            let locations = Array.from(locationTypes.keys()).sort();
+            locations.forEach(loc => {
+                let key = date + '|' + loc;
+                let types = locationTypes.get(loc);
+
+                let invQty = productInventory.get(key);
+                let ordQty = productOrders.get(key);
+
+                if (types.has('inventory') && types.has('order')) {
+                    let invValue = invQty != null ? (invQty || 0) : '';
+                    let ordValue = ordQty != null ? (ordQty || 0) : '';
+                    csv += `,"${invValue} / ${ordValue}"`;
+                } else if (types.has('order')) {
+                    csv += `,"${ordQty != null ? (ordQty || 0) : ''}"`;
+                } else {
+                    csv += `,"${invQty != null ? (invQty || 0) : ''}"`;
+                }
+            });
+        });
+
+        csv += '\n';
+    });
+
+    // Download CSV
+    const blob = new Blob([csv], { type: 'text/csv' });
+    const url = window.URL.createObjectURL(blob);
+    const a = document.createElement('a');
+    a.href = url;
+    a.download = `product_activity_${currentReportData.date_range.start}_to_${currentReportData.date_range.end}.csv`;
+    document.body.appendChild(a);
+    a.click();
+    document.body.removeChild(a);
+    window.URL.revokeObjectURL(url);
+}
+
+function showMessage(message, type) {
+    const msgDiv = document.getElementById('statusMessage');
+    msgDiv.textContent = message;
+    msgDiv.className = 'status-message ' + type;
+    msgDiv.style.display = 'block';
+
+    setTimeout(() => {
+        msgDiv.style.display = 'none';
+    }, 3000);
+}
+
+// Product Management Functions
+function displayProductList() {
+    syncProducts()
+        .then(() => {
+            const tbody = document.getElementById('productManagementTableBody');
+            tbody.innerHTML = '';
+
+            // Display products in the same order as they appear in Enter Inventory (CSV order)
+            currentProducts.forEach((product, index) => {
+                const row = tbody.insertRow();
+                row.draggable = true;
+                row.dataset.productNumber = product['Product Number'];
+                row.style.cursor = 'move';
+
+                // Safely escape HTML entities
+                function escapeHtml(str) {
+                    const div = document.createElement('div');
+                    div.textContent = str;
+                    return div.innerHTML;
+                }
+
+                const productNum = escapeHtml(product['Product Number']);
+                const productDesc = escapeHtml(product['Product Description'] || '');
+                const productBrand = escapeHtml(product['Product Brand'] || '');
+                const productPackage = escapeHtml(product['Product Package Size'] || '');
+                const caseCountType = product['Case Count Type'] || 'No';
+                const caseCountChecked = caseCountType.toUpperCase() === 'YES' ? 'checked' : '';
+
+                row.innerHTML = '<td style="font-weight: bold; color: #667eea; text-align: center;">&#128070; ' + (index + 1) + '</td>' +
+                    '<td><span style="background: #e9ecef; padding: 4px 8px; border-radius: 4px; font-size: 0.85em; font-weight: 600;">' + 
+                    (product['Group Name'] || 'OTHER') + '</span></td>' +
+                    '<td>' + productNum + '</td>' +
+                    '<td>' + productDesc + '</td>' +
+                    '<td>' + productBrand + '</td>' +
+                    '<td>' + productPackage + '</td>' +
+                    '<td style="text-align: center;">' +
+                    '<input type="checkbox" class="case-count-checkbox" data-product-num="' + productNum + '" ' + caseCountChecked + ' ' +
+                    'onchange="toggleCaseCount(&quot;' + productNum + '&quot;, this.checked)" ' +
+                    'title="When checked, invoice quantities stay as case count (not multiplied)" ' +
+                    'style="width: 20px; height: 20px; cursor: pointer;" ondragstart="event.stopPropagation()">' +
+                    '</td>' +
+                    '<td class="action-buttons">' +
+                    '<button class="btn btn-primary edit-product-btn" style="padding: 8px 15px;" ondragstart="event.stopPropagation()">&#9999; Edit</button>' +
+                    '<button class="btn btn-danger delete-product-btn" style="padding: 8px 15px;" ondragstart="event.stopPropagation()">&#128465; Delete</button>' +
+                    '</td>';
+
+                // Add drag event listeners
+                row.addEventListener('dragstart', handleDragStart);
+                row.addEventListener('dragover', handleDragOver);
+                row.addEventListener('drop', handleDrop);
+                row.addEventListener('dragend', handleDragEnd);
+
+                // Add click listeners to buttons (no inline onclick!)
+                const editBtn = row.querySelector('.edit-product-btn');
+                const deleteBtn = row.querySelector('.delete-product-btn');
+
+                editBtn.addEventListener('click', function(e) {
+                    e.stopPropagation();
+                    editProductByNumber(product['Product Number']);
+                });
+
+                deleteBtn.addEventListener('click', function(e) {
+                    e.stopPropagation();
+                    deleteProduct(product['Product Number']);
+                });
+            });
+        })
+        .catch(error => console.error('Error loading products:', error));
+}
+
+function filterProductList() {
+    const searchTerm = document.getElementById('productSearchBox').value.toLowerCase();
+    const rows = document.getElementById('productManagementTableBody').rows;
+
+    for (let row of rows) {
+        const text = row.textContent.toLowerCase();
+        row.style.display = text.includes(searchTerm) ? '' : 'none';
+    }
+}
+
+function showAddProductForm() {
+    document.getElementById('addProductForm').style.display = 'block';
+    document.getElementById('newProductNum').value = '';
+    document.getElementById('newDescription').value = '';
+    document.getElementById('newBrand').value = '';
+    document.getElementById('newPackageSize').value = '';
+    document.getElementById('newGroupName').value = '';
+    document.getElementById('insertPosition').value = '';
+}
+
+function hideAddProductForm() {
+    document.getElementById('addProductForm').style.display = 'none';
+}
+
+function addProduct() {
+    const insertPosition = document.getElementById('insertPosition').value;
+    const data = {
+        product_number: document.getElementById('newProductNum').value,
+        description: document.getElementById('newDescription').value,
+        brand: document.getElementById('newBrand').value,
+        package_size: document.getElementById('newPackageSize').value,
+        group_name: document.getElementById('newGroupName').value || 'OTHER',
+        insert_position: insertPosition ? parseInt(insertPosition) : null
+    };
+
+    if (!data.product_number || !data.description) {
+        alert('Product Number and Description are required');
+        return;
+    }
+
+    fetch('/api/products/add', {
+        method: 'POST',
+        headers: {'Content-Type': 'application/json'},
+        body: JSON.stringify(data)
+    })
+    .then(response => response.json())
+    .then(result => {
+        if (result.success) {
+            hideAddProductForm();
+            displayProductList();
+            loadProducts(); // Refresh main inventory table
+            alert(result.message);
+        } else {
+            alert('Error: ' + result.message);
+        }
+    })
+    .catch(error => console.error('Error adding product:', error));
+}
+
+function toggleCaseCount(productNumber, isChecked) {
+    const product = currentProducts.find(p => String(p['Product Number']) === String(productNumber));
+    if (!product) return;
+
+    fetch('/api/products/update-case-count', {
+        method: 'POST',
+        headers: {'Content-Type': 'application/json'},
+        body: JSON.stringify({
+            product_number: productNumber,
+            case_count_type: isChecked ? 'Yes' : 'No'
+        })
+    })
+    .then(response => response.json())
+    .then(result => {
+        if (result.success) {
+            console.log('Case Count Type updated for product ' + productNumber);
+            // Update local data
+            product['Case Count Type'] = isChecked ? 'Yes' : 'No';
+        } else {
+            alert('Error updating Case Count Type: ' + result.message);
+            // Revert checkbox
+            const checkbox = document.querySelector('.case-count-checkbox[data-product-num="' + productNumber + '"]');
+            if (checkbox) checkbox.checked = !isChecked;
+        }
+    })
+    .catch(error => {
+        console.error('Error updating Case Count Type:', error);
+        alert('Error updating Case Count Type');
+        // Revert checkbox
+        const checkbox = document.querySelector('.case-count-checkbox[data-product-num="' + productNumber + '"]');
+        if (checkbox) checkbox.checked = !isChecked;
+    });
+}
+
+function editProduct(product) {
+    const newDesc = prompt('Edit Description:', product['Product Description']);
+    const newBrand = prompt('Edit Brand:', product['Product Brand']);
+    const newSize = prompt('Edit Package Size:', product['Product Package Size']);
+
+    if (newDesc === null) return;
+
+    fetch('/api/products/update', {
+        method: 'POST',
+        headers: {'Content-Type': 'application/json'},
+        body: JSON.stringify({
+            product_number: product['Product Number'],
+            description: newDesc || product['Product Description'],
+            brand: newBrand || product['Product Brand'],
+            package_size: newSize || product['Product Package Size']
+        })
+    })
+    .then(response => response.json())
+    .then(result => {
+        if (result.success) {
+            displayProductList();
+            loadProducts();
+            alert(result.message);
+        } else {
+            alert('Error: ' + result.message);
+        }
+    })
+    .catch(error => console.error('Error updating product:', error));
+}
+
+function editProductByNumber(productNumber) {
+    // Find the product from currentProducts array
+    const product = currentProducts.find(p => String(p['Product Number']) === String(productNumber));
+    if (product) {
+        editProduct(product);
+    } else {
+        alert('Product not found');
+    }
+}
+
+function deleteProduct(productNum) {
+    if (!confirm('Delete product ' + productNum + '?')) return;
+
+    fetch('/api/products/delete', {
+        method: 'POST',
+        headers: {'Content-Type': 'application/json'},
+        body: JSON.stringify({product_number: productNum})
+    })
+    .then(response => response.json())
+    .then(result => {
+        if (result.success) {
+            displayProductList();
+            loadProducts();
+            alert(result.message);
+        } else {
+            alert('Error: ' + result.message);
+        }
+    })
+    .catch(error => console.error('Error deleting product:', error));
+}
+
+function uploadCSV() {
+    const fileInput = document.getElementById('uploadCSV');
+    const file = fileInput.files[0];
+
+    if (!file) return;
+
+    const formData = new FormData();
+    formData.append('file', file);
+
+    fetch('/api/products/upload', {
+        method: 'POST',
+        body: formData
+    })
+    .then(response => response.json())
+    .then(result => {
+        if (result.success) {
+            displayProductList();
+            loadProducts();
+            alert(result.message + '\nProducts loaded: ' + result.product_count);
+        } else {
+            alert('Error: ' + result.message);
+        }
+        fileInput.value = '';
+    })
+    .catch(error => {
+        console.error('Error uploading CSV:', error);
+        fileInput.value = '';
+    });
+}
+
+function viewProductHistory() {
+    fetch('/api/products/history')
+        .then(response => response.json())
+        .then(result => {
+            if (result.success) {
+                if (result.files.length === 0) {
+                    alert('No backup history found');
+                } else {
+                    alert('Product List Backups:\n\n' + result.files.join('\n'));
+                }
+            } else {
+                alert('Error: ' + result.message);
+            }
+        })
+        .catch(error => console.error('Error loading history:', error));
+}
+
+// Inventory Upload Functions
+function uploadInventoryCSV() {
+    const fileInput = document.getElementById('uploadInventoryCSV');
+    const file = fileInput.files[0];
+    const location = document.getElementById('uploadLocation').value;
+    const inventoryDate = document.getElementById('uploadInventoryDate').value;
+    const statusDiv = document.getElementById('uploadStatus');
+    const fileNameSpan = document.getElementById('selectedFileName');
+
+    if (!file) return;
+
+    // Show selected file name
+    fileNameSpan.textContent = file.name;
+
+    if (!inventoryDate) {
+        statusDiv.style.display = 'block';
+        statusDiv.style.background = '#f8d7da';
+        statusDiv.style.color = '#721c24';
+        statusDiv.innerHTML = '&#9888; Please select an inventory date before uploading.';
+        return;
+    }
+
+    // Show loading status
+    statusDiv.style.display = 'block';
+    statusDiv.style.background = '#d1ecf1';
+    statusDiv.style.color = '#0c5460';
+    statusDiv.innerHTML = '⏳ Uploading inventory CSV...';
+
+    const formData = new FormData();
+    formData.append('file', file);
+    formData.append('location', location);
+    formData.append('inventory_date', inventoryDate);
+
+    fetch('/api/inventory/upload', {
+        method: 'POST',
+        body: formData
+    })
+    .then(response => response.json())
+    .then(result => {
+        if (result.success) {
+            statusDiv.style.background = '#d4edda';
+            statusDiv.style.color = '#155724';
+
+            let message = '&#9989; ' + result.message;
+            message += '<br><strong>Total Items:</strong> ' + result.total_items;
+            message += '<br><strong>Matched Products:</strong> ' + result.matched_count;
+
+            if (result.unmatched_count > 0) {
+                message += '<br><strong>Unmatched Products:</strong> ' + result.unmatched_count;
+                if (result.unmatched_products && result.unmatched_products.length > 0) {
+                    message += '<br><em>Sample unmatched: ' + result.unmatched_products.join(', ') + '</em>';
+                }
+            }
+
+            statusDiv.innerHTML = message;
+
+            // Refresh the inventories list
+            loadInventoriesList();
+
+            // Reset file input after a delay
+            setTimeout(() => {
+                fileInput.value = '';
+                fileNameSpan.textContent = '';
+            }, 500);
+        } else {
+            statusDiv.style.background = '#f8d7da';
+            statusDiv.style.color = '#721c24';
+            statusDiv.innerHTML = '&#10060; Error: ' + result.message;
+        }
+    })
+    .catch(error => {
+        console.error('Error uploading inventory CSV:', error);
+        statusDiv.style.background = '#f8d7da';
+        statusDiv.style.color = '#721c24';
+        statusDiv.innerHTML = '&#10060; Error uploading file: ' + error.message;
+    });
+}
+
+// Order Management Functions
+function uploadOrderCSV() {
+    const fileInput = document.getElementById('uploadOrderCSV');
+    const file = fileInput.files[0];
+    const location = document.getElementById('orderLocation').value;
+    const orderDate = document.getElementById('orderDate').value;
+
+    if (!file) return;
+
+    if (!orderDate) {
+        alert('Please select an order date');
+        return;
+    }
+
+    const formData = new FormData();
+    formData.append('file', file);
+    formData.append('location', location);
+    formData.append('order_date', orderDate);
+
+    fetch('/api/orders/upload', {
+        method: 'POST',
+        body: formData
+    })
+    .then(response => response.json())
+    .then(result => {
+        if (result.success) {
+            alert(result.message + '\nOrders loaded: ' + result.order_count);
+        } else {
+            alert('Error: ' + result.message);
+        }
+        fileInput.value = '';
+    })
+    .catch(error => {
+        console.error('Error uploading orders:', error);
+        alert('Error uploading orders');
+        fileInput.value = '';
+    });
+}
+
+function uploadInvoiceCSV() {
+    const fileInput = document.getElementById('uploadInvoiceCSV');
+    const file = fileInput.files[0];
+    const location = document.getElementById('invoiceLocation').value;
+    const deliveryDate = document.getElementById('deliveryDate').value;
+    const statusDiv = document.getElementById('invoiceUploadStatus');
+    const fileNameSpan = document.getElementById('invoiceFileName');
+
+    if (!file) return;
+
+    // Show selected file name
+    fileNameSpan.textContent = 'Selected: ' + file.name;
+
+    if (!deliveryDate) {
+        statusDiv.style.display = 'block';
+        statusDiv.style.background = '#f8d7da';
+        statusDiv.style.color = '#721c24';
+        statusDiv.innerHTML = '&#9888; Please select a delivery date before uploading.';
+        return;
+    }
+
+    // Show loading status
+    statusDiv.style.display = 'block';
+    statusDiv.style.background = '#d1ecf1';
+    statusDiv.style.color = '#0c5460';
+    statusDiv.innerHTML = '&#8987; Uploading invoice...';
+
+    const formData = new FormData();
+    formData.append('file', file);
+    formData.append('location', location);
+    formData.append('delivery_date', deliveryDate);
+
+    fetch('/api/orders/upload-invoice', {
+        method: 'POST',
+        body: formData
+    })
+    .then(response => response.json())
+    .then(result => {
+        if (result.success) {
+            statusDiv.style.background = '#d4edda';
+            statusDiv.style.color = '#155724';
+
+            let message = '&#9989; ' + result.message;
+            message += '<br><strong>Total Items:</strong> ' + result.total_items;
+            message += '<br><strong>Matched Products:</strong> ' + result.matched_count;
+
+            if (result.new_products_created > 0) {
+                message += '<br><strong style="color: #0056b3;">&#127381; New Products Created:</strong> ' + result.new_products_created;
+                if (result.new_product_numbers && result.new_product_numbers.length > 0) {
+                    message += '<br><small>Product Numbers: ' + result.new_product_numbers.join(', ') + '</small>';
+                }
+                message += '<br><small>New products added to the bottom of your product list with Group = &quot;Unassigned&quot;</small>';
+            }
+
+            if (result.unmatched_count > 0) {
+                message += '<br><strong>Unmatched Products:</strong> ' + result.unmatched_count;
+                if (result.unmatched_products && result.unmatched_products.length > 0) {
+                    message += '<br><small>First few unmatched: ' + result.unmatched_products.join(', ') + '</small>';
+                }
+            }
+
+            statusDiv.innerHTML = message;
+
+            // Reload products list to show new products
+            if (result.new_products_created > 0) {
+                setTimeout(() => {
+                    loadProducts();
+                }, 1000);
+            }
+
+            // Refresh invoice history if visible
+            setTimeout(() => {
+                loadInvoiceHistory();
+            }, 1000);
+        } else {
+            statusDiv.style.background = '#f8d7da';
+            statusDiv.style.color = '#721c24';
+            statusDiv.innerHTML = '&#10060; Error: ' + result.message;
+        }
+        fileInput.value = '';
+        fileNameSpan.textContent = '';
+    })
+    .catch(error => {
+        console.error('Error uploading invoice:', error);
+        statusDiv.style.background = '#f8d7da';
+        statusDiv.style.color = '#721c24';
+        statusDiv.innerHTML = '&#10060; Error uploading file: ' + error.message;
+        fileInput.value = '';
+        fileNameSpan.textContent = '';
+    });
+}
+
+function calculateOrder() {
+    const location = document.getElementById('calcLocation').value;
+    const orderDate = document.getElementById('calcOrderDate').value;
+    const inventoryDate = document.getElementById('calcInventoryDate').value;
+    const leadTime = document.getElementById('calcLeadTime').value;
+    const reviewDays = document.getElementById('calcReviewDays').value;
+
+    if (!inventoryDate) {
+        alert('Please select an inventory date');
+        return;
+    }
+
+    fetch('/api/orders/calculate', {
+        method: 'POST',
+        headers: {'Content-Type': 'application/json'},
+        body: JSON.stringify({
+            location: location,
+            order_date: orderDate,
+            inventory_date: inventoryDate,
+            lead_time_days: leadTime || 0,
+            review_days: reviewDays || 0
+        })
+    })
+    .then(response => response.json())
+    .then(result => {
+        if (result.success) {
+            lastCalculatedOrder = result;
+            displayOrderResults(result);
+        } else {
+            alert('Error: ' + result.message);
+        }
+    })
+    .catch(error => {
+        console.error('Error calculating order:', error);
+        alert('Error calculating order');
+    });
+}
+
+function displayOrderResults(result) {
+    const resultsDiv = document.getElementById('orderResults');
+    const summaryDiv = document.getElementById('orderSummary');
+    const detailsDiv = document.getElementById('orderDetails');
+
+    // Show summary
+    summaryDiv.innerHTML = '<div style="display: grid; grid-template-columns: repeat(auto-fit, minmax(200px, 1fr)); gap: 15px; margin-bottom: 20px;">' +
+        '<div style="background: white; padding: 15px; border-radius: 8px; border: 2px solid #667eea;">' +
+        '<h4 style="margin: 0 0 10px 0; color: #667eea;">Order Total</h4>' +
+        '<p style="font-size: 2em; margin: 0; font-weight: bold;">' + Math.round(result.order_total) + '</p>' +
+        '</div>' +
+        '<div style="background: white; padding: 15px; border-radius: 8px; border: 2px solid #ffc107;">' +
+        '<h4 style="margin: 0 0 10px 0; color: #ffc107;">Inventory Total</h4>' +
+        '<p style="font-size: 2em; margin: 0; font-weight: bold;">' + Math.round(result.inventory_total) + '</p>' +
+        '</div>' +
+        '<div style="background: white; padding: 15px; border-radius: 8px; border: 2px solid #28a745;">' +
+        '<h4 style="margin: 0 0 10px 0; color: #28a745;">Official Order</h4>' +
+        '<p style="font-size: 2em; margin: 0; font-weight: bold;">' + Math.round(result.official_total) + '</p>' +
+        '</div>' +
+        '</div>';
+
+    // Show detailed order
+    let detailsHTML = '<table class="product-table"><thead><tr>' +
+        '<th>Product #</th><th>Description</th><th>Order Est.</th>' +
+        '<th>Inventory</th><th>Official Order</th></tr></thead><tbody>';
+
+    for (let productNum in result.official_order) {
+        const product = currentProducts.find(p => String(p['Product Number']) === String(productNum));
+        const officialQty = result.official_order[productNum];
+
+        if (product && officialQty > 0) {
+            detailsHTML += '<tr>' +
+                '<td>' + productNum + '</td>' +
+                '<td>' + (product['Product Description'] || '') + '</td>' +
+                '<td>-</td>' +
+                '<td>-</td>' +
+                '<td><strong>' + officialQty + '</strong></td>' +
+                '</tr>';
+        }
+    }
+
+    detailsHTML += '</tbody></table>';
+
+    // Usage-based suggestions for the whole catalog
+    if (result.forecast) {
+        const forecast = result.forecast;
+        const suggested = forecast.suggestions.filter(s => s.suggested_qty > 0);
+        detailsHTML += '<h4 style="margin-top: 25px;">Suggested Order</h4>' +
+            '<p style="color: #6c757d;">From the count on ' + (forecast.inventory_date || 'n/a') + ', ' +
+            forecast.lead_time_days + ' day lead time, ' + forecast.review_days + ' days until the next order, ' +
+            forecast.history_days + ' days of usage history. ' + suggested.length + ' products, ' +
+            Math.round(forecast.suggested_cases_total) + ' cases.</p>';
+        detailsHTML += '<table class="product-table"><thead><tr>' +
+            '<th>Product #</th><th>Description</th><th>On Hand</th><th>Avg / Day</th>' +
+            '<th>Forecast</th><th>Safety Stock</th><th>Suggested Cases</th></tr></thead><tbody>';
+        suggested.forEach(s => {
+            const product = currentProducts.find(p => String(p['Product Number']) === String(s.product_number));
+            detailsHTML += '<tr>' +
+                '<td>' + s.product_number + '</td>' +
+                '<td>' + (product ? (product['Product Description'] || '') : '') + '</td>' +
+                '<td>' + s.on_hand + '</td>' +
+                '<td>' + s.avg_daily_usage + '</td>' +
+                '<td>' + s.forecast_usage + '</td>' +
+                '<td>' + s.safety_stock + '</td>' +
+                '<td><strong>' + s.suggested_cases + '</strong></td>' +
+                '</tr>';
+        });
+        detailsHTML += '</tbody></table>';
+    }
+    detailsDiv.innerHTML = detailsHTML;
+
+    resultsDiv.style.display = 'block';
+}
+
+function exportOfficialOrder() {
+    if (!lastCalculatedOrder) {
+        alert('Please calculate an order first');
+        return;
+    }
+
+    // Create CSV content
+    let csv = 'Product Number,Product Description,Official Order Quantity\n';
+
+    for (let productNum in lastCalculatedOrder.official_order) {
+        const product = currentProducts.find(p => String(p['Product Number']) === String(productNum));
+        const qty = lastCalculatedOrder.official_order[productNum];
+
+        if (product && qty > 0) {
+            const desc = (product['Product Description'] || '').replace(/,/g, ' ');
+            csv += productNum + ',' + desc + ',' + qty + '\n';
+        }
+    }
+
+    // Download CSV
+    const blob = new Blob([csv], { type: 'text/csv' });
+    const url = window.URL.createObjectURL(blob);
+    const a = document.createElement('a');
+    a.href = url;
+    a.download = 'official_order_' + document.getElementById('calcLocation').value + '_' + 
+                 document.getElementById('calcOrderDate').value + '.csv';
+    document.body.appendChild(a);
+    a.click();
+    document.body.removeChild(a);
+    window.URL.revokeObjectURL(url);
+}
+
+// Invoice Import History Functions
+function loadInvoiceHistory() {
+    fetch('/api/invoices/import-log')
+        .then(response => response.json())
+        .then(result => {
+            if (result.success) {
+                displayInvoiceHistory(result.imports);
+            } else {
+                document.getElementById('invoiceHistoryContent').innerHTML = 
+                    '<p style="color: #d32f2f;">Error loading import history: ' + result.message + '</p>';
+            }
+        })
+        .catch(error => {
+            console.error('Error loading invoice history:', error);
+            document.getElementById('invoiceHistoryContent').innerHTML = 
+                '<p style="color: #d32f2f;">Error loading import history</p>';
+        });
+}
+
+function displayInvoiceHistory(imports) {
+    const container = document.getElementById('invoiceHistoryContent');
+
+    if (imports.length === 0) {
+        container.innerHTML = '<p style="color: #999;">No invoices have been imported yet.</p>';
+        return;
+    }
+
+    let html = '<div style="max-height: 500px; overflow-y: auto;">';
+    html += '<table style="width: 100%; border-collapse: collapse;">';
+    html += '<thead><tr style="background: #2196f3; color: white; position: sticky; top: 0;">';
+    html += '<th style="padding: 10px; text-align: left; border: 1px solid #ddd;">Import ID</th>';
+    html += '<th style="padding: 10px; text-align: left; border: 1px solid #ddd;">Date/Time</th>';
+    html += '<th style="padding: 10px; text-align: left; border: 1px solid #ddd;">Filename</th>';
+    html += '<th style="padding: 10px; text-align: left; border: 1px solid #ddd;">Location</th>';
+    html += '<th style="padding: 10px; text-align: left; border: 1px solid #ddd;">Delivery Date</th>';
+    html += '<th style="padding: 10px; text-align: center; border: 1px solid #ddd;">Products</th>';
+    html += '<th style="padding: 10px; text-align: center; border: 1px solid #ddd;">New Items</th>';
+    html += '<th style="padding: 10px; text-align: center; border: 1px solid #ddd;">Actions</th>';
+    html += '</tr></thead><tbody>';
+
+    imports.forEach(imp => {
+        const timestamp = new Date(imp.timestamp).toLocaleString();
+        html += '<tr style="border-bottom: 1px solid #ddd;">';
+        html += '<td style="padding: 10px; border: 1px solid #ddd;"><code>' + imp.import_id + '</code></td>';
+        html += '<td style="padding: 10px; border: 1px solid #ddd;">' + timestamp + '</td>';
+        html += '<td style="padding: 10px; border: 1px solid #ddd;">' + imp.filename + '</td>';
+        html += '<td style="padding: 10px; border: 1px solid #ddd;">' + imp.location + '</td>';
+        html += '<td style="padding: 10px; border: 1px solid #ddd;"><strong>' + imp.delivery_date + '</strong></td>';
+        html += '<td style="padding: 10px; text-align: center; border: 1px solid #ddd;">' + imp.total_products + '</td>';
+        html += '<td style="padding: 10px; text-align: center; border: 1px solid #ddd;">';
+        if (imp.new_products_created > 0) {
+            html += '<span style="color: #0056b3; font-weight: bold;">+' + imp.new_products_created + '</span>';
+        } else {
+            html += '-';
+        }
+        html += '</td>';
+        html += '<td style="padding: 10px; text-align: center; border: 1px solid #ddd;">';
+        html += '<button onclick="viewInvoiceDetails(&quot;' + imp.import_id + '&quot;)" style="padding: 5px 10px; background: #4caf50; color: white; border: none; border-radius: 4px; cursor: pointer; margin-right: 5px;">View</button>';
+        html += '<button onclick="deleteInvoiceImport(&quot;' + imp.import_id + '&quot;)" style="padding: 5px 10px; background: #f44336; color: white; border: none; border-radius: 4px; cursor: pointer;">Delete</button>';
+        html += '</td>';
+        html += '</tr>';
+    });
+
+    html += '</tbody></table></div>';
+    container.innerHTML = html;
+}
+
+function viewInvoiceDetails(importId) {
+    fetch('/api/invoices/import/' + importId)
+        .then(response => response.json())
+        .then(result => {
+            if (result.success) {
+                const imp = result.import;
+                let details = 'Import ID: ' + imp.import_id + '\n';
+                details += 'Timestamp: ' + new Date(imp.timestamp).toLocaleString() + '\n';
+                details += 'Filename: ' + imp.filename + '\n';
+                details += 'Location: ' + imp.location + '\n';
+                details += 'Delivery Date: ' + imp.delivery_date + '\n';
+                details += 'Total Products: ' + imp.total_products + '\n';
+                details += 'Matched: ' + imp.matched_count + '\n';
+                details += 'New Products Created: ' + imp.new_products_created + '\n\n';
+
+                if (imp.new_product_numbers && imp.new_product_numbers.length > 0) {
+                    details += 'New Product Numbers:\n' + imp.new_product_numbers.join(', ') + '\n\n';
+                }
+
+                details += 'Products in this import:\n';
+                for (let prodNum in imp.products) {
+                    details += prodNum + ': ' + imp.products[prodNum] + ' units\n';
+                }
+
+                alert(details);
+            } else {
+                alert('Error: ' + result.message);
+            }
+        })
+        .catch(error => {
+            console.error('Error fetching details:', error);
+            alert('Error loading import details');
+        });
+}
+
+function deleteInvoiceImport(importId) {
+    if (!confirm('Are you sure you want to delete this import?\n\nThis will remove the quantities from your orders but will NOT delete any new products that were created.\n\nImport ID: ' + importId)) {
+        return;
+    }
+
+    fetch('/api/invoices/import/' + importId, {
+        method: 'DELETE'
+    })
+    .then(response => response.json())
+    .then(result => {
+        if (result.success) {
+            alert(result.message);
+            loadInvoiceHistory();
+        } else {
+            alert('Error: ' + result.message);
+        }
+    })
+    .catch(error => {
+        console.error('Error deleting import:', error);
+        alert('Error deleting import');
+    });
+}
+
+// Drag and Drop Functions for Product Reordering
+let draggedRow = null;
+
+function handleDragStart(e) {
+    draggedRow = this;
+    this.style.opacity = '0.4';
+    e.dataTransfer.effectAllowed = 'move';
+    e.dataTransfer.setData('text/html', this.innerHTML);
+}
+
+function handleDragOver(e) {
+    if (e.preventDefault) {
+        e.preventDefault();
+    }
+    e.dataTransfer.dropEffect = 'move';
+    return false;
+}
+
+function handleDrop(e) {
+    if (e.stopPropagation) {
+        e.stopPropagation();
+    }
+
+    if (draggedRow !== this) {
+        // Get current order
+        const tbody = document.getElementById('productManagementTableBody');
+        const rows = Array.from(tbody.rows);
+        const fromIndex = rows.indexOf(draggedRow);
+        const toIndex = rows.indexOf(this);
+
+        // Insert dragged row before or after target
+        if (fromIndex < toIndex) {
+            this.parentNode.insertBefore(draggedRow, this.nextSibling);
+        } else {
+            this.parentNode.insertBefore(draggedRow, this);
+        }
+
+        // Update row numbers
+        updateRowNumbers();
+
+        // Save new order to backend
+        saveProductOrder();
+    }
+
+    return false;
+}
+
+function handleDragEnd(e) {
+    this.style.opacity = '1';
+
+    // Remove drag over styling from all rows
+    const rows = document.querySelectorAll('#productManagementTableBody tr');
+    rows.forEach(row => {
+        row.style.background = '';
+    });
+}
+
+function updateRowNumbers() {
+    const rows = document.querySelectorAll('#productManagementTableBody tr');
+    rows.forEach((row, index) => {
+        row.cells[0].innerHTML = '&#128070; ' + (index + 1);
+    });
+}
+
+function saveProductOrder() {
+    const tbody = document.getElementById('productManagementTableBody');
+    const rows = Array.from(tbody.rows);
+    const productNumbers = rows.map(row => row.dataset.productNumber);
+
+    fetch('/api/products/reorder', {
+        method: 'POST',
+        headers: { 'Content-Type': 'application/json' },
+        body: JSON.stringify({ product_order: productNumbers })
+    })
+    .then(response => response.json())
+    .then(result => {
+        if (result.success) {
+            console.log('Product order saved successfully');
+            // Reload products to update all views
+            loadProducts();
+        } else {
+            alert('Error saving order: ' + result.message);
+        }
+    })
+    .catch(error => {
+        console.error('Error saving product order:', error);
+        alert('Error saving order');
+    });
+}
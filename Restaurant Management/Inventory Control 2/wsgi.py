@@ -0,0 +1,11 @@
+"""
+Production entry point for the Inventory Control web app
+
+    gunicorn -w 4 --threads 4 -b 0.0.0.0:5002 wsgi:app
+
+Each worker process loads the data once at startup; workers stay in step
+through data/shared_state.db (see shared_storage.py) and the count log.
+"""
+from app import app, load_all_data
+
+load_all_data()
@@ -0,0 +1,295 @@
+"""
+Employee performance analytics for the Manager App
+Loads daily logs into one pandas frame of employee-shift rows and computes
+totals, averages, sales mix, tip/void percentages and rankings with groupby
+
+Shared by the web reports API and the desktop report window.
+"""
+import os
+import re
+import csv
+import logging
+import threading
+from datetime import datetime
+from collections import OrderedDict
+
+import numpy as np
+import pandas as pd
+
+log = logging.getLogger(__name__)
+
+SALES_COLUMNS = ['beer', 'liquor', 'wine', 'food']
+METRIC_COLUMNS = ['cash', 'cc_tips', 'cash_diff', 'visa', 'mastercard', 'amex', 'discover',
+                  'credit', 'beer', 'liquor', 'wine', 'food', 'voids']
+
+# Metrics where a lower value ranks better
+LOWER_IS_BETTER = {'total_voids', 'void_percentage'}
+
+# Daily log header label -> column name (web and desktop logs use different layouts)
+HEADER_MAP = {
+    'name': 'name',
+    'shift': 'shift',
+    'area': 'area',
+    'cash': 'cash',
+    'c.c. tips': 'cc_tips',
+    'cc received': 'cc_tips',
+    'cash diff': 'cash_diff',
+    'visa': 'visa',
+    'mastercard': 'mastercard',
+    'amex': 'amex',
+    'discover': 'discover',
+    'credit total': 'credit',
+    'beer': 'beer',
+    'liquor': 'liquor',
+    'wine': 'wine',
+    'food': 'food',
+    'voids': 'voids',
+}
+
+# Web logs are 20251107_Day.csv, desktop logs are 2025-11-07_Day.csv
+_LOG_NAME = re.compile(r'^(\d{4})-?(\d{2})-?(\d{2})_(\w+)\.csv$')
+
+# Parsed rows per file, reused until the file's mtime or size changes
+MAX_CACHED_FILES = 5000   # Least recently used files beyond this are evicted
+_file_cache = OrderedDict()
+_cache_lock = threading.Lock()
+
+
+def _to_float(value):
+    try:
+        return float(str(value).replace('$', '').replace(',', '').strip() or 0)
+    except ValueError:
+        return 0.0
+
+
+def list_log_files(log_dir, start=None, end=None):
+    """List (date, shift, path) for daily logs in a directory, optionally within a date range"""
+    if not os.path.isdir(log_dir):
+        return []
+
+    start = pd.Timestamp(start).normalize() if start else None
+    end = pd.Timestamp(end).normalize() if end else None
+
+    files = []
+    for filename in os.listdir(log_dir):
+        match = _LOG_NAME.match(filename)
+        if not match or match.group(4) == 'CashDeductions':
+            continue
+        try:
+            log_date = pd.Timestamp(datetime(int(match.group(1)), int(match.group(2)), int(match.group(3))))
+        except ValueError:
+            continue
+        if (start is not None and log_date < start) or (end is not None and log_date > end):
+            continue
+        files.append((log_date, match.group(4), os.path.join(log_dir, filename)))
+    return sorted(files)
+
+
+def _parse_entries(path, log_shift):
+    """Read the Employee Entries section of one daily log as row tuples"""
+    rows = []
+    with open(path, 'r', encoding='utf-8', newline='') as f:
+        columns = None
+        in_section = False
+        for row in csv.reader(f):
+            if not row or not row[0]:
+                if in_section and columns:
+                    break
+                continue
+            if row[0] == 'Employee Entries':
+                in_section = True
+                continue
+            if not in_section:
+                continue
+            if columns is None:
+                columns = [HEADER_MAP.get(h.strip().lower()) for h in row]
+                continue
+
+            record = {}
+            for key, value in zip(columns, row):
+                if key:
+                    record[key] = value
+            name = record.get('name', '').strip()
+            if not name:
+                continue
+            rows.append((
+                name,
+                record.get('shift') or log_shift,
+                record.get('area', ''),
+                *(_to_float(record.get(col, 0)) for col in METRIC_COLUMNS)
+            ))
+    return rows
+
+
+def _file_rows(path, log_shift):
+    try:
+        stat = os.stat(path)
+    except OSError:
+        return []
+    key = (stat.st_mtime_ns, stat.st_size)
+
+    with _cache_lock:
+        cached = _file_cache.get(path)
+        if cached and cached[0] == key:
+            _file_cache.move_to_end(path)
+            return cached[1]
+
+    try:
+        rows = _parse_entries(path, log_shift)
+    except (OSError, UnicodeDecodeError, csv.Error) as e:
+        log.warning("Error processing %s: %s", os.path.basename(path), e)
+        rows = []
+    with _cache_lock:
+        _file_cache[path] = (key, rows)
+        _file_cache.move_to_end(path)
+        while len(_file_cache) > MAX_CACHED_FILES:
+            _file_cache.popitem(last=False)
+    return rows
+
+
+def load_shift_frame(log_dir, start=None, end=None):
+    """Load every employee entry in a date range into one DataFrame
+
+    One row per employee per daily log with columns date, log_shift (the
+    log file's shift), name, shift (the employee's own shift), area, the
+    METRIC_COLUMNS and sales (beer + liquor + wine + food).
+    """
+    dates, log_shifts, rows = [], [], []
+    for log_date, log_shift, path in list_log_files(log_dir, start, end):
+        file_rows = _file_rows(path, log_shift)
+        rows.extend(file_rows)
+        dates.extend([log_date] * len(file_rows))
+        log_shifts.extend([log_shift] * len(file_rows))
+
+    frame = pd.DataFrame.from_records(rows, columns=['name', 'shift', 'area'] + METRIC_COLUMNS)
+    frame.insert(0, 'date', pd.to_datetime(pd.Series(dates, dtype='datetime64[ns]')))
+    frame.insert(1, 'log_shift', pd.Series(log_shifts, dtype=object))
+    frame[METRIC_COLUMNS] = frame[METRIC_COLUMNS].astype(float)
+    frame['sales'] = frame[SALES_COLUMNS].sum(axis=1)
+    return frame
+
+
+def _percent(numerator, denominator):
+    """Element-wise numerator / denominator * 100, 0 where denominator is 0"""
+    numerator = np.asarray(numerator, dtype=float)
+    denominator = np.asarray(denominator, dtype=float)
+    out = np.zeros_like(numerator)
+    np.divide(numerator * 100, denominator, out=out, where=denominator > 0)
+    return out.round(2)
+
+
+class PerformanceReport:
+    """Employee performance over a frame from load_shift_frame"""
+
+    def __init__(self, frame):
+        self.frame = frame
+
+    @classmethod
+    def from_logs(cls, log_dir, start=None, end=None):
+        """Build a report straight from a daily log directory"""
+        return cls(load_shift_frame(log_dir, start, end))
+
+    def __len__(self):
+        return len(self.frame)
+
+    @property
+    def employees(self):
+        """Sorted unique employee names"""
+        return sorted(self.frame['name'].unique())
+
+    def filter(self, employee=None, shift=None, log_shift=None):
+        """Return a report limited to one employee (case-insensitive) and/or shift"""
+        mask = np.ones(len(self.frame), dtype=bool)
+        if employee:
+            mask &= (self.frame['name'].str.lower() == employee.lower()).to_numpy()
+        if shift:
+            mask &= (self.frame['shift'] == shift).to_numpy()
+        if log_shift:
+            mask &= (self.frame['log_shift'] == log_shift).to_numpy()
+        return PerformanceReport(self.frame[mask])
+
+    def totals(self):
+        """Per-employee totals, averages, tip/void percentages and sales mix
+
+        Sorted by total sales, highest first.
+        """
+        grouped = self.frame.groupby('name', sort=False)
+        sums = grouped[METRIC_COLUMNS + ['sales']].sum()
+        out = pd.DataFrame(index=sums.index)
+        out['shifts_worked'] = grouped.size()
+        out['total_sales'] = sums['sales']
+        out['total_cash'] = sums['cash']
+        out['total_credit'] = sums['credit']
+        out['total_tips'] = sums['cc_tips']
+        out['total_voids'] = sums['voids']
+        for col in SALES_COLUMNS:
+            out[f'total_{col}'] = sums[col]
+        out['avg_sales'] = sums['sales'] / out['shifts_worked']
+        out['tip_percentage'] = _percent(sums['cc_tips'], sums['sales'])
+        out['void_percentage'] = _percent(sums['voids'], sums['sales'])
+        for col in SALES_COLUMNS:
+            out[f'{col}_mix'] = _percent(sums[col], sums['sales'])
+
+        out = out.round(2).sort_values('total_sales', ascending=False, kind='stable')
+        return out.reset_index()
+
+    def daily(self):
+        """Per-employee, per-log breakdown sorted by name, date and shift"""
+        grouped = self.frame.groupby(['name', 'date', 'log_shift'], sort=True)
+        out = grouped[['sales', 'cash', 'credit', 'cc_tips', 'voids'] + SALES_COLUMNS].sum()
+        out['tip_percentage'] = _percent(out['cc_tips'], out['sales'])
+        out = out.round(2).reset_index()
+        return out.rename(columns={'cc_tips': 'tips', 'log_shift': 'shift'})
+
+    def rank(self, metric='total_sales', ascending=None, top=None):
+        """Employee totals ranked by a metric
+
+        Adds 'rank' (1 = best, ties share a rank) and 'percentile'
+        (0-100, share of employees this one does at least as well as).
+        ascending defaults to True only for LOWER_IS_BETTER metrics.
+        """
+        totals = self.totals()
+        if metric not in totals.columns:
+            raise ValueError(f"Unknown metric: {metric}")
+        if ascending is None:
+            ascending = metric in LOWER_IS_BETTER
+        values = totals[metric]
+        totals['rank'] = values.rank(method='min', ascending=ascending).astype(int)
+        totals['percentile'] = values.rank(method='max', pct=True, ascending=not ascending).mul(100).round(1)
+        totals = totals.sort_values(['rank', 'name'], kind='stable')
+        return totals.head(top) if top else totals
+
+    def percentiles(self, metric='total_sales', q=(25, 50, 75, 90)):
+        """Percentiles of a per-employee metric, e.g. {50: 1234.5, 90: 2345.6}"""
+        totals = self.totals()
+        if metric not in totals.columns:
+            raise ValueError(f"Unknown metric: {metric}")
+        if totals.empty:
+            return {p: 0.0 for p in q}
+        values = np.percentile(totals[metric].to_numpy(dtype=float), q)
+        return {p: round(float(v), 2) for p, v in zip(q, values)}
+
+    def summary(self):
+        """Overall totals across every row"""
+        sums = self.frame[['cash', 'credit', 'cc_tips', 'voids', 'sales']].sum()
+        return {
+            'entries': int(len(self.frame)),
+            'employees': int(self.frame['name'].nunique()),
+            'total_cash': round(float(sums['cash']), 2),
+            'total_credit': round(float(sums['credit']), 2),
+            'total_tips': round(float(sums['cc_tips']), 2),
+            'total_voids': round(float(sums['voids']), 2),
+            'total_sales': round(float(sums['sales']), 2),
+        }
+
+
+def to_records(frame):
+    """DataFrame -> list of JSON-friendly dicts (dates as YYYY-MM-DD)"""
+    frame = frame.copy()
+    for col in frame.columns:
+        if pd.api.types.is_datetime64_any_dtype(frame[col]):
+            frame[col] = frame[col].dt.strftime('%Y-%m-%d')
+    return [
+        {k: (v.item() if isinstance(v, np.generic) else v) for k, v in record.items()}
+        for record in frame.to_dict('records')
+    ]
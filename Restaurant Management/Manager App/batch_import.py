@@ -0,0 +1,351 @@
+#!/usr/bin/env python3
+"""
+Batch back-fill of daily logs from a folder or ZIP of POS exports
+Parses exports in parallel and writes one daily log per date/shift
+"""
+import os
+import re
+import sys
+import json
+import hashlib
+import zipfile
+import tempfile
+import argparse
+import threading
+import uuid
+from datetime import datetime
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from daily_logs import get_daily_log_dir, save_daily_log
+from pos_import import parse_excel_file
+
+MANIFEST_NAME = '.batch_import.json'
+MANIFEST_FLUSH_EVERY = 25  # Write the resume manifest every N processed files
+SUPPORTED_EXTENSIONS = ('.xlsx',)
+
+# Filename tokens that mark a night shift export (e.g. "SalesSummaryN_2025-10-12_2025-10-12.xlsx")
+NIGHT_TOKENS = {'n', 'night', 'pm', 'dinner', 'evening'}
+
+_DATE_PATTERNS = [
+    (re.compile(r'(\d{4})-(\d{2})-(\d{2})'), '%Y-%m-%d'),
+    (re.compile(r'(?<!\d)(\d{4})(\d{2})(\d{2})(?!\d)'), '%Y%m%d'),
+    (re.compile(r'(\d{2})-(\d{2})-(\d{4})'), '%m-%d-%Y'),
+]
+
+
+def infer_date_and_shift(filename):
+    """Infer (date, shift) from an export filename
+
+    Returns (None, None) when no date is found or the export spans
+    more than one day (weekly summaries are not daily logs).
+    """
+    stem = os.path.splitext(os.path.basename(filename))[0]
+
+    dates = []
+    for pattern, fmt in _DATE_PATTERNS:
+        for match in pattern.finditer(stem):
+            try:
+                dates.append(datetime.strptime(match.group(0), fmt).strftime('%Y-%m-%d'))
+            except ValueError:
+                continue
+        if dates:
+            break
+
+    if not dates or len(set(dates)) > 1:
+        return None, None
+
+    # Shift marker is either its own token ("Night", "PM") or a single letter
+    # suffix on the report name ("SalesSummaryN" vs "SalesSummaryM")
+    shift = 'Day'
+    for token in re.split(r'[\s_\-\.()]+', stem):
+        if token.lower() in NIGHT_TOKENS or re.search(r'[a-z]N$', token):
+            shift = 'Night'
+            break
+
+    return dates[0], shift
+
+
+def build_log_data(date_str, shift, data):
+    """Build a daily log record from parsed export totals
+
+    Mirrors the "Imported Total" row the web daily log creates on import.
+    """
+    employee = {
+        'name': 'Imported Total',
+        'shift': shift,
+        'area': 'Dining',
+        'cash': data.get('cash', 0),
+        'cc_tips': data.get('cc_tips', 0),
+        'cash_diff': 0,
+        'visa': data.get('visa', 0),
+        'mastercard': data.get('mastercard', 0),
+        'amex': data.get('amex', 0),
+        'discover': data.get('discover', 0),
+        'credit': data.get('credit_total', 0),
+        'beer': data.get('beer', 0),
+        'liquor': data.get('liquor', 0),
+        'wine': data.get('wine', 0),
+        'food': data.get('food', 0),
+        'voids': data.get('voids', 0),
+    }
+    return {
+        'date': date_str,
+        'shift': shift,
+        'notes': 'Imported from POS export',
+        'employees': [employee],
+        'deduction_descs': [],
+        'deduction_locations': [],
+        'deduction_amounts': [],
+        'deposit_amount': round(employee['cash'] - employee['cc_tips'], 2),
+    }
+
+
+def _file_digest(path):
+    """Content hash used to recognise exports that were already imported"""
+    digest = hashlib.sha1()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(1 << 16), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def _parse_export(path):
+    """Worker: parse one export file (runs in a child process)"""
+    try:
+        return path, parse_excel_file(path), None
+    except Exception as e:
+        return path, None, str(e)
+
+
+def collect_exports(source, work_dir):
+    """List export files in a directory or ZIP archive
+
+    ZIP archives are extracted into work_dir. Returns a sorted list of paths.
+    """
+    if os.path.isfile(source) and zipfile.is_zipfile(source):
+        with zipfile.ZipFile(source) as archive:
+            members = [m for m in archive.namelist()
+                       if m.lower().endswith(SUPPORTED_EXTENSIONS)
+                       and not os.path.basename(m).startswith(('.', '~$'))
+                       and not m.startswith('__MACOSX/')]
+            for member in members:
+                archive.extract(member, work_dir)
+        source = work_dir
+
+    if not os.path.isdir(source):
+        raise ValueError(f"Not a folder or ZIP archive: {source}")
+
+    paths = []
+    for root, _dirs, files in os.walk(source):
+        for name in files:
+            if name.lower().endswith(SUPPORTED_EXTENSIONS) and not name.startswith(('.', '~$')):
+                paths.append(os.path.join(root, name))
+    return sorted(paths)
+
+
+class BatchImporter:
+    """Back-fills daily logs for one company/location from POS exports
+
+    Already-imported files are recorded in a manifest next to the daily logs,
+    so an interrupted run picks up where it stopped.
+    """
+
+    def __init__(self, company_id, location_id=None, overwrite=False, max_workers=None):
+        self.company_id = company_id
+        self.location_id = location_id
+        self.overwrite = overwrite
+        self.max_workers = max_workers
+        self.log_dir = get_daily_log_dir(company_id, location_id)
+        self.manifest_path = os.path.join(self.log_dir, MANIFEST_NAME)
+
+    def _load_manifest(self):
+        if os.path.exists(self.manifest_path):
+            try:
+                with open(self.manifest_path, 'r') as f:
+                    return json.load(f)
+            except (OSError, ValueError):
+                pass
+        return {'files': {}}
+
+    def _save_manifest(self, manifest):
+        os.makedirs(self.log_dir, exist_ok=True)
+        tmp_path = self.manifest_path + '.tmp'
+        with open(tmp_path, 'w') as f:
+            json.dump(manifest, f, indent=2)
+        os.replace(tmp_path, self.manifest_path)
+
+    def run(self, source, progress=None):
+        """Import every export under source (folder or ZIP)
+
+        Args:
+            source: Folder or ZIP archive of daily exports
+            progress: Optional callback(done, total, filename, status)
+
+        Returns:
+            dict summary with imported/skipped/failed lists
+        """
+        summary = {'total': 0, 'imported': [], 'skipped': [], 'failed': []}
+
+        with tempfile.TemporaryDirectory(prefix='batch_import_') as work_dir:
+            paths = collect_exports(source, work_dir)
+            summary['total'] = len(paths)
+            manifest = self._load_manifest()
+            done = 0
+
+            def report(path, status):
+                nonlocal done
+                done += 1
+                if progress:
+                    progress(done, summary['total'], os.path.basename(path), status)
+
+            # Resolve date/shift and resume state up front so only new work hits the pool.
+            # Two exports for the same date/shift would overwrite each other's daily log,
+            # so the first one in path order is kept and the others are skipped.
+            pending = {}
+            claimed = {}
+            for path in paths:
+                name = os.path.basename(path)
+                date_str, shift = infer_date_and_shift(name)
+                if not date_str:
+                    summary['skipped'].append({'file': name, 'reason': 'no single date in filename'})
+                    report(path, 'skipped')
+                    continue
+
+                first = claimed.setdefault((date_str, shift), path)
+                if first != path:
+                    reason = f'same date/shift as {os.path.relpath(first, os.path.dirname(path))}'
+                    summary['skipped'].append({'file': name, 'reason': reason})
+                    report(path, 'skipped')
+                    continue
+
+                key = f"{date_str}_{shift}:{_file_digest(path)}"
+                if key in manifest['files']:
+                    summary['skipped'].append({'file': name, 'reason': 'already imported'})
+                    report(path, 'skipped')
+                    continue
+
+                log_file = os.path.join(self.log_dir, f"{date_str.replace('-', '')}_{shift}.csv")
+                if os.path.exists(log_file) and not self.overwrite:
+                    summary['skipped'].append({'file': name, 'reason': f'{os.path.basename(log_file)} already exists'})
+                    report(path, 'skipped')
+                    continue
+
+                pending[path] = (key, date_str, shift)
+
+            if pending:
+                since_flush = 0
+                with ProcessPoolExecutor(max_workers=self.max_workers) as pool:
+                    futures = [pool.submit(_parse_export, path) for path in pending]
+                    for future in as_completed(futures):
+                        path, data, error = future.result()
+                        name = os.path.basename(path)
+                        key, date_str, shift = pending[path]
+
+                        if error:
+                            summary['failed'].append({'file': name, 'error': error})
+                            report(path, 'failed')
+                            continue
+
+                        save_daily_log(self.company_id, build_log_data(date_str, shift, data), self.location_id)
+                        manifest['files'][key] = {
+                            'file': name,
+                            'date': date_str,
+                            'shift': shift,
+                            'imported_at': datetime.now().isoformat()
+                        }
+                        summary['imported'].append({'file': name, 'date': date_str, 'shift': shift})
+                        report(path, 'imported')
+
+                        since_flush += 1
+                        if since_flush >= MANIFEST_FLUSH_EVERY:
+                            self._save_manifest(manifest)
+                            since_flush = 0
+
+                self._save_manifest(manifest)
+
+        return summary
+
+
+# ==================== BACKGROUND JOBS (web) ====================
+
+_jobs = {}
+_jobs_lock = threading.Lock()
+
+
+def start_job(company_id, source, location_id=None, overwrite=False, cleanup=None):
+    """Run a batch import on a background thread and return its job id
+
+    cleanup is an optional path removed when the job finishes (uploaded ZIPs).
+    """
+    job_id = str(uuid.uuid4())
+    job = {
+        'id': job_id,
+        'company_id': company_id,
+        'status': 'running',
+        'done': 0,
+        'total': 0,
+        'current_file': None,
+        'started_at': datetime.now().isoformat(),
+        'summary': None,
+        'error': None
+    }
+    with _jobs_lock:
+        _jobs[job_id] = job
+
+    def progress(done, total, filename, status):
+        with _jobs_lock:
+            job.update(done=done, total=total, current_file=filename)
+
+    def worker():
+        try:
+            importer = BatchImporter(company_id, location_id, overwrite=overwrite)
+            summary = importer.run(source, progress=progress)
+            with _jobs_lock:
+                job.update(status='complete', summary=summary)
+        except Exception as e:
+            with _jobs_lock:
+                job.update(status='failed', error=str(e))
+        finally:
+            if cleanup and os.path.exists(cleanup):
+                os.remove(cleanup)
+
+    threading.Thread(target=worker, daemon=True).start()
+    return job_id
+
+
+def get_job(job_id):
+    """Get a snapshot of a background job's progress"""
+    with _jobs_lock:
+        job = _jobs.get(job_id)
+        return dict(job) if job else None
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Back-fill daily logs from a folder or ZIP of POS exports')
+    parser.add_argument('source', help='Folder or ZIP archive of daily Excel exports')
+    parser.add_argument('--company', required=True, help='Company ID')
+    parser.add_argument('--location', help='Location ID (omit for company-level logs)')
+    parser.add_argument('--overwrite', action='store_true', help='Replace daily logs that already exist')
+    parser.add_argument('--workers', type=int, help='Number of parser processes (default: CPU count)')
+    args = parser.parse_args(argv)
+
+    def progress(done, total, filename, status):
+        print(f"[{done}/{total}] {status:<8} {filename}")
+
+    importer = BatchImporter(args.company, args.location, overwrite=args.overwrite, max_workers=args.workers)
+    summary = importer.run(args.source, progress=progress)
+
+    print(f"\n✅ Imported {len(summary['imported'])} of {summary['total']} files "
+          f"({len(summary['skipped'])} skipped, {len(summary['failed'])} failed)")
+    for item in summary['skipped']:
+        if item['reason'].startswith('same date/shift'):
+            print(f"   ⚠️ {item['file']}: {item['reason']}, not imported")
+    for item in summary['failed']:
+        print(f"   ❌ {item['file']}: {item['error']}")
+    return 1 if summary['failed'] else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
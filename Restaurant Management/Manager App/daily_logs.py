@@ -0,0 +1,246 @@
+"""
+Daily log storage for the Manager App web version
+CSV read/write helpers shared by the Flask routes and the batch importer
+Files are replaced in one step (see shared_storage.atomic_write), so a
+worker reading a log while another saves it never sees half a file.
+Reads and writes are counted as daily_log.read / daily_log.write on
+/admin/perf when PERF_MONITOR=1.
+"""
+import os
+import sys
+import csv
+import shutil
+import logging
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+from shared_storage import atomic_write
+import perf_monitor
+
+log = logging.getLogger(__name__)
+
+
+def get_daily_log_dir(company_id, location_id=None):
+    """Get the daily log directory for a company or one of its locations"""
+    if location_id:
+        return f"company_data/{company_id}/locations/{location_id}/daily_logs"
+    return f"company_data/{company_id}/daily_logs"
+
+
+def save_daily_log(company_id, log_data, location_id=None):
+    """Save daily log to CSV file - matching desktop dailylog.py format"""
+    data_dir = get_daily_log_dir(company_id, location_id)
+    os.makedirs(data_dir, exist_ok=True)
+    
+    date_str = log_data['date'].replace('-', '')
+    shift = log_data.get('shift', 'Day')
+    filepath = f"{data_dir}/{date_str}_{shift}.csv"
+    
+    started = perf_monitor.clock()
+    with atomic_write(filepath, newline='') as f:
+        writer = csv.writer(f)
+        
+        # Header matching desktop format
+        writer.writerow(['Date', log_data['date']])
+        writer.writerow(['Shift', shift])
+        writer.writerow(['Notes', log_data.get('notes', '')])
+        writer.writerow([])
+        
+        # Employee entries section
+        writer.writerow(['Employee Entries'])
+        writer.writerow(['Name', 'Shift', 'Area', 'Cash', 'C.C. Tips', 'Cash Diff', 'Visa', 'Mastercard', 'Amex', 'Discover',
+                        'Credit Total', 'Beer', 'Liquor', 'Wine', 'Food', 'Voids'])
+        
+        employees = log_data.get('employees', [])
+        for emp in employees:
+            writer.writerow([
+                emp.get('name', ''),
+                emp.get('shift', 'Day'),
+                emp.get('area', ''),
+                emp.get('cash', 0),
+                emp.get('cc_tips', 0),
+                emp.get('cash_diff', 0),
+                emp.get('visa', 0),
+                emp.get('mastercard', 0),
+                emp.get('amex', 0),
+                emp.get('discover', 0),
+                emp.get('credit', 0),
+                emp.get('beer', 0),
+                emp.get('liquor', 0),
+                emp.get('wine', 0),
+                emp.get('food', 0),
+                emp.get('voids', 0)
+            ])
+        
+        # Cash drawer count
+        writer.writerow([])
+        writer.writerow(['Cash Drawer Count'])
+        writer.writerow(['Pennies', log_data.get('pennies', 0)])
+        writer.writerow(['Nickels', log_data.get('nickels', 0)])
+        writer.writerow(['Dimes', log_data.get('dimes', 0)])
+        writer.writerow(['Quarters', log_data.get('quarters', 0)])
+        writer.writerow(['Ones', log_data.get('ones', 0)])
+        writer.writerow(['Fives', log_data.get('fives', 0)])
+        writer.writerow(['Tens', log_data.get('tens', 0)])
+        writer.writerow(['Twenties', log_data.get('twenties', 0)])
+        writer.writerow(['Fifties', log_data.get('fifties', 0)])
+        writer.writerow(['Hundreds', log_data.get('hundreds', 0)])
+        writer.writerow(['Drawer Total', log_data.get('drawer_total', 0)])
+        
+        # Cash Deductions
+        writer.writerow([])
+        writer.writerow(['Cash Deductions'])
+        deduction_descs = log_data.get('deduction_descs', [])
+        deduction_locations = log_data.get('deduction_locations', [])
+        deduction_amounts = log_data.get('deduction_amounts', [])
+        for i, desc in enumerate(deduction_descs):
+            if desc:
+                location = deduction_locations[i] if i < len(deduction_locations) else ''
+                amount = deduction_amounts[i] if i < len(deduction_amounts) else '0'
+                writer.writerow([desc, location, amount])
+        
+        # Deposit summary
+        writer.writerow([])
+        writer.writerow(['Deposit Summary'])
+        total_deductions = sum(float(amt) for amt in deduction_amounts if amt)
+        writer.writerow(['Cash Adjustments', total_deductions])
+        writer.writerow(['Cash in Drawer', log_data.get('drawer_total', 0)])
+        writer.writerow(['DEPOSIT AMOUNT', log_data.get('deposit_amount', 0)])
+    perf_monitor.count_io('daily_log.write', started, filepath)
+
+def load_daily_log(company_id, date_str, location_id=None):
+    """Load daily log from CSV file - matching desktop dailylog.py format"""
+    data_dir = get_daily_log_dir(company_id, location_id)
+    date_str_clean = date_str.replace('-', '')
+
+    # Try both Day and Night shifts
+    filepath = f"{data_dir}/{date_str_clean}_Day.csv"
+    legacy_dir = os.path.expanduser("~/Documents/AIO Python/daily_logs")
+    legacy_day = os.path.join(legacy_dir, f"{date_str}_Day.csv")
+    legacy_night = os.path.join(legacy_dir, f"{date_str}_Night.csv")
+
+    if not os.path.exists(filepath):
+        # If not found, check legacy folder and copy if exists
+        if os.path.exists(legacy_day):
+            shutil.copy(legacy_day, filepath)
+        elif os.path.exists(legacy_night):
+            filepath = f"{data_dir}/{date_str_clean}_Night.csv"
+            shutil.copy(legacy_night, filepath)
+
+    if not os.path.exists(filepath):
+        return None
+    
+    log_data = {
+        'employees': [],
+        'shift': 'Day',
+        'notes': '',
+        'pennies': 0,
+        'nickels': 0,
+        'dimes': 0,
+        'quarters': 0,
+        'ones': 0,
+        'fives': 0,
+        'tens': 0,
+        'twenties': 0,
+        'fifties': 0,
+        'hundreds': 0,
+        'drawer_total': 0,
+        'deduction_descs': [],
+        'deduction_locations': [],
+        'deduction_amounts': [],
+        'deposit_amount': 0
+    }
+    
+    try:
+        started = perf_monitor.clock()
+        with open(filepath, 'r') as f:
+            reader = csv.reader(f)
+            rows = list(reader)
+            perf_monitor.count_io('daily_log.read', started, filepath)
+            
+            section = None
+            for i, row in enumerate(rows):
+                if not row:
+                    continue
+                
+                # Parse header info
+                if row[0] == 'Shift' and len(row) > 1:
+                    log_data['shift'] = row[1]
+                elif row[0] == 'Notes' and len(row) > 1:
+                    log_data['notes'] = row[1]
+                
+                # Detect sections
+                elif row[0] == 'Employee Entries':
+                    section = 'employees'
+                    continue
+                elif row[0] == 'Cash Drawer Count':
+                    section = 'drawer'
+                    continue
+                elif row[0] == 'Deductions':
+                    section = 'deductions'
+                    continue
+                elif row[0] == 'Cash Deductions':
+                    section = 'deductions'
+                    continue
+                elif row[0] == 'Deposit Summary':
+                    section = 'deposit'
+                    continue
+                
+                # Parse employee data
+                if section == 'employees' and row[0] != 'Name' and len(row) >= 13:
+                    employee = {
+                        'name': row[0],
+                        'shift': row[1] if len(row) > 1 else 'Day',
+                        'area': row[2] if len(row) > 2 else '',
+                        'cash': float(row[3]) if len(row) > 3 and row[3] else 0,
+                        'cc_tips': float(row[4]) if len(row) > 4 and row[4] else 0,
+                        'cash_diff': float(row[5]) if len(row) > 5 and row[5] else 0,
+                        'visa': float(row[6]) if len(row) > 6 and row[6] else 0,
+                        'mastercard': float(row[7]) if len(row) > 7 and row[7] else 0,
+                        'amex': float(row[8]) if len(row) > 8 and row[8] else 0,
+                        'discover': float(row[9]) if len(row) > 9 and row[9] else 0,
+                        'credit': float(row[10]) if len(row) > 10 and row[10] else 0,
+                        'beer': float(row[11]) if len(row) > 11 and row[11] else 0,
+                        'liquor': float(row[12]) if len(row) > 12 and row[12] else 0,
+                        'wine': float(row[13]) if len(row) > 13 and row[13] else 0,
+                        'food': float(row[14]) if len(row) > 14 and row[14] else 0,
+                        'voids': float(row[15]) if len(row) > 15 and row[15] else 0
+                    }
+                    log_data['employees'].append(employee)
+                
+                # Parse drawer data
+                elif section == 'drawer' and len(row) >= 2:
+                    key = row[0].lower().replace(' ', '_')
+                    if key in ['pennies', 'nickels', 'dimes', 'quarters', 'ones', 'fives', 'tens', 'twenties', 'fifties', 'hundreds']:
+                        log_data[key] = float(row[1]) if row[1] else 0
+                    elif key == 'drawer_total':
+                        log_data['drawer_total'] = float(row[1]) if row[1] else 0
+                
+                # Parse deductions (support both old 2-column and new 3-column format)
+                elif section == 'deductions' and len(row) >= 2 and row[0] not in ['Total Deductions']:
+                    log_data['deduction_descs'].append(row[0])
+                    # Check if this is the new 3-column format (desc, location, amount)
+                    if len(row) >= 3:
+                        log_data['deduction_locations'].append(row[1] if row[1] else '')
+                        log_data['deduction_amounts'].append(float(row[2]) if row[2] else 0)
+                    else:
+                        # Old 2-column format (desc, amount)
+                        log_data['deduction_locations'].append('')
+                        log_data['deduction_amounts'].append(float(row[1]) if row[1] else 0)
+                
+                # Parse deposit
+                elif section == 'deposit' and len(row) >= 2:
+                    if row[0] == 'DEPOSIT AMOUNT':
+                        log_data['deposit_amount'] = float(row[1]) if row[1] else 0
+    
+    except Exception as e:
+        log.warning("Error loading daily log %s: %s", filepath, e)
+        return None
+    
+    # Calculate deposit if it's missing (for backwards compatibility with old CSV files)
+    if log_data['deposit_amount'] == 0 and log_data['employees']:
+        total_cash = sum(emp.get('cash', 0) for emp in log_data['employees'])
+        total_cc_tips = sum(emp.get('cc_tips', 0) for emp in log_data['employees'])
+        total_deductions = sum(log_data['deduction_amounts'])
+        log_data['deposit_amount'] = total_cash - total_cc_tips - total_deductions
+    
+    return log_data
@@ -1,5 +1,6 @@
 import os
 import csv
+import uuid
 import tkinter as tk
 from tkinter import ttk, messagebox, filedialog
 from datetime import datetime
@@ -9,6 +10,7 @@ from tkcalendar import DateEntry
 from utils import validate_number, format_currency, safe_file_read, safe_file_write
 from auto_save import AutoSaveManager, get_backup_manager
 from app_config import create_button, create_header, COLORS, FONTS
+from employee_store import get_employee_store, LOCAL_ROSTER
 
 try:
     import openpyxl
@@ -24,6 +26,63 @@ EMPLOYEE_LIST_FILE = os.path.expanduser("~/Documents/AIO Python/employee_list.cs
 # Initialize backup manager
 backup_manager = get_backup_manager(OUT_DIR)
 
+TOTAL_FIELDS = ("cash", "credit", "cc_tips", "beer", "liquor", "wine", "food")
+TOTALS_REDRAW_MS = 50         # Changes within this window are drawn once
+CASH_MANAGER_POLL_MS = 1000   # How often deductions are checked while Cash Manager is open
+
+
+def _entry_cents(emp):
+    """An entry's TOTAL_FIELDS in cents, or None if one isn't a number (left out of the totals)"""
+    try:
+        return [round(float(emp.get(field, "0.00")) * 100) for field in TOTAL_FIELDS]
+    except (ValueError, OverflowError):
+        return None
+
+
+class RunningTotals:
+    """Per-area and grand totals kept up to date one entry at a time
+    
+    Adding or removing an entry only adds or subtracts that entry's values,
+    so the totals never have to be summed over every row again. Amounts are
+    kept in cents so removing an entry leaves no rounding residue.
+    """
+    
+    def __init__(self, employees=()):
+        self.reset(employees)
+    
+    def reset(self, employees=()):
+        """Start over from a whole list of entries (loading a day, clearing)"""
+        self.areas = {}                     # area -> [entries, cents per field]
+        self.grand = [0] * len(TOTAL_FIELDS)
+        for emp in employees:
+            self.add(emp)
+    
+    def add(self, emp):
+        self._apply(emp, 1)
+    
+    def remove(self, emp):
+        self._apply(emp, -1)
+    
+    def _apply(self, emp, sign):
+        area = self.areas.setdefault(emp["area"], [0, [0] * len(TOTAL_FIELDS)])
+        area[0] += sign
+        cents = _entry_cents(emp)
+        if cents is not None:
+            for i, value in enumerate(cents):
+                area[1][i] += sign * value
+                self.grand[i] += sign * value
+        if area[0] <= 0:
+            del self.areas[emp["area"]]
+    
+    def area_totals(self, area):
+        """{field: dollars} for one area"""
+        return {field: cents / 100 for field, cents in zip(TOTAL_FIELDS, self.areas[area][1])}
+    
+    def grand_totals(self):
+        """{field: dollars} over every entry"""
+        return {field: cents / 100 for field, cents in zip(TOTAL_FIELDS, self.grand)}
+
+
 class DailyLogApp(tk.Tk):
     def __init__(self):
         super().__init__()
@@ -43,6 +102,14 @@ class DailyLogApp(tk.Tk):
         )
         self.auto_save_label = None
         
+        # Running totals: updated per entry, drawn after a short debounce
+        self.totals = RunningTotals()
+        self._totals_job = None
+        self._totals_shown = None
+        # Cash deductions are read once per change to the day's deductions file
+        self._cash_deductions_key = None
+        self._cash_deductions = 0.0
+        
         # Create canvas with scrollbar for scrollable content
         canvas = tk.Canvas(self, bg="#f0f0f0", highlightthickness=0)
         scrollbar = ttk.Scrollbar(self, orient="vertical", command=canvas.yview)
@@ -69,6 +136,7 @@ class DailyLogApp(tk.Tk):
         self._build_actions()
         self._build_status_bar()
         
+        self._refresh_cash_deductions()
         self._update_totals()
         
         # Check for imported data from DLimport
@@ -82,6 +150,9 @@ class DailyLogApp(tk.Tk):
         self.bind_all("<Button-4>", self._on_mousewheel)
         self.bind_all("<Button-5>", self._on_mousewheel)
         
+        # Coming back from the Cash Manager window: pick up saved deductions
+        self.bind("<FocusIn>", lambda e: self._refresh_cash_deductions())
+        
         # Start auto-save
         self.auto_save.start()
     
@@ -141,6 +212,7 @@ class DailyLogApp(tk.Tk):
         
         if not files_to_load:
             # No saved data for this date - just update totals (including cash deductions)
+            self._refresh_cash_deductions()
             self._update_totals()
             return
         
@@ -211,11 +283,13 @@ class DailyLogApp(tk.Tk):
             # Sort and display loaded employees
             self._sort_employees()
             self._update_display()
-            self._update_totals()
+            self._refresh_cash_deductions()
+            self._update_totals(rebuild=True)
         
         except Exception as e:
             print(f"Error auto-loading data: {e}")
-            self._update_totals()
+            self._refresh_cash_deductions()
+            self._update_totals(rebuild=True)
     
     def _build_header(self):
         """Build compact mobile header"""
@@ -597,7 +671,7 @@ class DailyLogApp(tk.Tk):
         
         try:
             cashmanager_path = os.path.join(os.path.dirname(__file__), "CashManager.py")
-            subprocess.Popen([sys.executable, cashmanager_path, date_str])
+            self._watch_cash_manager(subprocess.Popen([sys.executable, cashmanager_path, date_str]))
         except Exception as e:
             messagebox.showerror("Error", f"Could not open Cash Manager:\n{str(e)}")
     
@@ -607,7 +681,7 @@ class DailyLogApp(tk.Tk):
         
         try:
             cashmanager_path = os.path.join(os.path.dirname(__file__), "CashManager.py")
-            subprocess.Popen([sys.executable, cashmanager_path, date_str])
+            self._watch_cash_manager(subprocess.Popen([sys.executable, cashmanager_path, date_str]))
         except Exception as e:
             messagebox.showerror("Error", f"Could not open Cash Manager:\n{str(e)}")
     
@@ -640,6 +714,7 @@ class DailyLogApp(tk.Tk):
         }
         
         self.employees.append(employee_data)
+        self.totals.add(employee_data)
         
         # Sort employees by name, then by actual cash (cash - cc tips)
         self._sort_employees()
@@ -801,6 +876,7 @@ class DailyLogApp(tk.Tk):
                     pass
                 
                 self.employees.append(employee_data)
+                self.totals.add(employee_data)
                 imported_count += 1
             
             workbook.close()
@@ -831,17 +907,20 @@ class DailyLogApp(tk.Tk):
     
     def _update_display(self):
         """Update the listbox display"""
-        self.employee_listbox.delete(0, "end")
+        lines = []
         for emp in self.employees:
             try:
                 actual_cash = float(emp["cash"]) - float(emp.get("cc_tips", "0.00"))
                 shift_indicator = emp.get("shift", "Day")[0]  # "D" or "N"
-                display_text = f"{shift_indicator}|{emp['name'][:13]:13} {emp['area'][:6]:6} ${actual_cash:6.2f}"
-                self.employee_listbox.insert("end", display_text)
+                lines.append(f"{shift_indicator}|{emp['name'][:13]:13} {emp['area'][:6]:6} ${actual_cash:6.2f}")
             except ValueError:
                 shift_indicator = emp.get("shift", "Day")[0]
-                display_text = f"{shift_indicator}|{emp['name'][:13]:13} {emp['area'][:6]:6} ${float(emp['cash']):6.2f}"
-                self.employee_listbox.insert("end", display_text)
+                lines.append(f"{shift_indicator}|{emp['name'][:13]:13} {emp['area'][:6]:6} ${float(emp['cash']):6.2f}")
+        
+        # One insert for all rows instead of one Tk call per row
+        self.employee_listbox.delete(0, "end")
+        if lines:
+            self.employee_listbox.insert("end", *lines)
     
     def _edit_employee(self, event):
         """Edit selected employee by double-clicking"""
@@ -868,6 +947,7 @@ class DailyLogApp(tk.Tk):
         self.food_var.set(emp["food"])
         
         # Remove the old entry
+        self.totals.remove(emp)
         del self.employees[index]
         self._update_display()
         self._update_totals()
@@ -880,6 +960,7 @@ class DailyLogApp(tk.Tk):
             return
         
         index = selection[0]
+        self.totals.remove(self.employees[index])
         del self.employees[index]
         self._update_display()
         self._update_totals()
@@ -889,55 +970,32 @@ class DailyLogApp(tk.Tk):
         if messagebox.askyesno("Confirm", "Clear all employee entries?"):
             self.employees = []
             self._update_display()
-            self._update_totals()
+            self._update_totals(rebuild=True)
+    
+    def _update_totals(self, rebuild=False):
+        """Schedule a redraw of the running totals display
+        
+        Entries added or removed one at a time are already in self.totals;
+        pass rebuild=True after self.employees was replaced as a whole.
+        Several changes in a row are drawn once.
+        """
+        if rebuild:
+            self.totals.reset(self.employees)
+        if self._totals_job is not None:
+            self.after_cancel(self._totals_job)
+        self._totals_job = self.after(TOTALS_REDRAW_MS, self._draw_totals)
     
-    def _update_totals(self):
+    def _draw_totals(self):
         """Update running totals display"""
-        areas = {}
-        total_cash = 0.0
-        total_credit = 0.0
-        total_cc_tips = 0.0
-        total_beer = 0.0
-        total_liquor = 0.0
-        total_wine = 0.0
-        total_food = 0.0
-        
-        for emp in self.employees:
-            area = emp["area"]
-            
-            if area not in areas:
-                areas[area] = {
-                    "cash": 0.0, "credit": 0.0, "cc_tips": 0.0,
-                    "beer": 0.0, "liquor": 0.0, "wine": 0.0, "food": 0.0
-                }
-            
-            try:
-                cash_val = float(emp["cash"])
-                credit_val = float(emp.get("credit", "0.00"))
-                cc_tips_val = float(emp.get("cc_tips", "0.00"))
-                beer_val = float(emp["beer"])
-                liquor_val = float(emp["liquor"])
-                wine_val = float(emp["wine"])
-                food_val = float(emp["food"])
-                
-                areas[area]["cash"] += cash_val
-                areas[area]["credit"] += credit_val
-                areas[area]["cc_tips"] += cc_tips_val
-                areas[area]["beer"] += beer_val
-                areas[area]["liquor"] += liquor_val
-                areas[area]["wine"] += wine_val
-                areas[area]["food"] += food_val
-                
-                # Track grand totals across all employees
-                total_cash += cash_val
-                total_credit += credit_val
-                total_cc_tips += cc_tips_val
-                total_beer += beer_val
-                total_liquor += liquor_val
-                total_wine += wine_val
-                total_food += food_val
-            except ValueError:
-                pass
+        self._totals_job = None
+        grand = self.totals.grand_totals()
+        total_cash = grand["cash"]
+        total_credit = grand["credit"]
+        total_cc_tips = grand["cc_tips"]
+        total_beer = grand["beer"]
+        total_liquor = grand["liquor"]
+        total_wine = grand["wine"]
+        total_food = grand["food"]
         
         # Calculate and update deposit (Cash - CC Tips)
         calculated_deposit = total_cash - total_cc_tips
@@ -958,57 +1016,63 @@ class DailyLogApp(tk.Tk):
         # Update total C.C. tips
         self.total_cc_tips_var.set(f"${total_cc_tips:.2f}")
         
-        # Update total cash deductions (load from file)
-        cash_deductions_total = self._load_cash_deductions_total()
+        # Update total cash deductions (cached, see _refresh_cash_deductions)
+        cash_deductions_total = self._cash_deductions
         self.total_cash_deductions_var.set(f"${cash_deductions_total:.2f}")
         
         # Calculate and update expected deposit (Total Cash - Total CC Tips - Cash Deductions)
         expected_deposit = total_cash - total_cc_tips - cash_deductions_total
         self.expected_deposit_var.set(f"${expected_deposit:.2f}")
         
-        # Display totals
-        self.totals_text.config(state="normal")
-        self.totals_text.delete("1.0", "end")
-        
-        if not areas:
-            self.totals_text.insert("end", "No entries yet")
+        # Build the totals text, in the order areas first appear in the list
+        lines = []
+        if not self.totals.areas:
+            lines.append("No entries yet")
         else:
-            for area, totals in areas.items():
-                self.totals_text.insert("end", f"{area}:\n")
-                self.totals_text.insert("end", f"  Cash:     ${totals['cash']:8.2f}\n")
-                self.totals_text.insert("end", f"  CC Tips:  ${totals['cc_tips']:8.2f}\n")
-                self.totals_text.insert("end", f"  Credit:   ${totals['credit']:8.2f}\n")
-                self.totals_text.insert("end", f"  Beer:     ${totals['beer']:8.2f}\n")
-                self.totals_text.insert("end", f"  Liquor:   ${totals['liquor']:8.2f}\n")
-                self.totals_text.insert("end", f"  Wine:     ${totals['wine']:8.2f}\n")
-                self.totals_text.insert("end", f"  Food:     ${totals['food']:8.2f}\n")
-                self.totals_text.insert("end", "\n")
+            for area in dict.fromkeys(emp["area"] for emp in self.employees):
+                totals = self.totals.area_totals(area)
+                lines.append(f"{area}:\n")
+                lines.append(f"  Cash:     ${totals['cash']:8.2f}\n")
+                lines.append(f"  CC Tips:  ${totals['cc_tips']:8.2f}\n")
+                lines.append(f"  Credit:   ${totals['credit']:8.2f}\n")
+                lines.append(f"  Beer:     ${totals['beer']:8.2f}\n")
+                lines.append(f"  Liquor:   ${totals['liquor']:8.2f}\n")
+                lines.append(f"  Wine:     ${totals['wine']:8.2f}\n")
+                lines.append(f"  Food:     ${totals['food']:8.2f}\n")
+                lines.append("\n")
             
             # Show deposit calculation
-            self.totals_text.insert("end", "=" * 35 + "\n")
-            self.totals_text.insert("end", f"DEPOSIT CALCULATION:\n")
-            self.totals_text.insert("end", f"Total Cash:    ${total_cash:8.2f}\n")
-            self.totals_text.insert("end", f"Total CC Tips: ${total_cc_tips:8.2f}\n")
-            self.totals_text.insert("end", f"Deposit:       ${calculated_deposit:8.2f}\n")
+            lines.append("=" * 35 + "\n")
+            lines.append(f"DEPOSIT CALCULATION:\n")
+            lines.append(f"Total Cash:    ${total_cash:8.2f}\n")
+            lines.append(f"Total CC Tips: ${total_cc_tips:8.2f}\n")
+            lines.append(f"Deposit:       ${calculated_deposit:8.2f}\n")
             
-            # Calculate and show Total Net Sales (highlighted section)
-            total_net_sales = total_beer + total_liquor + total_wine + total_food
-            self.totals_text.insert("end", "\n" + "=" * 35 + "\n")
-            self.totals_text.insert("end", f"*** TOTAL NET SALES ***\n")
-            self.totals_text.insert("end", f"${total_net_sales:8.2f}\n")
-            self.totals_text.insert("end", "=" * 35 + "\n")
+            # Show Total Net Sales (highlighted section)
+            lines.append("\n" + "=" * 35 + "\n")
+            lines.append(f"*** TOTAL NET SALES ***\n")
+            lines.append(f"${total_net_sales:8.2f}\n")
+            lines.append("=" * 35 + "\n")
             
             # Show grand totals across all employees
-            self.totals_text.insert("end", "\n" + "-" * 35 + "\n")
-            self.totals_text.insert("end", f"GRAND TOTALS (ALL EMPLOYEES):\n")
-            self.totals_text.insert("end", f"Total Cash:    ${total_cash:8.2f}\n")
-            self.totals_text.insert("end", f"Total CC Tips: ${total_cc_tips:8.2f}\n")
-            self.totals_text.insert("end", f"Total Credit:  ${total_credit:8.2f}\n")
-            self.totals_text.insert("end", f"Total Beer:    ${total_beer:8.2f}\n")
-            self.totals_text.insert("end", f"Total Liquor:  ${total_liquor:8.2f}\n")
-            self.totals_text.insert("end", f"Total Wine:    ${total_wine:8.2f}\n")
-            self.totals_text.insert("end", f"Total Food:    ${total_food:8.2f}\n")
-        
+            lines.append("\n" + "-" * 35 + "\n")
+            lines.append(f"GRAND TOTALS (ALL EMPLOYEES):\n")
+            lines.append(f"Total Cash:    ${total_cash:8.2f}\n")
+            lines.append(f"Total CC Tips: ${total_cc_tips:8.2f}\n")
+            lines.append(f"Total Credit:  ${total_credit:8.2f}\n")
+            lines.append(f"Total Beer:    ${total_beer:8.2f}\n")
+            lines.append(f"Total Liquor:  ${total_liquor:8.2f}\n")
+            lines.append(f"Total Wine:    ${total_wine:8.2f}\n")
+            lines.append(f"Total Food:    ${total_food:8.2f}\n")
+        
+        # Display totals (the text widget is only rewritten when they changed)
+        text = "".join(lines)
+        if text == self._totals_shown:
+            return
+        self._totals_shown = text
+        self.totals_text.config(state="normal")
+        self.totals_text.delete("1.0", "end")
+        self.totals_text.insert("end", text)
         self.totals_text.config(state="disabled")
     
     def _save_log(self):
@@ -1149,7 +1213,7 @@ class DailyLogApp(tk.Tk):
             # Sort and display loaded employees
             self._sort_employees()
             self._update_display()
-            self._update_totals()
+            self._update_totals(rebuild=True)
             
             shifts_loaded = ", ".join([s for s, f in files_to_load])
             messagebox.showinfo("Success", f"Loaded logs from:\n{date_str}\nShifts: {shifts_loaded}\n{len(self.employees)} employees")
@@ -1193,10 +1257,18 @@ class DailyLogApp(tk.Tk):
             self.employees = []
             self.notes_var.set("")
             self._update_display()
-            self._update_totals()
+            self._update_totals(rebuild=True)
     
     def _load_employee_names(self):
-        """Load employee names from CSV file"""
+        """Load employee names from the employee store, falling back to the CSV file"""
+        try:
+            employees, _removed = get_employee_store().get_roster(LOCAL_ROSTER)
+            if employees:
+                return sorted(emp['name'] for emp in employees
+                              if emp.get('name') and emp.get('status', 'Active') == 'Active')
+        except Exception as e:
+            print(f"Error loading employee store: {e}")
+        
         if os.path.exists(EMPLOYEE_LIST_FILE):
             try:
                 with open(EMPLOYEE_LIST_FILE, "r", encoding='utf-8') as f:
@@ -1263,11 +1335,36 @@ class DailyLogApp(tk.Tk):
             print(f"Error loading imported data: {e}")
             # Don't show error to user, just fail silently
     
-    def _load_cash_deductions_total(self):
-        """Load cash deductions total from saved file"""
+    def _refresh_cash_deductions(self):
+        """Reload the selected day's cash deductions if their file changed since it was read
+        
+        Only stats the file; it is parsed again when its size or modification
+        time changed (Cash Manager saved) or another date was selected.
+        """
         date_str = f"{self.year_var.get()}-{self.month_var.get():02d}-{self.day_var.get():02d}"
         filename = os.path.join(OUT_DIR, f"{date_str}_CashDeductions.csv")
+        try:
+            stat = os.stat(filename)
+            key = (filename, stat.st_mtime_ns, stat.st_size)
+        except OSError:
+            key = (filename, None, None)
         
+        if key == self._cash_deductions_key:
+            return
+        self._cash_deductions_key = key
+        total = self._load_cash_deductions_total(filename) if key[1] is not None else 0.0
+        if total != self._cash_deductions:
+            self._cash_deductions = total
+            self._update_totals()
+    
+    def _watch_cash_manager(self, process):
+        """Pick up deductions saved while Cash Manager is open, and once more after it closes"""
+        self._refresh_cash_deductions()
+        if process.poll() is None:
+            self.after(CASH_MANAGER_POLL_MS, self._watch_cash_manager, process)
+    
+    def _load_cash_deductions_total(self, filename):
+        """Load cash deductions total from saved file"""
         if not os.path.exists(filename):
             return 0.0
         
@@ -1298,7 +1395,7 @@ class DailyLogApp(tk.Tk):
             return 0.0
     
     def _import_employee_list(self):
-        """Import employee names from a CSV file"""
+        """Import employee names from a CSV file into the employee store"""
         filename = filedialog.askopenfilename(
             title="Select Employee List CSV",
             filetypes=[("CSV files", "*.csv"), ("All files", "*.*")]
@@ -1310,17 +1407,34 @@ class DailyLogApp(tk.Tk):
                     reader = csv.reader(f)
                     names = [row[0].strip() for row in reader if row and row[0].strip()]
                 
-                # Save to employee list file
-                with open(EMPLOYEE_LIST_FILE, "w", newline="") as f:
-                    writer = csv.writer(f)
-                    for name in names:
-                        writer.writerow([name])
+                store = get_employee_store()
+                # Keep the names of an older employee_list.csv (the store replaces it)
+                store.import_csv(LOCAL_ROSTER, EMPLOYEE_LIST_FILE)
+                
+                # Add names the roster doesn't have yet, as Employee Maintenance would
+                employees, _removed = store.get_roster(LOCAL_ROSTER)
+                known = {emp.get('name', '').lower() for emp in employees}
+                new_employees = []
+                for name in names:
+                    if name.lower() in known or name.lower() in ("name", "employee"):
+                        continue
+                    known.add(name.lower())
+                    new_employees.append({
+                        'id': uuid.uuid4().hex,
+                        'name': name,
+                        'position': '',
+                        'phone': '',
+                        'email': '',
+                        'hire_date': datetime.now().strftime("%Y-%m-%d"),
+                        'status': 'Active'
+                    })
+                store.upsert(LOCAL_ROSTER, new_employees)
                 
                 # Update the list and combobox
-                self.employee_names = sorted(names)
-                self.name_entry['values'] = self.employee_names
+                self._refresh_employee_list()
                 
-                messagebox.showinfo("Success", f"Imported {len(names)} employee names!\n\nList saved to:\n{EMPLOYEE_LIST_FILE}")
+                messagebox.showinfo("Success", f"Imported {len(new_employees)} new employee names "
+                                               f"({len(names) - len(new_employees)} already on the roster)")
             
             except Exception as e:
                 messagebox.showerror("Error", f"Error importing employee list:\n{str(e)}")
@@ -4,11 +4,16 @@ Handles users, companies, and role-based access
 """
 import sqlite3
 import os
+import sys
 import hashlib
 import uuid
 from datetime import datetime
 import json
 
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+from shared_storage import FileLock
+import perf_monitor
+
 DB_PATH = os.path.expanduser("~/Documents/AIO Python/Manager App/manager_app.db")
 
 
@@ -20,11 +25,13 @@ class Database:
         # Ensure the directory for the database exists
         db_dir = os.path.dirname(self.db_path)
         os.makedirs(db_dir, exist_ok=True)
-        self.init_database()
+        # Workers start together; only one at a time creates or migrates tables
+        with FileLock(self.db_path):
+            self.init_database()
     
     def get_connection(self):
-        """Get database connection with timeout and WAL mode"""
-        conn = sqlite3.connect(self.db_path, timeout=30.0, check_same_thread=False)
+        """Get database connection with timeout and WAL mode (statements timed when PERF_MONITOR=1)"""
+        conn = perf_monitor.connect(self.db_path, timeout=30.0, check_same_thread=False)
         conn.row_factory = sqlite3.Row
         # Enable Write-Ahead Logging for better concurrency
         conn.execute('PRAGMA journal_mode=WAL')
@@ -147,6 +154,20 @@ class Database:
             )
         ''')
         
+        # Server-side session columns (added after the sessions table first shipped)
+        session_columns = {row[1] for row in cursor.execute('PRAGMA table_info(sessions)')}
+        if 'data' not in session_columns:
+            cursor.execute('ALTER TABLE sessions ADD COLUMN data TEXT')
+        if 'version' not in session_columns:
+            cursor.execute('ALTER TABLE sessions ADD COLUMN version INTEGER DEFAULT 0')
+        # Bumped whenever a user's companies or roles change (sessions re-read them)
+        user_columns = {row[1] for row in cursor.execute('PRAGMA table_info(users)')}
+        if 'access_version' not in user_columns:
+            cursor.execute('ALTER TABLE users ADD COLUMN access_version INTEGER DEFAULT 0')
+        # token is UNIQUE (indexed); these serve the expiry sweeper and per-user logout
+        cursor.execute('CREATE INDEX IF NOT EXISTS idx_sessions_expires_at ON sessions(expires_at)')
+        cursor.execute('CREATE INDEX IF NOT EXISTS idx_sessions_user_id ON sessions(user_id)')
+        
         # Invitations table
         cursor.execute('''
             CREATE TABLE IF NOT EXISTS invitations (
@@ -330,6 +351,7 @@ class Database:
                                           permissions, created_at)
                 VALUES (?, ?, ?, ?, ?, ?)
             ''', (uc_id, admin_user_id, company_id, 'business_admin', None, now))
+            self._bump_access_version(cursor, admin_user_id)
             
             conn.commit()
             return company_id
@@ -339,6 +361,15 @@ class Database:
         finally:
             conn.close()
     
+    def _bump_access_version(self, cursor, user_id):
+        """Mark a user's company memberships/roles as changed
+        
+        Every write to user_companies goes through a method that calls this,
+        so sessions holding the user's company list know to re-read it.
+        """
+        cursor.execute('UPDATE users SET access_version = COALESCE(access_version, 0) + 1 WHERE id = ?',
+                       (user_id,))
+    
     def add_user_to_company(self, user_id, company_id, role, permissions=None):
         """Add user to company with specific role"""
         conn = self.get_connection()
@@ -354,6 +385,7 @@ class Database:
                 VALUES (?, ?, ?, ?, ?, ?)
             ''', (uc_id, user_id, company_id, role, 
                   json.dumps(permissions) if permissions else None, now))
+            self._bump_access_version(cursor, user_id)
             
             conn.commit()
             return True
@@ -469,6 +501,7 @@ class Database:
             SET role = ?, permissions = ?
             WHERE user_id = ? AND company_id = ?
         ''', (role, json.dumps(permissions) if permissions else None, user_id, company_id))
+        self._bump_access_version(cursor, user_id)
         
         conn.commit()
         conn.close()
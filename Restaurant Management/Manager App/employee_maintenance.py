@@ -1,8 +1,10 @@
 import os
 import csv
+import uuid
 import tkinter as tk
 from tkinter import ttk, messagebox, Canvas, Scrollbar
 from datetime import datetime
+from employee_store import get_employee_store, employee_id, LOCAL_ROSTER
 
 EMPLOYEE_LIST_FILE = os.path.expanduser("~/Documents/AIO Python/employee_list.csv")
 
@@ -61,38 +63,41 @@ class EmployeeMaintenanceApp(tk.Tk):
         canvas.bind_all("<MouseWheel>", _on_mousewheel)
     
     def _load_employees(self):
-        """Load employees from CSV file"""
-        employees = []
+        """Load employees from the employee store (migrating the legacy CSV once)"""
+        store = get_employee_store()
         
-        if os.path.exists(EMPLOYEE_LIST_FILE):
-            try:
-                with open(EMPLOYEE_LIST_FILE, 'r', encoding='utf-8') as f:
-                    reader = csv.DictReader(f)
-                    for row in reader:
-                        employees.append(row)
-            except Exception as e:
-                print(f"Error loading employees: {e}")
+        try:
+            store.import_csv(LOCAL_ROSTER, EMPLOYEE_LIST_FILE)
+        except Exception as e:
+            print(f"Error loading employees: {e}")
         
-        return employees
+        try:
+            employees, _removed = store.get_roster(LOCAL_ROSTER)
+            return employees
+        except Exception as e:
+            print(f"Error loading employees: {e}")
+            return []
     
-    def _save_employees(self):
-        """Save employees to CSV file"""
+    def _save_employees(self, employees):
+        """Save new or edited employee records (only these rows are written)"""
         try:
-            # Ensure directory exists
-            os.makedirs(os.path.dirname(EMPLOYEE_LIST_FILE), exist_ok=True)
-            
-            with open(EMPLOYEE_LIST_FILE, 'w', newline='', encoding='utf-8') as f:
-                if self.employees:
-                    fieldnames = ['name', 'position', 'phone', 'email', 'hire_date', 'status']
-                    writer = csv.DictWriter(f, fieldnames=fieldnames)
-                    writer.writeheader()
-                    writer.writerows(self.employees)
-            
+            for emp in employees:
+                emp.setdefault('id', uuid.uuid4().hex)
+            get_employee_store().upsert(LOCAL_ROSTER, employees)
             return True
         except Exception as e:
             messagebox.showerror("Error", f"Failed to save employees:\n{str(e)}")
             return False
     
+    def _remove_employee_record(self, employee):
+        """Delete a single employee record from the store"""
+        try:
+            get_employee_store().delete(LOCAL_ROSTER, [employee_id(employee)])
+            return True
+        except Exception as e:
+            messagebox.showerror("Error", f"Failed to delete employee:\n{str(e)}")
+            return False
+    
     def _build_add_section(self):
         """Build add new employee section"""
         add_frame = tk.Frame(self.content_frame, bg="#f5f5f5", relief="solid", bd=1)
@@ -345,7 +350,7 @@ class EmployeeMaintenanceApp(tk.Tk):
         
         self.employees.append(employee)
         
-        if self._save_employees():
+        if self._save_employees([employee]):
             # Clear form
             self.name_var.set("")
             self.position_var.set("")
@@ -400,6 +405,7 @@ class EmployeeMaintenanceApp(tk.Tk):
             imported_count = 0
             skipped_count = 0
             errors = []
+            imported = []
             
             with open(filename, 'r', encoding='utf-8') as f:
                 reader = csv.DictReader(f)
@@ -435,10 +441,11 @@ class EmployeeMaintenanceApp(tk.Tk):
                     }
                     
                     self.employees.append(employee)
+                    imported.append(employee)
                     imported_count += 1
             
             if imported_count > 0:
-                if self._save_employees():
+                if self._save_employees(imported):
                     if self.employee_list_container.winfo_ismapped():
                         self._refresh_employee_list()
                     
@@ -545,6 +552,7 @@ class EmployeeMaintenanceApp(tk.Tk):
                 return
             
             self.employees[index] = {
+                'id': emp.get('id') or uuid.uuid4().hex,
                 'name': name,
                 'position': position_var.get().strip(),
                 'phone': phone_var.get().strip(),
@@ -553,7 +561,7 @@ class EmployeeMaintenanceApp(tk.Tk):
                 'status': status_var.get()
             }
             
-            if self._save_employees():
+            if self._save_employees([self.employees[index]]):
                 if self.employee_list_container.winfo_ismapped():
                     self._refresh_employee_list()
                 edit_window.destroy()
@@ -592,7 +600,7 @@ class EmployeeMaintenanceApp(tk.Tk):
                               f"Are you sure you want to delete '{name}'?"):
             self.employees.pop(index)
             
-            if self._save_employees():
+            if self._remove_employee_record(emp):
                 if self.employee_list_container.winfo_ismapped():
                     self._refresh_employee_list()
                 messagebox.showinfo("Success", f"Employee '{name}' deleted successfully!")
@@ -0,0 +1,194 @@
+"""
+Employee autocomplete for the Manager App
+In-process roster cache with a prefix + trigram index for fuzzy name lookup
+"""
+import heapq
+import threading
+from bisect import bisect_left
+
+from employee_store import get_employee_store
+
+MIN_TRIGRAM_SCORE = 0.3  # Dice similarity below this is not considered a match
+MAX_TYPOS = 2            # Edits allowed between the query and a name word (1 for short queries)
+
+
+def employee_name(employee):
+    """Full display name for an employee record"""
+    if employee.get('firstName') or employee.get('lastName'):
+        return f"{employee.get('firstName', '')} {employee.get('lastName', '')}".strip()
+    return (employee.get('name') or '').strip()
+
+
+def _trigrams(text):
+    padded = f"  {text} "
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+
+def _typo_distance(a, b, limit):
+    """Edits (insert, delete, replace, swap two neighbours) from a to b, or limit + 1 if more"""
+    if abs(len(a) - len(b)) > limit:
+        return limit + 1
+    previous, current = None, list(range(len(b) + 1))
+    for i in range(1, len(a) + 1):
+        before, previous, current = previous, current, [i] + [0] * len(b)
+        for j in range(1, len(b) + 1):
+            current[j] = min(previous[j] + 1, current[j - 1] + 1,
+                             previous[j - 1] + (a[i - 1] != b[j - 1]))
+            if i > 1 and j > 1 and a[i - 1] == b[j - 2] and a[i - 2] == b[j - 1]:
+                current[j] = min(current[j], before[j - 2] + 1)
+        if min(current) > limit:
+            return limit + 1
+    return current[-1]
+
+
+class RosterIndex:
+    """Case-insensitive prefix and trigram index over one roster"""
+
+    def __init__(self, employees):
+        self.employees = [e for e in employees if employee_name(e)]
+        self.names = [employee_name(e) for e in self.employees]
+        self._lower = [n.lower() for n in self.names]
+        self._alphabetical = sorted(range(len(self.names)), key=self._lower.__getitem__)
+
+        # Sorted (token, idx) pairs for every word and the full name
+        tokens = []
+        for idx, name in enumerate(self._lower):
+            tokens.append((name, idx))
+            for word in name.split():
+                if word != name:
+                    tokens.append((word, idx))
+        tokens.sort()
+        self._tokens = tokens
+        self._token_keys = [t[0] for t in tokens]
+
+        # Trigrams of every word and the full name; a typo is matched against the closest one
+        self._words = [sorted(set(n.split()) | {n}) for n in self._lower]
+        self._grams = [[_trigrams(w) for w in words] for words in self._words]
+        self._postings = {}
+        for idx, word_grams in enumerate(self._grams):
+            for grams in word_grams:
+                for gram in grams:
+                    self._postings.setdefault(gram, set()).add(idx)
+
+    def __len__(self):
+        return len(self.names)
+
+    def _prefix_matches(self, query):
+        start = bisect_left(self._token_keys, query)
+        for token, idx in self._tokens[start:]:
+            if not token.startswith(query):
+                break
+            yield token, idx
+
+    def search(self, query, limit=10):
+        """Return up to limit (score, idx) pairs, best first
+
+        Full-name prefix beats word prefix, which beats substring, which
+        beats a fuzzy match: the query against the full name or, when
+        closer, one word of it ("jhon" finds "John Smith"). Fuzzy matches
+        score by trigram similarity or, for typos and transposed letters,
+        by how few edits the word is away from the query.
+        """
+        query = (query or '').strip().lower()
+        if not query:
+            return [(0.0, idx) for idx in self._alphabetical[:limit]]
+
+        scores = {}
+        for token, idx in self._prefix_matches(query):
+            score = 3.0 if token == self._lower[idx] else 2.0
+            if score > scores.get(idx, 0):
+                scores[idx] = score
+
+        # Trigram candidates; also catches substrings in the middle of a name
+        q_grams = _trigrams(query)
+        shared = {}
+        for gram in q_grams:
+            for idx in self._postings.get(gram, ()):
+                shared[idx] = shared.get(idx, 0) + 1
+        for idx, count in shared.items():
+            if idx in scores:
+                continue
+            if query in self._lower[idx]:
+                scores[idx] = 1.5
+                continue
+            score = self._fuzzy_score(query, q_grams, idx)
+            if score >= MIN_TRIGRAM_SCORE:
+                scores[idx] = score
+
+        # Ties broken by shorter, then alphabetical name
+        best = heapq.nsmallest(
+            limit, scores.items(),
+            key=lambda item: (-item[1], len(self._lower[item[0]]), self._lower[item[0]])
+        )
+        return [(score, idx) for idx, score in best]
+
+    def _fuzzy_score(self, query, q_grams, idx):
+        """Best similarity (below 1) of the query to the name or one of its words"""
+        limit = MAX_TYPOS if len(query) > 4 else 1
+        best = 0.0
+        for word, grams in zip(self._words[idx], self._grams[idx]):
+            best = max(best, 2.0 * len(q_grams & grams) / (len(q_grams) + len(grams)))
+            typos = _typo_distance(query, word, limit)
+            if typos <= limit:
+                best = max(best, 1.0 - typos / max(len(query), len(word)))
+        return min(best, 0.99)
+
+    def complete(self, query, limit=10):
+        """Return the top matching employee records"""
+        return [self.employees[idx] for _score, idx in self.search(query, limit)]
+
+
+class RosterCache:
+    """Per-process cache of roster indexes, invalidated by store version"""
+
+    def __init__(self, store=None):
+        self.store = store or get_employee_store()
+        self._entries = {}
+        self._lock = threading.Lock()
+
+    def get(self, company_id, location_id=None, legacy_path=None):
+        """Get (employees, removed_employees, index) for a roster
+
+        legacy_path is an employees.json imported into the store the first
+        time the roster is requested.
+        """
+        key = (company_id, location_id or '')
+        version = self.store.get_version(company_id, location_id)
+        if not version and legacy_path and self.store.import_json(company_id, legacy_path, location_id):
+            version = self.store.get_version(company_id, location_id)
+
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry and entry[0] == version:
+                return entry[1], entry[2], entry[3]
+
+        employees, removed = self.store.get_roster(company_id, location_id)
+        index = RosterIndex(employees)
+        with self._lock:
+            self._entries[key] = (version, employees, removed, index)
+        return employees, removed, index
+
+    def has_roster(self, company_id, location_id=None, legacy_path=None):
+        """Check whether a roster has ever been saved (or can be migrated)"""
+        if self.store.get_version(company_id, location_id):
+            return True
+        return bool(legacy_path) and self.store.import_json(company_id, legacy_path, location_id)
+
+    def invalidate(self, company_id=None, location_id=None):
+        """Drop cached indexes (all of them when company_id is None)"""
+        with self._lock:
+            if company_id is None:
+                self._entries.clear()
+            else:
+                self._entries.pop((company_id, location_id or ''), None)
+
+
+# Singleton instance
+_cache = None
+
+def get_roster_cache():
+    """Get roster cache instance"""
+    global _cache
+    if _cache is None:
+        _cache = RosterCache()
+    return _cache
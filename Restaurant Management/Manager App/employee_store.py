@@ -0,0 +1,348 @@
+"""
+Employee roster store for the Manager App
+SQLite-backed, per-record upsert so a save only touches employees that changed
+"""
+import os
+import csv
+import uuid
+import json
+import sqlite3
+import hashlib
+import logging
+import threading
+from datetime import datetime
+
+from database import DB_PATH
+
+log = logging.getLogger(__name__)
+
+# Roster scope used by the desktop apps (web rosters are scoped by company/location)
+LOCAL_ROSTER = 'desktop'
+
+STATUS_ACTIVE = 'active'
+STATUS_REMOVED = 'removed'
+
+
+def employee_id(employee):
+    """Get the stable ID for an employee record
+
+    Uses the record's own id when present, otherwise falls back to the
+    First_Last key the per-employee JSON files are named after.
+    """
+    emp_id = employee.get('id')
+    if emp_id not in (None, ''):
+        return str(emp_id)
+    if employee.get('firstName') or employee.get('lastName'):
+        return f"{employee.get('firstName', '')}_{employee.get('lastName', '')}"
+    return employee.get('name', '')
+
+
+def fingerprint(employee):
+    """Stable hash of a record's contents for change detection"""
+    payload = json.dumps(employee, sort_keys=True, default=str)
+    return hashlib.sha1(payload.encode('utf-8')).hexdigest()
+
+
+class EmployeeStore:
+    """Employee roster keyed by (company, location, employee id)
+
+    Every roster has a version number that increases on each change, so
+    readers can cache a roster and cheaply check whether it is stale.
+    """
+
+    def __init__(self, db_path=DB_PATH):
+        self.db_path = db_path
+        self._lock = threading.Lock()
+        os.makedirs(os.path.dirname(self.db_path) or '.', exist_ok=True)
+        self._init_tables()
+
+    def get_connection(self):
+        """Get database connection with WAL mode"""
+        conn = sqlite3.connect(self.db_path, timeout=30.0, check_same_thread=False)
+        conn.row_factory = sqlite3.Row
+        conn.execute('PRAGMA journal_mode=WAL')
+        conn.execute('PRAGMA busy_timeout=30000')
+        return conn
+
+    def _init_tables(self):
+        conn = self.get_connection()
+        try:
+            conn.execute('''
+                CREATE TABLE IF NOT EXISTS employees (
+                    company_id TEXT NOT NULL,
+                    location_id TEXT NOT NULL DEFAULT '',
+                    employee_id TEXT NOT NULL,
+                    status TEXT NOT NULL DEFAULT 'active',
+                    position INTEGER NOT NULL DEFAULT 0,
+                    data TEXT NOT NULL,
+                    fingerprint TEXT NOT NULL,
+                    updated_at TEXT NOT NULL,
+                    PRIMARY KEY (company_id, location_id, employee_id)
+                )
+            ''')
+            conn.execute('''
+                CREATE TABLE IF NOT EXISTS employee_roster_versions (
+                    company_id TEXT NOT NULL,
+                    location_id TEXT NOT NULL DEFAULT '',
+                    version INTEGER NOT NULL DEFAULT 0,
+                    PRIMARY KEY (company_id, location_id)
+                )
+            ''')
+            conn.commit()
+        finally:
+            conn.close()
+
+    # ==================== READS ====================
+
+    def get_version(self, company_id, location_id=None):
+        """Get the roster version (0 if the roster has never been saved)"""
+        conn = self.get_connection()
+        try:
+            row = conn.execute('''
+                SELECT version FROM employee_roster_versions
+                WHERE company_id = ? AND location_id = ?
+            ''', (company_id, location_id or '')).fetchone()
+        finally:
+            conn.close()
+        return row['version'] if row else 0
+
+    def get_roster(self, company_id, location_id=None):
+        """Get (employees, removed_employees) in saved order"""
+        conn = self.get_connection()
+        try:
+            rows = conn.execute('''
+                SELECT status, data FROM employees
+                WHERE company_id = ? AND location_id = ?
+                ORDER BY position, employee_id
+            ''', (company_id, location_id or '')).fetchall()
+        finally:
+            conn.close()
+
+        employees, removed = [], []
+        for row in rows:
+            target = removed if row['status'] == STATUS_REMOVED else employees
+            target.append(json.loads(row['data']))
+        return employees, removed
+
+    def get_employee(self, company_id, emp_id, location_id=None):
+        """Get a single employee record by ID"""
+        conn = self.get_connection()
+        try:
+            row = conn.execute('''
+                SELECT data FROM employees
+                WHERE company_id = ? AND location_id = ? AND employee_id = ?
+            ''', (company_id, location_id or '', str(emp_id))).fetchone()
+        finally:
+            conn.close()
+        return json.loads(row['data']) if row else None
+
+    # ==================== WRITES ====================
+
+    def _bump_version(self, cursor, company_id, location_id):
+        cursor.execute('''
+            INSERT INTO employee_roster_versions (company_id, location_id, version)
+            VALUES (?, ?, 1)
+            ON CONFLICT(company_id, location_id) DO UPDATE SET version = version + 1
+        ''', (company_id, location_id))
+
+    def _upsert_rows(self, cursor, company_id, location_id, employees, status, now):
+        """Write the records that differ (caller holds the lock and commits)"""
+        result = {'added': [], 'updated': [], 'unchanged': []}
+        for employee in employees:
+            emp_id = employee_id(employee)
+            fp = fingerprint(employee)
+            row = cursor.execute('''
+                SELECT fingerprint, status FROM employees
+                WHERE company_id = ? AND location_id = ? AND employee_id = ?
+            ''', (company_id, location_id, emp_id)).fetchone()
+
+            if row and row['fingerprint'] == fp and row['status'] == status:
+                result['unchanged'].append(employee)
+                continue
+
+            if row:
+                cursor.execute('''
+                    UPDATE employees SET status = ?, data = ?, fingerprint = ?, updated_at = ?
+                    WHERE company_id = ? AND location_id = ? AND employee_id = ?
+                ''', (status, json.dumps(employee), fp, now, company_id, location_id, emp_id))
+                result['updated'].append(employee)
+            else:
+                cursor.execute('''
+                    INSERT INTO employees (company_id, location_id, employee_id, status,
+                                           position, data, fingerprint, updated_at)
+                    VALUES (?, ?, ?, ?,
+                            (SELECT COALESCE(MAX(position), -1) + 1 FROM employees
+                             WHERE company_id = ? AND location_id = ?),
+                            ?, ?, ?)
+                ''', (company_id, location_id, emp_id, status, company_id, location_id,
+                      json.dumps(employee), fp, now))
+                result['added'].append(employee)
+        return result
+
+    def _delete_rows(self, cursor, company_id, location_id, emp_ids):
+        """Delete records by ID (caller holds the lock and commits); returns rows deleted"""
+        cursor.executemany('''
+            DELETE FROM employees
+            WHERE company_id = ? AND location_id = ? AND employee_id = ?
+        ''', [(company_id, location_id, e) for e in emp_ids])
+        return cursor.rowcount
+
+    def upsert(self, company_id, employees, location_id=None, status=STATUS_ACTIVE):
+        """Insert or update individual records without touching the rest
+
+        Returns dict with 'added', 'updated' and 'unchanged' employee lists.
+        """
+        location_id = location_id or ''
+
+        with self._lock:
+            conn = self.get_connection()
+            try:
+                cursor = conn.cursor()
+                result = self._upsert_rows(cursor, company_id, location_id, employees, status,
+                                           datetime.now().isoformat())
+                if result['added'] or result['updated']:
+                    self._bump_version(cursor, company_id, location_id)
+                conn.commit()
+            finally:
+                conn.close()
+
+        return result
+
+    def delete(self, company_id, emp_ids, location_id=None):
+        """Delete records by ID; returns number of rows deleted"""
+        location_id = location_id or ''
+        emp_ids = [str(e) for e in emp_ids]
+        if not emp_ids:
+            return 0
+
+        with self._lock:
+            conn = self.get_connection()
+            try:
+                cursor = conn.cursor()
+                deleted = self._delete_rows(cursor, company_id, location_id, emp_ids)
+                if deleted:
+                    self._bump_version(cursor, company_id, location_id)
+                conn.commit()
+            finally:
+                conn.close()
+        return deleted
+
+    def sync(self, company_id, employees, removed_employees=None, location_id=None):
+        """Apply a full roster snapshot, writing only the records that differ
+
+        Used by clients that post the whole list (the web employee page).
+        Records missing from both lists are deleted. The read and every
+        write happen in one transaction, so a save from another client
+        cannot land in between and a crash leaves the roster unchanged.
+
+        Returns dict with 'added', 'updated', 'removed' (status changed to
+        removed), 'deleted' (ids) and 'unchanged' (count).
+        """
+        removed_employees = removed_employees or []
+        loc = location_id or ''
+
+        with self._lock:
+            conn = self.get_connection()
+            try:
+                cursor = conn.cursor()
+                cursor.execute('BEGIN IMMEDIATE')
+                stored = {
+                    row['employee_id']: (row['fingerprint'], row['status'])
+                    for row in cursor.execute('''
+                        SELECT employee_id, fingerprint, status FROM employees
+                        WHERE company_id = ? AND location_id = ?
+                    ''', (company_id, loc))
+                }
+
+                def changed(records, status):
+                    out = []
+                    for employee in records:
+                        current = stored.get(employee_id(employee))
+                        if current != (fingerprint(employee), status):
+                            out.append(employee)
+                    return out
+
+                active_changes = changed(employees, STATUS_ACTIVE)
+                removed_changes = changed(removed_employees, STATUS_REMOVED)
+                seen = {employee_id(e) for e in employees} | {employee_id(e) for e in removed_employees}
+                stale = [emp_id for emp_id in stored if emp_id not in seen]
+
+                now = datetime.now().isoformat()
+                active = self._upsert_rows(cursor, company_id, loc, active_changes, STATUS_ACTIVE, now)
+                removed = self._upsert_rows(cursor, company_id, loc, removed_changes, STATUS_REMOVED, now)
+                deleted = self._delete_rows(cursor, company_id, loc, stale) if stale else 0
+                if active['added'] or active['updated'] or removed['added'] or removed['updated'] or deleted:
+                    self._bump_version(cursor, company_id, loc)
+                conn.commit()
+            except BaseException:
+                conn.rollback()
+                raise
+            finally:
+                conn.close()
+
+        return {
+            'added': active['added'],
+            'updated': active['updated'],
+            'removed': removed['added'] + removed['updated'],
+            'deleted': stale,
+            'unchanged': len(employees) + len(removed_employees) - len(active_changes) - len(removed_changes)
+        }
+
+    def import_json(self, company_id, json_path, location_id=None):
+        """One-time migration of a legacy employees.json roster
+
+        Only runs when the roster has never been saved to the store.
+        Returns True if records were imported.
+        """
+        if self.get_version(company_id, location_id) or not os.path.exists(json_path):
+            return False
+        try:
+            with open(json_path, 'r') as f:
+                data = json.load(f)
+        except (OSError, ValueError) as e:
+            log.warning("Error reading %s: %s", json_path, e)
+            return False
+
+        self.upsert(company_id, data.get('employees', []), location_id, STATUS_ACTIVE)
+        self.upsert(company_id, data.get('removedEmployees', []), location_id, STATUS_REMOVED)
+        return True
+
+    def import_csv(self, company_id, csv_path, location_id=None):
+        """One-time migration of the legacy employee_list.csv
+
+        Reads either the Employee Maintenance format (a header row with a
+        'name' column) or a plain list of names, one per row. Only runs when
+        the roster has never been saved to the store. Returns True if
+        records were imported.
+        """
+        if self.get_version(company_id, location_id) or not os.path.exists(csv_path):
+            return False
+        try:
+            with open(csv_path, 'r', encoding='utf-8', newline='') as f:
+                rows = list(csv.reader(f))
+        except OSError as e:
+            log.warning("Error reading %s: %s", csv_path, e)
+            return False
+        if not rows:
+            return False
+
+        if 'name' in rows[0]:
+            header = rows[0]
+            records = [dict(zip(header, row)) for row in rows[1:] if row]
+        else:
+            records = [{'name': row[0].strip(), 'status': 'Active'} for row in rows if row and row[0].strip()]
+        for record in records:
+            record['id'] = uuid.uuid4().hex
+        self.upsert(company_id, records, location_id, STATUS_ACTIVE)
+        return True
+
+
+# Singleton instance
+_store = None
+
+def get_employee_store():
+    """Get employee store instance"""
+    global _store
+    if _store is None:
+        _store = EmployeeStore()
+    return _store
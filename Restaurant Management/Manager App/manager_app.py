@@ -4,7 +4,7 @@ Dexter Restaurant Management Assistant - Flask Web Application
 Multi-tenant restaurant management system
 """
 from flask import Flask, render_template, request, redirect, url_for, session, flash, jsonify
-from flask_login import LoginManager, UserMixin, login_user, logout_user, login_required as flask_login_required, current_user
+from flask_login import LoginManager, UserMixin, login_user, logout_user, login_required as flask_login_required, current_user, user_logged_in, user_logged_out
 
 # --- BYPASS LOGIN FOR ALL ROUTES ---
 def login_required(func):
@@ -16,29 +16,68 @@ from werkzeug.security import check_password_hash, generate_password_hash
 from functools import wraps
 import os
 import csv
+import logging
 from datetime import datetime, timedelta
-import secrets
 import re
+import atexit
 from flask_limiter import Limiter
 from flask_limiter.util import get_remote_address
 
 # Import existing modules
 import sys
 sys.path.insert(0, os.path.dirname(__file__))
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
 
 import database
 from security import InputValidator
+from daily_logs import save_daily_log, load_daily_log
+from pos_import import parse_excel_file, parse_csv_file
+from employee_store import get_employee_store
+from employee_search import get_roster_cache
+from analytics import PerformanceReport, to_records
+import rate_limit  # Registers the sqlite:// storage used by Flask-Limiter
+from session_store import SessionStore, ServerSessionInterface, rotate_session
+from shared_storage import FileLock, write_json, write_csv, append_csv_rows, shared_secret_key
+import perf_monitor
+import app_logging
+from app_logging import debug_enabled
 
 # Initialize Flask app
 app = Flask(__name__)
-app.config['SECRET_KEY'] = secrets.token_hex(32)
+log = logging.getLogger(__name__)
+# Leveled logs, written off the request thread to logs/manager_app.log next to the database
+app_logging.init_app(app, 'manager_app', os.path.join(os.path.dirname(database.DB_PATH), 'logs'))
+# One key for every worker process (a per-process random key breaks flash messages across workers)
+os.makedirs(os.path.dirname(database.DB_PATH), exist_ok=True)
+app.config['SECRET_KEY'] = os.environ.get('SECRET_KEY') or shared_secret_key(
+	os.path.join(os.path.dirname(database.DB_PATH), 'secret_key'))
 app.config['PERMANENT_SESSION_LIFETIME'] = timedelta(days=7)
 
+# Server-side sessions: the cookie carries only a token, data lives in the sessions table
+session_store = SessionStore(lifetime=app.config['PERMANENT_SESSION_LIFETIME'])
+app.session_interface = ServerSessionInterface(session_store)
+session_store.start()
+atexit.register(session_store.stop)
+
+
+@user_logged_in.connect_via(app)
+@user_logged_out.connect_via(app)
+def rotate_session_token(sender, user, **extra):
+	"""New session token on every login and logout (no session fixation)"""
+	rotate_session(session)
+
+# Request, query and daily-log I/O timings on /admin/perf (only with PERF_MONITOR=1)
+perf_monitor.init_app(app)
+
 # Flask-Limiter setup for rate limiting
+# Counters live in a SQLite file next to the app database so every worker
+# process enforces the same limits (override with RATELIMIT_STORAGE_URI)
+RATE_LIMIT_DB = os.path.join(os.path.dirname(database.DB_PATH), 'rate_limits.db')
 limiter = Limiter(
 	get_remote_address,
 	app=app,
-	default_limits=["200 per day", "50 per hour"]
+	default_limits=["200 per day", "50 per hour"],
+	storage_uri=os.environ.get('RATELIMIT_STORAGE_URI', f"sqlite:///{RATE_LIMIT_DB}")
 )
 
 # Password strength checker
@@ -59,10 +98,13 @@ login_manager.login_view = 'login'
 login_manager.login_message = 'Please log in to access this page.'
 
 db = database.Database()
+COMPANIES_REFRESH_SECONDS = 300  # Re-read a session's company list after this long
+# Server folder batch imports may read from (unset: ZIP uploads only)
+BATCH_IMPORT_ROOT = os.environ.get('BATCH_IMPORT_ROOT')
 
 # ==================== DATA STORAGE HELPERS ====================
 def create_employee_json(company_id, employee, location_id=None):
-	"""Create a JSON file for a new employee with basic info, discipline, and certifications."""
+	"""Create (or refresh) the JSON file for an employee with basic info, discipline, and certifications."""
 	if location_id:
 		emp_dir = f"company_data/{company_id}/locations/{location_id}/employees"
 	else:
@@ -70,249 +112,40 @@ def create_employee_json(company_id, employee, location_id=None):
 	os.makedirs(emp_dir, exist_ok=True)
 	filename = f"{employee['firstName']}_{employee['lastName']}.json"
 	filepath = os.path.join(emp_dir, filename)
-	data = {
-		"employeeInfo": {
-			"firstName": employee["firstName"],
-			"lastName": employee["lastName"],
-			"dateOfHire": employee["dateOfHire"],
-			"id": employee["id"],
-			"locationId": location_id
-		},
-		"disciplinaryReports": [],
-		"certifications": {
-			"TABC": None,
-			"FoodHandlers": None,
-			"Other": []
-		}
-	}
 	import json
-	with open(filepath, "w") as f:
-		json.dump(data, f, indent=2)
-	return filepath
-
-def save_daily_log(company_id, log_data, location_id=None):
-	"""Save daily log to CSV file - matching desktop dailylog.py format"""
-	if location_id:
-		data_dir = f"company_data/{company_id}/locations/{location_id}/daily_logs"
-	else:
-		data_dir = f"company_data/{company_id}/daily_logs"
-	os.makedirs(data_dir, exist_ok=True)
-    
-	date_str = log_data['date'].replace('-', '')
-	shift = log_data.get('shift', 'Day')
-	filepath = f"{data_dir}/{date_str}_{shift}.csv"
-    
-	with open(filepath, 'w', newline='') as f:
-		writer = csv.writer(f)
-        
-		# Header matching desktop format
-		writer.writerow(['Date', log_data['date']])
-		writer.writerow(['Shift', shift])
-		writer.writerow(['Notes', log_data.get('notes', '')])
-		writer.writerow([])
-        
-		# Employee entries section
-		writer.writerow(['Employee Entries'])
-		writer.writerow(['Name', 'Shift', 'Area', 'Cash', 'C.C. Tips', 'Cash Diff', 'Visa', 'Mastercard', 'Amex', 'Discover',
-						'Credit Total', 'Beer', 'Liquor', 'Wine', 'Food', 'Voids'])
-        
-		employees = log_data.get('employees', [])
-		for emp in employees:
-			writer.writerow([
-				emp.get('name', ''),
-				emp.get('shift', 'Day'),
-				emp.get('area', ''),
-				emp.get('cash', 0),
-				emp.get('cc_tips', 0),
-				emp.get('cash_diff', 0),
-				emp.get('visa', 0),
-				emp.get('mastercard', 0),
-				emp.get('amex', 0),
-				emp.get('discover', 0),
-				emp.get('credit', 0),
-				emp.get('beer', 0),
-				emp.get('liquor', 0),
-				emp.get('wine', 0),
-				emp.get('food', 0),
-				emp.get('voids', 0)
-			])
-        
-		# Cash drawer count
-		writer.writerow([])
-		writer.writerow(['Cash Drawer Count'])
-		writer.writerow(['Pennies', log_data.get('pennies', 0)])
-		writer.writerow(['Nickels', log_data.get('nickels', 0)])
-		writer.writerow(['Dimes', log_data.get('dimes', 0)])
-		writer.writerow(['Quarters', log_data.get('quarters', 0)])
-		writer.writerow(['Ones', log_data.get('ones', 0)])
-		writer.writerow(['Fives', log_data.get('fives', 0)])
-		writer.writerow(['Tens', log_data.get('tens', 0)])
-		writer.writerow(['Twenties', log_data.get('twenties', 0)])
-		writer.writerow(['Fifties', log_data.get('fifties', 0)])
-		writer.writerow(['Hundreds', log_data.get('hundreds', 0)])
-		writer.writerow(['Drawer Total', log_data.get('drawer_total', 0)])
-        
-		# Cash Deductions
-		writer.writerow([])
-		writer.writerow(['Cash Deductions'])
-		deduction_descs = log_data.get('deduction_descs', [])
-		deduction_locations = log_data.get('deduction_locations', [])
-		deduction_amounts = log_data.get('deduction_amounts', [])
-		for i, desc in enumerate(deduction_descs):
-			if desc:
-				location = deduction_locations[i] if i < len(deduction_locations) else ''
-				amount = deduction_amounts[i] if i < len(deduction_amounts) else '0'
-				writer.writerow([desc, location, amount])
-        
-		# Deposit summary
-		writer.writerow([])
-		writer.writerow(['Deposit Summary'])
-		total_deductions = sum(float(amt) for amt in deduction_amounts if amt)
-		writer.writerow(['Cash Adjustments', total_deductions])
-		writer.writerow(['Cash in Drawer', log_data.get('drawer_total', 0)])
-		writer.writerow(['DEPOSIT AMOUNT', log_data.get('deposit_amount', 0)])
-
-def load_daily_log(company_id, date_str, location_id=None):
-	"""Load daily log from CSV file - matching desktop dailylog.py format"""
-	if location_id:
-		data_dir = f"company_data/{company_id}/locations/{location_id}/daily_logs"
-	else:
-		data_dir = f"company_data/{company_id}/daily_logs"
-	date_str_clean = date_str.replace('-', '')
-
-	# Try both Day and Night shifts
-	filepath = f"{data_dir}/{date_str_clean}_Day.csv"
-	legacy_dir = os.path.expanduser("~/Documents/AIO Python/daily_logs")
-	legacy_day = os.path.join(legacy_dir, f"{date_str}_Day.csv")
-	legacy_night = os.path.join(legacy_dir, f"{date_str}_Night.csv")
-
-	if not os.path.exists(filepath):
-		# If not found, check legacy folder and copy if exists
-		if os.path.exists(legacy_day):
-			import shutil
-			shutil.copy(legacy_day, filepath)
-		elif os.path.exists(legacy_night):
-			filepath = f"{data_dir}/{date_str_clean}_Night.csv"
-			shutil.copy(legacy_night, filepath)
-
-	if not os.path.exists(filepath):
-		return None
-    
-	log_data = {
-		'employees': [],
-		'shift': 'Day',
-		'notes': '',
-		'pennies': 0,
-		'nickels': 0,
-		'dimes': 0,
-		'quarters': 0,
-		'ones': 0,
-		'fives': 0,
-		'tens': 0,
-		'twenties': 0,
-		'fifties': 0,
-		'hundreds': 0,
-		'drawer_total': 0,
-		'deduction_descs': [],
-		'deduction_locations': [],
-		'deduction_amounts': [],
-		'deposit_amount': 0
+	employee_info = {
+		"firstName": employee["firstName"],
+		"lastName": employee["lastName"],
+		"dateOfHire": employee["dateOfHire"],
+		"id": employee["id"],
+		"locationId": location_id
 	}
-    
-	try:
-		with open(filepath, 'r') as f:
-			reader = csv.reader(f)
-			rows = list(reader)
-            
-			section = None
-			for i, row in enumerate(rows):
-				if not row:
-					continue
-                
-				# Parse header info
-				if row[0] == 'Shift' and len(row) > 1:
-					log_data['shift'] = row[1]
-				elif row[0] == 'Notes' and len(row) > 1:
-					log_data['notes'] = row[1]
-                
-				# Detect sections
-				elif row[0] == 'Employee Entries':
-					section = 'employees'
-					continue
-				elif row[0] == 'Cash Drawer Count':
-					section = 'drawer'
-					continue
-				elif row[0] == 'Deductions':
-					section = 'deductions'
-					continue
-				elif row[0] == 'Cash Deductions':
-					section = 'deductions'
-					continue
-				elif row[0] == 'Deposit Summary':
-					section = 'deposit'
-					continue
-                
-				# Parse employee data
-				if section == 'employees' and row[0] != 'Name' and len(row) >= 13:
-					employee = {
-						'name': row[0],
-						'shift': row[1] if len(row) > 1 else 'Day',
-						'area': row[2] if len(row) > 2 else '',
-						'cash': float(row[3]) if len(row) > 3 and row[3] else 0,
-						'cc_tips': float(row[4]) if len(row) > 4 and row[4] else 0,
-						'cash_diff': float(row[5]) if len(row) > 5 and row[5] else 0,
-						'visa': float(row[6]) if len(row) > 6 and row[6] else 0,
-						'mastercard': float(row[7]) if len(row) > 7 and row[7] else 0,
-						'amex': float(row[8]) if len(row) > 8 and row[8] else 0,
-						'discover': float(row[9]) if len(row) > 9 and row[9] else 0,
-						'credit': float(row[10]) if len(row) > 10 and row[10] else 0,
-						'beer': float(row[11]) if len(row) > 11 and row[11] else 0,
-						'liquor': float(row[12]) if len(row) > 12 and row[12] else 0,
-						'wine': float(row[13]) if len(row) > 13 and row[13] else 0,
-						'food': float(row[14]) if len(row) > 14 and row[14] else 0,
-						'voids': float(row[15]) if len(row) > 15 and row[15] else 0
-					}
-					log_data['employees'].append(employee)
-                
-				# Parse drawer data
-				elif section == 'drawer' and len(row) >= 2:
-					key = row[0].lower().replace(' ', '_')
-					if key in ['pennies', 'nickels', 'dimes', 'quarters', 'ones', 'fives', 'tens', 'twenties', 'fifties', 'hundreds']:
-						log_data[key] = float(row[1]) if row[1] else 0
-					elif key == 'drawer_total':
-						log_data['drawer_total'] = float(row[1]) if row[1] else 0
-                
-				# Parse deductions (support both old 2-column and new 3-column format)
-				elif section == 'deductions' and len(row) >= 2 and row[0] not in ['Total Deductions']:
-					log_data['deduction_descs'].append(row[0])
-					# Check if this is the new 3-column format (desc, location, amount)
-					if len(row) >= 3:
-						log_data['deduction_locations'].append(row[1] if row[1] else '')
-						log_data['deduction_amounts'].append(float(row[2]) if row[2] else 0)
-					else:
-						# Old 2-column format (desc, amount)
-						log_data['deduction_locations'].append('')
-						log_data['deduction_amounts'].append(float(row[1]) if row[1] else 0)
-                
-				# Parse deposit
-				elif section == 'deposit' and len(row) >= 2:
-					if row[0] == 'DEPOSIT AMOUNT':
-						log_data['deposit_amount'] = float(row[1]) if row[1] else 0
-    
-	except Exception as e:
-		print(f"Error loading daily log: {e}")
-		return None
-    
-	# Calculate deposit if it's missing (for backwards compatibility with old CSV files)
-	if log_data['deposit_amount'] == 0 and log_data['employees']:
-		total_cash = sum(emp.get('cash', 0) for emp in log_data['employees'])
-		total_cc_tips = sum(emp.get('cc_tips', 0) for emp in log_data['employees'])
-		total_deductions = sum(log_data['deduction_amounts'])
-		log_data['deposit_amount'] = total_cash - total_cc_tips - total_deductions
-    
-	return log_data
-
-	return log_data
+	# Locked so two workers refreshing the same employee cannot drop each other's changes;
+	# the lock files live together in company_data/.locks, not beside the employee files
+	lock_dir = os.path.join("company_data", ".locks")
+	os.makedirs(lock_dir, exist_ok=True)
+	with FileLock(os.path.join(lock_dir, filepath.replace(os.sep, "__").replace("/", "__"))):
+		# Existing file: refresh basic info only, keep discipline and certifications
+		if os.path.exists(filepath):
+			try:
+				with open(filepath, "r") as f:
+					data = json.load(f)
+				data["employeeInfo"] = {**data.get("employeeInfo", {}), **employee_info}
+				write_json(filepath, data, indent=2)
+				return filepath
+			except (OSError, ValueError):
+				pass
+		data = {
+			"employeeInfo": employee_info,
+			"disciplinaryReports": [],
+			"certifications": {
+				"TABC": None,
+				"FoodHandlers": None,
+				"Other": []
+			}
+		}
+		write_json(filepath, data, indent=2)
+	return filepath
 
 
 def save_cash_drawer(company_id, drawer_data):
@@ -339,10 +172,7 @@ def save_cash_drawer(company_id, drawer_data):
 		['Total', drawer_data.get('total', 0)]
 	]
     
-	with open(filepath, 'w', newline='') as f:
-		writer = csv.writer(f)
-		for row in cash_section:
-			writer.writerow(row)
+	write_csv(filepath, cash_section)
 
 def load_cash_drawer(company_id, date_str):
 	"""Load cash drawer counts from CSV file"""
@@ -400,13 +230,11 @@ def save_cash_deduction(company_id, deduction_data):
     date_str = deduction_data['date'].replace('-', '')
     filepath = f"{data_dir}/{date_str}_CashDeductions.csv"
     
-    with open(filepath, 'a', newline='') as f:
-        writer = csv.writer(f)
-        writer.writerow([
-            deduction_data.get('description', ''),
-            deduction_data.get('amount', 0),
-            datetime.now().isoformat()
-        ])
+    append_csv_rows(filepath, [[
+        deduction_data.get('description', ''),
+        deduction_data.get('amount', 0),
+        datetime.now().isoformat()
+    ]])
 
 
 def load_cash_deductions(company_id, date_str):
@@ -451,6 +279,22 @@ class User(UserMixin):
         self.current_role = None
 
 
+def get_session_companies(user_id, refresh=False, access_version=None):
+    """Get the user's companies, cached in the server-side session
+
+    The list is also re-read as soon as the user's access_version (bumped
+    on every membership or role change) differs from the one it was read at.
+    """
+    loaded_at = session.get('companies_loaded_at', 0)
+    if (refresh or 'companies' not in session
+            or session.get('companies_access_version') != access_version
+            or datetime.now().timestamp() - loaded_at > COMPANIES_REFRESH_SECONDS):
+        session['companies'] = db.get_user_companies(user_id)
+        session['companies_loaded_at'] = datetime.now().timestamp()
+        session['companies_access_version'] = access_version
+    return session['companies']
+
+
 @login_manager.user_loader
 def load_user(user_id):
     """Load user from database"""
@@ -464,7 +308,8 @@ def load_user(user_id):
     
     if user_data:
         user = User(dict(user_data))
-        user.companies = db.get_user_companies(user_id)
+        # current_role comes from this list, so it follows role changes on the next request
+        user.companies = get_session_companies(user_id, access_version=user_data['access_version'] or 0)
         
         # Load current company from session
         if session.get('current_company_id'):
@@ -540,7 +385,7 @@ def login():
                     return redirect(url_for('terms_acceptance'))
                 
                 user = User(user_data)
-                user.companies = db.get_user_companies(user_data['id'])
+                user.companies = get_session_companies(user_data['id'], refresh=True)
                 
                 # Set session to permanent if remember me is checked
                 if remember:
@@ -632,9 +477,7 @@ def terms_acceptance():
     """Terms of Service acceptance"""
     pending_user_id = session.get('pending_user_id')
     
-    # Debug logging
-    print(f"DEBUG: Terms page - pending_user_id: {pending_user_id}")
-    print(f"DEBUG: Session contents: {dict(session)}")
+    log.debug("Terms page - pending_user_id: %s, session keys: %s", pending_user_id, sorted(session.keys()))
     
     if not pending_user_id:
         flash('Session expired. Please login again.', 'warning')
@@ -668,7 +511,7 @@ def terms_acceptance():
                 conn.close()
             
             user = User(user_data)
-            user.companies = db.get_user_companies(pending_user_id)
+            user.companies = get_session_companies(pending_user_id, refresh=True)
             login_user(user)
             
             session.pop('pending_user_id', None)
@@ -782,7 +625,7 @@ def create_company():
                          {'company_name': name, 'locations': location_names})
             
             # Reload user companies
-            current_user.companies = db.get_user_companies(current_user.id)
+            current_user.companies = get_session_companies(current_user.id, refresh=True)
             session['current_company_id'] = company_id
             
             flash(f'Company "{name}" created with {len(location_names)} location(s): {", ".join(location_names)}!', 'success')
@@ -1064,6 +907,7 @@ def api_daily_summary():
     else:
         data_dir = f"company_data/{current_user.current_company_id}/daily_logs"
     summary_data = []
+    trace = debug_enabled(log)  # Per-row debug output only costs anything at DEBUG
     
     if not os.path.exists(data_dir):
         return jsonify({'success': True, 'data': []})
@@ -1077,15 +921,14 @@ def api_daily_summary():
     
     # Group files by date to combine Day and Night shifts
     date_files = {}
-    import sys
     for filename in os.listdir(data_dir):
         if not filename.endswith('.csv') or filename.startswith('.'):
-            print(f"Skipping file (not CSV or hidden): {filename}", file=sys.stderr)
+            log.debug("Skipping file (not CSV or hidden): %s", filename)
             continue
 
         date_str = filename.split('_')[0]
         if len(date_str) != 8 or not date_str.isdigit():
-            print(f"Skipping file (bad date format): {filename}", file=sys.stderr)
+            log.debug("Skipping file (bad date format): %s", filename)
             continue
 
         try:
@@ -1093,10 +936,10 @@ def api_daily_summary():
 
             # Check if in date range
             if start and file_date < start:
-                print(f"Skipping file (before start date): {filename}", file=sys.stderr)
+                log.debug("Skipping file (before start date): %s", filename)
                 continue
             if end and file_date > end:
-                print(f"Skipping file (after end date): {filename}", file=sys.stderr)
+                log.debug("Skipping file (after end date): %s", filename)
                 continue
 
             date_key = file_date.strftime('%Y-%m-%d')
@@ -1104,7 +947,7 @@ def api_daily_summary():
                 date_files[date_key] = []
             date_files[date_key].append(filename)
         except Exception as e:
-            print(f"Skipping file (exception): {filename} - {e}", file=sys.stderr)
+            log.warning("Skipping file %s: %s", filename, e)
             continue
     
     # Process each date (combining Day and Night shifts)
@@ -1126,27 +969,33 @@ def api_daily_summary():
                 
                 # Read CSV file directly
                 try:
+                    started = perf_monitor.clock()
                     with open(filepath, 'r') as f:
                         reader = csv.reader(f)
                         rows = list(reader)
+                        perf_monitor.count_io('daily_log.read', started, filepath)
                         
                         section = None
-                        print(f"\n=== PARSING FILE: {filename} ===")  # Debug
+                        if trace:
+                            log.debug("Parsing file %s", filename)
                         for row_idx, row in enumerate(rows):
                             if not row:
                                 continue
                             
                             if row[0] == 'Employee Entries':
                                 section = 'employees'
-                                print(f"Row {row_idx}: Section changed to 'employees'")  # Debug
+                                if trace:
+                                    log.debug("Row %d: section changed to 'employees'", row_idx)
                                 continue
                             elif row[0] == 'Deposit Summary':
                                 section = 'deposit'
-                                print(f"Row {row_idx}: Section changed to 'deposit'")  # Debug
+                                if trace:
+                                    log.debug("Row %d: section changed to 'deposit'", row_idx)
                                 continue
                             elif row[0] in ['Cash Drawer Count', 'Deductions', 'Cash Deductions']:
                                 section = None
-                                print(f"Row {row_idx}: Section set to None ({row[0]})")  # Debug
+                                if trace:
+                                    log.debug("Row %d: section set to None (%s)", row_idx, row[0])
                                 continue
                             
                             # Parse employee data
@@ -1177,30 +1026,31 @@ def api_daily_summary():
                                     log_data['employees'].append(employee)
                                     combined_employees.append(employee)
                                 except (ValueError, IndexError) as e:
-                                    print(f"Error parsing employee row: {e}")
+                                    log.warning("Error parsing employee row in %s: %s", filename, e)
                                     continue
                             
                             # Parse deposit
                             elif section == 'deposit' and len(row) >= 2:
-                                print(f"Row {row_idx} in deposit section: {row[0]} = {row[1]}")  # Debug
+                                if trace:
+                                    log.debug("Row %d in deposit section: %s = %s", row_idx, row[0], row[1])
                                 if row[0] == 'DEPOSIT AMOUNT':
                                     try:
                                         deposit_val = float(row[1]) if row[1] else 0
                                         log_data['deposit_amount'] = deposit_val
-                                        print(f"  -> Found deposit in {filename}: {deposit_val}")  # Debug
+                                        if trace:
+                                            log.debug("Found deposit in %s: %s", filename, deposit_val)
                                     except ValueError:
-                                        print(f"  -> ValueError parsing deposit: {row[1]}")  # Debug
-                                        pass
+                                        log.warning("Could not parse deposit %r in %s", row[1], filename)
                                 elif row[0] in ['Cash Adjustments', 'Total Deductions']:
                                     try:
                                         deductions_val = float(row[1]) if row[1] else 0
                                         log_data['deductions'] = deductions_val
-                                        print(f"  -> Found deductions in {filename}: {deductions_val}")  # Debug
+                                        if trace:
+                                            log.debug("Found deductions in %s: %s", filename, deductions_val)
                                     except ValueError:
-                                        print(f"  -> ValueError parsing deductions: {row[1]}")  # Debug
-                                        pass
+                                        log.warning("Could not parse deductions %r in %s", row[1], filename)
                 except Exception as e:
-                    print(f"Error reading file {filename}: {e}")
+                    log.warning("Error reading file %s: %s", filename, e)
                     continue
                 
                 # Calculate deposit if it's missing (backwards compatibility)
@@ -1208,13 +1058,15 @@ def api_daily_summary():
                     total_cash = sum(emp.get('cash', 0) for emp in log_data['employees'])
                     total_cc_tips = sum(emp.get('cc_tips', 0) for emp in log_data['employees'])
                     log_data['deposit_amount'] = total_cash - total_cc_tips - log_data['deductions']
-                    print(f"Calculated deposit for {filename}: {log_data['deposit_amount']}")  # Debug
+                    if trace:
+                        log.debug("Calculated deposit for %s: %s", filename, log_data['deposit_amount'])
                 
                 # Add to combined totals
                 combined_deposit += log_data['deposit_amount']
                 combined_deductions += log_data['deductions']
-                print(f"File {filename}: deposit={log_data['deposit_amount']}, deductions={log_data['deductions']}")  # Debug
-                print(f"Running totals: combined_deposit={combined_deposit}, combined_deductions={combined_deductions}")  # Debug
+                if trace:
+                    log.debug("File %s: deposit=%s, deductions=%s; running totals: deposit=%s, deductions=%s",
+                              filename, log_data['deposit_amount'], log_data['deductions'], combined_deposit, combined_deductions)
             
             if combined_employees:
                 # Calculate totals from all shifts
@@ -1240,8 +1092,6 @@ def api_daily_summary():
                 tip_percentage = (total_tips / total_sales * 100) if total_sales > 0 else 0
                 void_percentage = (total_voids / total_sales * 100) if total_sales > 0 else 0
                 
-                print(f"DEBUG - Date {date_key}: total_cash_adjustments = {total_cash_adjustments}, combined_deductions = {combined_deductions}")  # Debug
-                
                 # Determine shift label based on what was filtered
                 if shift_filter == 'Full':
                     # Check if we have both Day and Night employees
@@ -1250,7 +1100,8 @@ def api_daily_summary():
                 else:
                     shift_label = shift_filter
                 
-                print(f"Date: {date_key}, Combined Deposit: {combined_deposit}")  # Debug
+                if trace:
+                    log.debug("Date %s: combined deposit %s, cash adjustments %s", date_key, combined_deposit, total_cash_adjustments)
                 
                 summary_data.append({
                     'date': date_key,
@@ -1271,15 +1122,13 @@ def api_daily_summary():
                     'void_percentage': round(void_percentage, 2)
                 })
         except Exception as e:
-            print(f"Error processing date {date_key}: {e}")
-            import traceback
-            traceback.print_exc()
+            log.exception("Error processing date %s", date_key)
             continue
     
     # Sort by date
     summary_data.sort(key=lambda x: x['date'], reverse=True)
     
-    print(f"Daily summary returning {len(summary_data)} records")
+    log.debug("Daily summary returning %d records", len(summary_data))
     return jsonify({'success': True, 'data': summary_data})
 
 
@@ -1347,15 +1196,20 @@ def api_cash_deductions():
 @login_required
 @company_required
 def api_employee_performance():
-    """Get employee performance report"""
+    """Get employee performance report
+
+    Query params: start_date, end_date, employee_name, shift_filter
+    (Full/Day/Night), plus optional sort_by (any total column, default
+    total_sales) and top (only the N best employees).
+    """
     start_date = request.args.get('start_date')
     end_date = request.args.get('end_date')
     employee_name = request.args.get('employee_name')
     shift_filter = request.args.get('shift_filter', 'Full')  # Default to Full (combined)
+    sort_by = request.args.get('sort_by', 'total_sales')
+    top = request.args.get('top', type=int)
     
     data_dir = f"company_data/{current_user.current_company_id}/daily_logs"
-    employee_data = {}
-    daily_breakdown = {}  # Store daily data when filtering by specific employee
     
     if not os.path.exists(data_dir):
         return jsonify({'success': True, 'data': []})
@@ -1366,129 +1220,30 @@ def api_employee_performance():
     except:
         return jsonify({'success': False, 'error': 'Invalid date format'})
     
-    # Aggregate employee data across all days
-    for filename in os.listdir(data_dir):
-        if not filename.endswith('.csv') or filename.startswith('.'):
-            continue
-            
-        date_str = filename.split('_')[0]
-        if len(date_str) != 8 or not date_str.isdigit():
-            continue
-            
-        try:
-            file_date = datetime.strptime(date_str, '%Y%m%d')
-            
-            if start and file_date < start:
-                continue
-            if end and file_date > end:
-                continue
-            
-            log_data = load_daily_log(current_user.current_company_id, file_date.strftime('%Y-%m-%d'))
-            
-            if log_data and log_data.get('employees'):
-                for emp in log_data['employees']:
-                    name = emp.get('name', 'Unknown')
-                    emp_shift = emp.get('shift', 'Day')  # Get employee's shift from their data
-                    
-                    # Filter by shift if not Full
-                    if shift_filter != 'Full' and emp_shift != shift_filter:
-                        continue
-                    
-                    # Filter by employee name if provided
-                    if employee_name and name.lower() != employee_name.lower():
-                        continue
-                    
-                    if name not in employee_data:
-                        employee_data[name] = {
-                            'name': name,
-                            'shifts_worked': 0,
-                            'total_sales': 0,
-                            'total_cash': 0,
-                            'total_credit': 0,
-                            'total_tips': 0,
-                            'total_voids': 0,
-                            'total_beer': 0,
-                            'total_liquor': 0,
-                            'total_wine': 0,
-                            'total_food': 0,
-                            'avg_sales': 0,
-                            'tip_percentage': 0
-                        }
-                    
-                    sales = (emp.get('beer', 0) + emp.get('liquor', 0) + 
-                            emp.get('wine', 0) + emp.get('food', 0))
-                    
-                    employee_data[name]['shifts_worked'] += 1
-                    employee_data[name]['total_sales'] += sales
-                    employee_data[name]['total_cash'] += emp.get('cash', 0)
-                    employee_data[name]['total_credit'] += emp.get('credit', 0)
-                    employee_data[name]['total_tips'] += emp.get('cc_tips', 0)
-                    employee_data[name]['total_voids'] += emp.get('voids', 0)
-                    employee_data[name]['total_beer'] += emp.get('beer', 0)
-                    employee_data[name]['total_liquor'] += emp.get('liquor', 0)
-                    employee_data[name]['total_wine'] += emp.get('wine', 0)
-                    employee_data[name]['total_food'] += emp.get('food', 0)
-                    
-                    # Store daily breakdown if filtering by specific employee
-                    if employee_name and name.lower() == employee_name.lower():
-                        date_key = file_date.strftime('%Y-%m-%d')
-                        shift = filename.split('_')[1].replace('.csv', '') if '_' in filename else 'Day'
-                        
-                        if name not in daily_breakdown:
-                            daily_breakdown[name] = []
-                        
-                        tips = emp.get('cc_tips', 0)
-                        tip_pct = round((tips / sales * 100), 2) if sales > 0 else 0
-                        
-                        daily_breakdown[name].append({
-                            'date': date_key,
-                            'shift': shift,
-                            'sales': round(sales, 2),
-                            'cash': round(emp.get('cash', 0), 2),
-                            'credit': round(emp.get('credit', 0), 2),
-                            'tips': round(tips, 2),
-                            'tip_percentage': tip_pct,
-                            'voids': round(emp.get('voids', 0), 2),
-                            'beer': round(emp.get('beer', 0), 2),
-                            'liquor': round(emp.get('liquor', 0), 2),
-                            'wine': round(emp.get('wine', 0), 2),
-                            'food': round(emp.get('food', 0), 2)
-                        })
-        except Exception as e:
-            print(f"Error processing {filename}: {e}")
-            continue
-    
-    # Calculate averages
-    result = []
-    for name, data in employee_data.items():
-        if data['shifts_worked'] > 0:
-            data['avg_sales'] = round(data['total_sales'] / data['shifts_worked'], 2)
-        data['total_sales'] = round(data['total_sales'], 2)
-        data['total_cash'] = round(data['total_cash'], 2)
-        data['total_credit'] = round(data['total_credit'], 2)
-        data['total_tips'] = round(data['total_tips'], 2)
-        data['total_voids'] = round(data['total_voids'], 2)
-        data['total_beer'] = round(data['total_beer'], 2)
-        data['total_liquor'] = round(data['total_liquor'], 2)
-        data['total_wine'] = round(data['total_wine'], 2)
-        data['total_food'] = round(data['total_food'], 2)
-        
-        # Calculate overall tip percentage
-        if data['total_sales'] > 0:
-            data['tip_percentage'] = round((data['total_tips'] / data['total_sales'] * 100), 2)
-        else:
-            data['tip_percentage'] = 0
-        
-        # Add daily breakdown if available
-        if name in daily_breakdown:
-            data['daily_breakdown'] = sorted(daily_breakdown[name], key=lambda x: x['date'])
-        
-        result.append(data)
-    
-    # Sort by total sales descending
-    result.sort(key=lambda x: x['total_sales'], reverse=True)
+    # One vectorized pass over every employee-shift row in the range
+    report = PerformanceReport.from_logs(data_dir, start, end).filter(
+        employee=employee_name,
+        shift=None if shift_filter == 'Full' else shift_filter
+    )
+    try:
+        ranked = report.rank(sort_by, top=top)
+    except ValueError as e:
+        return jsonify({'success': False, 'error': str(e)})
+    result = to_records(ranked)
+    
+    # Add daily breakdown when filtering by specific employee
+    if employee_name and result:
+        breakdown = {}
+        for day in to_records(report.daily()):
+            breakdown.setdefault(day.pop('name'), []).append(day)
+        for data in result:
+            data['daily_breakdown'] = breakdown.get(data['name'], [])
     
-    return jsonify({'success': True, 'data': result})
+    return jsonify({
+        'success': True,
+        'data': result,
+        'percentiles': {str(p): v for p, v in report.percentiles(sort_by).items()} if result else {}
+    })
 
 
 @app.route('/settings', methods=['GET', 'POST'])
@@ -1523,6 +1278,7 @@ def settings():
                 
                 db.log_action(current_user.id, 'company_updated', current_user.current_company_id,
                              {'company_name': name})
+                current_user.companies = get_session_companies(current_user.id, refresh=True)
                 flash('Company information updated successfully!', 'success')
             except Exception as e:
                 flash(f'Error updating company information: {str(e)}', 'danger')
@@ -1678,6 +1434,15 @@ def audit_log():
     return render_template('audit_log.html', logs=logs)
 
 
+@app.route('/admin/perf')
+@login_required
+@company_required
+@role_required('business_admin')
+def admin_perf():
+    """Request, SQL and daily-log I/O timings for this worker (404 unless PERF_MONITOR=1)"""
+    return perf_monitor.perf_page()
+
+
 # ==================== API ROUTES ====================
 
 @app.route('/api/profile')
@@ -1716,41 +1481,38 @@ def api_data_export():
 @login_required
 @company_required
 def api_employee_names():
-    print("[DEBUG] api_employee_names called")
-    """Get employee names for autocomplete"""
+    """Get employee names for autocomplete
+
+    Query params:
+        location_id: Roster to read (defaults to the selected location, falling
+            back to the company roster when the location has none)
+        q: Optional search text; returns only the best matches
+        limit: Max matches for q (default 10)
+    """
     try:
-        # Read employee roster from company data
         company_id = current_user.current_company_id
-        employee_file = f"company_data/{company_id}/employees.json"
-        print(f"[DEBUG] employee_file path: {employee_file}")
+        location_id = request.args.get('location_id') or session.get('selected_location_id')
+        cache = get_roster_cache()
 
-        employees = []
-        removedEmployees = []
-        print(f"[DEBUG] Checking if employee_file exists: {os.path.exists(employee_file)}")
-        if not os.path.exists(employee_file):
-            print(f"[ERROR] employee_file does not exist at path: {employee_file}")
+        # Legacy employees.json rosters are migrated the first time they are read
+        if location_id and cache.has_roster(company_id, location_id,
+                                            f"company_data/{company_id}/locations/{location_id}/employees.json"):
+            employees, removedEmployees, index = cache.get(company_id, location_id)
         else:
-            raw = None
-            try:
-                with open(employee_file, 'r') as f:
-                    raw = f.read()
-            except Exception as e:
-                print(f"[ERROR] Failed to read employees.json: {e}")
-            print(f"[DEBUG] RAW employee_file contents: {raw}")
-            try:
-                if raw:
-                    import json
-                    data = json.loads(raw)
-                    print(f"[DEBUG] Parsed employee_file contents: {data}")
-                    employees = data.get('employees', [])
-                    removedEmployees = data.get('removedEmployees', [])
-            except Exception as e:
-                print(f"[ERROR] Failed to parse employees.json: {e}")
+            employees, removedEmployees, index = cache.get(company_id, legacy_path=f"company_data/{company_id}/employees.json")
+
+        query = request.args.get('q')
+        if query is not None:
+            limit = max(1, min(request.args.get('limit', 10, type=int), 100))
+            matches = index.search(query, limit)
+            return jsonify({
+                'success': True,
+                'employees': [index.employees[idx] for _score, idx in matches],
+                'employeeNames': [index.names[idx] for _score, idx in matches]
+            })
 
         # Build list of full names for autocomplete
         employee_names = [f"{emp.get('firstName', '')} {emp.get('lastName', '')}".strip() for emp in employees if emp.get('firstName') and emp.get('lastName')]
-        print(f"[DEBUG] employees returned: {employees}")
-        print(f"[DEBUG] employee_names for autocomplete: {employee_names}")
         return jsonify({
             'success': True,
             'employees': employees,
@@ -1759,7 +1521,7 @@ def api_employee_names():
         })
 
     except Exception as e:
-        print(f"[ERROR] api_employee_names: {e}")
+        log.exception("api_employee_names failed")
         return jsonify({
             'success': False, 
             'error': str(e), 
@@ -1772,38 +1534,39 @@ def api_employee_names():
 @login_required
 @company_required
 def api_save_employees():
-    """Save employee roster"""
+    """Save employee roster (only changed records are written)"""
     try:
-        import json
         company_id = current_user.current_company_id
         location_id = request.json.get('location_id') or session.get('selected_location_id')
-        
-        if location_id:
-            data_dir = f"company_data/{company_id}/locations/{location_id}"
-        else:
-            data_dir = f"company_data/{company_id}"
-        os.makedirs(data_dir, exist_ok=True)
-        
-        employee_file = f"{data_dir}/employees.json"
         employees = request.json.get('employees', [])
         removedEmployees = request.json.get('removedEmployees', [])
-        
-        with open(employee_file, 'w') as f:
-            json.dump({
-                'employees': employees,
-                'removedEmployees': removedEmployees
-            }, f, indent=2)
 
-        # Create individual JSON file for each employee
-        for emp in employees:
+        # Add an 'id' field if missing so the record has a stable key
+        for emp in employees + removedEmployees:
+            if 'id' not in emp and emp.get('firstName') and emp.get('lastName'):
+                emp['id'] = f"{emp['firstName']}_{emp['lastName']}"
+
+        store = get_employee_store()
+        if location_id:
+            store.import_json(company_id, f"company_data/{company_id}/locations/{location_id}/employees.json", location_id)
+        else:
+            store.import_json(company_id, f"company_data/{company_id}/employees.json")
+        changes = store.sync(company_id, employees, removedEmployees, location_id)
+
+        # Create or refresh individual JSON files for new and edited employees only
+        for emp in changes['added'] + changes['updated']:
             # Ensure required fields exist
             if emp.get('firstName') and emp.get('lastName') and emp.get('dateOfHire'):
-                # Add an 'id' field if missing
-                if 'id' not in emp:
-                    emp['id'] = f"{emp['firstName']}_{emp['lastName']}"
                 create_employee_json(company_id, emp, location_id)
 
-        return jsonify({'success': True})
+        return jsonify({
+            'success': True,
+            'added': len(changes['added']),
+            'updated': len(changes['updated']),
+            'removed': len(changes['removed']),
+            'deleted': len(changes['deleted']),
+            'unchanged': changes['unchanged']
+        })
     
     except Exception as e:
         return jsonify({'success': False, 'error': str(e)}), 500
@@ -1838,6 +1601,69 @@ def import_file():
         return jsonify({'success': False, 'error': str(e)}), 500
 
 
+def _batch_import_folder(folder):
+    """Real path of folder when it is inside BATCH_IMPORT_ROOT, else None"""
+    if not BATCH_IMPORT_ROOT or not folder:
+        return None
+    root = os.path.realpath(BATCH_IMPORT_ROOT)
+    path = os.path.realpath(os.path.join(root, folder))
+    if os.path.commonpath([root, path]) != root or not os.path.isdir(path):
+        return None
+    return path
+
+
+@app.route('/api/batch-import', methods=['POST'])
+@login_required
+@company_required
+@role_required('business_admin')
+def api_batch_import():
+    """Back-fill daily logs from an uploaded ZIP (or a folder under BATCH_IMPORT_ROOT) of POS exports"""
+    import batch_import
+    import tempfile
+
+    company_id = current_user.current_company_id
+    location_id = request.form.get('location_id') or session.get('selected_location_id')
+    if location_id and location_id not in {loc['id'] for loc in db.get_company_locations(company_id)}:
+        return jsonify({'success': False, 'error': 'Unknown location'}), 400
+    overwrite = request.form.get('overwrite') in ('1', 'true', 'on')
+    cleanup = None
+
+    if 'file' in request.files and request.files['file'].filename:
+        file = request.files['file']
+        if not file.filename.lower().endswith('.zip'):
+            return jsonify({'success': False, 'error': 'Please upload a .zip of daily exports'}), 400
+        fd, source = tempfile.mkstemp(suffix='.zip')
+        os.close(fd)
+        file.save(source)
+        cleanup = source
+    else:
+        source = _batch_import_folder(request.form.get('folder', '').strip())
+        if not source:
+            return jsonify({'success': False, 'error': 'No ZIP uploaded and folder not found'}), 400
+
+    job_id = batch_import.start_job(company_id, source, location_id,
+                                    overwrite=overwrite, cleanup=cleanup)
+
+    db.log_action(current_user.id, 'batch_import_started', company_id,
+                 {'job_id': job_id, 'location_id': location_id})
+
+    return jsonify({'success': True, 'job_id': job_id})
+
+
+@app.route('/api/batch-import/<job_id>')
+@login_required
+@company_required
+@role_required('business_admin')
+def api_batch_import_status(job_id):
+    """Get progress of a batch import job"""
+    import batch_import
+
+    job = batch_import.get_job(job_id)
+    if not job or job['company_id'] != current_user.current_company_id:
+        return jsonify({'success': False, 'error': 'Job not found'}), 404
+    return jsonify({'success': True, 'job': job})
+
+
 @app.route('/api/import-employees', methods=['POST'])
 @login_required
 def import_employees():
@@ -2010,422 +1836,6 @@ def parse_employee_csv(file):
     return employees
 
 
-def parse_excel_file(file):
-    """Parse Excel file like DLimport.py does"""
-    import openpyxl
-    
-    # Load workbook
-    workbook = openpyxl.load_workbook(file, data_only=True)
-    
-    # Initialize data structure matching DLimport.py
-    data = {
-        'cash': 0.0,
-        'cc_tips': 0.0,
-        'visa': 0.0,
-        'mastercard': 0.0,
-        'amex': 0.0,
-        'discover': 0.0,
-        'liquor': 0.0,
-        'beer': 0.0,
-        'wine': 0.0,
-        'food': 0.0,
-        'voids': 0.0
-    }
-    
-    # Search through all sheets for data
-    for sheet_name in workbook.sheetnames:
-        sheet = workbook[sheet_name]
-        sheet_name_lower = sheet_name.lower()
-        
-        # Parse "Cash activity" sheet - gets actual cash values
-        if "cash" in sheet_name_lower and "activity" in sheet_name_lower:
-            cash_payments, cc_tips = parse_cash_activity_sheet(sheet)
-            if cash_payments is not None:
-                data['cash'] = cash_payments
-            if cc_tips is not None:
-                data['cc_tips'] = abs(cc_tips)  # CC tips are usually negative
-        
-        # Parse "All Data" sheet (fallback if Cash activity not found)
-        elif "all data" in sheet_name_lower and data['cash'] == 0:
-            cash, cc_tips = parse_all_data_sheet(sheet)
-            if cash is not None:
-                data['cash'] = cash
-            if cc_tips is not None:
-                data['cc_tips'] = cc_tips
-        
-        # Parse "Payment Summary" sheet
-        if "payment" in sheet_name_lower and "summary" in sheet_name_lower:
-            visa, mc, amex, disc, tips = parse_payment_summary_sheet(sheet)
-            if visa is not None:
-                data['visa'] = visa
-            if mc is not None:
-                data['mastercard'] = mc
-            if amex is not None:
-                data['amex'] = amex
-            if disc is not None:
-                data['discover'] = disc
-            # Use CC tips from payment summary if not found in cash activity
-            if tips is not None and data['cc_tips'] == 0:
-                data['cc_tips'] = tips
-        
-        # Parse "Sales Category Summary" sheet from "All data"
-        if "all data" in sheet_name_lower:
-            liquor, beer, wine, food = parse_sales_category_sheet(sheet)
-            if liquor is not None:
-                data['liquor'] = liquor
-            if beer is not None:
-                data['beer'] = beer
-            if wine is not None:
-                data['wine'] = wine
-            if food is not None:
-                data['food'] = food
-            
-            # Parse voids from "All data" sheet
-            voids = parse_voids_summary_sheet(sheet)
-            if voids is not None:
-                data['voids'] = voids
-    
-    # Calculate credit total
-    data['credit_total'] = data['visa'] + data['mastercard'] + data['amex'] + data['discover']
-    
-    return data
-
-
-def parse_cash_activity_sheet(sheet):
-    """Parse 'Cash activity' sheet for cash payments and CC tips"""
-    cash_payments = None
-    cc_tips = None
-    
-    try:
-        # Find header row
-        header_row = None
-        for row_idx, row in enumerate(sheet.iter_rows()):
-            for cell in row:
-                if cell.value and isinstance(cell.value, str) and "total cash payment" in cell.value.lower():
-                    header_row = row_idx
-                    break
-            if header_row is not None:
-                break
-        
-        if header_row is None:
-            return None, None
-        
-        # Get column headers and data
-        headers = [cell.value for cell in list(sheet.iter_rows())[header_row]]
-        data_row = list(sheet.iter_rows())[header_row + 1]
-        
-        # Find "Total cash payments" column
-        for idx, header in enumerate(headers):
-            if header and isinstance(header, str):
-                header_lower = header.lower()
-                if "total cash payment" in header_lower:
-                    if idx < len(data_row) and isinstance(data_row[idx].value, (int, float)):
-                        cash_payments = float(data_row[idx].value)
-                
-                # Look for "Credit/non-cash tips"
-                if "credit" in header_lower and "non" in header_lower and "tip" in header_lower:
-                    if idx < len(data_row) and isinstance(data_row[idx].value, (int, float)):
-                        cc_tips = abs(float(data_row[idx].value))  # Get absolute value
-    except Exception as e:
-        print(f"Error parsing Cash activity sheet: {e}")
-    
-    return cash_payments, cc_tips
-
-
-def parse_all_data_sheet(sheet):
-    """Parse 'All Data' sheet for cash and CC tips"""
-    cash = None
-    cc_tips = None
-    
-    try:
-        for row in sheet.iter_rows():
-            for cell in row:
-                if cell.value and isinstance(cell.value, str):
-                    cell_lower = cell.value.lower()
-                    
-                    # Look for "Cash" row
-                    if "cash" in cell_lower and "total" not in cell_lower:
-                        # Amount should be in next cell or same row
-                        for check_cell in row:
-                            if check_cell != cell and isinstance(check_cell.value, (int, float)):
-                                if cash is None:
-                                    cash = float(check_cell.value)
-                                break
-                    
-                    # Look for "CC Tips" or "Credit Card Tips"
-                    if ("cc" in cell_lower or "credit card" in cell_lower) and "tip" in cell_lower:
-                        for check_cell in row:
-                            if check_cell != cell and isinstance(check_cell.value, (int, float)):
-                                if cc_tips is None:
-                                    cc_tips = float(check_cell.value)
-                                break
-    except Exception as e:
-        print(f"Error parsing All Data sheet: {e}")
-    
-    return cash, cc_tips
-
-
-def parse_payment_summary_sheet(sheet):
-    """Parse 'Payment Summary' sheet for card types and tips"""
-    visa = None
-    mastercard = None
-    amex = None
-    discover = None
-    total_tips = None
-    
-    try:
-        # Find header row
-        header_row = None
-        headers = []
-        for row_idx, row in enumerate(sheet.iter_rows()):
-            row_values = [cell.value for cell in row]
-            if any(val and isinstance(val, str) and "payment sub type" in val.lower() for val in row_values):
-                header_row = row_idx
-                headers = row_values
-                break
-        
-        if header_row is None:
-            return None, None, None, None, None
-        
-        # Find column indices
-        subtype_col = None
-        amount_col = None
-        tips_col = None
-        
-        for idx, header in enumerate(headers):
-            if header and isinstance(header, str):
-                header_lower = header.lower()
-                if "payment sub type" in header_lower:
-                    subtype_col = idx
-                elif header_lower == "amount":
-                    amount_col = idx
-                elif "tips" in header_lower and "grat" not in header_lower:
-                    tips_col = idx
-        
-        # Parse data rows
-        for row in list(sheet.iter_rows())[header_row + 1:]:
-            row_values = [cell.value for cell in row]
-            
-            # Get payment sub type and amount
-            if subtype_col is not None and subtype_col < len(row_values):
-                subtype = row_values[subtype_col]
-                
-                if subtype and isinstance(subtype, str):
-                    subtype_lower = subtype.lower()
-                    
-                    # Get amount from Amount column
-                    if amount_col is not None and amount_col < len(row_values):
-                        amount = row_values[amount_col]
-                        
-                        if isinstance(amount, (int, float)) and amount > 0:
-                            if "visa" in subtype_lower:
-                                visa = float(amount)
-                            elif "mastercard" in subtype_lower:
-                                mastercard = float(amount)
-                            elif "amex" in subtype_lower:
-                                amex = float(amount)
-                            elif "discover" in subtype_lower:
-                                discover = float(amount)
-            
-            # Get total tips from Credit/debit row
-            payment_type = row_values[0] if len(row_values) > 0 else None
-            if payment_type and isinstance(payment_type, str) and "credit/debit" in payment_type.lower():
-                if subtype_col is not None and subtype_col < len(row_values):
-                    # This is the total Credit/debit row (Payment sub type is NaN)
-                    subtype_val = row_values[subtype_col]
-                    if subtype_val is None or (isinstance(subtype_val, float) and str(subtype_val) == 'nan'):
-                        if tips_col is not None and tips_col < len(row_values):
-                            tips_val = row_values[tips_col]
-                            if isinstance(tips_val, (int, float)):
-                                total_tips = float(tips_val)
-    except Exception as e:
-        print(f"Error parsing Payment Summary sheet: {e}")
-    
-    return visa, mastercard, amex, discover, total_tips
-
-
-def parse_sales_category_sheet(sheet):
-    """Parse 'All data' sheet for sales by category with Net sales column"""
-    liquor = None
-    beer = None
-    wine = None
-    food = None
-    
-    try:
-        # Find the "Sales category summary" section header
-        header_row_idx = None
-        for row_idx, row in enumerate(sheet.iter_rows()):
-            for cell in row:
-                if cell.value and isinstance(cell.value, str) and "sales category summary" in cell.value.lower():
-                    header_row_idx = row_idx
-                    break
-            if header_row_idx is not None:
-                break
-        
-        if header_row_idx is None:
-            return None, None, None, None
-        
-        # Find the column headers row (next row after section header)
-        rows_list = list(sheet.iter_rows())
-        column_headers_row = rows_list[header_row_idx + 1] if header_row_idx + 1 < len(rows_list) else None
-        
-        if column_headers_row is None:
-            return None, None, None, None
-        
-        # Find "Net sales" column index
-        net_sales_col_idx = None
-        for idx, cell in enumerate(column_headers_row):
-            if cell.value and isinstance(cell.value, str) and "net sales" in cell.value.lower():
-                net_sales_col_idx = idx
-                break
-        
-        if net_sales_col_idx is None:
-            return None, None, None, None
-        
-        # Parse data rows starting from header_row_idx + 2
-        for row_idx in range(header_row_idx + 2, len(rows_list)):
-            row = rows_list[row_idx]
-            
-            # First column has category name
-            category_cell = row[0]
-            if not category_cell.value or not isinstance(category_cell.value, str):
-                continue
-            
-            category = category_cell.value.lower()
-            
-            # Check if we've reached the end of this section (Total row or empty)
-            if "total" in category or category.strip() == "":
-                break
-            
-            # Get Net sales value
-            if net_sales_col_idx < len(row):
-                net_sales_cell = row[net_sales_col_idx]
-                if isinstance(net_sales_cell.value, (int, float)):
-                    amount = float(net_sales_cell.value)
-                    
-                    # Categorize by name
-                    if "beer" in category:
-                        beer = amount
-                    elif "liquor" in category or "spirits" in category:
-                        liquor = amount
-                    elif "wine" in category:
-                        wine = amount
-                    elif "food" in category:
-                        food = amount
-    except Exception as e:
-        print(f"Error parsing Sales category summary section: {e}")
-    
-    return liquor, beer, wine, food
-
-
-def parse_voids_summary_sheet(sheet):
-    """Parse voids from All data sheet - void summary section"""
-    voids = 0.0
-    
-    try:
-        # Search for "void amount" anywhere in the sheet
-        void_amount_row = None
-        for row in sheet.iter_rows(values_only=False):
-            for cell in row:
-                if cell.value and isinstance(cell.value, str):
-                    if "void amount" in cell.value.lower():
-                        void_amount_row = cell.row
-                        print(f"Found 'void amount' at row {cell.row}")
-                        break
-            if void_amount_row is not None:
-                break
-        
-        if void_amount_row is None:
-            print("'void amount' text not found in sheet")
-            return voids
-        
-        # Get the value from column B of the same row
-        void_cell = sheet.cell(row=void_amount_row, column=2)  # Column B = 2
-        print(f"Void cell at row {void_amount_row}, column B: value={void_cell.value}, type={type(void_cell.value)}")
-        
-        if void_cell.value:
-            if isinstance(void_cell.value, (int, float)):
-                voids = abs(float(void_cell.value))
-                print(f"Parsed void amount: {voids}")
-            else:
-                # Try to convert string to float
-                try:
-                    voids = abs(float(str(void_cell.value).replace('$', '').replace(',', '').strip()))
-                    print(f"Parsed void amount from string: {voids}")
-                except:
-                    print(f"Could not convert void value to number: {void_cell.value}")
-    
-    except Exception as e:
-        print(f"Error parsing Void summary section: {e}")
-        import traceback
-        traceback.print_exc()
-    
-    return voids
-
-
-def parse_csv_file(file):
-    """Parse CSV file with simple structure"""
-    import csv
-    from io import StringIO
-    
-    data = {
-        'employees': [],
-        'cash_sales': 0.0,
-        'visa': 0.0,
-        'mastercard': 0.0,
-        'amex': 0.0,
-        'other_income': 0.0
-    }
-    
-    try:
-        content = file.read().decode('utf-8')
-        reader = csv.reader(StringIO(content))
-        
-        section = None
-        for row in reader:
-            if not row or all(not cell.strip() for cell in row):
-                continue
-            
-            # Detect sections
-            if row[0].strip().lower() == 'employee hours':
-                section = 'employees'
-                continue
-            elif row[0].strip().lower() == 'sales summary':
-                section = 'sales'
-                continue
-            
-            # Parse data based on section
-            if section == 'employees' and len(row) >= 2:
-                try:
-                    name = row[0].strip()
-                    hours = float(row[1].strip())
-                    data['employees'].append({'name': name, 'hours': hours})
-                except ValueError:
-                    pass
-            
-            elif section == 'sales' and len(row) >= 2:
-                key = row[0].strip().lower()
-                try:
-                    value = float(row[1].strip())
-                    if 'cash' in key:
-                        data['cash_sales'] = value
-                    elif 'visa' in key:
-                        data['visa'] = value
-                    elif 'mastercard' in key:
-                        data['mastercard'] = value
-                    elif 'amex' in key:
-                        data['amex'] = value
-                    elif 'other' in key or 'income' in key:
-                        data['other_income'] = value
-                except ValueError:
-                    pass
-    
-    except Exception as e:
-        raise Exception(f"CSV parsing error: {str(e)}")
-    
-    return data
-
-
 # ==================== ERROR HANDLERS ====================
 
 @app.errorhandler(404)
@@ -2463,12 +1873,12 @@ def employee_profile(company_id, filename):
     base_dir = os.path.dirname(os.path.abspath(__file__))
     emp_dir = os.path.join(base_dir, 'company_data', company_id, 'employees')
     filepath = os.path.join(emp_dir, filename)
-    print(f"[DEBUG] Absolute file path: {filepath}")
+    log.debug("Employee file path: %s", filepath)
     if not filename.endswith('.json') or '/' in filename or '\\' in filename:
         flash('Invalid file request.', 'danger')
         return redirect(url_for('employees'))
     if not os.path.exists(filepath):
-        print(f"[ERROR] Employee file not found at: {filepath}")
+        log.warning("Employee file not found at: %s", filepath)
         flash('Employee file not found.', 'danger')
         return redirect(url_for('employees'))
     with open(filepath, 'r') as f:
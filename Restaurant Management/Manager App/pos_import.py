@@ -0,0 +1,421 @@
+"""
+POS export parsers for the Manager App web version
+Extracts sales, payment and tip totals from Toast-style Excel/CSV exports
+"""
+import logging
+
+log = logging.getLogger(__name__)
+
+
+def parse_excel_file(file):
+    """Parse Excel file like DLimport.py does"""
+    import openpyxl
+    
+    # Load workbook
+    workbook = openpyxl.load_workbook(file, data_only=True)
+    
+    # Initialize data structure matching DLimport.py
+    data = {
+        'cash': 0.0,
+        'cc_tips': 0.0,
+        'visa': 0.0,
+        'mastercard': 0.0,
+        'amex': 0.0,
+        'discover': 0.0,
+        'liquor': 0.0,
+        'beer': 0.0,
+        'wine': 0.0,
+        'food': 0.0,
+        'voids': 0.0
+    }
+    
+    # Search through all sheets for data
+    for sheet_name in workbook.sheetnames:
+        sheet = workbook[sheet_name]
+        sheet_name_lower = sheet_name.lower()
+        
+        # Parse "Cash activity" sheet - gets actual cash values
+        if "cash" in sheet_name_lower and "activity" in sheet_name_lower:
+            cash_payments, cc_tips = parse_cash_activity_sheet(sheet)
+            if cash_payments is not None:
+                data['cash'] = cash_payments
+            if cc_tips is not None:
+                data['cc_tips'] = abs(cc_tips)  # CC tips are usually negative
+        
+        # Parse "All Data" sheet (fallback if Cash activity not found)
+        elif "all data" in sheet_name_lower and data['cash'] == 0:
+            cash, cc_tips = parse_all_data_sheet(sheet)
+            if cash is not None:
+                data['cash'] = cash
+            if cc_tips is not None:
+                data['cc_tips'] = cc_tips
+        
+        # Parse "Payment Summary" sheet
+        if "payment" in sheet_name_lower and "summary" in sheet_name_lower:
+            visa, mc, amex, disc, tips = parse_payment_summary_sheet(sheet)
+            if visa is not None:
+                data['visa'] = visa
+            if mc is not None:
+                data['mastercard'] = mc
+            if amex is not None:
+                data['amex'] = amex
+            if disc is not None:
+                data['discover'] = disc
+            # Use CC tips from payment summary if not found in cash activity
+            if tips is not None and data['cc_tips'] == 0:
+                data['cc_tips'] = tips
+        
+        # Parse "Sales Category Summary" sheet from "All data"
+        if "all data" in sheet_name_lower:
+            liquor, beer, wine, food = parse_sales_category_sheet(sheet)
+            if liquor is not None:
+                data['liquor'] = liquor
+            if beer is not None:
+                data['beer'] = beer
+            if wine is not None:
+                data['wine'] = wine
+            if food is not None:
+                data['food'] = food
+            
+            # Parse voids from "All data" sheet
+            voids = parse_voids_summary_sheet(sheet)
+            if voids is not None:
+                data['voids'] = voids
+    
+    # Calculate credit total
+    data['credit_total'] = data['visa'] + data['mastercard'] + data['amex'] + data['discover']
+    
+    return data
+
+
+def parse_cash_activity_sheet(sheet):
+    """Parse 'Cash activity' sheet for cash payments and CC tips"""
+    cash_payments = None
+    cc_tips = None
+    
+    try:
+        # Find header row
+        header_row = None
+        for row_idx, row in enumerate(sheet.iter_rows()):
+            for cell in row:
+                if cell.value and isinstance(cell.value, str) and "total cash payment" in cell.value.lower():
+                    header_row = row_idx
+                    break
+            if header_row is not None:
+                break
+        
+        if header_row is None:
+            return None, None
+        
+        # Get column headers and data
+        headers = [cell.value for cell in list(sheet.iter_rows())[header_row]]
+        data_row = list(sheet.iter_rows())[header_row + 1]
+        
+        # Find "Total cash payments" column
+        for idx, header in enumerate(headers):
+            if header and isinstance(header, str):
+                header_lower = header.lower()
+                if "total cash payment" in header_lower:
+                    if idx < len(data_row) and isinstance(data_row[idx].value, (int, float)):
+                        cash_payments = float(data_row[idx].value)
+                
+                # Look for "Credit/non-cash tips"
+                if "credit" in header_lower and "non" in header_lower and "tip" in header_lower:
+                    if idx < len(data_row) and isinstance(data_row[idx].value, (int, float)):
+                        cc_tips = abs(float(data_row[idx].value))  # Get absolute value
+    except Exception as e:
+        log.warning("Error parsing Cash activity sheet: %s", e)
+    
+    return cash_payments, cc_tips
+
+
+def parse_all_data_sheet(sheet):
+    """Parse 'All Data' sheet for cash and CC tips"""
+    cash = None
+    cc_tips = None
+    
+    try:
+        for row in sheet.iter_rows():
+            for cell in row:
+                if cell.value and isinstance(cell.value, str):
+                    cell_lower = cell.value.lower()
+                    
+                    # Look for "Cash" row
+                    if "cash" in cell_lower and "total" not in cell_lower:
+                        # Amount should be in next cell or same row
+                        for check_cell in row:
+                            if check_cell != cell and isinstance(check_cell.value, (int, float)):
+                                if cash is None:
+                                    cash = float(check_cell.value)
+                                break
+                    
+                    # Look for "CC Tips" or "Credit Card Tips"
+                    if ("cc" in cell_lower or "credit card" in cell_lower) and "tip" in cell_lower:
+                        for check_cell in row:
+                            if check_cell != cell and isinstance(check_cell.value, (int, float)):
+                                if cc_tips is None:
+                                    cc_tips = float(check_cell.value)
+                                break
+    except Exception as e:
+        log.warning("Error parsing All Data sheet: %s", e)
+    
+    return cash, cc_tips
+
+
+def parse_payment_summary_sheet(sheet):
+    """Parse 'Payment Summary' sheet for card types and tips"""
+    visa = None
+    mastercard = None
+    amex = None
+    discover = None
+    total_tips = None
+    
+    try:
+        # Find header row
+        header_row = None
+        headers = []
+        for row_idx, row in enumerate(sheet.iter_rows()):
+            row_values = [cell.value for cell in row]
+            if any(val and isinstance(val, str) and "payment sub type" in val.lower() for val in row_values):
+                header_row = row_idx
+                headers = row_values
+                break
+        
+        if header_row is None:
+            return None, None, None, None, None
+        
+        # Find column indices
+        subtype_col = None
+        amount_col = None
+        tips_col = None
+        
+        for idx, header in enumerate(headers):
+            if header and isinstance(header, str):
+                header_lower = header.lower()
+                if "payment sub type" in header_lower:
+                    subtype_col = idx
+                elif header_lower == "amount":
+                    amount_col = idx
+                elif "tips" in header_lower and "grat" not in header_lower:
+                    tips_col = idx
+        
+        # Parse data rows
+        for row in list(sheet.iter_rows())[header_row + 1:]:
+            row_values = [cell.value for cell in row]
+            
+            # Get payment sub type and amount
+            if subtype_col is not None and subtype_col < len(row_values):
+                subtype = row_values[subtype_col]
+                
+                if subtype and isinstance(subtype, str):
+                    subtype_lower = subtype.lower()
+                    
+                    # Get amount from Amount column
+                    if amount_col is not None and amount_col < len(row_values):
+                        amount = row_values[amount_col]
+                        
+                        if isinstance(amount, (int, float)) and amount > 0:
+                            if "visa" in subtype_lower:
+                                visa = float(amount)
+                            elif "mastercard" in subtype_lower:
+                                mastercard = float(amount)
+                            elif "amex" in subtype_lower:
+                                amex = float(amount)
+                            elif "discover" in subtype_lower:
+                                discover = float(amount)
+            
+            # Get total tips from Credit/debit row
+            payment_type = row_values[0] if len(row_values) > 0 else None
+            if payment_type and isinstance(payment_type, str) and "credit/debit" in payment_type.lower():
+                if subtype_col is not None and subtype_col < len(row_values):
+                    # This is the total Credit/debit row (Payment sub type is NaN)
+                    subtype_val = row_values[subtype_col]
+                    if subtype_val is None or (isinstance(subtype_val, float) and str(subtype_val) == 'nan'):
+                        if tips_col is not None and tips_col < len(row_values):
+                            tips_val = row_values[tips_col]
+                            if isinstance(tips_val, (int, float)):
+                                total_tips = float(tips_val)
+    except Exception as e:
+        log.warning("Error parsing Payment Summary sheet: %s", e)
+    
+    return visa, mastercard, amex, discover, total_tips
+
+
+def parse_sales_category_sheet(sheet):
+    """Parse 'All data' sheet for sales by category with Net sales column"""
+    liquor = None
+    beer = None
+    wine = None
+    food = None
+    
+    try:
+        # Find the "Sales category summary" section header
+        header_row_idx = None
+        for row_idx, row in enumerate(sheet.iter_rows()):
+            for cell in row:
+                if cell.value and isinstance(cell.value, str) and "sales category summary" in cell.value.lower():
+                    header_row_idx = row_idx
+                    break
+            if header_row_idx is not None:
+                break
+        
+        if header_row_idx is None:
+            return None, None, None, None
+        
+        # Find the column headers row (next row after section header)
+        rows_list = list(sheet.iter_rows())
+        column_headers_row = rows_list[header_row_idx + 1] if header_row_idx + 1 < len(rows_list) else None
+        
+        if column_headers_row is None:
+            return None, None, None, None
+        
+        # Find "Net sales" column index
+        net_sales_col_idx = None
+        for idx, cell in enumerate(column_headers_row):
+            if cell.value and isinstance(cell.value, str) and "net sales" in cell.value.lower():
+                net_sales_col_idx = idx
+                break
+        
+        if net_sales_col_idx is None:
+            return None, None, None, None
+        
+        # Parse data rows starting from header_row_idx + 2
+        for row_idx in range(header_row_idx + 2, len(rows_list)):
+            row = rows_list[row_idx]
+            
+            # First column has category name
+            category_cell = row[0]
+            if not category_cell.value or not isinstance(category_cell.value, str):
+                continue
+            
+            category = category_cell.value.lower()
+            
+            # Check if we've reached the end of this section (Total row or empty)
+            if "total" in category or category.strip() == "":
+                break
+            
+            # Get Net sales value
+            if net_sales_col_idx < len(row):
+                net_sales_cell = row[net_sales_col_idx]
+                if isinstance(net_sales_cell.value, (int, float)):
+                    amount = float(net_sales_cell.value)
+                    
+                    # Categorize by name
+                    if "beer" in category:
+                        beer = amount
+                    elif "liquor" in category or "spirits" in category:
+                        liquor = amount
+                    elif "wine" in category:
+                        wine = amount
+                    elif "food" in category:
+                        food = amount
+    except Exception as e:
+        log.warning("Error parsing Sales category summary section: %s", e)
+    
+    return liquor, beer, wine, food
+
+
+def parse_voids_summary_sheet(sheet):
+    """Parse voids from All data sheet - void summary section"""
+    voids = 0.0
+    
+    try:
+        # Search for "void amount" anywhere in the sheet
+        void_amount_row = None
+        for row in sheet.iter_rows(values_only=False):
+            for cell in row:
+                if cell.value and isinstance(cell.value, str):
+                    if "void amount" in cell.value.lower():
+                        void_amount_row = cell.row
+                        log.debug("Found 'void amount' at row %d", cell.row)
+                        break
+            if void_amount_row is not None:
+                break
+        
+        if void_amount_row is None:
+            log.debug("'void amount' text not found in sheet")
+            return voids
+        
+        # Get the value from column B of the same row
+        void_cell = sheet.cell(row=void_amount_row, column=2)  # Column B = 2
+        log.debug("Void cell at row %d, column B: value=%r", void_amount_row, void_cell.value)
+        
+        if void_cell.value:
+            if isinstance(void_cell.value, (int, float)):
+                voids = abs(float(void_cell.value))
+                log.debug("Parsed void amount: %s", voids)
+            else:
+                # Try to convert string to float
+                try:
+                    voids = abs(float(str(void_cell.value).replace('$', '').replace(',', '').strip()))
+                    log.debug("Parsed void amount from string: %s", voids)
+                except:
+                    log.warning("Could not convert void value to number: %r", void_cell.value)
+    
+    except Exception as e:
+        log.exception("Error parsing Void summary section")
+    
+    return voids
+
+
+def parse_csv_file(file):
+    """Parse CSV file with simple structure"""
+    import csv
+    from io import StringIO
+    
+    data = {
+        'employees': [],
+        'cash_sales': 0.0,
+        'visa': 0.0,
+        'mastercard': 0.0,
+        'amex': 0.0,
+        'other_income': 0.0
+    }
+    
+    try:
+        content = file.read().decode('utf-8')
+        reader = csv.reader(StringIO(content))
+        
+        section = None
+        for row in reader:
+            if not row or all(not cell.strip() for cell in row):
+                continue
+            
+            # Detect sections
+            if row[0].strip().lower() == 'employee hours':
+                section = 'employees'
+                continue
+            elif row[0].strip().lower() == 'sales summary':
+                section = 'sales'
+                continue
+            
+            # Parse data based on section
+            if section == 'employees' and len(row) >= 2:
+                try:
+                    name = row[0].strip()
+                    hours = float(row[1].strip())
+                    data['employees'].append({'name': name, 'hours': hours})
+                except ValueError:
+                    pass
+            
+            elif section == 'sales' and len(row) >= 2:
+                key = row[0].strip().lower()
+                try:
+                    value = float(row[1].strip())
+                    if 'cash' in key:
+                        data['cash_sales'] = value
+                    elif 'visa' in key:
+                        data['visa'] = value
+                    elif 'mastercard' in key:
+                        data['mastercard'] = value
+                    elif 'amex' in key:
+                        data['amex'] = value
+                    elif 'other' in key or 'income' in key:
+                        data['other_income'] = value
+                except ValueError:
+                    pass
+    
+    except Exception as e:
+        raise Exception(f"CSV parsing error: {str(e)}")
+    
+    return data
@@ -0,0 +1,313 @@
+#!/usr/bin/env python3
+"""
+Rate limiting backends for the Manager App
+Sliding-window counters with O(1) work per check, in memory (LRU-bounded)
+or in a shared SQLite file so limits hold across worker processes
+"""
+import os
+import sys
+import time
+import sqlite3
+import argparse
+import threading
+from collections import OrderedDict
+
+DEFAULT_MAX_KEYS = 100000   # Memory backend: least recently used keys beyond this are evicted
+DEFAULT_MAX_IDLE = 86400    # SQLite backend: rows idle this many seconds are pruned
+PRUNE_EVERY = 10000         # SQLite backend: prune idle rows every N writes
+
+
+def _roll(window_start, previous, current, window, now):
+    """Advance a counter to the window containing now
+
+    Returns (window_start, previous, current, estimate) where estimate is
+    the sliding-window count: the previous window's hits weighted by how
+    much of it still overlaps the last `window` seconds, plus this window's.
+    """
+    start = now - (now % window)
+    if window_start != start:
+        previous = current if window_start == start - window else 0
+        current = 0
+        window_start = start
+    estimate = previous * (window - (now - start)) / window + current
+    return window_start, previous, current, estimate
+
+
+class MemoryBackend:
+    """Per-process counters, evicting the least recently used key when full"""
+
+    def __init__(self, max_keys=DEFAULT_MAX_KEYS):
+        self.max_keys = max_keys
+        self._counters = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._counters)
+
+    def hit(self, key, limit, window, now, cost=1):
+        """Count a hit if it fits under limit; returns (allowed, count)"""
+        with self._lock:
+            state = self._counters.get(key)
+            if state is None:
+                state = (0, 0, 0)
+                if len(self._counters) >= self.max_keys:
+                    self._counters.popitem(last=False)
+            else:
+                self._counters.move_to_end(key)
+
+            start, previous, current, estimate = _roll(*state, window, now)
+            allowed = estimate + cost <= limit
+            if allowed:
+                current += cost
+                estimate += cost
+            self._counters[key] = (start, previous, current)
+        return allowed, estimate
+
+    def get(self, key, window, now):
+        """Current sliding-window count for a key"""
+        with self._lock:
+            state = self._counters.get(key)
+        if state is None:
+            return 0
+        return _roll(*state, window, now)[3]
+
+    def clear(self, key):
+        with self._lock:
+            self._counters.pop(key, None)
+
+
+class SQLiteBackend:
+    """Counters in a SQLite file shared by every process that opens it
+
+    Each check is one short IMMEDIATE transaction on a per-thread
+    connection. Keys idle longer than max_idle seconds are pruned.
+    """
+
+    def __init__(self, db_path, max_idle=DEFAULT_MAX_IDLE):
+        self.db_path = db_path
+        self.max_idle = max_idle
+        self._local = threading.local()
+        self._writes = 0
+        os.makedirs(os.path.dirname(os.path.abspath(db_path)), exist_ok=True)
+        conn = self._connection()
+        conn.execute('''
+            CREATE TABLE IF NOT EXISTS rate_limits (
+                key TEXT PRIMARY KEY,
+                window_start REAL NOT NULL,
+                previous REAL NOT NULL,
+                current REAL NOT NULL,
+                updated_at REAL NOT NULL
+            )
+        ''')
+        conn.execute('CREATE INDEX IF NOT EXISTS idx_rate_limits_updated ON rate_limits(updated_at)')
+
+    def _connection(self):
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            # Autocommit mode; transactions are opened explicitly
+            conn = sqlite3.connect(self.db_path, timeout=30.0, isolation_level=None, check_same_thread=False)
+            conn.execute('PRAGMA journal_mode=WAL')
+            conn.execute('PRAGMA synchronous=NORMAL')
+            conn.execute('PRAGMA busy_timeout=30000')
+            self._local.conn = conn
+        return conn
+
+    def hit(self, key, limit, window, now, cost=1):
+        """Count a hit if it fits under limit; returns (allowed, count)"""
+        conn = self._connection()
+        conn.execute('BEGIN IMMEDIATE')
+        try:
+            row = conn.execute(
+                'SELECT window_start, previous, current FROM rate_limits WHERE key = ?', (key,)
+            ).fetchone()
+            start, previous, current, estimate = _roll(*(row or (0, 0, 0)), window, now)
+            allowed = estimate + cost <= limit
+            if allowed:
+                current += cost
+                estimate += cost
+            conn.execute('''
+                INSERT INTO rate_limits (key, window_start, previous, current, updated_at)
+                VALUES (?, ?, ?, ?, ?)
+                ON CONFLICT(key) DO UPDATE SET window_start = excluded.window_start,
+                    previous = excluded.previous, current = excluded.current,
+                    updated_at = excluded.updated_at
+            ''', (key, start, previous, current, now))
+            conn.execute('COMMIT')
+        except BaseException:
+            conn.execute('ROLLBACK')
+            raise
+
+        self._writes += 1
+        if self._writes >= PRUNE_EVERY:
+            self._writes = 0
+            self.prune(now)
+        return allowed, estimate
+
+    def get(self, key, window, now):
+        """Current sliding-window count for a key"""
+        row = self._connection().execute(
+            'SELECT window_start, previous, current FROM rate_limits WHERE key = ?', (key,)
+        ).fetchone()
+        if row is None:
+            return 0
+        return _roll(*row, window, now)[3]
+
+    def clear(self, key):
+        self._connection().execute('DELETE FROM rate_limits WHERE key = ?', (key,))
+
+    def prune(self, now=None):
+        """Delete keys idle longer than max_idle; returns rows deleted"""
+        now = time.time() if now is None else now
+        cursor = self._connection().execute(
+            'DELETE FROM rate_limits WHERE updated_at < ?', (now - self.max_idle,)
+        )
+        return cursor.rowcount
+
+
+class SlidingWindowLimiter:
+    """Sliding-window rate limiter over a memory or SQLite backend"""
+
+    def __init__(self, backend=None, clock=time.time):
+        self.backend = backend if backend is not None else MemoryBackend()
+        self.clock = clock
+
+    def hit(self, key, limit, window_seconds, cost=1):
+        """Record a hit; returns False (and records nothing) if over the limit"""
+        return self.backend.hit(key, limit, window_seconds, self.clock(), cost)[0]
+
+    def remaining(self, key, limit, window_seconds):
+        """Hits still allowed in the current window"""
+        count = self.backend.get(key, window_seconds, self.clock())
+        return max(0, int(limit - count))
+
+    def clear(self, key):
+        """Forget all hits for a key"""
+        self.backend.clear(key)
+
+
+# ==================== FLASK-LIMITER STORAGE ====================
+
+try:
+    from limits.storage import Storage
+except ImportError:  # Desktop installs don't ship Flask-Limiter
+    Storage = None
+
+if Storage is not None:
+    class SQLiteLimitStorage(Storage):
+        """Fixed-window counter storage for Flask-Limiter in a SQLite file
+
+        Registered for sqlite:// URIs, e.g.
+        Limiter(..., storage_uri="sqlite:////path/to/rate_limits.db")
+        """
+
+        STORAGE_SCHEME = ['sqlite']
+
+        def __init__(self, uri=None, wrap_exceptions=False, **options):
+            super().__init__(uri, wrap_exceptions=wrap_exceptions, **options)
+            self.db_path = uri.split('://', 1)[1]
+            self._local = threading.local()
+            os.makedirs(os.path.dirname(os.path.abspath(self.db_path)), exist_ok=True)
+            self._connection().execute('''
+                CREATE TABLE IF NOT EXISTS limit_counters (
+                    key TEXT PRIMARY KEY,
+                    count INTEGER NOT NULL,
+                    expires_at REAL NOT NULL
+                )
+            ''')
+
+        @property
+        def base_exceptions(self):
+            return sqlite3.Error
+
+        def _connection(self):
+            conn = getattr(self._local, 'conn', None)
+            if conn is None:
+                conn = sqlite3.connect(self.db_path, timeout=30.0, isolation_level=None, check_same_thread=False)
+                conn.execute('PRAGMA journal_mode=WAL')
+                conn.execute('PRAGMA synchronous=NORMAL')
+                conn.execute('PRAGMA busy_timeout=30000')
+                self._local.conn = conn
+            return conn
+
+        def incr(self, key, expiry, elastic_expiry=False, amount=1):
+            now = time.time()
+            conn = self._connection()
+            conn.execute('BEGIN IMMEDIATE')
+            try:
+                # Expired windows restart at amount; live ones keep their expiry
+                conn.execute('''
+                    INSERT INTO limit_counters (key, count, expires_at) VALUES (?, ?, ?)
+                    ON CONFLICT(key) DO UPDATE SET
+                        count = CASE WHEN expires_at <= ? THEN excluded.count ELSE count + excluded.count END,
+                        expires_at = CASE WHEN expires_at <= ? OR ? THEN excluded.expires_at ELSE expires_at END
+                ''', (key, amount, now + expiry, now, now, bool(elastic_expiry)))
+                count = conn.execute('SELECT count FROM limit_counters WHERE key = ?', (key,)).fetchone()[0]
+                conn.execute('COMMIT')
+            except BaseException:
+                conn.execute('ROLLBACK')
+                raise
+            return count
+
+        def get(self, key):
+            row = self._connection().execute(
+                'SELECT count FROM limit_counters WHERE key = ? AND expires_at > ?', (key, time.time())
+            ).fetchone()
+            return row[0] if row else 0
+
+        def get_expiry(self, key):
+            row = self._connection().execute(
+                'SELECT expires_at FROM limit_counters WHERE key = ?', (key,)
+            ).fetchone()
+            return row[0] if row else time.time()
+
+        def check(self):
+            try:
+                self._connection().execute('SELECT 1')
+                return True
+            except sqlite3.Error:
+                return False
+
+        def reset(self):
+            return self._connection().execute('DELETE FROM limit_counters').rowcount
+
+        def clear(self, key):
+            self._connection().execute('DELETE FROM limit_counters WHERE key = ?', (key,))
+
+
+# ==================== BENCHMARK ====================
+
+def benchmark(checks, keys, backend, limit=100, window=60):
+    """Time `checks` hits spread over `keys` keys; returns checks per second"""
+    limiter = SlidingWindowLimiter(backend)
+    names = [f"user{i}:login" for i in range(keys)]
+    start = time.perf_counter()
+    for i in range(checks):
+        limiter.hit(names[i % keys], limit, window)
+    return checks / (time.perf_counter() - start)
+
+
+def main(argv=None):
+    import tempfile
+
+    parser = argparse.ArgumentParser(description='Rate limiter micro-benchmark')
+    parser.add_argument('--checks', type=int, default=2000000, help='Checks against the memory backend')
+    parser.add_argument('--keys', type=int, default=50000, help='Distinct user:action keys')
+    parser.add_argument('--max-keys', type=int, default=DEFAULT_MAX_KEYS, help='Memory backend LRU capacity')
+    parser.add_argument('--sqlite-checks', type=int, default=50000, help='Checks against the SQLite backend (0 to skip)')
+    args = parser.parse_args(argv)
+
+    memory = MemoryBackend(max_keys=args.max_keys)
+    rate = benchmark(args.checks, args.keys, memory)
+    print(f"memory: {args.checks:,} checks over {args.keys:,} keys -> {rate:,.0f} checks/s "
+          f"({1e6 / rate:.2f} µs/check), {len(memory):,} keys held")
+
+    if args.sqlite_checks:
+        with tempfile.TemporaryDirectory() as tmp:
+            rate = benchmark(args.sqlite_checks, args.keys, SQLiteBackend(os.path.join(tmp, 'rate_limits.db')))
+        print(f"sqlite: {args.sqlite_checks:,} checks over {args.keys:,} keys -> {rate:,.0f} checks/s "
+              f"({1e6 / rate:.2f} µs/check)")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -1,10 +1,11 @@
 import os
-import csv
 import tkinter as tk
 from tkinter import ttk, messagebox, Canvas, Scrollbar
-from datetime import datetime, timedelta
+from datetime import datetime
 from tkcalendar import DateEntry
 
+from analytics import PerformanceReport
+
 OUT_DIR = os.path.expanduser("~/Documents/AIO Python/daily_logs")
 
 class ReportApp(tk.Tk):
@@ -63,34 +64,7 @@ class ReportApp(tk.Tk):
     
     def _load_employees(self):
         """Load unique employee names from daily log files"""
-        employees = set()
-        
-        if not os.path.exists(OUT_DIR):
-            return sorted(list(employees))
-        
-        for filename in os.listdir(OUT_DIR):
-            if filename.endswith('.csv') and not filename.endswith('_CashDeductions.csv'):
-                filepath = os.path.join(OUT_DIR, filename)
-                try:
-                    with open(filepath, 'r', encoding='utf-8') as f:
-                        reader = csv.reader(f)
-                        lines = list(reader)
-                        
-                        # Find "Employee Entries" section
-                        for i, row in enumerate(lines):
-                            if row and row[0] == "Employee Entries":
-                                # Next row is header, skip it
-                                # Following rows are employee data
-                                for j in range(i + 2, len(lines)):
-                                    if lines[j] and lines[j][0]:
-                                        name = lines[j][0].strip()
-                                        if name and name != "Name":
-                                            employees.add(name)
-                                break
-                except Exception:
-                    pass
-        
-        return sorted(list(employees))
+        return PerformanceReport.from_logs(OUT_DIR).employees
     
     def _build_filters(self):
         """Build filter section"""
@@ -247,105 +221,30 @@ class ReportApp(tk.Tk):
             messagebox.showerror("Error", "From date must be before To date")
             return
         
-        # Collect data
-        report_data = []
-        current_date = from_date
-        
-        while current_date <= to_date:
-            date_str = current_date.strftime("%Y-%m-%d")
-            
-            # Check both shifts if "All Shifts" selected
-            shifts_to_check = ["Day", "Night"] if shift == "All Shifts" else [shift]
-            
-            for shift_name in shifts_to_check:
-                filename = f"{date_str}_{shift_name}.csv"
-                filepath = os.path.join(OUT_DIR, filename)
-                
-                if os.path.exists(filepath):
-                    data = self._parse_log_file(filepath, employee)
-                    report_data.extend(data)
-            
-            current_date += timedelta(days=1)
+        # Load every entry in the range in one pass
+        report = PerformanceReport.from_logs(OUT_DIR, from_date, to_date).filter(
+            employee=None if employee == "All Employees" else employee,
+            log_shift=None if shift == "All Shifts" else shift
+        )
         
         # Display results
-        self._display_report(report_data)
+        self._display_report(report)
         
         # Enable export button if we have data
-        if report_data:
+        if len(report):
             self.export_btn.config(state="normal")
-            self.current_report_data = report_data
+            self.current_report = report
         else:
             self.export_btn.config(state="disabled")
-            self.current_report_data = []
+            self.current_report = None
     
-    def _parse_log_file(self, filepath, employee_filter):
-        """Parse a daily log file and extract employee data"""
-        data = []
-        
-        try:
-            with open(filepath, 'r', encoding='utf-8') as f:
-                reader = csv.reader(f)
-                lines = list(reader)
-            
-            # Extract date and shift from header
-            date = None
-            shift = None
-            
-            for row in lines[:10]:  # Check first 10 rows for metadata
-                if row and len(row) >= 2:
-                    if row[0] == "Date":
-                        date = row[1]
-                    elif row[0] == "Shift":
-                        shift = row[1]
-            
-            # Find employee entries
-            for i, row in enumerate(lines):
-                if row and row[0] == "Employee Entries":
-                    # Next row is header
-                    if i + 1 < len(lines):
-                        headers = lines[i + 1]
-                    
-                    # Following rows are employee data
-                    for j in range(i + 2, len(lines)):
-                        if lines[j] and lines[j][0]:
-                            emp_row = lines[j]
-                            emp_name = emp_row[0].strip()
-                            
-                            # Apply employee filter
-                            if employee_filter != "All Employees" and emp_name != employee_filter:
-                                continue
-                            
-                            # Extract employee data
-                            entry = {
-                                'Date': date or 'Unknown',
-                                'Shift': shift or 'Unknown',
-                                'Name': emp_name,
-                                'Area': emp_row[1] if len(emp_row) > 1 else '',
-                                'Cash': emp_row[2] if len(emp_row) > 2 else '0.00',
-                                'Credit Total': emp_row[3] if len(emp_row) > 3 else '0.00',
-                                'CC Received': emp_row[4] if len(emp_row) > 4 else '0.00',
-                                'Voids': emp_row[5] if len(emp_row) > 5 else '0.00',
-                                'Beer': emp_row[6] if len(emp_row) > 6 else '0.00',
-                                'Liquor': emp_row[7] if len(emp_row) > 7 else '0.00',
-                                'Wine': emp_row[8] if len(emp_row) > 8 else '0.00',
-                                'Food': emp_row[9] if len(emp_row) > 9 else '0.00',
-                            }
-                            
-                            data.append(entry)
-                    break
-        
-        except Exception as e:
-            print(f"Error parsing {filepath}: {e}")
-        
-        return data
-    
-    def _display_report(self, data):
+    def _display_report(self, report):
         """Display report data in results container"""
         # Clear container
         for widget in self.results_container.winfo_children():
             widget.destroy()
         
-        if not data:
+        if not len(report):
             tk.Label(self.results_container, text="No data found for selected filters",
                     font=("Helvetica", 11), bg="#f9f9f9", fg="black").pack(pady=30)
             return
@@ -358,79 +257,69 @@ class ReportApp(tk.Tk):
                 font=("Helvetica", 12, "bold"),
                 bg="#e8f4f8", fg="black").pack(pady=(8, 5))
         
-        # Calculate totals
-        total_cash = sum(float(entry['Cash']) for entry in data)
-        total_credit = sum(float(entry['Credit Total']) for entry in data)
-        total_sales = sum(float(entry['Beer']) + float(entry['Liquor']) + 
-                         float(entry['Wine']) + float(entry['Food']) for entry in data)
-        
-        summary_text = f"Total Entries: {len(data)}\n"
-        summary_text += f"Total Cash: ${total_cash:,.2f}\n"
-        summary_text += f"Total Credit: ${total_credit:,.2f}\n"
-        summary_text += f"Total Sales: ${total_sales:,.2f}"
+        summary = report.summary()
+        summary_text = f"Total Entries: {summary['entries']}\n"
+        summary_text += f"Total Cash: ${summary['total_cash']:,.2f}\n"
+        summary_text += f"Total Credit: ${summary['total_credit']:,.2f}\n"
+        summary_text += f"Total Sales: ${summary['total_sales']:,.2f}"
         
         tk.Label(summary_frame, text=summary_text,
                 font=("Helvetica", 10), bg="#e8f4f8", fg="black",
                 justify="left").pack(pady=(0, 8), padx=10)
         
-        # Individual entries
-        entries_label = tk.Label(self.results_container, text="Detailed Entries",
-                                font=("Helvetica", 11, "bold"),
-                                bg="#f9f9f9", fg="black")
-        entries_label.pack(pady=(10, 5))
-        
-        # Create scrollable frame for entries
-        entries_canvas = Canvas(self.results_container, bg="#f9f9f9", highlightthickness=0, height=300)
-        entries_scrollbar = Scrollbar(self.results_container, orient="vertical", command=entries_canvas.yview)
-        entries_frame = tk.Frame(entries_canvas, bg="#f9f9f9")
-        
-        entries_frame.bind(
-            "<Configure>",
-            lambda e: entries_canvas.configure(scrollregion=entries_canvas.bbox("all"))
+        # Per-employee totals, ranked by sales
+        tk.Label(self.results_container, text="By Employee",
+                font=("Helvetica", 11, "bold"),
+                bg="#f9f9f9", fg="black").pack(pady=(10, 5))
+        
+        totals = report.rank('total_sales')
+        self._build_table(
+            totals,
+            [("rank", "#", 30, "{}"), ("name", "Name", 110, "{}"), ("shifts_worked", "Shifts", 45, "{}"),
+             ("total_sales", "Sales", 80, "${:,.2f}"), ("tip_percentage", "Tip %", 50, "{:.1f}"),
+             ("void_percentage", "Void %", 50, "{:.1f}")],
+            height=min(len(totals), 8)
         )
         
-        entries_canvas.create_window((0, 0), window=entries_frame, anchor="nw")
-        entries_canvas.configure(yscrollcommand=entries_scrollbar.set)
-        
-        entries_canvas.pack(side="left", fill="both", expand=True, padx=10)
-        entries_scrollbar.pack(side="right", fill="y")
-        
-        # Display each entry
-        for i, entry in enumerate(data):
-            entry_frame = tk.Frame(entries_frame, bg="white", relief="solid", bd=1)
-            entry_frame.pack(fill="x", pady=3, padx=5)
-            
-            # Header with name and date
-            header = tk.Frame(entry_frame, bg="#3a3a3a")
-            header.pack(fill="x")
-            
-            tk.Label(header, text=f"{entry['Name']} - {entry['Date']} ({entry['Shift']})",
-                    font=("Helvetica", 10, "bold"),
-                    bg="#3a3a3a", fg="black").pack(pady=5, padx=8, anchor="w")
-            
-            # Details
-            details = tk.Frame(entry_frame, bg="white")
-            details.pack(fill="x", padx=8, pady=5)
-            
-            # Create two columns
-            col1 = tk.Frame(details, bg="white")
-            col1.pack(side="left", fill="both", expand=True)
-            
-            col2 = tk.Frame(details, bg="white")
-            col2.pack(side="left", fill="both", expand=True)
-            
-            # Column 1
-            self._add_detail_row(col1, "Area:", entry['Area'])
-            self._add_detail_row(col1, "Cash:", f"${float(entry['Cash']):,.2f}")
-            self._add_detail_row(col1, "Credit:", f"${float(entry['Credit Total']):,.2f}")
-            self._add_detail_row(col1, "CC Received:", f"${float(entry['CC Received']):,.2f}")
-            
-            # Column 2
-            self._add_detail_row(col2, "Voids:", f"${float(entry['Voids']):,.2f}")
-            self._add_detail_row(col2, "Beer:", f"${float(entry['Beer']):,.2f}")
-            self._add_detail_row(col2, "Liquor:", f"${float(entry['Liquor']):,.2f}")
-            self._add_detail_row(col2, "Wine:", f"${float(entry['Wine']):,.2f}")
-            self._add_detail_row(col2, "Food:", f"${float(entry['Food']):,.2f}")
+        # Individual entries (one table row each instead of one widget per entry)
+        tk.Label(self.results_container, text="Detailed Entries",
+                font=("Helvetica", 11, "bold"),
+                bg="#f9f9f9", fg="black").pack(pady=(10, 5))
+        
+        entries = report.frame.sort_values(['date', 'log_shift', 'name'], kind='stable')
+        entries = entries.assign(date=entries['date'].dt.strftime('%Y-%m-%d'))
+        self._build_table(
+            entries,
+            [("date", "Date", 80, "{}"), ("log_shift", "Shift", 45, "{}"), ("name", "Name", 110, "{}"),
+             ("area", "Area", 60, "{}"), ("cash", "Cash", 70, "${:,.2f}"), ("credit", "Credit", 70, "${:,.2f}"),
+             ("cc_tips", "CC Received", 80, "${:,.2f}"), ("voids", "Voids", 60, "${:,.2f}"),
+             ("beer", "Beer", 60, "${:,.2f}"), ("liquor", "Liquor", 60, "${:,.2f}"),
+             ("wine", "Wine", 60, "${:,.2f}"), ("food", "Food", 70, "${:,.2f}")],
+            height=12
+        )
+    
+    def _build_table(self, frame, columns, height):
+        """Show a DataFrame in a scrollable Treeview
+
+        columns is a list of (frame column, heading, width, format string).
+        """
+        table_frame = tk.Frame(self.results_container, bg="#f9f9f9")
+        table_frame.pack(fill="x", padx=10, pady=(0, 5))
+        
+        keys = [c[0] for c in columns]
+        tree = ttk.Treeview(table_frame, columns=keys, show="headings", height=max(height, 1))
+        for key, heading, width, _fmt in columns:
+            tree.heading(key, text=heading)
+            tree.column(key, width=width, minwidth=30, anchor="w", stretch=False)
+        
+        formats = [c[3] for c in columns]
+        for values in frame[keys].itertuples(index=False, name=None):
+            tree.insert("", "end", values=[fmt.format(v) for fmt, v in zip(formats, values)])
+        
+        x_scroll = Scrollbar(table_frame, orient="horizontal", command=tree.xview)
+        tree.configure(xscrollcommand=x_scroll.set)
+        tree.pack(fill="x")
+        x_scroll.pack(fill="x")
     
     def _add_detail_row(self, parent, label, value):
         """Add a detail row to the entry display"""
@@ -445,7 +334,7 @@ class ReportApp(tk.Tk):
     
     def _export_report(self):
         """Export current report to CSV"""
-        if not hasattr(self, 'current_report_data') or not self.current_report_data:
+        if not getattr(self, 'current_report', None):
             messagebox.showwarning("Warning", "No report data to export")
             return
         
@@ -464,18 +353,12 @@ class ReportApp(tk.Tk):
         
         if filename:
             try:
-                with open(filename, 'w', newline='', encoding='utf-8') as f:
-                    writer = csv.writer(f)
-                    
-                    # Write header
-                    headers = ['Date', 'Shift', 'Name', 'Area', 'Cash', 'Credit Total',
-                              'CC Received', 'Voids', 'Beer', 'Liquor', 'Wine', 'Food']
-                    writer.writerow(headers)
-                    
-                    # Write data
-                    for entry in self.current_report_data:
-                        row = [entry.get(h, '') for h in headers]
-                        writer.writerow(row)
+                headers = {'date': 'Date', 'log_shift': 'Shift', 'name': 'Name', 'area': 'Area',
+                           'cash': 'Cash', 'credit': 'Credit Total', 'cc_tips': 'CC Received',
+                           'voids': 'Voids', 'beer': 'Beer', 'liquor': 'Liquor', 'wine': 'Wine', 'food': 'Food'}
+                entries = self.current_report.frame.sort_values(['date', 'log_shift', 'name'], kind='stable')
+                entries = entries[list(headers)].rename(columns=headers)
+                entries.to_csv(filename, index=False, date_format='%Y-%m-%d', float_format='%.2f')
                 
                 messagebox.showinfo("Success", f"Report exported to:\n{filename}")
             
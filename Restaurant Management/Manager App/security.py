@@ -4,6 +4,7 @@ Ensures data isolation and prevents unauthorized access
 """
 from session import get_session
 from database import get_db
+from rate_limit import SlidingWindowLimiter, MemoryBackend, SQLiteBackend, DEFAULT_MAX_KEYS
 from functools import wraps
 import os
 
@@ -197,40 +198,24 @@ class DataIsolation:
 
 
 class RateLimiter:
-    """Rate limiting to prevent abuse"""
+    """Rate limiting to prevent abuse
     
-    def __init__(self):
-        self.attempts = {}
+    Sliding-window counter per user/action. Pass db_path to share limits
+    between processes; otherwise counters live in memory and the least
+    recently used keys are evicted past max_keys.
+    """
+    
+    def __init__(self, db_path=None, max_keys=DEFAULT_MAX_KEYS):
+        backend = SQLiteBackend(db_path) if db_path else MemoryBackend(max_keys)
+        self.limiter = SlidingWindowLimiter(backend)
     
     def check_rate_limit(self, user_id, action, max_attempts=5, window_seconds=300):
-        """Check if user has exceeded rate limit"""
-        import time
-        
-        key = f"{user_id}:{action}"
-        now = time.time()
-        
-        if key not in self.attempts:
-            self.attempts[key] = []
-        
-        # Remove old attempts outside window
-        self.attempts[key] = [
-            timestamp for timestamp in self.attempts[key]
-            if now - timestamp < window_seconds
-        ]
-        
-        # Check if limit exceeded
-        if len(self.attempts[key]) >= max_attempts:
-            return False
-        
-        # Add current attempt
-        self.attempts[key].append(now)
-        return True
+        """Check if user has exceeded rate limit (records the attempt if not)"""
+        return self.limiter.hit(f"{user_id}:{action}", max_attempts, window_seconds)
     
     def reset_rate_limit(self, user_id, action):
         """Reset rate limit for user action"""
-        key = f"{user_id}:{action}"
-        if key in self.attempts:
-            del self.attempts[key]
+        self.limiter.clear(f"{user_id}:{action}")
 
 
 class InputValidator:
@@ -9,6 +9,7 @@ from datetime import datetime, timedelta
 SESSION_FILE = os.path.expanduser("~/Documents/AIO Python/Manager App/session.json")
 SESSION_TIMEOUT_MINUTES = 30  # Inactivity timeout
 MAX_SESSION_HOURS = 8  # Maximum session duration
+ACTIVITY_SAVE_SECONDS = 60  # Persist last_activity at most this often
 
 
 class Session:
@@ -27,6 +28,7 @@ class Session:
         self.companies = []
         self.session_created_at = None
         self.last_activity = None
+        self._saved_state = None  # Last state written to SESSION_FILE
     
     def login(self, user_data, companies):
         """Set session data after login"""
@@ -72,10 +74,10 @@ class Session:
         
         if os.path.exists(SESSION_FILE):
             os.remove(SESSION_FILE)
+        self._saved_state = None
     
-    def save(self):
-        """Save session to file"""
-        data = {
+    def _state(self):
+        return {
             'user_id': self.user_id,
             'username': self.username,
             'full_name': self.full_name,
@@ -87,12 +89,21 @@ class Session:
             'current_permissions': self.current_permissions,
             'companies': self.companies,
             'session_created_at': self.session_created_at.isoformat() if self.session_created_at else None,
-            'last_activity': self.last_activity.isoformat() if self.last_activity else None,
-            'timestamp': datetime.now().isoformat()
+            'last_activity': self.last_activity.isoformat() if self.last_activity else None
         }
+    
+    def save(self):
+        """Save session to file (skipped when nothing changed since the last save)"""
+        data = self._state()
+        if data == self._saved_state:
+            return
         
-        with open(SESSION_FILE, 'w') as f:
-            json.dump(data, f, indent=2)
+        # Write to a temp file and rename so a crash never leaves a half-written session
+        tmp_file = SESSION_FILE + '.tmp'
+        with open(tmp_file, 'w') as f:
+            json.dump({**data, 'timestamp': datetime.now().isoformat()}, f, indent=2)
+        os.replace(tmp_file, SESSION_FILE)
+        self._saved_state = data
     
     def load(self):
         """Load session from file"""
@@ -118,6 +129,7 @@ class Session:
                 if data.get('last_activity'):
                     self.last_activity = datetime.fromisoformat(data['last_activity'])
                 
+                self._saved_state = self._state()
                 return True
             except:
                 return False
@@ -150,9 +162,11 @@ class Session:
                 self.logout()
                 return False
         
-        # Update activity timestamp
+        # Update activity timestamp; only written to disk once a minute
         self.last_activity = datetime.now()
-        self.save()
+        saved_activity = (self._saved_state or {}).get('last_activity')
+        if not saved_activity or (self.last_activity - datetime.fromisoformat(saved_activity)).total_seconds() >= ACTIVITY_SAVE_SECONDS:
+            self.save()
         
         return True
     
@@ -0,0 +1,338 @@
+"""
+Server-side sessions for the Manager App web version
+Session data lives in the sessions table; the cookie only carries the token.
+Workers keep a hot cache of recent sessions, batch last_activity writes and
+sweep expired rows on a background thread.
+"""
+import json
+import uuid
+import secrets
+import sqlite3
+import logging
+import threading
+from collections import OrderedDict
+from datetime import datetime, timedelta
+
+from flask import request
+from flask.sessions import SessionInterface, SessionMixin
+from werkzeug.datastructures import CallbackDict
+
+from database import DB_PATH
+
+log = logging.getLogger(__name__)
+
+ACTIVITY_FLUSH_SECONDS = 60      # Batch last_activity writes at most this often
+SWEEP_INTERVAL_SECONDS = 300     # Delete expired sessions this often
+MAX_CACHED_SESSIONS = 10000      # Hot cache size per worker (least recently used evicted)
+CACHE_TTL_SECONDS = 30           # Re-read a cached session after this long (sees logouts on other workers)
+
+
+class SessionStore:
+    """Sessions table access with a per-process hot cache
+
+    Every save bumps the session's version; readers pass the version they
+    last saw (from the cookie) so a cache entry older than a write made on
+    another worker is re-read. The version never refuses a session: a
+    request sent with the cookie from before a concurrent save still gets it.
+    """
+
+    def __init__(self, db_path=DB_PATH, lifetime=timedelta(days=7), max_cached=MAX_CACHED_SESSIONS):
+        self.db_path = db_path
+        self.lifetime = lifetime
+        self.max_cached = max_cached
+        self._cache = OrderedDict()   # token -> {'data', 'version', 'expires_at'}
+        self._dirty = {}              # token -> last activity not yet written
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread = None
+
+    def get_connection(self):
+        """Get database connection with WAL mode"""
+        conn = sqlite3.connect(self.db_path, timeout=30.0, check_same_thread=False)
+        conn.row_factory = sqlite3.Row
+        conn.execute('PRAGMA journal_mode=WAL')
+        conn.execute('PRAGMA busy_timeout=30000')
+        return conn
+
+    def _cache_put(self, token, data, version, expires_at):
+        self._cache[token] = {'data': data, 'version': version, 'expires_at': expires_at,
+                              'stale_at': datetime.now() + timedelta(seconds=CACHE_TTL_SECONDS)}
+        self._cache.move_to_end(token)
+        while len(self._cache) > self.max_cached:
+            self._cache.popitem(last=False)
+
+    # ==================== SESSIONS ====================
+
+    def create(self, data, user_id=None, company_id=None, ip_address=None, user_agent=None):
+        """Store a new session; returns (token, version)"""
+        token = secrets.token_urlsafe(32)
+        now = datetime.now()
+        expires_at = (now + self.lifetime).isoformat()
+
+        conn = self.get_connection()
+        try:
+            conn.execute('''
+                INSERT INTO sessions (id, user_id, company_id, token, created_at, last_activity,
+                                      expires_at, ip_address, user_agent, is_active, data, version)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, 1, ?, 1)
+            ''', (str(uuid.uuid4()), user_id or '', company_id, token, now.isoformat(), now.isoformat(),
+                  expires_at, ip_address, user_agent, json.dumps(data)))
+            conn.commit()
+        finally:
+            conn.close()
+
+        with self._lock:
+            self._cache_put(token, data, 1, expires_at)
+        return token, 1
+
+    def get(self, token, min_version=None):
+        """Get (data, version) for a live session, or None
+
+        A cached copy older than min_version is re-read from the table.
+        Counts as activity; the last_activity write is deferred to flush().
+        """
+        now = datetime.now()
+        with self._lock:
+            entry = self._cache.get(token)
+            if (entry and (min_version is None or entry['version'] >= min_version)
+                    and entry['stale_at'] > now and entry['expires_at'] > now.isoformat()):
+                self._cache.move_to_end(token)
+                self._dirty[token] = now
+                return entry['data'], entry['version']
+
+        conn = self.get_connection()
+        try:
+            row = conn.execute('''
+                SELECT data, version, expires_at FROM sessions
+                WHERE token = ? AND is_active = 1 AND expires_at > ?
+            ''', (token, now.isoformat())).fetchone()
+        finally:
+            conn.close()
+        if not row:
+            with self._lock:
+                self._cache.pop(token, None)
+            return None
+
+        data = json.loads(row['data']) if row['data'] else {}
+        with self._lock:
+            self._cache_put(token, data, row['version'], row['expires_at'])
+            self._dirty[token] = now
+        return data, row['version']
+
+    def save(self, token, data, user_id=None, company_id=None):
+        """Replace a session's data; returns the new version"""
+        now = datetime.now()
+        expires_at = (now + self.lifetime).isoformat()
+
+        conn = self.get_connection()
+        try:
+            conn.execute('''
+                UPDATE sessions SET data = ?, user_id = ?, company_id = ?, version = version + 1,
+                                    last_activity = ?, expires_at = ?
+                WHERE token = ?
+            ''', (json.dumps(data), user_id or '', company_id, now.isoformat(), expires_at, token))
+            version = conn.execute('SELECT version FROM sessions WHERE token = ?', (token,)).fetchone()
+            conn.commit()
+        finally:
+            conn.close()
+        if version is None:
+            return None
+
+        with self._lock:
+            self._cache_put(token, data, version['version'], expires_at)
+            self._dirty.pop(token, None)
+        return version['version']
+
+    def delete(self, token):
+        """End a session"""
+        with self._lock:
+            self._cache.pop(token, None)
+            self._dirty.pop(token, None)
+        conn = self.get_connection()
+        try:
+            conn.execute('DELETE FROM sessions WHERE token = ?', (token,))
+            conn.commit()
+        finally:
+            conn.close()
+
+    def delete_user_sessions(self, user_id):
+        """End every session for a user (password change, deactivation)"""
+        conn = self.get_connection()
+        try:
+            tokens = [r['token'] for r in conn.execute('SELECT token FROM sessions WHERE user_id = ?', (user_id,))]
+            conn.execute('DELETE FROM sessions WHERE user_id = ?', (user_id,))
+            conn.commit()
+        finally:
+            conn.close()
+        with self._lock:
+            for token in tokens:
+                self._cache.pop(token, None)
+                self._dirty.pop(token, None)
+        return len(tokens)
+
+    # ==================== BACKGROUND WORK ====================
+
+    def flush(self):
+        """Write pending last_activity updates in one transaction; returns rows written
+
+        Activity also slides the session's expiry forward.
+        """
+        with self._lock:
+            dirty, self._dirty = self._dirty, {}
+            for token, seen in dirty.items():
+                entry = self._cache.get(token)
+                if entry:
+                    entry['expires_at'] = (seen + self.lifetime).isoformat()
+        if not dirty:
+            return 0
+
+        conn = self.get_connection()
+        try:
+            conn.executemany('''
+                UPDATE sessions SET last_activity = ?, expires_at = ?
+                WHERE token = ? AND last_activity < ?
+            ''', [(seen.isoformat(), (seen + self.lifetime).isoformat(), token, seen.isoformat())
+                  for token, seen in dirty.items()])
+            conn.commit()
+        finally:
+            conn.close()
+        return len(dirty)
+
+    def sweep(self):
+        """Delete expired sessions; returns rows deleted"""
+        now = datetime.now().isoformat()
+        conn = self.get_connection()
+        try:
+            cursor = conn.execute('DELETE FROM sessions WHERE expires_at <= ? OR is_active = 0', (now,))
+            deleted = cursor.rowcount
+            conn.commit()
+        finally:
+            conn.close()
+        with self._lock:
+            for token in [t for t, e in self._cache.items() if e['expires_at'] <= now]:
+                del self._cache[token]
+        return deleted
+
+    def start(self, flush_interval=ACTIVITY_FLUSH_SECONDS, sweep_interval=SWEEP_INTERVAL_SECONDS):
+        """Start the background flush/sweep thread (once per process)"""
+        if self._thread and self._thread.is_alive():
+            return
+
+        def run():
+            since_sweep = sweep_interval
+            while not self._stop.wait(flush_interval):
+                try:
+                    self.flush()
+                    since_sweep += flush_interval
+                    if since_sweep >= sweep_interval:
+                        self.sweep()
+                        since_sweep = 0
+                except sqlite3.Error as e:
+                    log.warning("Session sweeper error: %s", e)
+
+        self._stop.clear()
+        self._thread = threading.Thread(target=run, name='session-sweeper', daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        """Stop the background thread and write pending activity"""
+        self._stop.set()
+        if self._thread:
+            self._thread.join(timeout=5)
+        self.flush()
+
+
+# ==================== FLASK INTEGRATION ====================
+
+class ServerSession(CallbackDict, SessionMixin):
+    """Flask session whose contents are stored server-side"""
+
+    def __init__(self, initial=None, token=None, version=None):
+        def on_update(self):
+            self.modified = True
+        super().__init__(initial, on_update)
+        self.token = token
+        self.version = version
+        self.modified = False
+        self.regenerate = False
+
+    def rotate(self):
+        """Move the data to a new token when the response is saved (the old one stops working)"""
+        self.regenerate = True
+        self.modified = True
+
+
+def rotate_session(session):
+    """Give the current session a new token (call on login and logout)"""
+    if isinstance(session, ServerSession):
+        session.rotate()
+
+
+class ServerSessionInterface(SessionInterface):
+    """Flask session interface over a SessionStore
+
+    The cookie value is "<token>.<version>"; the token is random, so the
+    cookie does not need to be signed. The token alone identifies the
+    session; the version only tells this worker whether its cached copy is
+    current, so requests still in flight with an older cookie (parallel
+    XHR calls, a second tab) keep their session. A rotated session gets a
+    new token and row, and the old token stops working.
+    """
+
+    def __init__(self, store):
+        self.store = store
+
+    def open_session(self, app, request):
+        cookie = request.cookies.get(self.get_cookie_name(app))
+        if cookie:
+            token, _, version = cookie.partition('.')
+            record = self.store.get(token, int(version) if version.isdigit() else None)
+            if record:
+                data, version = record
+                return ServerSession(data, token=token, version=version)
+        return ServerSession()
+
+    def save_session(self, app, session, response):
+        name = self.get_cookie_name(app)
+        domain = self.get_cookie_domain(app)
+        path = self.get_cookie_path(app)
+
+        if session.regenerate and session.token:
+            # Session fixation: the token the client had before must not survive login/logout
+            self.store.delete(session.token)
+            if not session:
+                response.delete_cookie(name, domain=domain, path=path)
+            session.token = session.version = None
+        session.regenerate = False
+
+        if not session:
+            if session.token:
+                if session.modified:
+                    self.store.delete(session.token)
+                    response.delete_cookie(name, domain=domain, path=path)
+            return
+
+        user_id = session.get('_user_id')
+        company_id = session.get('current_company_id')
+        changed = session.modified or session.token is None
+        if session.token is None:
+            session.token, session.version = self.store.create(
+                dict(session), user_id, company_id,
+                ip_address=request.remote_addr, user_agent=request.headers.get('User-Agent', '')[:255]
+            )
+        elif session.modified:
+            session.version = self.store.save(session.token, dict(session), user_id, company_id)
+            if session.version is None:
+                # Swept while in use; start over with a fresh row
+                session.token, session.version = self.store.create(dict(session), user_id, company_id)
+
+        if changed or self.should_set_cookie(app, session):
+            response.set_cookie(
+                name, f"{session.token}.{session.version}",
+                expires=self.get_expiration_time(app, session),
+                httponly=self.get_cookie_httponly(app),
+                domain=domain, path=path,
+                secure=self.get_cookie_secure(app),
+                samesite=self.get_cookie_samesite(app)
+            )
+
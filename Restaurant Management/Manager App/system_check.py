@@ -152,8 +152,24 @@ def check_system():
         print(f"   ❌ Enhanced auth error: {e}")
         return False
     
-    # 9. Count users and companies
-    print("\n9. Database Status...")
+    # 9. Employee search
+    print("\n9. Employee Search Check...")
+    try:
+        from employee_search import RosterIndex
+        index = RosterIndex([{'name': 'John Smith'}, {'name': 'Maria Gonzalez'}, {'name': 'Bob Jones'}])
+        for query, expected in [('joh', 'John Smith'), ('jhon', 'John Smith'),
+                                ('smtih', 'John Smith'), ('gonzales', 'Maria Gonzalez')]:
+            matches = index.complete(query, limit=1)
+            if not matches or matches[0]['name'] != expected:
+                print(f"   ❌ '{query}' did not find {expected}")
+                return False
+        print(f"   ✅ Prefix and typo lookups find the right employee")
+    except Exception as e:
+        print(f"   ❌ Employee search error: {e}")
+        return False
+    
+    # 10. Count users and companies
+    print("\n10. Database Status...")
     try:
         conn = db.get_connection()
         cursor = conn.cursor()
@@ -0,0 +1,14 @@
+"""
+Production entry point for the Manager App web version
+
+    gunicorn -w 4 --threads 4 -b 0.0.0.0:8000 wsgi:app
+
+Workers share the SQLite database (sessions, rosters, rate limits), one
+secret key and the company_data files, which are replaced atomically.
+"""
+import os
+
+# company_data/ paths are relative to the app folder
+os.chdir(os.path.dirname(os.path.abspath(__file__)))
+
+from manager_app import app
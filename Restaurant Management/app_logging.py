@@ -0,0 +1,223 @@
+#!/usr/bin/env python3
+"""
+Leveled, non-blocking logging for the Flask apps
+Modules log through logging.getLogger(__name__). setup_logging() sends
+every record to one in-memory queue (QueueHandler), so a request thread
+only formats the message and enqueues it. A background QueueListener
+writes the records to a rotating file and to stderr:
+
+    <log dir>/<app>.log       LOG_MAX_BYTES (default 5 MB) per file,
+                              LOG_BACKUPS (default 5) old files kept; worker
+                              processes share it (writes and rotation hold
+                              a FileLock, see shared_storage.py)
+    LOG_LEVEL                 DEBUG, INFO (default), WARNING, ...
+    LOG_DIR                   overrides the app's log folder
+
+init_app() gives every request a correlation id: the X-Request-ID header
+when the client sent a usable one, otherwise a new one. It is on every
+record logged while the request runs ([pid request-id] in each line) and
+is sent back in the X-Request-ID response header.
+
+Per-row debug output in hot loops is guarded with debug_enabled(log),
+checked once per call, so at INFO the loop does no logging work at all.
+
+Shared by Inventory Control 2 and the Manager App web version.
+
+Batch usage:
+    python app_logging.py tail logs/manager_app.log --request 3f2a9c1e7b40
+"""
+import os
+import re
+import sys
+import uuid
+import queue
+import atexit
+import logging
+import argparse
+import threading
+import contextvars
+from logging.handlers import QueueHandler, QueueListener, RotatingFileHandler
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+from shared_storage import FileLock
+
+DEFAULT_MAX_BYTES = 5 * 1024 * 1024
+DEFAULT_BACKUPS = 5
+LOG_FORMAT = '%(asctime)s %(levelname)-7s [%(process)d %(request_id)s] %(name)s: %(message)s'
+REQUEST_ID_HEADER = 'X-Request-ID'
+_VALID_REQUEST_ID = re.compile(r'^[A-Za-z0-9._-]{1,64}$')
+
+request_id = contextvars.ContextVar('request_id', default='-')
+
+
+def debug_enabled(logger):
+    """True when logger would emit DEBUG records (check once, outside the loop)"""
+    return logger.isEnabledFor(logging.DEBUG)
+
+
+class RequestIdFilter(logging.Filter):
+    """Stamps records with the current request's correlation id ('-' outside requests)"""
+
+    def filter(self, record):
+        record.request_id = request_id.get()
+        return True
+
+
+class SharedRotatingFileHandler(RotatingFileHandler):
+    """RotatingFileHandler that several worker processes can write
+
+    Each write holds a FileLock on the log and first reopens the file if
+    another worker rotated it, so no worker keeps writing to a renamed file.
+    """
+
+    def __init__(self, filename, maxBytes=DEFAULT_MAX_BYTES, backupCount=DEFAULT_BACKUPS):
+        super().__init__(filename, maxBytes=maxBytes, backupCount=backupCount, encoding='utf-8', delay=True)
+        self._file_lock = FileLock(self.baseFilename)
+
+    def _reopen_if_rotated(self):
+        if self.stream is None:
+            return
+        try:
+            current = os.stat(self.baseFilename)
+            rotated = (current.st_ino, current.st_dev) != (os.fstat(self.stream.fileno()).st_ino,
+                                                          os.fstat(self.stream.fileno()).st_dev)
+        except OSError:
+            rotated = True
+        if rotated:
+            self.stream.close()
+            self.stream = None  # Opened again by emit()
+
+    def emit(self, record):
+        try:
+            with self._file_lock:
+                self._reopen_if_rotated()
+                super().emit(record)
+        except Exception:
+            self.handleError(record)
+
+
+# ==================== SETUP ====================
+
+_listener = None
+_queue_handler = None
+_setup_lock = threading.Lock()
+
+
+def _level(level):
+    name = str(level or os.environ.get('LOG_LEVEL') or 'INFO').upper()
+    return getattr(logging, name) if isinstance(getattr(logging, name, None), int) else logging.INFO
+
+
+def setup_logging(app_name, log_dir, level=None, console=True):
+    """Send every logger through the queue to <log dir>/<app_name>.log (and stderr); returns the listener
+
+    Called once per process; later calls return the running listener.
+    """
+    global _listener, _queue_handler
+    with _setup_lock:
+        if _listener is not None:
+            return _listener
+        log_dir = os.environ.get('LOG_DIR') or log_dir
+        os.makedirs(log_dir, exist_ok=True)
+        formatter = logging.Formatter(LOG_FORMAT)
+        handlers = [SharedRotatingFileHandler(
+            os.path.join(log_dir, f"{app_name}.log"),
+            maxBytes=int(os.environ.get('LOG_MAX_BYTES', DEFAULT_MAX_BYTES)),
+            backupCount=int(os.environ.get('LOG_BACKUPS', DEFAULT_BACKUPS)))]
+        if console:
+            handlers.append(logging.StreamHandler(sys.stderr))
+        for handler in handlers:
+            handler.setFormatter(formatter)
+
+        _queue_handler = QueueHandler(queue.SimpleQueue())
+        _queue_handler.addFilter(RequestIdFilter())
+        root = logging.getLogger()
+        root.setLevel(_level(level))
+        root.addHandler(_queue_handler)
+
+        _listener = QueueListener(_queue_handler.queue, *handlers, respect_handler_level=True)
+        _listener.start()
+        atexit.register(stop_logging)
+        if hasattr(os, 'register_at_fork'):
+            # A forked worker (gunicorn --preload) does not inherit the listener thread
+            os.register_at_fork(after_in_child=_restart_in_child)
+        return _listener
+
+
+def _restart_in_child():
+    global _listener
+    if _listener is None:
+        return
+    _queue_handler.queue = queue.SimpleQueue()
+    _listener = QueueListener(_queue_handler.queue, *_listener.handlers, respect_handler_level=True)
+    _listener.start()
+
+
+def stop_logging():
+    """Write out whatever is still queued (runs at exit)"""
+    global _listener
+    with _setup_lock:
+        if _listener is not None:
+            _listener.stop()
+            for handler in _listener.handlers:
+                handler.close()
+            _listener = None
+
+
+# ==================== FLASK ====================
+
+def init_app(app, app_name, log_dir, level=None):
+    """setup_logging() plus a correlation id per request"""
+    setup_logging(app_name, log_dir, level)
+    init_request_ids(app)
+
+
+def init_request_ids(app):
+    """A correlation id per request; for apps that call setup_logging() later, at startup"""
+    from flask import g, request
+
+    @app.before_request
+    def assign_request_id():
+        sent = request.headers.get(REQUEST_ID_HEADER, '')
+        g.request_id = sent if _VALID_REQUEST_ID.match(sent) else uuid.uuid4().hex[:12]
+        g.request_id_token = request_id.set(g.request_id)
+
+    @app.after_request
+    def send_request_id(response):
+        if 'request_id' in g:
+            response.headers[REQUEST_ID_HEADER] = g.request_id
+        return response
+
+    @app.teardown_request
+    def clear_request_id(exc=None):
+        token = g.pop('request_id_token', None)
+        if token is not None:
+            try:
+                request_id.reset(token)
+            except ValueError:  # Set in another context
+                request_id.set('-')
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Show log lines, optionally for one request')
+    subparsers = parser.add_subparsers(dest='command', required=True)
+    tail = subparsers.add_parser('tail', help='Print the last lines of a log')
+    tail.add_argument('path')
+    tail.add_argument('--request', default=None, help='Only lines with this correlation id')
+    tail.add_argument('--lines', type=int, default=50)
+    args = parser.parse_args(argv)
+
+    if not os.path.exists(args.path):
+        print(f"Error: {args.path} not found")
+        return 1
+    with open(args.path, 'r', encoding='utf-8', errors='replace') as f:
+        lines = [line.rstrip('\n') for line in f]
+    if args.request:
+        lines = [line for line in lines if f" {args.request}] " in line]
+    for line in lines[-args.lines:]:
+        print(line)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,291 @@
+#!/usr/bin/env python3
+"""
+Budget reconciliation engine
+Matches budget line names to actual vendor names in one shot instead of a
+fuzzy search per budget row: names are normalized, candidate pairs are
+blocked by shared tokens / prefixes, the whole similarity matrix is scored
+at once (rapidfuzz.process.cdist when installed, difflib on the blocked
+pairs otherwise) and pairs are assigned one-to-one, best score first.
+
+Matches are remembered in assigned_expense_names.csv (rows with a Budget
+Name), so the next reconciliation of the same budget reuses them without
+scoring. Matches found by scoring are saved as automatic (Confirmed empty):
+an exact name match always wins over them and replaces them. Only matches
+a user accepted (--accept, confirm_matches()) are saved as confirmed, and
+those are used before anything else.
+
+Shared by Tools/billaverage_streamlit.py (compare_budget) and
+Tools/billaverage_gui.py (MainWindow.compare_with_budget).
+
+Batch usage:
+    python budget_reconcile.py budget.csv budget_tab.csv
+    python budget_reconcile.py budget.csv budget_tab.csv --no-cache
+    python budget_reconcile.py budget.csv budget_tab.csv --accept
+"""
+import os
+import re
+import csv
+import sys
+import argparse
+from difflib import SequenceMatcher
+
+import numpy as np
+import pandas as pd
+
+try:
+    from rapidfuzz import fuzz, process
+except ImportError:  # Optional; difflib scores the blocked pairs instead
+    fuzz = process = None
+
+# Beside category_map.csv, not in whatever folder the tool was started from
+ASSIGNMENTS_CSV = os.path.join(os.path.dirname(os.path.abspath(__file__)), "assigned_expense_names.csv")
+MATCH_COLUMN = "Budget Name"
+CONFIRMED_COLUMN = "Confirmed"   # "yes" for matches a user accepted, empty for automatic ones
+
+MATCH_THRESHOLD = 90     # Minimum score (0-100) for a budget line to take an actual
+CONTAINS_SCORE = 90      # One normalized name inside the other (the old substring rule)
+PREFIX_LENGTH = 4        # Names sharing this many leading characters are compared
+
+# Dropped when normalizing: legal suffixes and filler words
+STOPWORDS = {"inc", "llc", "co", "company", "corp", "corporation", "ltd", "the", "of", "and"}
+
+
+# ==================== NORMALIZATION & BLOCKING ====================
+
+def normalize(name):
+    """Lowercase, '&' -> 'and', punctuation and legal suffixes dropped"""
+    text = str(name).lower().replace("’", "'").replace("&", " and ")
+    text = re.sub(r"[^a-z0-9 ]+", " ", text.replace("'", ""))
+    tokens = [t for t in text.split() if t not in STOPWORDS]
+    return " ".join(tokens) if tokens else " ".join(text.split())
+
+
+def _blocks(norm):
+    """Blocking keys for a normalized name: its tokens and its leading characters"""
+    keys = {("t", token) for token in norm.split() if len(token) > 1}
+    compact = norm.replace(" ", "")
+    if compact:
+        keys.add(("p", compact[:PREFIX_LENGTH]))
+    return keys
+
+
+def candidate_pairs(budget_norms, actual_norms):
+    """Boolean matrix: True where a budget and an actual name share a blocking key"""
+    index = {}
+    for j, norm in enumerate(actual_norms):
+        for key in _blocks(norm):
+            index.setdefault(key, []).append(j)
+    mask = np.zeros((len(budget_norms), len(actual_norms)), dtype=bool)
+    for i, norm in enumerate(budget_norms):
+        for key in _blocks(norm):
+            mask[i, index.get(key, [])] = True
+    return mask
+
+
+# ==================== SCORING & ASSIGNMENT ====================
+
+def score_matrix(budget_norms, actual_norms, mask=None):
+    """Similarity (0-100) of every budget name against every actual name
+
+    Pairs outside mask score 0. Exact normalized matches score 100 and a
+    name contained in the other scores at least CONTAINS_SCORE.
+    """
+    if mask is None:
+        mask = candidate_pairs(budget_norms, actual_norms)
+    if not budget_norms or not actual_norms:
+        return np.zeros((len(budget_norms), len(actual_norms)))
+
+    if process is not None:
+        scores = process.cdist(budget_norms, actual_norms, scorer=fuzz.WRatio, workers=-1).astype(float)
+        scores[~mask] = 0.0
+    else:
+        scores = np.zeros(mask.shape)
+        sorted_actuals = [" ".join(sorted(n.split())) for n in actual_norms]
+        for i, j in zip(*np.nonzero(mask)):
+            a = " ".join(sorted(budget_norms[i].split()))
+            scores[i, j] = 100.0 * SequenceMatcher(None, a, sorted_actuals[j]).ratio()
+
+    for i, j in zip(*np.nonzero(mask)):
+        b, a = budget_norms[i], actual_norms[j]
+        if b == a:
+            scores[i, j] = 100.0
+        elif b and a and (b in a or a in b):
+            scores[i, j] = max(scores[i, j], CONTAINS_SCORE)
+    return scores
+
+
+def assign(scores, threshold=MATCH_THRESHOLD):
+    """One-to-one assignment, best score first (ties by row, then column)
+
+    Returns an array with the matched column per row, -1 where unmatched.
+    """
+    match = np.full(scores.shape[0], -1, dtype=int)
+    rows, cols = np.nonzero(scores >= threshold)
+    if not len(rows):
+        return match
+    order = np.lexsort((cols, rows, -scores[rows, cols]))
+    used = np.zeros(scores.shape[1], dtype=bool)
+    for i, j in zip(rows[order], cols[order]):
+        if match[i] < 0 and not used[j]:
+            match[i] = j
+            used[j] = True
+    return match
+
+
+# ==================== MATCH CACHE ====================
+
+def load_confirmed_matches(path=ASSIGNMENTS_CSV):
+    """Normalized budget name -> (category, actual name, budget name, confirmed)
+
+    confirmed is False for automatic matches, including every row saved
+    before the Confirmed column existed (those were never accepted by a user).
+    """
+    matches = {}
+    if not path or not os.path.exists(path):
+        return matches
+    with open(path, "r", newline="", encoding="utf-8") as f:
+        for row in csv.DictReader(f):
+            budget_name = (row.get(MATCH_COLUMN) or "").strip()
+            if budget_name:
+                confirmed = (row.get(CONFIRMED_COLUMN) or "").strip().lower() == "yes"
+                matches[normalize(budget_name)] = (row.get("Category") or "", row.get("Name") or "",
+                                                   budget_name, confirmed)
+    return matches
+
+
+def write_assignments(writer, assignments, matches):
+    """Write the assignments file: plain category assignments, then budget matches"""
+    writer.writerow(["Category", "Name", MATCH_COLUMN, CONFIRMED_COLUMN])
+    for cat, name in assignments:
+        writer.writerow([cat, name, "", ""])
+    for cat, name, budget_name, confirmed in matches.values():
+        writer.writerow([cat, name, budget_name, "yes" if confirmed else ""])
+
+
+def save_confirmed_matches(matches, path=ASSIGNMENTS_CSV):
+    """Rewrite the assignments file with these matches, keeping plain category assignments"""
+    assignments = []
+    if os.path.exists(path):
+        with open(path, "r", newline="", encoding="utf-8") as f:
+            assignments = [(row.get("Category") or "", row.get("Name") or "")
+                           for row in csv.DictReader(f) if not (row.get(MATCH_COLUMN) or "").strip()]
+    with open(path, "w", newline="", encoding="utf-8") as f:
+        write_assignments(csv.writer(f), assignments, matches)
+
+
+def confirm_matches(pairs, path=ASSIGNMENTS_CSV):
+    """Save matches a user accepted; pairs are (budget name, actual name, category)"""
+    matches = load_confirmed_matches(path)
+    for budget_name, actual_name, category in pairs:
+        budget_name = str(budget_name).strip()
+        matches[normalize(budget_name)] = (category or "", str(actual_name).strip(), budget_name, True)
+    save_confirmed_matches(matches, path)
+
+
+# ==================== RECONCILIATION ====================
+
+def reconcile(budget_names, actual_names, categories=None, cache_path=ASSIGNMENTS_CSV,
+              threshold=MATCH_THRESHOLD):
+    """Match every budget name to at most one actual name
+
+    Returns (match, scores): match[i] is the index into actual_names for
+    budget_names[i] (-1 if none) and scores[i] its score (100 for cached
+    matches). Order: matches a user confirmed, exact name matches,
+    automatic cached matches, then scoring. New scored matches are cached
+    as automatic; an automatic entry whose budget line now has an exact
+    match is dropped. Pass cache_path=None to skip the cache.
+    """
+    budget_names = [str(n).strip() for n in budget_names]
+    actual_names = [str(n).strip() for n in actual_names]
+    categories = list(categories) if categories is not None else [""] * len(budget_names)
+    budget_norms = [normalize(n) for n in budget_names]
+    actual_norms = [normalize(n) for n in actual_names]
+
+    match = np.full(len(budget_names), -1, dtype=int)
+    best = np.zeros(len(budget_names))
+    used = np.zeros(len(actual_names), dtype=bool)
+
+    actual_index = {}
+    for j, norm in enumerate(actual_norms):
+        actual_index.setdefault(norm, j)
+    confirmed = load_confirmed_matches(cache_path) if cache_path else {}
+
+    def take_cached(user_confirmed):
+        for i, norm in enumerate(budget_norms):
+            cached = confirmed.get(norm)
+            if match[i] >= 0 or not cached or cached[3] != user_confirmed:
+                continue
+            j = actual_index.get(normalize(cached[1]), -1)
+            if j >= 0 and not used[j]:
+                match[i], best[i], used[j] = j, 100.0, True
+
+    take_cached(True)
+    exact = []
+    for i, norm in enumerate(budget_norms):
+        j = actual_index.get(norm, -1)
+        if match[i] < 0 and j >= 0 and not used[j]:
+            match[i], best[i], used[j] = j, 100.0, True
+            exact.append(i)
+    take_cached(False)
+
+    rows = np.flatnonzero(match < 0)
+    cols = np.flatnonzero(~used)
+    found = np.zeros(len(rows), dtype=bool)
+    if len(rows) and len(cols):
+        sub_budget = [budget_norms[i] for i in rows]
+        sub_actual = [actual_norms[j] for j in cols]
+        scores = score_matrix(sub_budget, sub_actual)
+        sub_match = assign(scores, threshold)
+        found = sub_match >= 0
+        match[rows[found]] = cols[sub_match[found]]
+        best[rows[found]] = scores[np.flatnonzero(found), sub_match[found]]
+
+    if cache_path:
+        changed = False
+        for i in exact:
+            cached = confirmed.get(budget_norms[i])
+            if cached and not cached[3]:
+                del confirmed[budget_norms[i]]
+                changed = True
+        for i in rows[found]:
+            cached = confirmed.get(budget_norms[i])
+            if not (cached and cached[3]):
+                confirmed[budget_norms[i]] = (categories[i], actual_names[match[i]], budget_names[i], False)
+                changed = True
+        if changed:
+            save_confirmed_matches(confirmed, cache_path)
+    return match, best
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Match budget line names to actual expense names')
+    parser.add_argument('budget', help='Budget CSV (Name, Category columns)')
+    parser.add_argument('actuals', help='Actuals CSV, e.g. an exported Budget tab (Name column)')
+    parser.add_argument('--threshold', type=float, default=MATCH_THRESHOLD, help='Minimum match score (0-100)')
+    parser.add_argument('--cache', default=ASSIGNMENTS_CSV, help='Confirmed-match cache')
+    parser.add_argument('--no-cache', action='store_true', help='Ignore and do not update the cache')
+    parser.add_argument('--accept', action='store_true',
+                        help='Save the matches shown as confirmed (review them first)')
+    args = parser.parse_args(argv)
+
+    budget = pd.read_csv(args.budget)
+    actuals = pd.read_csv(args.actuals)
+    budget = budget[budget['Name'].notna()]
+    actual_names = actuals['Name'].dropna().astype(str).drop_duplicates().tolist()
+    match, scores = reconcile(budget['Name'], actual_names,
+                              budget['Category'] if 'Category' in budget.columns else None,
+                              cache_path=None if args.no_cache else args.cache, threshold=args.threshold)
+
+    for name, j, s in zip(budget['Name'], match, scores):
+        print(f"{str(name):<40} -> {actual_names[j] if j >= 0 else '(No Match)':<40} {s:5.1f}")
+    print(f"\n{int((match >= 0).sum())} of {len(match)} budget lines matched")
+    if args.accept and not args.no_cache:
+        categories = budget['Category'] if 'Category' in budget.columns else [""] * len(budget)
+        confirm_matches([(name, actual_names[j], cat) for name, j, cat in zip(budget['Name'], match, categories)
+                         if j >= 0], args.cache)
+        print(f"Saved as confirmed in {args.cache}")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
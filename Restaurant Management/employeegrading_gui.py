@@ -1,10 +1,11 @@
 import pandas as pd
-import pdfplumber
 import os
 import tkinter as tk
 from tkinter import ttk, filedialog, messagebox, scrolledtext
 from datetime import datetime
 
+from grading_pipeline import grade_pdf, grade_folder, trend_table
+
 class EmployeeGradingGUI:
     def __init__(self, root):
         self.root = root
@@ -58,6 +59,13 @@ class EmployeeGradingGUI:
                                relief="flat", padx=20, pady=8, cursor="hand2")
         process_btn.pack(side="left", padx=(10, 0))
         
+        # Batch button
+        folder_btn = tk.Button(file_frame, text="📂 Grade Folder", 
+                              command=self._grade_folder,
+                              bg="#7B1FA2", fg="black", font=("Arial", 10, "bold"),
+                              relief="flat", padx=20, pady=8, cursor="hand2")
+        folder_btn.pack(side="left", padx=(10, 0))
+        
         # Grade color key
         key_frame = tk.LabelFrame(self.root, text="Grade Color Key", 
                                  font=("Arial", 10, "bold"),
@@ -274,252 +282,56 @@ class EmployeeGradingGUI:
     
     def _extract_and_grade(self, pdf_path):
         """Extract data from PDF and apply grading"""
-        # Extract tables from PDF
-        all_tables = []
-        with pdfplumber.open(pdf_path) as pdf:
-            for page in pdf.pages:
-                tables = page.extract_tables()
-                for table in tables:
-                    if table:
-                        all_tables.append(table)
-        
-        if not all_tables:
-            raise ValueError("No tables found in PDF")
-        
-        # Find the table with employee data
-        df = None
-        for table in all_tables:
-            if len(table) > 1:
-                headers = table[0]
-                if any('Employee' in str(cell) or 'Sales' in str(cell) for cell in headers if cell):
-                    df = pd.DataFrame(table[1:], columns=headers)
-                    break
-        
-        if df is None:
-            df = pd.DataFrame(all_tables[0][1:], columns=all_tables[0][0])
-        
-        # Clean column names
-        df.columns = df.columns.str.replace('\n', ' ').str.strip()
-        
-        # Map columns
-        def find_column(df, keywords):
-            for col in df.columns:
-                col_lower = str(col).lower()
-                for keyword in keywords:
-                    if keyword.lower() in col_lower:
-                        return col
-            return None
-        
-        employee_col = find_column(df, ['employee', 'name', 'server'])
-        sales_col = find_column(df, ['sales'])
-        void_col = find_column(df, ['void total', 'void count', 'Void Total'])
-        # If not found, try exact match for 'Void Total' (case-insensitive)
-        if not void_col:
-            for col in df.columns:
-                if col.strip().lower() == 'void total':
-                    void_col = col
-                    break
-        hours_col = find_column(df, ['hours worked', 'hours', 'hrs'])
-        turn_time_col = find_column(df, ['average turn time', 'turn time', 'avg turn'])
-        tips_col = find_column(df, ['non-cash tips', 'tips %', 'non cash tips'])
-        
-        # Find void total specifically (case-insensitive)
-        for col in df.columns:
-            if 'void' in col.lower() and 'total' in col.lower():
-                void_col = col
-                break
-        
-        # Rename columns
-        column_mapping = {}
-        if employee_col:
-            column_mapping[employee_col] = 'Employee'
-        if sales_col:
-            column_mapping[sales_col] = 'Sales $'
-        if void_col:
-            column_mapping[void_col] = 'Void total'
-        if hours_col:
-            column_mapping[hours_col] = 'Hours worked'
-        if turn_time_col:
-            column_mapping[turn_time_col] = 'Average turn time'
-        if tips_col:
-            column_mapping[tips_col] = 'Non-cash tips %'
-        
-        df = df.rename(columns=column_mapping)
-        
-        # Clean data
-        df = df.dropna(how='all')
-        df = df[df['Employee'].notna()]
-        df = df[~df['Employee'].astype(str).str.lower().str.contains('employee|total|average|summary', na=False)]
-        
-        for col in df.columns:
-            if df[col].dtype == 'object':
-                df[col] = df[col].astype(str).str.replace('\n', ' ').str.strip()
-        
-        # Clean currency columns
-        def clean_currency(col):
-            return df[col].astype(str).str.replace(r'[$,]', '', regex=True).replace('--', '0').replace('None', '0').replace('nan', '0').astype(float)
-        
-        required_cols = ['Sales $', 'Void total', 'Hours worked']
-        for col in required_cols:
-            if col not in df.columns:
-                df[col] = '0'
-        
-        df['Sales'] = clean_currency('Sales $')
-        df['Void total'] = clean_currency('Void total')
-        df['Hours worked'] = df['Hours worked'].astype(str).replace('--', '0').replace('None', '0').replace('nan', '0').astype(float)
-        
-        # Handle non-cash tips
-        if 'Non-cash tips %' in df.columns:
-            df['Tips %'] = df['Non-cash tips %'].astype(str).str.replace('%', '').str.replace('--', '0').replace('None', '0').replace('nan', '0').astype(float)
-        else:
-            df['Tips %'] = 0.0
-        
-        # Handle turn time
-        def time_to_seconds(time_str):
-            if pd.isna(time_str) or time_str == '--' or str(time_str).lower() in ['none', 'nan', '']:
-                return 0
-            try:
-                time_str = str(time_str).strip()
-                parts = time_str.split(':')
-                if len(parts) >= 2:
-                    minutes = int(parts[0])
-                    seconds = int(parts[1])
-                    return minutes * 60 + seconds
-            except:
-                pass
-            return 0
-        
-        if 'Average turn time' in df.columns:
-            df['Turn Time (sec)'] = df['Average turn time'].apply(time_to_seconds)
-        else:
-            df['Turn Time (sec)'] = 0
-        
-        # Calculate KPIs
-        df['Sales/Hour'] = df['Sales'] / df['Hours worked'].replace(0, 1)
-        df['Void %'] = (df['Void total'] / df['Sales']).replace([float('inf'), -float('inf')], 0).fillna(0)
-        
-        # Weighted scoring
-        weights = {
-            'Sales/Hour': 0.35,
-            'Turn Time (sec)': 0.05,
-            'Void %': 0.20,
-            'Hours worked': 0.20,
-            'Tips %': 0.20
-        }
-        
-        min_max = {col: {'min': df[col].min(), 'max': df[col].max()} for col in weights.keys()}
-        
-        def normalize_score(value, col_name, direction):
-            min_val = min_max[col_name]['min']
-            max_val = min_max[col_name]['max']
-            if max_val == min_val:
-                return 1.0
-            normalized = (value - min_val) / (max_val - min_val)
-            if direction == 'higher_is_better':
-                return normalized
-            elif direction == 'lower_is_better':
-                return 1.0 - normalized
-            return 0.0
-        
-        df['Normalized Sales/Hour'] = df.apply(lambda row: normalize_score(row['Sales/Hour'], 'Sales/Hour', 'higher_is_better'), axis=1)
-        df['Normalized Turn Time'] = df.apply(lambda row: normalize_score(row['Turn Time (sec)'], 'Turn Time (sec)', 'lower_is_better'), axis=1)
-        df['Normalized Void %'] = df.apply(lambda row: normalize_score(row['Void %'], 'Void %', 'lower_is_better'), axis=1)
-        df['Normalized Hours worked'] = df.apply(lambda row: normalize_score(row['Hours worked'], 'Hours worked', 'higher_is_better'), axis=1)
-        df['Normalized Tips %'] = df.apply(lambda row: normalize_score(row['Tips %'], 'Tips %', 'higher_is_better'), axis=1)
-        
-        df['Weighted Score'] = (
-            df['Normalized Sales/Hour'] * weights['Sales/Hour'] +
-            df['Normalized Turn Time'] * weights['Turn Time (sec)'] +
-            df['Normalized Void %'] * weights['Void %'] +
-            df['Normalized Hours worked'] * weights['Hours worked'] +
-            df['Normalized Tips %'] * weights['Tips %']
+        return grade_pdf(pdf_path)
+    
+    def _grade_folder(self):
+        """Grade every weekly PDF in a folder and save a per-employee trend workbook"""
+        folder = filedialog.askdirectory(
+            title="Select Folder of Weekly PDFs",
+            initialdir=os.path.expanduser("~/Downloads")
+        )
+        if not folder:
+            return
+        
+        self.file_label.config(text=f"Grading folder: {os.path.basename(folder)}...", fg="black")
+        self.root.update()
+        try:
+            history, errors = grade_folder(folder)
+        except Exception as e:
+            messagebox.showerror("Error", f"Failed to grade folder:\n{str(e)}")
+            self.file_label.config(text=f"Error: {os.path.basename(folder)}", fg="black")
+            return
+        
+        if history.empty:
+            detail = "\n".join(errors) if errors else "No PDF files found."
+            messagebox.showerror("Error", f"No employee data found in folder\n{detail}")
+            self.file_label.config(text=f"Error: {os.path.basename(folder)}", fg="black")
+            return
+        
+        trend = trend_table(history)
+        self.file_label.config(text=f"Graded {history['source'].nunique()} PDF(s) in {os.path.basename(folder)}", fg="black")
+        
+        filename = filedialog.asksaveasfilename(
+            title="Save Grade Trends",
+            defaultextension=".xlsx",
+            filetypes=[("Excel files", "*.xlsx"), ("All files", "*.*")],
+            initialfile=f"employee_grade_trends_{datetime.now().strftime('%Y%m%d_%H%M%S')}.xlsx",
+            initialdir=os.path.expanduser("~/Documents/AIO Python")
         )
+        if not filename:
+            return
+        try:
+            with pd.ExcelWriter(filename) as writer:
+                trend.to_excel(writer, sheet_name="Trend", index=False)
+                history.to_excel(writer, sheet_name="History", index=False)
+        except Exception as e:
+            messagebox.showerror("Error", f"Failed to save file:\n{str(e)}")
+            return
         
-        # Grade assignment
-        def assign_grade(row):
-            score = row['Weighted Score']
-            tips_pct = row['Tips %']
-            void_pct = row['Void %']
-            hours = row['Hours worked']
-            # N/A grade for employees who didn't work enough hours
-            if hours < 12:
-                return 'N/A'
-            if score >= 0.90:
-                base_grade = 'A'
-            elif score >= 0.80:
-                base_grade = 'B'
-            elif score >= 0.70:
-                base_grade = 'C'
-            elif score >= 0.60:
-                base_grade = 'D'
-            else:
-                base_grade = 'F'
-            # Tips adjustments
-            if tips_pct >= 15:
-                if base_grade == 'B':
-                    base_grade = 'A'
-                elif base_grade == 'C':
-                    base_grade = 'B'
-                elif base_grade == 'D':
-                    base_grade = 'C'
-                elif base_grade == 'F':
-                    base_grade = 'D'
-            elif tips_pct < 6:
-                if base_grade == 'A':
-                    base_grade = 'B'
-                elif base_grade == 'B':
-                    base_grade = 'C'
-                elif base_grade == 'C':
-                    base_grade = 'D'
-                elif base_grade == 'D':
-                    base_grade = 'F'
-            # Void adjustments
-            if void_pct == 0:
-                if base_grade == 'B':
-                    base_grade = 'A'
-                elif base_grade == 'C':
-                    base_grade = 'B'
-                elif base_grade == 'D':
-                    base_grade = 'C'
-                elif base_grade == 'F':
-                    base_grade = 'D'
-            elif void_pct >= 0.08:
-                if base_grade == 'A':
-                    base_grade = 'B'
-                elif base_grade == 'B':
-                    base_grade = 'C'
-                elif base_grade == 'C':
-                    base_grade = 'D'
-                elif base_grade == 'D':
-                    base_grade = 'F'
-            elif void_pct >= 0.06:
-                if base_grade == 'A':
-                    base_grade = 'B'
-                elif base_grade == 'B':
-                    base_grade = 'C'
-                elif base_grade == 'C':
-                    base_grade = 'D'
-            elif void_pct >= 0.04:
-                if base_grade == 'A':
-                    base_grade = 'B'
-                elif base_grade == 'B':
-                    base_grade = 'C'
-            elif void_pct >= 0.02:
-                if base_grade == 'A':
-                    base_grade = 'B'
-            return base_grade
-        
-        df['Grade'] = df.apply(assign_grade, axis=1)
-        
-        # Create results sorted by grade then score
-        grade_order = {'A': 1, 'B': 2, 'C': 3, 'D': 4, 'F': 5, 'N/A': 6}
-        df['Grade_Order'] = df['Grade'].map(grade_order)
-        grading_results = df[['Employee', 'Sales/Hour', 'Turn Time (sec)', 'Void %', 'Void total', 'Tips %', 
-                              'Hours worked', 'Weighted Score', 'Grade', 'Grade_Order']].sort_values(
-                                  by=['Grade_Order', 'Weighted Score'], ascending=[True, False])
-        grading_results = grading_results.drop('Grade_Order', axis=1)
-        
-        return grading_results
+        message = f"Graded {history['source'].nunique()} PDF(s), {len(trend)} employee(s).\nSaved to:\n{filename}"
+        if errors:
+            message += "\n\nSkipped:\n" + "\n".join(errors)
+        messagebox.showinfo("Success", message)
     
     def _display_results(self):
         """Display results in the treeview"""
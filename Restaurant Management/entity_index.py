@@ -0,0 +1,199 @@
+#!/usr/bin/env python3
+"""
+Entity index for ledger names
+Keeps the canonical vendors and employees in entity_index.csv (one row per
+alias), keyed by the same normalized names the budget reconciliation uses,
+so "US FOODS INC" and "US Foods" resolve to one entity.
+
+Names are resolved and classified for a whole frame at once: each distinct
+name is normalized once, looked up in the alias table, and names the index
+does not know fall back to the business / person heuristics, vectorized
+with pandas string methods.
+
+Shared by combine_and_group_by_name_location_type.py; the budget tools can
+load the same index to canonicalize vendor names.
+
+Batch usage:
+    python entity_index.py Kingsville.csv Alice.csv --employees users-export.xls --out combined.csv
+    python entity_index.py --add "Lowes" "Lowe's" Vendor
+"""
+import os
+import re
+import csv
+import sys
+import argparse
+
+import numpy as np
+import pandas as pd
+
+from budget_reconcile import normalize
+
+ENTITY_INDEX_CSV = os.path.join(os.path.dirname(os.path.abspath(__file__)), "entity_index.csv")
+
+EMPLOYEE = "Employee"
+VENDOR = "Vendor"
+
+# Business keywords for heuristic (matched anywhere in the lowercased name)
+BUSINESS_KEYWORDS = [
+    "inc", "llc", "corp", "company", "co", "ltd", "services", "store",
+    "enterprises", "group", "partners", "pllc", "pc", "plc", "associates"
+]
+_BUSINESS_RE = "|".join(re.escape(k) for k in BUSINESS_KEYWORDS)
+
+
+class EntityIndex:
+    """Alias table: normalized key -> (canonical name, kind)"""
+
+    def __init__(self):
+        self._entries = {}
+
+    def __len__(self):
+        return len(self._entries)
+
+    def __contains__(self, name):
+        return normalize(name) in self._entries
+
+    @classmethod
+    def load(cls, path=ENTITY_INDEX_CSV):
+        """Index from an Alias,Canonical,Kind CSV (empty if the file is missing)"""
+        index = cls()
+        if os.path.exists(path):
+            with open(path, "r", newline="", encoding="utf-8") as f:
+                for row in csv.DictReader(f):
+                    index.add(row["Alias"], row.get("Canonical") or None, row.get("Kind") or VENDOR)
+        return index
+
+    def save(self, path=ENTITY_INDEX_CSV):
+        with open(path, "w", newline="", encoding="utf-8") as f:
+            writer = csv.writer(f)
+            writer.writerow(["Alias", "Canonical", "Kind"])
+            for alias, canonical, kind in sorted(self._entries.values(), key=lambda e: (e[2], e[1], e[0])):
+                writer.writerow([alias, canonical, kind])
+
+    def add(self, alias, canonical=None, kind=VENDOR):
+        """Register alias for canonical (itself by default); later entries win"""
+        alias = str(alias).strip()
+        key = normalize(alias)
+        if key:
+            self._entries[key] = (alias, str(canonical).strip() if canonical else alias, kind)
+
+    def add_employees(self, names):
+        """Register every non-blank name as its own Employee entity"""
+        for name in pd.Series(list(names), dtype=object).dropna().astype(str).str.strip():
+            if name and normalize(name) not in self._entries:
+                self.add(name, kind=EMPLOYEE)
+
+    def lookup(self, name):
+        """(canonical, kind) for a name, or None"""
+        entry = self._entries.get(normalize(name))
+        return (entry[1], entry[2]) if entry else None
+
+    def resolve(self, names):
+        """Canonical name and kind for every row
+
+        Returns a frame aligned with names with columns Canonical and Kind.
+        Unknown names get Kind None and the first spelling seen for their
+        normalized key, so case and punctuation variants still group together.
+        """
+        names = pd.Series(names).astype(str).str.strip() if not isinstance(names, pd.Series) \
+            else names.astype(str).str.strip()
+        codes, uniques = pd.factorize(names)
+        keys = pd.Index(uniques).map(normalize)
+        canonical = np.empty(len(uniques), dtype=object)
+        kinds = np.empty(len(uniques), dtype=object)
+        first_seen = {}
+        for u, (name, key) in enumerate(zip(uniques, keys)):
+            entry = self._entries.get(key)
+            if entry:
+                canonical[u], kinds[u] = entry[1], entry[2]
+            else:
+                canonical[u], kinds[u] = first_seen.setdefault(key, name), None
+        return pd.DataFrame({'Canonical': canonical[codes], 'Kind': kinds[codes]}, index=names.index)
+
+    def classify(self, names, kinds=None):
+        """Employee / Business / Likely Person / Unknown for every name
+
+        Index kinds decide first (Employee, or Business for vendors); other
+        names use the keyword, character and word-count heuristics.
+        """
+        names = names if isinstance(names, pd.Series) else pd.Series(names)
+        if kinds is None:
+            resolved = self.resolve(names)
+            names, kinds = resolved['Canonical'], resolved['Kind']
+        codes, uniques = pd.factorize(names.astype(str))
+        text = pd.Series(uniques, dtype=object).astype(str)
+        words = text.str.split().str.len().fillna(0).to_numpy()
+        business = (text.str.lower().str.contains(_BUSINESS_RE, regex=True).to_numpy()
+                    | text.str.contains(r"[^a-zA-Z\s\-'.]", regex=True).to_numpy()
+                    | (words > 3))
+        heuristic = np.select([business, (words > 1) & (words <= 3)], ["Business", "Likely Person"], "Unknown")
+
+        kinds = pd.Series(kinds, index=names.index, dtype=object).to_numpy()
+        return pd.Series(np.select([kinds == EMPLOYEE, kinds == VENDOR], [EMPLOYEE, "Business"],
+                                   heuristic.astype(object)[codes]),
+                         index=names.index, dtype=object)
+
+
+_index = None
+
+
+def get_entity_index(path=ENTITY_INDEX_CSV):
+    """Shared index loaded once per process"""
+    global _index
+    if _index is None:
+        _index = EntityIndex.load(path)
+    return _index
+
+
+def read_employee_exports(paths):
+    """Every cell of the user-export workbooks (any column may hold the name)"""
+    names = []
+    for path in paths:
+        user_df = pd.read_excel(path)
+        for col in user_df.columns:
+            names.extend(user_df[col].dropna().astype(str).str.strip())
+    return names
+
+
+def consolidate(frames, index):
+    """Combine per-location ledgers and sum numeric columns by entity, location and type
+
+    frames maps location -> ledger frame with a Name column.
+    """
+    combined = pd.concat([df.assign(Location=location) for location, df in frames.items()], ignore_index=True)
+    resolved = index.resolve(combined['Name'])
+    combined['Name'] = resolved['Canonical']
+    combined['Type'] = index.classify(resolved['Canonical'], resolved['Kind'])
+    return combined.groupby(['Name', 'Location', 'Type'], as_index=False).sum(numeric_only=True)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Combine location ledgers grouped by entity, location and type')
+    parser.add_argument('ledgers', nargs='*', help='Location CSVs (location taken from the file name)')
+    parser.add_argument('--employees', nargs='*', default=[], help='User-export workbooks to add as employees')
+    parser.add_argument('--index', default=ENTITY_INDEX_CSV, help='Entity index CSV')
+    parser.add_argument('--add', nargs=3, metavar=('ALIAS', 'CANONICAL', 'KIND'), help='Add one alias and exit')
+    parser.add_argument('--out', default='combined_grouped_by_name_location_type.csv', help='Output CSV')
+    args = parser.parse_args(argv)
+
+    index = EntityIndex.load(args.index)
+    if args.add:
+        index.add(*args.add)
+        index.save(args.index)
+        print(f"{len(index):,} aliases in {args.index}")
+        return 0
+    if args.employees:
+        index.add_employees(read_employee_exports(args.employees))
+        index.save(args.index)
+    if not args.ledgers:
+        parser.error('at least one ledger CSV is required')
+
+    frames = {os.path.splitext(os.path.basename(p))[0].capitalize(): pd.read_csv(p) for p in args.ledgers}
+    grouped = consolidate(frames, index)
+    grouped.to_csv(args.out, index=False)
+    print(f"Grouped data saved to {args.out} ({len(grouped):,} rows)")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
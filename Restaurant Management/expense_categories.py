@@ -0,0 +1,288 @@
+#!/usr/bin/env python3
+"""
+Expense categorization engine
+Compiles every category's keywords (lowercased) into one Aho-Corasick
+automaton and classifies a whole P&L ledger in one vectorized pass: each
+distinct Name / Type text is scanned once and rows pick up their category
+by code lookup.
+
+A row belongs to the first category, in map order, with a keyword contained
+in its Name or its Type (case-insensitive) - the same rule the per-row
+get_category loops used.
+
+Shared by Tools/billaverage.py, billaverage_gui.py, billaverage_streamlit.py
+and Big House Budget/expensereportbudget.py. The category map is read from
+category_map.csv next to this file.
+
+Batch usage:
+    python expense_categories.py "Profit and Loss Detail 2025.xlsm" --out categorized.csv
+    python expense_categories.py --benchmark 100000
+"""
+import os
+import csv
+import sys
+import time
+import argparse
+from collections import deque
+
+import numpy as np
+import pandas as pd
+
+CATEGORY_MAP_CSV = os.path.join(os.path.dirname(os.path.abspath(__file__)), "category_map.csv")
+
+# Used when category_map.csv is missing or empty
+DEFAULT_CATEGORY_MAP = {
+    "Food Expense": [
+        "Big House Burgers Kingsville", "CC Produce", "Corpus Christi Produce",
+        "M&M Ramos Distribution", "MCM Bread and Sweets", "US Foods",
+        "Cash & Carry", "Pepsi Cola", "Pepsi-Cola"
+    ],
+    "Beer Expense": [
+        "Andrew’s Distributors", "L&F Distributors"
+    ],
+    "Liquor Expenses": [
+        "The Jigger", "Jigger", "Discount Liquor"
+    ],
+    "Payroll Expense": [
+        "Hourly Regular", "Hourly OT", "Manager Salary", "Assistant Manager",
+        "Admin", "Vacation", "Bonus"
+    ],
+    "Utility Expense": [
+        "Centerpoint", "Center Point", "Constellation", "Directv", "Jim Wells",
+        "Jim wells County Appraisal District", "NuCo2", "STGR", "Spectrum",
+        "Toast", "Easy", "City of Kingsville", "City of Alice"
+    ],
+    "Maintenance": [
+        "Repair", "Maintenance", "Service Call", "Plumbing", "HVAC", "Electrical"
+    ],
+    "Tax & Licenses": [
+        "Tax", "License", "Permit", "Registration", "State Comptroller", "IRS"
+    ],
+    "Insurance": [
+        "Insurance", "Policy", "Premium"
+    ],
+    "Advertising": [
+        "Ad", "Advertising", "Marketing", "Promotion"
+    ],
+    "Office Supplies": [
+        "Office", "Supplies", "Stationery", "Printer", "Ink"
+    ],
+    "Bank Fees": [
+        "Bank Fee", "Service Charge", "Overdraft", "Wire Fee"
+    ],
+    "Miscellaneous": [
+        "Misc", "Other", "Uncategorized"
+    ],
+    "Reimbursement": [
+        "Reimburse", "Reimbursement", "Refund", "Repayment"
+    ],
+    "Employee Check Tip": [
+        "Tip", "Employee Tip", "Check Tip"
+    ],
+    "Entertainment": [
+        "Entertainment", "Music", "DJ", "Band"
+    ]
+}
+
+
+# ==================== CATEGORY MAP FILE ====================
+
+def load_category_map(path=CATEGORY_MAP_CSV, default=DEFAULT_CATEGORY_MAP):
+    """Category -> keyword list from a Category,Keywords CSV (keywords joined by ';')
+
+    Returns a copy of default if the file is missing or has no rows.
+    """
+    category_map = {}
+    if os.path.exists(path):
+        with open(path, "r", newline="", encoding="utf-8") as f:
+            for row in csv.DictReader(f):
+                keywords = row.get("Keywords") or ""
+                category_map[row["Category"]] = [k.strip() for k in keywords.split(";") if k.strip()]
+    if not category_map:
+        category_map = {cat: list(keywords) for cat, keywords in default.items()}
+    return category_map
+
+
+def save_category_map(category_map, path=CATEGORY_MAP_CSV):
+    """Write a category map as Category,Keywords (semicolons allow commas in keywords)"""
+    with open(path, "w", newline="", encoding="utf-8") as f:
+        writer = csv.writer(f)
+        writer.writerow(["Category", "Keywords"])
+        for cat, keywords in category_map.items():
+            writer.writerow([cat, ";".join(keywords)])
+
+
+# ==================== MATCHING ====================
+
+def _text(value):
+    """Ledger cell as text: blanks become '', numbers their str()"""
+    if isinstance(value, str):
+        return value
+    return "" if value is None or pd.isna(value) else str(value)
+
+
+class CategoryMatcher:
+    """Aho-Corasick automaton over every keyword of every category
+
+    Each node keeps the lowest category index among the keywords ending
+    there (directly or through its failure chain), so one scan of a text
+    gives the first matching category in map order.
+    """
+
+    def __init__(self, category_map):
+        self.categories = list(category_map)
+        self._none = len(self.categories)
+
+        self._goto = [{}]
+        self._fail = [0]
+        self._best = [self._none]
+        for index, keywords in enumerate(category_map.values()):
+            for keyword in keywords:
+                if not keyword:
+                    continue
+                node = 0
+                for ch in keyword.lower():
+                    nxt = self._goto[node].get(ch)
+                    if nxt is None:
+                        nxt = len(self._goto)
+                        self._goto[node][ch] = nxt
+                        self._goto.append({})
+                        self._fail.append(0)
+                        self._best.append(self._none)
+                    node = nxt
+                self._best[node] = min(self._best[node], index)
+
+        # Breadth-first so every failure target is finished before it is used
+        queue = deque(self._goto[0].values())
+        while queue:
+            node = queue.popleft()
+            for ch, nxt in self._goto[node].items():
+                queue.append(nxt)
+                fail = self._fail[node]
+                while fail and ch not in self._goto[fail]:
+                    fail = self._fail[fail]
+                self._fail[nxt] = self._goto[fail].get(ch, 0)
+                self._best[nxt] = min(self._best[nxt], self._best[self._fail[nxt]])
+
+    def index(self, text):
+        """Index of the first category with a keyword in text (len(categories) if none)"""
+        goto, fail, best = self._goto, self._fail, self._best
+        found = self._none
+        node = 0
+        for ch in text.lower():
+            while node and ch not in goto[node]:
+                node = fail[node]
+            node = goto[node].get(ch, 0)
+            if best[node] < found:
+                found = best[node]
+                if found == 0:
+                    break
+        return found
+
+    def _indexes(self, values):
+        """Category index per row; each distinct text is scanned once"""
+        codes, uniques = pd.factorize(values)
+        found = np.fromiter((self.index(_text(value)) for value in uniques), dtype=np.int64, count=len(uniques))
+        # Blank cells factorize to -1, which picks the trailing "no category"
+        return np.append(found, self._none)[codes]
+
+    def categorize(self, names, types=None, default=None):
+        """Category for every row from its Name (and Type) cell
+
+        Returns a Series aligned with names; rows matching no keyword get
+        default.
+        """
+        names = names if isinstance(names, pd.Series) else pd.Series(names)
+        found = self._indexes(names)
+        if types is not None:
+            found = np.minimum(found, self._indexes(types))
+        labels = np.array(self.categories + [default], dtype=object)
+        return pd.Series(labels[found], index=names.index, dtype=object)
+
+    def __call__(self, name, type_=None, default=None):
+        """Category for a single name / type pair"""
+        found = min(self.index(_text(name)), self.index(_text(type_)))
+        return self.categories[found] if found < self._none else default
+
+
+_matchers = {}
+
+
+def get_matcher(category_map=None):
+    """Compiled matcher for a category map (default: category_map.csv)
+
+    Matchers are cached by map contents, so callers that edit their map
+    in place just call this again.
+    """
+    if category_map is None:
+        category_map = load_category_map()
+    key = tuple((cat, tuple(keywords)) for cat, keywords in category_map.items())
+    matcher = _matchers.get(key)
+    if matcher is None:
+        if len(_matchers) >= 8:
+            _matchers.clear()
+        matcher = _matchers[key] = CategoryMatcher(category_map)
+    return matcher
+
+
+def categorize_frame(df, name_col='Name', type_col='Type', category_map=None, default=None):
+    """Category Series for a ledger frame (Type is optional)"""
+    matcher = get_matcher(category_map)
+    types = df[type_col] if type_col in df.columns else None
+    return matcher.categorize(df[name_col], types, default=default)
+
+
+# ==================== BENCHMARK ====================
+
+def synthetic_ledger(rows, category_map, seed=0):
+    """Random P&L detail rows whose names mix keywords with unmatched vendors"""
+    rng = np.random.default_rng(seed)
+    keywords = [k for keywords in category_map.values() for k in keywords] or ["Vendor"]
+    vendors = [f"{rng.choice(keywords)} #{i}" if i % 3 else f"Unlisted Vendor {i}" for i in range(2000)]
+    types = ["Check", "Bill Payment (Check)", "Expense", "Deposit", "Journal Entry", "Hourly Regular"]
+    return pd.DataFrame({
+        'Type': rng.choice(types, rows),
+        'Name': rng.choice(vendors, rows),
+        'Debit': rng.uniform(5, 2500, rows).round(2),
+    })
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Categorize P&L detail by vendor/type keywords')
+    parser.add_argument('ledger', nargs='?', help='P&L detail workbook or CSV')
+    parser.add_argument('--map', default=CATEGORY_MAP_CSV, help='Category map CSV')
+    parser.add_argument('--header', type=int, default=0, help='Header row of the ledger sheet')
+    parser.add_argument('--out', help='Write the categorized rows here (CSV)')
+    parser.add_argument('--benchmark', type=int, metavar='ROWS', help='Time a synthetic ledger of ROWS rows')
+    args = parser.parse_args(argv)
+
+    category_map = load_category_map(args.map)
+    if args.benchmark:
+        df = synthetic_ledger(args.benchmark, category_map)
+        start = time.perf_counter()
+        categories = categorize_frame(df, category_map=category_map, default='Other')
+        elapsed = time.perf_counter() - start
+        print(f"{len(df):,} rows, {df['Name'].nunique():,} distinct names -> {elapsed * 1000:.1f} ms "
+              f"({categories.ne('Other').sum():,} categorized)")
+        return 0
+    if not args.ledger:
+        parser.error('a ledger file or --benchmark is required')
+
+    if args.ledger.lower().endswith('.csv'):
+        df = pd.read_csv(args.ledger, header=args.header)
+    else:
+        df = pd.read_excel(args.ledger, header=args.header, engine='openpyxl')
+    df['Category'] = categorize_frame(df, category_map=category_map, default='Other')
+    amounts = next((c for c in df.columns if str(c).lower() in ('debit', 'amount', 'total')), None)
+    if amounts is not None:
+        totals = pd.to_numeric(df[amounts], errors='coerce').fillna(0).groupby(df['Category'], sort=False).sum()
+        for cat, total in totals.sort_values(ascending=False).items():
+            print(f"{cat:<30} ${total:>15,.2f}")
+    if args.out:
+        df.to_csv(args.out, index=False)
+        print(f"Categorized rows written to {args.out}")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
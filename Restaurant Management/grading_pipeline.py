@@ -0,0 +1,472 @@
+#!/usr/bin/env python3
+"""
+Employee grading pipeline
+Finds the employee productivity table in a PDF (pages extracted in parallel,
+stopping at the first page that has it), caches the table by PDF hash and
+grades every employee with vectorized scoring.
+
+Shared by employeegrading_gui.py and employeegrading.py.
+
+Batch usage:
+    python grading_pipeline.py ~/Downloads/Alice_2025-11-03.pdf
+    python grading_pipeline.py --folder ~/Downloads/weekly --trend trend.csv
+"""
+import os
+import re
+import sys
+import json
+import hashlib
+import logging
+import argparse
+import threading
+from datetime import datetime
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import pandas as pd
+
+try:
+    import pdfplumber
+except ImportError:
+    pdfplumber = None
+
+log = logging.getLogger(__name__)
+
+CACHE_DIR = os.path.expanduser("~/Documents/AIO Python/grading_cache")
+
+# Weighted score components: column -> (weight, higher_is_better)
+WEIGHTS = {
+    'Sales/Hour': (0.35, True),
+    'Turn Time (sec)': (0.05, False),
+    'Void %': (0.20, False),
+    'Hours worked': (0.20, True),
+    'Tips %': (0.20, True),
+}
+
+GRADES = np.array(['A', 'B', 'C', 'D', 'F'])
+GRADE_THRESHOLDS = [0.90, 0.80, 0.70, 0.60]   # A, B, C, D lower bounds
+GRADE_ORDER = {'A': 1, 'B': 2, 'C': 3, 'D': 4, 'F': 5, 'N/A': 6}
+MIN_HOURS = 12   # Fewer hours than this grades as N/A
+
+# Void % lower bound -> worst grade (index into GRADES) that still drops one level
+VOID_PENALTIES = [(0.08, 3), (0.06, 2), (0.04, 1), (0.02, 0)]
+
+RESULT_COLUMNS = ['Employee', 'Sales/Hour', 'Turn Time (sec)', 'Void %', 'Void total', 'Tips %',
+                  'Hours worked', 'Weighted Score', 'Grade']
+
+# Tables keyed by PDF hash for this process (the disk cache survives restarts)
+MAX_CACHED_TABLES = 256   # Least recently used tables beyond this are evicted
+_memory_cache = OrderedDict()
+_cache_lock = threading.Lock()
+
+
+# ==================== EXTRACTION ====================
+
+def file_hash(path):
+    """SHA-256 of a file's contents"""
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(1 << 20), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def is_employee_table(table):
+    """True for a table whose header row mentions Employee or Sales"""
+    return len(table) > 1 and any(
+        'Employee' in str(cell) or 'Sales' in str(cell) for cell in table[0] if cell
+    )
+
+
+def _page_tables(pdf, page_number):
+    return [table for table in pdf.pages[page_number].extract_tables() if table]
+
+
+_worker_pdf = None
+
+def _open_worker_pdf(pdf_path):
+    """Pool initializer: open the PDF once per worker process"""
+    global _worker_pdf
+    _worker_pdf = pdfplumber.open(pdf_path)
+
+
+def _worker_page_tables(page_number):
+    return _page_tables(_worker_pdf, page_number)
+
+
+def _scan_pages(pdf_path, workers=None):
+    """Return (table, page_number) for the employee table
+
+    Page 1 is read in-process since that is where the table usually is;
+    the remaining pages are extracted in parallel and checked in page
+    order, cancelling pages that are no longer needed once a match is
+    found. Without a match the first table in the PDF is used.
+    """
+    if pdfplumber is None:
+        raise ImportError("pdfplumber is required to read PDFs (pip install pdfplumber)")
+
+    first_table = None
+    with pdfplumber.open(pdf_path) as pdf:
+        page_count = len(pdf.pages)
+        if not page_count:
+            raise ValueError("No tables found in PDF")
+        for table in _page_tables(pdf, 0):
+            if is_employee_table(table):
+                return table, 1
+            first_table = first_table or (table, 1)
+
+        workers = workers or min(page_count - 1, os.cpu_count() or 1)
+        if page_count == 2 or workers <= 1:
+            for page_number in range(1, page_count):
+                for table in _page_tables(pdf, page_number):
+                    if is_employee_table(table):
+                        return table, page_number + 1
+                    first_table = first_table or (table, page_number + 1)
+            if first_table is None:
+                raise ValueError("No tables found in PDF")
+            return first_table
+
+    with ProcessPoolExecutor(max_workers=workers, initializer=_open_worker_pdf,
+                             initargs=(pdf_path,)) as pool:
+        futures = [pool.submit(_worker_page_tables, n) for n in range(1, page_count)]
+        try:
+            for page_number, future in enumerate(futures, 2):
+                for table in future.result():
+                    if is_employee_table(table):
+                        return table, page_number
+                    first_table = first_table or (table, page_number)
+        finally:
+            for future in futures:
+                future.cancel()
+
+    if first_table is None:
+        raise ValueError("No tables found in PDF")
+    return first_table
+
+
+def _remember(key, table):
+    with _cache_lock:
+        _memory_cache[key] = table
+        _memory_cache.move_to_end(key)
+        while len(_memory_cache) > MAX_CACHED_TABLES:
+            _memory_cache.popitem(last=False)
+
+
+def extract_employee_table(pdf_path, workers=None, use_cache=True):
+    """Get the employee table (header row first) from a PDF, cached by file hash"""
+    key = file_hash(pdf_path)
+    cache_path = os.path.join(CACHE_DIR, f"{key}.json")
+    if use_cache:
+        with _cache_lock:
+            if key in _memory_cache:
+                _memory_cache.move_to_end(key)
+                return _memory_cache[key]
+        try:
+            with open(cache_path, 'r', encoding='utf-8') as f:
+                table = json.load(f)['table']
+            _remember(key, table)
+            return table
+        except (OSError, ValueError, KeyError):
+            pass
+
+    table, page_number = _scan_pages(pdf_path, workers)
+    _remember(key, table)
+    try:
+        os.makedirs(CACHE_DIR, exist_ok=True)
+        tmp_path = f"{cache_path}.tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump({'source': os.path.basename(pdf_path), 'page': page_number, 'table': table}, f)
+        os.replace(tmp_path, cache_path)
+    except OSError as e:
+        log.warning("Could not write grading cache: %s", e)
+    return table
+
+
+# ==================== CLEANING ====================
+
+def find_column(df, keywords):
+    """Find column that contains any of the keywords"""
+    for col in df.columns:
+        col_lower = str(col).lower()
+        for keyword in keywords:
+            if keyword.lower() in col_lower:
+                return col
+    return None
+
+
+def _to_number(series, strip=None):
+    """Text cells -> floats after removing the strip pattern; '--', 'None' and 'nan' count as 0"""
+    text = series.astype(str)
+    if strip:
+        text = text.str.replace(strip, '', regex=True)
+    return text.replace({'--': '0', 'None': '0', 'nan': '0'}).astype(float)
+
+
+def _turn_time_seconds(series):
+    """'M:SS' (or 'M:SS:xx') turn times -> seconds; anything else is 0"""
+    parts = series.astype(str).str.strip().str.extract(r'^([+-]?\d+)\s*:\s*([+-]?\d+)\s*(?::|$)')
+    minutes = pd.to_numeric(parts[0], errors='coerce')
+    seconds = pd.to_numeric(parts[1], errors='coerce')
+    return (minutes * 60 + seconds).fillna(0).astype(int)
+
+
+def table_to_frame(table):
+    """Employee table -> cleaned frame with Sales, Void total, Hours worked, Tips % and Turn Time (sec)"""
+    df = pd.DataFrame(table[1:], columns=table[0])
+    df.columns = df.columns.str.replace('\n', ' ').str.strip()
+
+    column_mapping = {}
+    for target, keywords in (
+        ('Employee', ['employee', 'name', 'server']),
+        ('Sales $', ['sales']),
+        ('Void total', ['void total', 'void count']),
+        ('Hours worked', ['hours worked', 'hours', 'hrs']),
+        ('Average turn time', ['average turn time', 'turn time', 'avg turn']),
+        ('Non-cash tips %', ['non-cash tips', 'tips %', 'non cash tips']),
+    ):
+        col = find_column(df, keywords)
+        if target == 'Void total':
+            # Prefer the void total over the void count
+            col = next((c for c in df.columns if 'void' in c.lower() and 'total' in c.lower()), col)
+        if col:
+            column_mapping[col] = target
+    df = df.rename(columns=column_mapping)
+
+    # Drop empty rows and header/footer rows
+    df = df.dropna(how='all')
+    df = df[df['Employee'].notna()]
+    df = df[~df['Employee'].astype(str).str.lower().str.contains('employee|total|average|summary', na=False)]
+
+    for col in df.columns:
+        if pd.api.types.is_string_dtype(df[col]):
+            df[col] = df[col].astype(str).str.replace('\n', ' ').str.strip()
+
+    for col in ['Sales $', 'Void total', 'Hours worked']:
+        if col not in df.columns:
+            df[col] = '0'
+
+    df['Sales'] = _to_number(df['Sales $'], strip=r'[$,]')
+    df['Void total'] = _to_number(df['Void total'], strip=r'[$,]')
+    df['Hours worked'] = _to_number(df['Hours worked'])
+    if 'Non-cash tips %' in df.columns:
+        df['Tips %'] = _to_number(df['Non-cash tips %'], strip='%')
+    else:
+        df['Tips %'] = 0.0
+    if 'Average turn time' in df.columns:
+        df['Turn Time (sec)'] = _turn_time_seconds(df['Average turn time'])
+    else:
+        df['Turn Time (sec)'] = 0
+    return df
+
+
+# ==================== GRADING ====================
+
+def score(df):
+    """Add Sales/Hour, Void %, normalized components and Weighted Score
+
+    Each component is min-max normalized across the frame (1.0 when every
+    employee has the same value) and inverted where lower is better.
+    """
+    df = df.copy()
+    df['Sales/Hour'] = df['Sales'] / df['Hours worked'].replace(0, 1)
+    df['Void %'] = (df['Void total'] / df['Sales']).replace([np.inf, -np.inf], 0).fillna(0)
+
+    components = df[list(WEIGHTS)].astype(float)
+    values = components.to_numpy()
+    low = components.min().to_numpy()
+    span = components.max().to_numpy() - low
+    normalized = np.ones_like(values)
+    np.divide(values - low, span, out=normalized, where=span != 0)
+    higher = np.array([h for _w, h in WEIGHTS.values()])
+    normalized = np.where(higher | (span == 0), normalized, 1.0 - normalized)
+
+    for i, col in enumerate(WEIGHTS):
+        df[f"Normalized {col.replace(' (sec)', '')}"] = normalized[:, i]
+    df['Weighted Score'] = normalized @ np.array([w for w, _h in WEIGHTS.values()])
+    return df
+
+
+def assign_grades(score_values, tips_pct, void_pct, hours=None, min_hours=MIN_HOURS):
+    """Letter grades from weighted score, adjusted for tips % and void %
+
+    Tips >= 15% raise a grade one level and tips < 6% lower it; 0% voids
+    raise it and each void band lowers grades at or below its worst grade.
+    Employees under min_hours get N/A (pass min_hours=None to grade everyone).
+    """
+    score_values = np.asarray(score_values, dtype=float)
+    tips_pct = np.asarray(tips_pct, dtype=float)
+    void_pct = np.asarray(void_pct, dtype=float)
+
+    grade = np.select([score_values >= t for t in GRADE_THRESHOLDS], range(len(GRADE_THRESHOLDS)),
+                      default=len(GRADES) - 1)
+    last = len(GRADES) - 1
+
+    grade = np.where(tips_pct >= 15, np.maximum(grade - 1, 0),
+                     np.where(tips_pct < 6, np.minimum(grade + 1, last), grade))
+
+    worst = np.select([void_pct >= bound for bound, _g in VOID_PENALTIES],
+                      [g for _b, g in VOID_PENALTIES], default=-1)
+    grade = np.where(void_pct == 0, np.maximum(grade - 1, 0),
+                     np.where(grade <= worst, grade + 1, grade))
+
+    letters = GRADES[grade].astype(object)
+    if hours is not None and min_hours is not None:
+        letters[np.asarray(hours, dtype=float) < min_hours] = 'N/A'
+    return letters
+
+
+def grade_frame(df, min_hours=MIN_HOURS):
+    """Score and grade a frame from table_to_frame"""
+    df = score(df)
+    df['Grade'] = assign_grades(df['Weighted Score'], df['Tips %'], df['Void %'],
+                                df['Hours worked'], min_hours)
+    return df
+
+
+def results_table(df):
+    """RESULT_COLUMNS sorted by grade, then score (highest first)"""
+    order = df['Grade'].map(GRADE_ORDER)
+    return df.assign(_order=order).sort_values(
+        by=['_order', 'Weighted Score'], ascending=[True, False]
+    )[RESULT_COLUMNS]
+
+
+def grade_pdf(pdf_path, min_hours=MIN_HOURS, workers=None, use_cache=True):
+    """Extract, clean and grade one PDF; returns results_table()"""
+    table = extract_employee_table(pdf_path, workers=workers, use_cache=use_cache)
+    return results_table(grade_frame(table_to_frame(table), min_hours))
+
+
+# ==================== BATCH / TREND ====================
+
+_PERIOD_DATE = re.compile(r'(\d{4})[-_.]?(\d{2})[-_.]?(\d{2})')
+
+
+def period_label(pdf_path):
+    """Week label for a PDF: a YYYY-MM-DD date in the filename, else its modified date"""
+    match = _PERIOD_DATE.search(os.path.basename(pdf_path))
+    if match:
+        try:
+            return datetime(*map(int, match.groups())).strftime('%Y-%m-%d')
+        except ValueError:
+            pass
+    return datetime.fromtimestamp(os.path.getmtime(pdf_path)).strftime('%Y-%m-%d')
+
+
+def _grade_job(job):
+    """Worker: grade one PDF (runs in a child process)"""
+    pdf_path, min_hours = job
+    try:
+        # Pages are read serially here; the batch already runs one PDF per process
+        return grade_pdf(pdf_path, min_hours, workers=1), None
+    except Exception as e:
+        return None, f"{os.path.basename(pdf_path)}: {e}"
+
+
+def grade_folder(folder, min_hours=MIN_HOURS, max_workers=None):
+    """Grade every PDF in a folder, one process per PDF
+
+    Returns (history, errors): history is every result row with period
+    and source columns added, oldest period first.
+    """
+    paths = sorted(os.path.join(folder, name) for name in os.listdir(folder)
+                   if name.lower().endswith('.pdf'))
+    if not paths:
+        return pd.DataFrame(columns=['period', 'source'] + RESULT_COLUMNS), []
+
+    jobs = [(path, min_hours) for path in paths]
+    if len(jobs) == 1 or max_workers == 1:
+        outcomes = [_grade_job(job) for job in jobs]
+    else:
+        with ProcessPoolExecutor(max_workers=max_workers or min(len(jobs), os.cpu_count() or 1)) as pool:
+            outcomes = list(pool.map(_grade_job, jobs))
+
+    frames, errors = [], []
+    for path, (result, error) in zip(paths, outcomes):
+        if error:
+            errors.append(error)
+            continue
+        frames.append(result.assign(period=period_label(path), source=os.path.basename(path)))
+    if not frames:
+        return pd.DataFrame(columns=['period', 'source'] + RESULT_COLUMNS), errors
+
+    history = pd.concat(frames, ignore_index=True)
+    history = history[['period', 'source'] + RESULT_COLUMNS].sort_values(['period', 'source'], kind='stable')
+    return history.reset_index(drop=True), errors
+
+
+def trend_table(history, value='Weighted Score'):
+    """One row per employee, one column per period, plus average, change and latest grade
+
+    Change is the latest period's value minus the first period's the
+    employee was graded in.
+    """
+    if history.empty:
+        return pd.DataFrame()
+    history = history.assign(_name=history['Employee'].str.strip())
+    wide = history.pivot_table(index='_name', columns='period', values=value, aggfunc='mean')
+    wide = wide.reindex(columns=sorted(wide.columns))
+
+    values = wide.to_numpy(dtype=float)
+    present = ~np.isnan(values)
+    first = values[np.arange(len(values)), present.argmax(axis=1)]
+    last = values[np.arange(len(values)), present.shape[1] - 1 - present[:, ::-1].argmax(axis=1)]
+
+    out = wide.round(3)
+    out['Periods'] = present.sum(axis=1)
+    out['Average'] = np.nanmean(values, axis=1).round(3)
+    out['Change'] = (last - first).round(3)
+    latest = history.sort_values('period', kind='stable').groupby('_name')['Grade'].last()
+    out['Latest Grade'] = latest.reindex(out.index)
+    out.index.name = 'Employee'
+    out.columns.name = None
+    return out.sort_values('Average', ascending=False, kind='stable').reset_index()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Grade employee productivity PDFs')
+    parser.add_argument('pdfs', nargs='*', help='PDF files to grade')
+    parser.add_argument('--folder', help='Grade every PDF in this folder and build a trend table')
+    parser.add_argument('--trend', help='Write the per-employee trend table to this CSV')
+    parser.add_argument('--history', help='Write every graded row (all periods) to this CSV')
+    parser.add_argument('--min-hours', type=float, default=MIN_HOURS, help='Fewer hours grade as N/A')
+    parser.add_argument('--workers', type=int, default=None, help='Worker processes')
+    parser.add_argument('--no-cache', action='store_true', help='Re-extract tables even if cached')
+    args = parser.parse_args(argv)
+
+    if not args.pdfs and not args.folder:
+        parser.error('give PDF files or --folder')
+
+    errors = []
+    for pdf_path in args.pdfs:
+        try:
+            results = grade_pdf(os.path.expanduser(pdf_path), args.min_hours, args.workers,
+                                use_cache=not args.no_cache)
+        except Exception as e:
+            errors.append(f"{os.path.basename(pdf_path)}: {e}")
+            continue
+        print(f"\n{os.path.basename(pdf_path)}")
+        print(results.to_string(index=False))
+
+    if args.folder:
+        history, folder_errors = grade_folder(os.path.expanduser(args.folder), args.min_hours, args.workers)
+        errors.extend(folder_errors)
+        trend = trend_table(history)
+        print(f"\nGraded {history['source'].nunique()} PDF(s), {len(trend)} employee(s)")
+        if not trend.empty:
+            print(trend.to_string(index=False))
+        if args.trend:
+            trend.to_csv(args.trend, index=False)
+            print(f"Trend table saved to: {args.trend}")
+        if args.history:
+            history.to_csv(args.history, index=False)
+            print(f"History saved to: {args.history}")
+
+    for error in errors:
+        print(f"❌ {error}")
+    return 1 if errors else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,233 @@
+#!/usr/bin/env python3
+"""
+Inventory snapshot index
+Indexes the daily_inventory_YYYY-MM-DD.csv counts and the
+OrderInvoices/Order_Invoice_YYYY-MM-DD.csv receipts by date (one directory
+listing, refreshed only when the directory changes) and keeps each parsed
+file cached until it is rewritten, so a report over any range reads at
+most the two snapshots it compares.
+
+The reference catalog and its UPP (units per package) column come from
+reference_catalog.py.
+
+Usage over a range is one vectorized join over the catalog:
+    usage = begin count + 3rd party + ordered cases * UPP - end count
+so its cost depends on the number of products, not the number of days.
+
+Shared by inventory_report.py (the root app's /inventory_report blueprint).
+
+Batch usage:
+    python inventory_snapshots.py 2025-12-01 2025-12-15
+    python inventory_snapshots.py 2025-12-01 2025-12-15 --dir ~/inventory --out usage.csv
+"""
+import os
+import sys
+import bisect
+import argparse
+from datetime import datetime
+
+import numpy as np
+import pandas as pd
+
+from reference_catalog import REFERENCE_INVENTORY_FILE, get_reference_catalog
+
+SNAPSHOT_PREFIX = 'daily_inventory_'
+INVOICE_DIR = 'OrderInvoices'
+INVOICE_PREFIX = 'Order_Invoice_'
+
+
+# ==================== FILE CACHE ====================
+
+_frames = {}
+
+
+def read_cached(path, **read_kw):
+    """Parsed CSV, re-read only when the file's size or mtime changes
+
+    Cached per (path, read options), so a file read with a dtype is never
+    served from a parse made without it.
+    """
+    st = os.stat(path)
+    key = (st.st_size, st.st_mtime_ns)
+    cache_key = (path, repr(sorted(read_kw.items())))
+    entry = _frames.get(cache_key)
+    if entry is None or entry[0] != key:
+        entry = _frames[cache_key] = (key, pd.read_csv(path, **read_kw))
+    return entry[1]
+
+
+# ==================== SNAPSHOT INDEX ====================
+
+class SnapshotIndex:
+    """Date -> file for the <prefix>YYYY-MM-DD.csv files of one directory"""
+
+    def __init__(self, directory='.', prefix=SNAPSHOT_PREFIX):
+        self.directory = directory
+        self.prefix = prefix
+        self._listed = None
+        self._dates = []
+        self._paths = {}
+
+    def _refresh(self):
+        try:
+            mtime = os.stat(self.directory).st_mtime_ns
+        except OSError:
+            self._listed, self._dates, self._paths = None, [], {}
+            return
+        if mtime == self._listed:
+            return
+        paths = {}
+        for fname in os.listdir(self.directory):
+            if fname.startswith(self.prefix) and fname.endswith('.csv'):
+                try:
+                    file_dt = datetime.strptime(fname[len(self.prefix):-len('.csv')], '%Y-%m-%d')
+                except ValueError:
+                    continue
+                paths[file_dt] = os.path.join(self.directory, fname)
+        self._listed, self._dates, self._paths = mtime, sorted(paths), paths
+
+    def dates_between(self, begin_dt, end_dt):
+        """Dates with a file, begin_dt <= date <= end_dt, ascending"""
+        self._refresh()
+        lo = bisect.bisect_left(self._dates, begin_dt)
+        hi = bisect.bisect_right(self._dates, end_dt)
+        return self._dates[lo:hi]
+
+    def path(self, file_dt):
+        self._refresh()
+        return self._paths.get(file_dt)
+
+    def load(self, file_dt, **read_kw):
+        """Parsed file for a date (cached until the file changes)"""
+        return read_cached(self.path(file_dt), **read_kw)
+
+
+_indexes = {}
+
+
+def get_snapshot_index(directory='.', prefix=SNAPSHOT_PREFIX):
+    """Shared index per (directory, prefix)"""
+    key = (os.path.abspath(directory), prefix)
+    index = _indexes.get(key)
+    if index is None:
+        index = _indexes[key] = SnapshotIndex(directory, prefix)
+    return index
+
+
+def get_invoice_index(directory=INVOICE_DIR):
+    return get_snapshot_index(directory, INVOICE_PREFIX)
+
+
+# ==================== USAGE ====================
+
+def ordered_quantities(invoices, begin_dt, end_dt):
+    """ProductNumber -> total QtyShip over the order invoices in range"""
+    totals = []
+    for file_dt in invoices.dates_between(begin_dt, end_dt):
+        try:
+            df = invoices.load(file_dt, dtype={'ProductNumber': str})
+        except (OSError, ValueError):
+            continue
+        if 'ProductNumber' not in df.columns or 'QtyShip' not in df.columns:
+            continue
+        rows = df[df['ProductNumber'].notna() & (df['ProductNumber'] != '')]
+        totals.append(rows.groupby('ProductNumber', sort=False)['QtyShip'].sum())
+    if not totals:
+        return pd.Series(dtype='float64')
+    return pd.concat(totals).groupby(level=0, sort=False).sum()
+
+
+def _counts(snapshot, keys, key_col, normalize):
+    """quantity_on_hand per catalog row from a snapshot (last row per key wins), NaN where absent"""
+    if snapshot is None or key_col not in snapshot.columns or 'quantity_on_hand' not in snapshot.columns:
+        return pd.Series(np.nan, index=keys.index)
+    snap_keys = snapshot[key_col].fillna('').astype(str).str.strip()
+    if normalize:
+        snap_keys = snap_keys.str.lower()
+    qty = pd.Series(snapshot['quantity_on_hand'].to_numpy(), index=snap_keys.to_numpy())
+    qty = qty[~qty.index.duplicated(keep='last')]
+    return pd.Series(keys.map(qty).to_numpy(), index=keys.index)
+
+
+def snapshot_counts(catalog, snapshot):
+    """Counts of a snapshot aligned with the catalog, matched by description (the sheet's key)"""
+    return _counts(snapshot, catalog.description_keys, 'description', normalize=True)
+
+
+def usage_report(catalog, begin_dt, end_dt, third_party=None, snapshots=None, invoices=None):
+    """Usage per catalog item between the first and last snapshot in range
+
+    Returns None when no snapshot falls in the range, else a dict with the
+    begin / end snapshot dates and frames, ordered quantities by product
+    number, and usage per item number. Snapshots are matched to the catalog
+    by item_number when they carry one, otherwise by description.
+    """
+    snapshots = snapshots or get_snapshot_index()
+    invoices = invoices or get_invoice_index()
+    dates = snapshots.dates_between(begin_dt, end_dt)
+    if not dates:
+        return None
+    ends = [dates[0], dates[-1]] if len(dates) > 1 else [dates[0]]
+    # Read item numbers as text: one blank one would otherwise turn the column to float
+    frames = [snapshots.load(file_dt, dtype={'item_number': str}) for file_dt in ends]
+
+    def counts(snapshot):
+        if 'item_number' in snapshot.columns:
+            # '5360547.0' from snapshots saved while the column was float
+            snapshot = snapshot.assign(item_number=snapshot['item_number'].fillna('').astype(str)
+                                       .str.strip().str.replace(r'\.0$', '', regex=True))
+            return _counts(snapshot, catalog.item_keys, 'item_number', normalize=False)
+        return snapshot_counts(catalog, snapshot)
+
+    def numeric(values):
+        return pd.to_numeric(values, errors='coerce').fillna(0).to_numpy(dtype=float)
+
+    ordered = ordered_quantities(invoices, begin_dt, end_dt)
+    third = pd.Series(third_party or {}, dtype=object)
+    begin_qty = numeric(counts(frames[0]))
+    end_qty = numeric(counts(frames[-1]))
+    ordered_qty = numeric(catalog.item_keys.map(ordered))
+    third_qty = numeric(catalog.item_keys.map(third))
+    usage = begin_qty + third_qty + ordered_qty * catalog.upp - end_qty
+    return {
+        'dates': ends,
+        'snapshots': frames,
+        'ordered': ordered,
+        'usage': dict(zip(catalog.item_keys, usage.tolist())),
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Inventory usage between two dates')
+    parser.add_argument('begin', help='Beginning date (YYYY-MM-DD)')
+    parser.add_argument('end', help='Ending date (YYYY-MM-DD)')
+    parser.add_argument('--dir', default='.', help='Folder with the daily_inventory_*.csv files and OrderInvoices')
+    parser.add_argument('--out', help='Write item, description, UPP and usage here (CSV)')
+    args = parser.parse_args(argv)
+
+    begin_dt = datetime.strptime(args.begin, '%Y-%m-%d')
+    end_dt = datetime.strptime(args.end, '%Y-%m-%d')
+    catalog = get_reference_catalog(os.path.join(args.dir, REFERENCE_INVENTORY_FILE))
+    if catalog is None:
+        print(f"No {REFERENCE_INVENTORY_FILE} in {args.dir}")
+        return 1
+    report = usage_report(catalog, begin_dt, end_dt,
+                          snapshots=get_snapshot_index(args.dir),
+                          invoices=get_invoice_index(os.path.join(args.dir, INVOICE_DIR)))
+    if report is None:
+        print("No inventory files found in the selected date range.")
+        return 1
+
+    out = catalog.frame[[c for c in ('item_number', 'description', 'UPP') if c in catalog.frame.columns]].copy()
+    out['Usage'] = [report['usage'][key] for key in catalog.item_keys]
+    print(f"{len(out):,} items, {' -> '.join(d.strftime('%Y-%m-%d') for d in report['dates'])}")
+    if args.out:
+        out.to_csv(args.out, index=False)
+        print(f"Usage saved to {args.out}")
+    else:
+        print(out.to_string(index=False))
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,230 @@
+#!/usr/bin/env python3
+"""
+US Foods invoice aggregation engine
+Reads the InvoiceDetails CSVs in a folder on a thread pool (pyarrow when
+installed, pandas otherwise) with explicit dtypes and only the columns the
+totals need, and sums QtyShip / ExtendedPrice by product.
+
+Aggregation is incremental: each folder gets a cache file with the parsed
+lines of every invoice already folded in, keyed by file name, size and
+modification time. A re-run only parses new or changed files; removed files
+simply drop out of the totals. The caches live in the user cache directory
+($XDG_CACHE_HOME or ~/.cache, under invoice_aggregator/), named after the
+folder's path, so invoice folders - including the samples in the repo - are
+only ever read.
+
+Shared by USfoodorders.py, PDFOrderSorter/UsFoodOrderReader.py and the
+root app.py /merge_usfoodorders route.
+
+Batch usage:
+    python invoice_aggregator.py Kingsville=~/Desktop/Kingsville Alice=~/Downloads/AliceInvoice --out-dir ~/Desktop
+    python invoice_aggregator.py Alice=PDFOrderSorter/AliceCSV --quantity-file PDFOrderSorter/quantity_data.csv
+"""
+import os
+import sys
+import json
+import hashlib
+import argparse
+from concurrent.futures import ThreadPoolExecutor
+
+import pandas as pd
+
+try:
+    import pyarrow as pa
+    from pyarrow import csv as pa_csv
+except ImportError:  # Optional; pandas' C parser reads the files instead
+    pa = pa_csv = None
+
+CACHE_DIR = os.path.join(os.environ.get("XDG_CACHE_HOME") or os.path.expanduser("~/.cache"),
+                         "invoice_aggregator")
+CACHE_VERSION = 1
+
+KEY_COLUMNS = ['ProductNumber', 'ProductDescription']
+SUM_COLUMNS = ['QtyShip', 'ExtendedPrice']
+INVOICE_COLUMNS = KEY_COLUMNS + SUM_COLUMNS
+DTYPES = {'ProductNumber': str, 'ProductDescription': str, 'QtyShip': 'float64', 'ExtendedPrice': 'float64'}
+
+MAX_READERS = 8
+
+
+# ==================== READING ====================
+
+def read_invoice(path):
+    """One invoice CSV, only the aggregation columns (missing sums read as 0)"""
+    if pa_csv is not None:
+        table = pa_csv.read_csv(path, convert_options=pa_csv.ConvertOptions(
+            include_columns=INVOICE_COLUMNS, include_missing_columns=True,
+            column_types={'ProductNumber': pa.string(), 'ProductDescription': pa.string(),
+                          'QtyShip': pa.float64(), 'ExtendedPrice': pa.float64()}))
+        df = table.to_pandas()
+    else:
+        try:
+            df = pd.read_csv(path, usecols=INVOICE_COLUMNS, dtype=DTYPES)
+        except ValueError:  # Exports without an ExtendedPrice (or QtyShip) column
+            df = pd.read_csv(path, dtype=DTYPES).reindex(columns=INVOICE_COLUMNS)
+    if df['ProductNumber'].isna().all() and len(df):
+        raise ValueError("no ProductNumber column")
+    df[SUM_COLUMNS] = df[SUM_COLUMNS].fillna(0.0)
+    return df
+
+
+def _file_rows(path):
+    """Invoice lines of one file as JSON-ready rows; returns (rows, error)"""
+    try:
+        df = read_invoice(path)
+    except Exception as e:
+        return None, f"{os.path.basename(path)}: {e}"
+    df = df[df['ProductNumber'].notna() & df['ProductDescription'].notna()]
+    return list(zip(*(df[c].tolist() for c in INVOICE_COLUMNS))), None
+
+
+# ==================== INCREMENTAL AGGREGATION ====================
+
+def _cache_path(folder):
+    key = hashlib.sha1(os.path.abspath(folder).encode("utf-8")).hexdigest()[:16]
+    return os.path.join(CACHE_DIR, f"{key}.json")
+
+
+def _load_cache(folder):
+    try:
+        with open(_cache_path(folder), "r", encoding="utf-8") as f:
+            cache = json.load(f)
+        if cache.get("version") == CACHE_VERSION:
+            return cache["files"]
+    except (OSError, ValueError, KeyError):
+        pass
+    return {}
+
+
+def _save_cache(folder, files):
+    path = _cache_path(folder)
+    tmp = f"{path}.{os.getpid()}.tmp"
+    try:
+        os.makedirs(CACHE_DIR, exist_ok=True)
+        with open(tmp, "w", encoding="utf-8") as f:
+            f.write(json.dumps({"version": CACHE_VERSION, "files": files}))
+        os.replace(tmp, path)
+    except OSError:
+        pass  # No writable cache dir: totals are still correct, just not remembered
+
+
+def aggregate_folder(folder, rebuild=False, max_workers=MAX_READERS):
+    """Product totals over every invoice CSV in folder
+
+    Returns (totals, stats): totals has ProductNumber, ProductDescription,
+    QtyShip and ExtendedPrice sorted by product number; stats counts files
+    read, reused from the cache, removed, plus an errors list.
+    """
+    names = sorted(f for f in os.listdir(folder) if f.lower().endswith('.csv'))
+    cached = {} if rebuild else _load_cache(folder)
+
+    files, todo = {}, []
+    for name in names:
+        st = os.stat(os.path.join(folder, name))
+        entry = cached.get(name)
+        if entry and entry["size"] == st.st_size and entry["mtime_ns"] == st.st_mtime_ns:
+            files[name] = entry
+        else:
+            todo.append((name, st))
+
+    errors = []
+    if todo:
+        workers = max(1, min(max_workers, len(todo)))
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            results = pool.map(_file_rows, [os.path.join(folder, name) for name, _st in todo])
+            for (name, st), (rows, error) in zip(todo, results):
+                if error:
+                    errors.append(error)
+                    continue
+                files[name] = {"size": st.st_size, "mtime_ns": st.st_mtime_ns, "rows": rows}
+
+    if todo or len(files) != len(cached):
+        _save_cache(folder, files)
+
+    rows = [row for name in names if name in files for row in files[name]["rows"]]
+    totals = pd.DataFrame(rows, columns=INVOICE_COLUMNS)
+    totals = totals.astype({'ProductNumber': object, 'ProductDescription': object,
+                            'QtyShip': 'float64', 'ExtendedPrice': 'float64'})
+    totals = totals.groupby(KEY_COLUMNS, as_index=False)[SUM_COLUMNS].sum()
+    totals = _sort_products(totals)
+    totals['ExtendedPrice'] = totals['ExtendedPrice'].round(2)
+    if len(totals) and (totals['QtyShip'] % 1 == 0).all():
+        totals['QtyShip'] = totals['QtyShip'].astype('int64')
+
+    stats = {
+        'files': len(names),
+        'read': len(todo) - len(errors),
+        'cached': len(names) - len(todo),
+        'removed': len(set(cached) - set(names)),
+        'errors': errors,
+    }
+    return totals, stats
+
+
+def _sort_products(df):
+    """Order by product number (numerically where it is a number), then description"""
+    numeric = pd.to_numeric(df['ProductNumber'], errors='coerce')
+    order = df.assign(_n=numeric).sort_values(['_n', 'ProductNumber', 'ProductDescription'],
+                                              na_position='last', kind='stable').index
+    return df.loc[order].reset_index(drop=True)
+
+
+def with_units(totals, quantity_file):
+    """Add Quantity (units per case) from quantity_file and Units = QtyShip * Quantity"""
+    quantity_df = pd.read_csv(quantity_file, dtype={'ProductNumber': str})
+    merged = pd.merge(totals, quantity_df[['ProductNumber', 'Quantity']], on='ProductNumber', how='left')
+    merged['Units'] = merged['QtyShip'] * merged['Quantity']
+    return merged
+
+
+def aggregate_locations(locations, out_dir, quantity_file=None, suffix=None, rebuild=False):
+    """Aggregate each location's folder and write one CSV per location
+
+    locations maps name -> invoice folder. Files are written to
+    out_dir/<name>_with_units.csv when quantity_file is given, else
+    out_dir/<name>_sorted.csv (suffix overrides). Returns
+    {name: (output path or None, stats)}.
+    """
+    suffix = suffix or ('with_units' if quantity_file else 'sorted')
+    results = {}
+    for name, folder in locations.items():
+        totals, stats = aggregate_folder(folder, rebuild=rebuild)
+        if totals.empty:
+            results[name] = (None, stats)
+            continue
+        if quantity_file:
+            totals = with_units(totals, quantity_file)
+        out_file = os.path.join(out_dir, f"{name}_{suffix}.csv")
+        totals.to_csv(out_file, index=False)
+        results[name] = (out_file, stats)
+    return results
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Sum US Foods invoice CSVs by product, per location')
+    parser.add_argument('locations', nargs='+', metavar='NAME=FOLDER', help='Location name and its invoice folder')
+    parser.add_argument('--out-dir', default='.', help='Where <name>_sorted.csv / <name>_with_units.csv go')
+    parser.add_argument('--quantity-file', help='ProductNumber,Quantity CSV to add Units')
+    parser.add_argument('--rebuild', action='store_true', help='Ignore the cached invoices and re-read every file')
+    args = parser.parse_args(argv)
+
+    locations = {}
+    for spec in args.locations:
+        name, sep, folder = spec.partition('=')
+        if not sep:
+            name, folder = os.path.basename(os.path.normpath(spec)), spec
+        locations[name] = os.path.expanduser(folder)
+
+    status = 0
+    results = aggregate_locations(locations, args.out_dir, args.quantity_file, rebuild=args.rebuild)
+    for name, (out_file, stats) in results.items():
+        print(f"{name}: {stats['files']} files ({stats['read']} read, {stats['cached']} cached, "
+              f"{stats['removed']} removed) -> {out_file or 'no invoice rows'}")
+        for error in stats['errors']:
+            print(f"  ⚠️ {error}")
+            status = 1
+    return status
+
+
+if __name__ == '__main__':
+    sys.exit(main())
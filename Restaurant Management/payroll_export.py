@@ -0,0 +1,339 @@
+#!/usr/bin/env python3
+"""
+Payroll export engine
+Builds the sorted payroll workbook in a single streaming pass (xlsxwriter
+when installed, otherwise openpyxl write-only mode) and can process every
+location's export in parallel.
+
+Shared by Payroll - WebVersion.py, app_web.py and Payrollauto3_gui.py.
+
+Batch usage:
+    python payroll_export.py Kingsville=uploads/PayrollExport_..._1.csv Alice=uploads/PayrollExport_..._2.csv
+    python payroll_export.py --folder uploads
+"""
+import os
+import re
+import sys
+import argparse
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import pandas as pd
+
+try:
+    import xlsxwriter
+except ImportError:
+    xlsxwriter = None
+
+COLUMNS = [
+    'Employee', 'Job Title', 'Regular Hours', 'Overtime Hours',
+    'Declared Tips', 'Non-Cash Tips', 'Total Tips'
+]
+NUMERIC_COLUMNS = COLUMNS[2:]
+
+# Salaried staff added to every export
+EXTRA_EMPLOYEES = [
+    ('Arnold Ramirez', 'General Manager'),
+    ('Victor Moreno', 'Director of Catering'),
+]
+
+# The only MANAGER whose hours and tips are kept
+MANAGER_EXCEPTIONS = {'APRIL SALINAS'}
+
+# Export filename suffix (PayrollExport_..._1.csv) -> location, for --folder batches
+LOCATION_SUFFIXES = {'1': 'Kingsville', '2': 'Alice'}
+
+
+def process_payroll(csv_path, zero_managers=True):
+    """Sort one payroll export and append totals
+
+    Returns (reg_hours, ot_hours, total_hours, ot_pct, sorted_data).
+    With zero_managers, MANAGER rows (except MANAGER_EXCEPTIONS) are zeroed.
+    """
+    df = pd.read_csv(csv_path)
+    extracted_data = df[COLUMNS].copy()
+
+    # "Last, First" -> "First Last" (names with other comma counts are kept as-is)
+    names = extracted_data['Employee'].astype(str)
+    parts = names.str.partition(',')
+    flipped = parts[2].str.strip() + ' ' + parts[0].str.strip()
+    extracted_data['Employee'] = flipped.where(names.str.count(',') == 1, extracted_data['Employee'])
+
+    if zero_managers:
+        employee = extracted_data['Employee'].astype(str).str.strip().str.upper()
+        manager_mask = (
+            (extracted_data['Job Title'].astype(str).str.strip().str.upper() == 'MANAGER') &
+            ~employee.isin(MANAGER_EXCEPTIONS)
+        )
+        extracted_data.loc[manager_mask, NUMERIC_COLUMNS] = 0
+
+    extras = pd.DataFrame([
+        {'Employee': name, 'Job Title': title, **{col: 0 for col in NUMERIC_COLUMNS}}
+        for name, title in EXTRA_EMPLOYEES
+    ])
+    extracted_data = pd.concat([extracted_data, extras], ignore_index=True)
+
+    # Calculate totals
+    totals = extracted_data[NUMERIC_COLUMNS].sum()
+    total_combined_hours = float(totals['Regular Hours']) + float(totals['Overtime Hours'])
+    totals_row = pd.DataFrame([{'Employee': 'Total', 'Job Title': total_combined_hours, **totals.to_dict()}])
+
+    sorted_data = pd.concat([extracted_data.sort_values(by='Employee'), totals_row], ignore_index=True)
+
+    reg_hours = totals['Regular Hours']
+    ot_hours = totals['Overtime Hours']
+    ot_pct = (ot_hours / total_combined_hours) if total_combined_hours > 0 else 0
+    # Replace zeros with empty string for display
+    sorted_data = sorted_data.replace(0, "")
+    return reg_hours, ot_hours, total_combined_hours, ot_pct, sorted_data
+
+
+def add_summary_row(df, location, total_hours, ot_hours, ot_pct):
+    """Append the weekly overtime sentence as a last row; returns (df, summary)"""
+    summary = (f"Total hours for the BHB {location} for the week is {total_hours:.2f} "
+               f"of which {ot_hours:.2f} or {ot_pct:.2%} is considered overtime.")
+    summary_row = pd.DataFrame([{col: "" for col in df.columns}])
+    summary_row.iloc[0, 0] = summary
+    return pd.concat([df, summary_row], ignore_index=True), summary
+
+
+def duplicate_rows(df, column='Employee'):
+    """Boolean mask of rows whose name matches the row above or below"""
+    names = df[column]
+    filled = names.notna() & (names.astype(str) != '')
+    same_next = (names == names.shift(-1)) & filled
+    same_prev = (names == names.shift(1)) & filled
+    return (same_next | same_prev).to_numpy()
+
+
+def _cell_layout(df, styled=True):
+    """Header + data values and per-cell style keys, computed with array ops
+
+    Style key is (left, right, top, bottom, highlighted, bordered, centered).
+    """
+    values = [list(df.columns)] + df.astype(object).where(df.notna(), None).values.tolist()
+    n_rows, n_cols = len(values), len(df.columns)
+
+    filled = np.ones((n_rows, n_cols), dtype=bool)
+    body = df.to_numpy(dtype=object)
+    filled[1:] = ~pd.isna(body) & (body != '')
+
+    highlighted = np.zeros((n_rows, n_cols), dtype=bool)
+    if styled:
+        highlighted[1:] = duplicate_rows(df)[:, None]
+    centered = filled & styled
+
+    rows = np.arange(n_rows)[:, None]
+    cols = np.arange(n_cols)[None, :]
+    left = np.broadcast_to(cols == 0, (n_rows, n_cols))
+    right = np.broadcast_to(cols == n_cols - 1, (n_rows, n_cols))
+    top = np.broadcast_to(rows == 0, (n_rows, n_cols))
+    bottom = np.broadcast_to(rows == n_rows - 1, (n_rows, n_cols))
+
+    keys = np.stack([left, right, top, bottom, highlighted, filled, centered], axis=-1)
+    return values, keys
+
+
+def _save_xlsxwriter(values, keys, out_path):
+    workbook = xlsxwriter.Workbook(out_path, {'constant_memory': True})
+    worksheet = workbook.add_worksheet('Sheet1')
+    formats = {}
+
+    def cell_format(key):
+        key = tuple(bool(k) for k in key)
+        if key not in formats:
+            left, right, top, bottom, highlighted, bordered, centered = key
+            props = {}
+            if bordered:
+                # xlsxwriter border styles: 1 = thin, 5 = thick
+                props.update(left=5 if left else 1, right=5 if right else 1,
+                             top=5 if top else 1, bottom=5 if bottom else 1)
+            if centered:
+                props.update(align='center', valign='vcenter')
+            if highlighted:
+                props.update(bg_color='#FFFF00', pattern=1, bold=True)
+            formats[key] = workbook.add_format(props) if props else None
+        return formats[key]
+
+    for r, row in enumerate(values):
+        for c, value in enumerate(row):
+            fmt = cell_format(keys[r, c])
+            if value is None or value == '':
+                if fmt is not None:
+                    worksheet.write_blank(r, c, None, fmt)
+            else:
+                worksheet.write(r, c, value, fmt)
+
+    worksheet.fit_to_pages(1, 1)
+    workbook.close()
+
+
+def _save_openpyxl(values, keys, out_path):
+    from openpyxl import Workbook
+    from openpyxl.cell import WriteOnlyCell
+    from openpyxl.styles import Alignment, Border, Font, PatternFill, Side
+
+    thick = Side(border_style="thick", color="000000")
+    thin = Side(border_style="thin", color="000000")
+    yellow_fill = PatternFill(start_color="FFFF00", end_color="FFFF00", fill_type="solid")
+    bold_font = Font(bold=True)
+    centered = Alignment(horizontal="center", vertical="center")
+    borders = {}
+
+    wb = Workbook(write_only=True)
+    ws = wb.create_sheet('Sheet1')
+    ws.sheet_properties.pageSetUpPr.fitToPage = True
+    ws.page_setup.fitToWidth = 1
+    ws.page_setup.fitToHeight = 1
+
+    for r, row in enumerate(values):
+        out_row = []
+        for c, value in enumerate(row):
+            left, right, top, bottom, highlighted, bordered, centered_cell = (bool(k) for k in keys[r, c])
+            cell = WriteOnlyCell(ws, value=None if value == '' else value)
+            if bordered:
+                edges = (left, right, top, bottom)
+                if edges not in borders:
+                    borders[edges] = Border(left=thick if left else thin, right=thick if right else thin,
+                                            top=thick if top else thin, bottom=thick if bottom else thin)
+                cell.border = borders[edges]
+            if centered_cell:
+                cell.alignment = centered
+            if highlighted:
+                cell.fill = yellow_fill
+                cell.font = bold_font
+            out_row.append(cell)
+        ws.append(out_row)
+
+    wb.save(out_path)
+
+
+def save_to_excel(df, out_path, styled=True):
+    """Write the payroll frame as a styled workbook in one pass
+
+    Non-empty cells get thin borders (thick around the outside); the sheet
+    prints on one page. With styled (the web apps' layout) non-empty cells
+    are also centered and consecutive rows with the same employee are
+    highlighted in bold yellow; without it only the borders are drawn
+    (the Tk GUI's layout).
+    """
+    values, keys = _cell_layout(df, styled)
+    if xlsxwriter is not None:
+        _save_xlsxwriter(values, keys, out_path)
+    else:
+        _save_openpyxl(values, keys, out_path)
+    return out_path
+
+
+def export_location(location, csv_path, out_path, zero_managers=True, styled=True):
+    """Process one location's export and write its workbook
+
+    Returns dict with location, out_path, summary, hours and the frame.
+    """
+    reg, ot, total, pct, df = process_payroll(csv_path, zero_managers=zero_managers)
+    df_with_summary, summary = add_summary_row(df, location, total, ot, pct)
+    save_to_excel(df_with_summary, out_path, styled)
+    return {
+        'location': location,
+        'csv_path': csv_path,
+        'out_path': out_path,
+        'summary': summary,
+        'regular_hours': float(reg),
+        'overtime_hours': float(ot),
+        'total_hours': float(total),
+        'overtime_pct': float(pct),
+        'data': df_with_summary
+    }
+
+
+def _export_job(job):
+    """Worker: export one location (runs in a child process)"""
+    try:
+        return export_location(*job), None
+    except Exception as e:
+        return None, f"{job[0]}: {e}"
+
+
+def output_name(location, csv_path):
+    """Result filename used by the web app, e.g. BHB_Alice_sorted_PayrollExport_..._2.xlsx"""
+    return f"BHB_{location}_sorted_{os.path.splitext(os.path.basename(csv_path))[0]}.xlsx"
+
+
+def export_locations(jobs, results_dir, zero_managers=True, max_workers=None, styled=True):
+    """Export several locations in parallel
+
+    Args:
+        jobs: list of (location, csv_path) or (location, csv_path, out_path)
+        results_dir: Folder for outputs without an explicit out_path
+
+    Returns:
+        (results, errors) with results in the order of jobs
+    """
+    os.makedirs(results_dir, exist_ok=True)
+    work = []
+    for job in jobs:
+        location, csv_path = job[0], job[1]
+        out_path = job[2] if len(job) > 2 else os.path.join(results_dir, output_name(location, csv_path))
+        work.append((location, csv_path, out_path, zero_managers, styled))
+
+    if len(work) == 1 or max_workers == 1:
+        outcomes = [_export_job(job) for job in work]
+    else:
+        with ProcessPoolExecutor(max_workers=max_workers or min(len(work), os.cpu_count() or 1)) as pool:
+            outcomes = list(pool.map(_export_job, work))
+
+    results = [r for r, _ in outcomes if r]
+    errors = [e for _, e in outcomes if e]
+    return results, errors
+
+
+def find_exports(folder, suffixes=LOCATION_SUFFIXES):
+    """Match PayrollExport_*_<n>.csv files in a folder to locations by suffix
+
+    When a location has several exports the newest file wins.
+    """
+    latest = {}
+    for name in os.listdir(folder):
+        match = re.search(r'_(\d+)\.csv$', name)
+        if not match or match.group(1) not in suffixes:
+            continue
+        location = suffixes[match.group(1)]
+        path = os.path.join(folder, name)
+        if location not in latest or os.path.getmtime(path) > os.path.getmtime(latest[location]):
+            latest[location] = path
+    return sorted(latest.items())
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Build sorted payroll workbooks for every location')
+    parser.add_argument('exports', nargs='*', help='LOCATION=path/to/PayrollExport.csv pairs')
+    parser.add_argument('--folder', help='Pick up the latest export for each location from a folder')
+    parser.add_argument('--results', default=os.path.join(os.path.dirname(os.path.abspath(__file__)), 'results'),
+                        help='Output folder (default: results/ next to this script)')
+    parser.add_argument('--keep-managers', action='store_true', help="Don't zero MANAGER hours and tips")
+    parser.add_argument('--workers', type=int, help='Number of worker processes')
+    args = parser.parse_args(argv)
+
+    jobs = []
+    for pair in args.exports:
+        location, sep, path = pair.partition('=')
+        if not sep:
+            parser.error(f"Expected LOCATION=path, got {pair!r}")
+        jobs.append((location, path))
+    if args.folder:
+        jobs.extend(find_exports(args.folder))
+    if not jobs:
+        parser.error('No exports given')
+
+    results, errors = export_locations(jobs, args.results, zero_managers=not args.keep_managers,
+                                       max_workers=args.workers)
+    for result in results:
+        print(f"✅ {result['location']}: {result['out_path']}")
+        print(f"   {result['summary']}")
+    for error in errors:
+        print(f"❌ {error}")
+    return 1 if errors else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,350 @@
+#!/usr/bin/env python3
+"""
+Opt-in request and query profiling for the Flask apps
+Off unless the PERF_MONITOR environment variable is 1. When off nothing is
+wrapped or registered: connect() is sqlite3.connect itself, init_app()
+adds no hooks, count_io() returns at once and /admin/perf answers 404.
+When on:
+
+    init_app          WSGI middleware timing every request from the first
+                      byte in to the response being returned, labelled by
+                      route rule ('GET /api/inventory/<location>/<date>'),
+                      so one slow URL pattern is not spread over many URLs
+    connect           sqlite3.connect whose cursors time every statement.
+                      Statements slower than PERF_SLOW_QUERY_MS (default
+                      50) go to the slow-query log with their parameter
+                      shape (types only, never values) and EXPLAIN QUERY PLAN
+    count_io          calls, bytes and milliseconds per file operation name
+    perf_page         the /admin/perf page: p50 / p90 / p95 / p99 / max per
+                      route and per statement, the slow-query log and the
+                      I/O counters (?format=json for the numbers)
+
+The last PERF_SAMPLES (default 1000) timings are kept per route and per
+statement. Numbers are per worker process; the page shows which one.
+
+Shared by Inventory Control 2 and the Manager App web version.
+
+Batch usage:
+    python perf_monitor.py http://localhost:8000/admin/perf
+"""
+import os
+import sys
+import html
+import json
+import time
+import sqlite3
+import logging
+import argparse
+import threading
+import urllib.request
+from collections import deque
+
+ENABLED = os.environ.get('PERF_MONITOR', '').strip().lower() in ('1', 'true', 'yes', 'on')
+SLOW_QUERY_MS = float(os.environ.get('PERF_SLOW_QUERY_MS', 50))
+SAMPLES = int(os.environ.get('PERF_SAMPLES', 1000))
+SLOW_LOG_SIZE = 200
+PERCENTILES = (50, 90, 95, 99)
+EXPLAINABLE = ('SELECT', 'WITH', 'INSERT', 'UPDATE', 'DELETE', 'REPLACE')
+
+log = logging.getLogger(__name__)
+
+clock = time.perf_counter
+
+
+def percentiles(samples, q=PERCENTILES):
+    """{'p50': ..., 'max': ...} by nearest rank; empty for no samples"""
+    if not samples:
+        return {}
+    ordered = sorted(samples)
+    result = {f"p{p}": ordered[min(len(ordered) - 1, max(0, -(-p * len(ordered) // 100) - 1))] for p in q}
+    result['max'] = ordered[-1]
+    return result
+
+
+def params_shape(params):
+    """Parameter types without their values: '(str, int)' or '{name: str}'"""
+    if params is None:
+        return '()'
+    if isinstance(params, dict):
+        return '{' + ', '.join(f"{k}: {type(v).__name__}" for k, v in params.items()) + '}'
+    try:
+        return '(' + ', '.join(type(v).__name__ for v in params) + ')'
+    except TypeError:
+        return type(params).__name__
+
+
+def _statement(sql):
+    """One-line statement label (whitespace collapsed, long statements cut)"""
+    text = ' '.join(sql.split())
+    return text if len(text) <= 200 else text[:197] + '...'
+
+
+# ==================== MONITOR ====================
+
+class PerfMonitor:
+    """Bounded timing samples and counters for one worker process"""
+
+    def __init__(self, samples=SAMPLES, slow_query_ms=SLOW_QUERY_MS):
+        self.samples = samples
+        self.slow_query_ms = slow_query_ms
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        with self._lock:
+            self.started = time.time()
+            self._requests = {}     # label -> [count, errors, deque of ms]
+            self._queries = {}      # statement -> [count, errors, deque of ms]
+            self._io = {}           # name -> [calls, bytes, ms]
+            self._slow = deque(maxlen=SLOW_LOG_SIZE)
+
+    def _add(self, table, label, ms, failed):
+        with self._lock:
+            entry = table.get(label)
+            if entry is None:
+                entry = table[label] = [0, 0, deque(maxlen=self.samples)]
+            entry[0] += 1
+            entry[1] += failed
+            entry[2].append(ms)
+
+    def record_request(self, label, ms, status):
+        self._add(self._requests, label, ms, status >= 500)
+
+    def record_query(self, sql, params, ms, failed=False, plan=None):
+        self._add(self._queries, _statement(sql), ms, failed)
+        if ms >= self.slow_query_ms:
+            entry = {'at': time.strftime('%Y-%m-%d %H:%M:%S'), 'ms': round(ms, 2), 'sql': _statement(sql),
+                     'params': params_shape(params), 'plan': plan() if plan else []}
+            with self._lock:
+                self._slow.append(entry)
+            log.warning("Slow query %.2f ms: %s %s", ms, entry['sql'], entry['params'])
+
+    def record_io(self, name, ms, nbytes):
+        with self._lock:
+            entry = self._io.setdefault(name, [0, 0, 0.0])
+            entry[0] += 1
+            entry[1] += nbytes
+            entry[2] += ms
+
+    def snapshot(self):
+        """Everything recorded so far as JSON-ready dicts, slowest p95 first"""
+        with self._lock:
+            requests = {k: (v[0], v[1], list(v[2])) for k, v in self._requests.items()}
+            queries = {k: (v[0], v[1], list(v[2])) for k, v in self._queries.items()}
+            io = {k: list(v) for k, v in self._io.items()}
+            slow = list(self._slow)
+
+        def rows(table, key):
+            out = [{key: label, 'count': count, 'errors': errors,
+                    **{p: round(ms, 2) for p, ms in percentiles(samples).items()}}
+                   for label, (count, errors, samples) in table.items()]
+            return sorted(out, key=lambda r: r.get('p95', 0), reverse=True)
+
+        return {
+            'pid': os.getpid(),
+            'since': time.strftime('%Y-%m-%d %H:%M:%S', time.localtime(self.started)),
+            'slow_query_ms': self.slow_query_ms,
+            'requests': rows(requests, 'route'),
+            'queries': rows(queries, 'sql'),
+            'slow_queries': slow[::-1],
+            'io': [{'name': name, 'calls': calls, 'bytes': nbytes, 'ms': round(ms, 2),
+                    'avg_ms': round(ms / calls, 3) if calls else 0}
+                   for name, (calls, nbytes, ms) in sorted(io.items())],
+        }
+
+
+_monitor = None
+_monitor_lock = threading.Lock()
+
+def get_monitor():
+    """The process's monitor (None while PERF_MONITOR is off)"""
+    global _monitor
+    if not ENABLED:
+        return None
+    if _monitor is None:
+        with _monitor_lock:
+            if _monitor is None:
+                _monitor = PerfMonitor()
+    return _monitor
+
+
+# ==================== SQLITE ====================
+
+class TimedCursor(sqlite3.Cursor):
+    """Cursor timing execute / executemany (time to the first row for queries)"""
+
+    def execute(self, sql, parameters=()):
+        return self._timed(super().execute, sql, parameters)
+
+    def executemany(self, sql, seq_of_parameters):
+        return self._timed(super().executemany, sql, seq_of_parameters, many=True)
+
+    def _timed(self, run, sql, parameters, many=False):
+        started = clock()
+        failed = True
+        try:
+            result = run(sql, parameters)
+            failed = False
+            return result
+        finally:
+            ms = (clock() - started) * 1000
+            connection = self.connection
+            plan = None
+            if not many and sql.lstrip()[:7].upper().startswith(EXPLAINABLE):
+                plan = lambda: explain(connection, sql, parameters)
+            get_monitor().record_query(sql, None if many else parameters, ms, failed, plan)
+
+
+class TimedConnection(sqlite3.Connection):
+    def cursor(self, factory=TimedCursor):
+        return super().cursor(factory)
+
+    def execute(self, sql, parameters=()):
+        return self.cursor().execute(sql, parameters)
+
+    def executemany(self, sql, seq_of_parameters):
+        return self.cursor().executemany(sql, seq_of_parameters)
+
+
+def explain(connection, sql, parameters=()):
+    """EXPLAIN QUERY PLAN lines for one statement (empty if SQLite cannot explain it)"""
+    try:
+        rows = sqlite3.Connection.execute(connection, f"EXPLAIN QUERY PLAN {sql}", parameters).fetchall()
+    except sqlite3.Error:
+        return []
+    return [row[-1] for row in rows]
+
+
+def _timed_connect(database, **kwargs):
+    kwargs.setdefault('factory', TimedConnection)
+    return sqlite3.connect(database, **kwargs)
+
+
+connect = _timed_connect if ENABLED else sqlite3.connect
+
+
+# ==================== FILE I/O ====================
+
+def count_io(name, started, path=None):
+    """Count one file operation begun at clock() time started (bytes = path's size)"""
+    monitor = get_monitor()
+    if monitor is None:
+        return
+    ms = (clock() - started) * 1000
+    try:
+        nbytes = os.path.getsize(path) if path else 0
+    except OSError:
+        nbytes = 0
+    monitor.record_io(name, ms, nbytes)
+
+
+# ==================== FLASK ====================
+
+class RequestTimer:
+    """WSGI middleware recording each request's duration under its route label"""
+
+    def __init__(self, wsgi_app, monitor):
+        self.wsgi_app = wsgi_app
+        self.monitor = monitor
+
+    def __call__(self, environ, start_response):
+        started = clock()
+        status = [500]
+
+        def timed_start_response(status_line, headers, exc_info=None):
+            status[0] = int(status_line.split(' ', 1)[0])
+            return start_response(status_line, headers, exc_info)
+
+        try:
+            return self.wsgi_app(environ, timed_start_response)
+        finally:
+            label = environ.get('perf.route') or f"{environ.get('REQUEST_METHOD', '')} (no route)"
+            self.monitor.record_request(label, (clock() - started) * 1000, status[0])
+
+
+def init_app(app):
+    """Time every request when PERF_MONITOR is on; returns the monitor (None when off)"""
+    monitor = get_monitor()
+    if monitor is None:
+        return None
+
+    @app.before_request
+    def label_request():
+        from flask import request
+        rule = request.url_rule.rule if request.url_rule is not None else '(no route)'
+        request.environ['perf.route'] = f"{request.method} {rule}"
+
+    app.wsgi_app = RequestTimer(app.wsgi_app, monitor)
+    app.extensions['perf_monitor'] = monitor
+    return monitor
+
+
+def _table(rows, columns):
+    head = ''.join(f"<th>{html.escape(title)}</th>" for title, _ in columns)
+    body = ''.join('<tr>' + ''.join(f"<td>{html.escape(str(row.get(key, '')))}</td>" for _, key in columns) + '</tr>'
+                   for row in rows)
+    return f"<table><thead><tr>{head}</tr></thead><tbody>{body}</tbody></table>" if rows else '<p>Nothing yet.</p>'
+
+
+def render_html(data):
+    timing = [('count', 'count'), ('errors', 'errors')] + [(f"p{p} ms", f"p{p}") for p in PERCENTILES] + [('max ms', 'max')]
+    slow = [(entry | {'plan': ' / '.join(entry['plan'])}) for entry in data['slow_queries']]
+    return f"""<!doctype html>
+<html><head><meta charset="utf-8"><title>Performance</title>
+<style>
+body {{ font-family: system-ui, sans-serif; margin: 1.5rem; color: #222; }}
+table {{ border-collapse: collapse; margin-bottom: 1.5rem; font-size: 0.9rem; }}
+th, td {{ border: 1px solid #ccc; padding: 0.25rem 0.5rem; text-align: right; }}
+th:first-child, td:first-child {{ text-align: left; max-width: 48rem; word-break: break-all; }}
+</style></head><body>
+<h1>Performance</h1>
+<p>Worker {data['pid']}, since {html.escape(data['since'])}. Slow queries: {data['slow_query_ms']:g} ms or more.
+<a href="?format=json">JSON</a></p>
+<h2>Requests</h2>{_table(data['requests'], [('route', 'route')] + timing)}
+<h2>SQL statements</h2>{_table(data['queries'], [('statement', 'sql')] + timing)}
+<h2>Slow queries</h2>{_table(slow, [('statement', 'sql'), ('at', 'at'), ('ms', 'ms'), ('params', 'params'), ('plan', 'plan')])}
+<h2>File I/O</h2>{_table(data['io'], [('operation', 'name'), ('calls', 'calls'), ('bytes', 'bytes'), ('ms', 'ms'), ('avg ms', 'avg_ms')])}
+</body></html>"""
+
+
+def perf_page():
+    """View for /admin/perf: HTML, or JSON with ?format=json; ?reset=1 clears the numbers after showing them"""
+    from flask import abort, jsonify, request
+    monitor = get_monitor()
+    if monitor is None:
+        abort(404)
+    data = monitor.snapshot()
+    if request.args.get('reset') == '1':
+        monitor.reset()
+    if request.args.get('format') == 'json':
+        return jsonify(data)
+    return render_html(data)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Print an app's /admin/perf numbers")
+    parser.add_argument('url', help='e.g. http://localhost:8000/admin/perf')
+    parser.add_argument('--top', type=int, default=15, help='Rows per table')
+    args = parser.parse_args(argv)
+
+    url = args.url + ('&' if '?' in args.url else '?') + 'format=json'
+    with urllib.request.urlopen(url) as response:
+        data = json.load(response)
+
+    print(f"Worker {data['pid']}, since {data['since']}")
+    for title, key, rows in (('Requests', 'route', data['requests']), ('SQL statements', 'sql', data['queries'])):
+        print(f"\n{title}")
+        print(f"  {'count':>7} {'p50':>8} {'p95':>8} {'p99':>8} {'max':>8}  {key}")
+        for row in rows[:args.top]:
+            print(f"  {row['count']:>7} {row['p50']:>8} {row['p95']:>8} {row['p99']:>8} {row['max']:>8}  {row[key][:90]}")
+    print(f"\nSlow queries ({len(data['slow_queries'])})")
+    for entry in data['slow_queries'][:args.top]:
+        print(f"  {entry['at']} {entry['ms']:>8} ms  {entry['sql'][:90]} {entry['params']}")
+    print("\nFile I/O")
+    for row in data['io']:
+        print(f"  {row['name']:<24} {row['calls']:>7} calls {row['bytes']:>12,} bytes {row['ms']:>10} ms")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
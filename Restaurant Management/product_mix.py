@@ -0,0 +1,349 @@
+#!/usr/bin/env python3
+"""
+Product mix matching engine
+Compiles every category's item names into one Aho-Corasick automaton, finds
+all of them in the POS sheet's item column in a single pass and computes
+totals, weight conversions and cases for every category together.
+
+Shared by productmixextraction.py; also builds an order-planning table from
+several weeks of product-mix exports.
+
+Batch usage:
+    python product_mix.py week1.xlsx week2.xlsx week3.xlsx --out order_plan.csv
+    python product_mix.py --folder ~/Downloads/product_mix --out order_plan.csv
+"""
+import os
+import sys
+import argparse
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+SHEET_NAME = "Selected levels"
+ITEM_COLUMN = 7    # Column H
+QTY_COLUMN = 13    # Column N
+
+# Product categories: item name (matched anywhere in column H) -> units per item sold
+CATEGORIES = {
+    "Chicken Wings": {
+        "items": {
+            "Side Kick Wings 5 Piece": 5,
+            "6pc Wings w Fries": 6,
+            "10pc Wings w Fries": 10,
+            "16pc  Wings": 16,
+            "SideKick of Wings": 5,
+            "8 Wings & 8 O-Rings": 8,
+            "10 Wings": 10,
+            "15 Wings": 15,
+            "20 Wings": 20
+        },
+        "case_quantity": 250
+    },
+    "Beef Cutlets": {
+        "items": {
+            "Steak Finger Basket": 1,
+            "Chicken Fried Steak": 1,
+        },
+        "case_quantity": 28
+    },
+    "Chicken Boneless": {
+        "items": {
+            "6pc Boneless": 6,
+            "12pc Boneless": 12,
+            "Chicken Strip Basket (4)": 4,
+            "Grilled Chicken Tater": 4,
+            "Crispy Chicken Tater": 4,
+            "Boneless Wing Tater": 4,
+            "Chicken & Mushroom": 4,
+            "Grilled Chicken Salad": 4,
+            "Crispy Chicken Salad": 4,
+            "Chicken Tacos": 4,
+            "3PC Chicken Strips w Fries": 3,
+            "6 Boneless Wings & Fries": 6,
+            "Crispy Chicken Baked Potato": 4,
+            "Grilled Chicken SALAD": 4,
+            "Kid's Boneless": 4,
+            "Kids Chicken Strip (3)": 3
+        },
+        "case_quantity": 40,  # 40 lbs per case
+        "is_weight_based": True,
+        "oz_per_piece": 1.3
+    },
+    "Chicken Breast 6oz": {
+        "items": {
+            "Chicken Fried Chicken" :1,
+            "Grilled Chicken Sandwich": 1,
+            "Crispy Chicken Sandwich": 1,
+            "Spicy Buffalo Chicken Sandwich": 1,
+            "Deluxe Chicken Sandwich": 1,
+            "Add Extra Chicken": 1
+        },
+        "case_quantity": 53
+    },
+    "Burger Patties": {
+        "items": {
+            "Big House Burger": 1,
+            "Double Burger": 2,
+            "Triple Burger": 3,
+            "Bigun' (4)": 4,
+            "Burger A La Mexicana": 2,
+            "Chili Cheese Burger": 1,
+            "Green Chili Burger": 1,
+            "Fire Burger": 2,
+            "Brunch Burger": 2,
+            "Deluxe Burger": 1,
+            "Single Burger w Fries": 1,
+            "Burger A La Mexicana -- Single": 1,
+            "Chili Cheese Burger -- Single": 1,
+            "Green Chili Burger -- Single": 1,
+            "Fire Burger -- Single": 1,
+            "Brunch Burger -- Single": 1,
+            "Patty Melt": 1,
+            "Hamburger Patty Solo": 1,
+            "Taco Salad": 2,
+            "Beef Tacos": 1,
+            "Cheddar Jala Hamburger Steak": 2,
+            "Mushroom Swiss Hamburger Steak": 2,
+            "Jalapeno Cheddar HBS Lunch": 1.5,
+            "Kid's Burger": .5,
+        },
+        "case_quantity": 40,  # 70 lbs per case
+        "is_weight_based": True,
+        "oz_per_piece": 5.28
+    },
+    "Ribeye Roll": {
+        "items": {
+            "Ribeye Tater": 1,
+            "Ribeye Salad": 1,
+            "Ribeye Sandwich": 1,
+            "Side of RIbeye": 1,
+        },
+        "case_quantity": 70,  # 70 lbs per case
+        "is_weight_based": True,
+        "oz_per_piece": 8
+    },
+    # Add more categories here as needed
+    # "Category Name": {
+    #     "items": {"Item 1": multiplier, "Item 2": multiplier},
+    #     "case_quantity": qty
+    # }
+}
+
+MATCH_COLUMNS = ['category', 'item_name', 'qty_sold', 'multiplier', 'total', 'row']
+
+
+class ItemMatcher:
+    """Aho-Corasick automaton over every item name in every category
+
+    Finds all item names contained in a cell (overlapping ones too, e.g.
+    "Fire Burger" and "Fire Burger -- Single") in one scan of the text.
+    """
+
+    def __init__(self, categories=CATEGORIES):
+        self.categories = categories
+        # Pattern ids follow category order, then item order within a category
+        self.patterns = [(category, item_name, multiplier)
+                         for category, config in categories.items()
+                         for item_name, multiplier in config['items'].items()]
+
+        self._goto = [{}]
+        self._fail = [0]
+        self._out = [[]]
+        for pid, (_category, item_name, _multiplier) in enumerate(self.patterns):
+            node = 0
+            for ch in item_name:
+                nxt = self._goto[node].get(ch)
+                if nxt is None:
+                    nxt = len(self._goto)
+                    self._goto[node][ch] = nxt
+                    self._goto.append({})
+                    self._fail.append(0)
+                    self._out.append([])
+                node = nxt
+            self._out[node].append(pid)
+
+        # Breadth-first so every failure target is finished before it is used
+        queue = deque(self._goto[0].values())
+        while queue:
+            node = queue.popleft()
+            for ch, nxt in self._goto[node].items():
+                queue.append(nxt)
+                fail = self._fail[node]
+                while fail and ch not in self._goto[fail]:
+                    fail = self._fail[fail]
+                self._fail[nxt] = self._goto[fail].get(ch, 0)
+                self._out[nxt] = self._out[nxt] + self._out[self._fail[nxt]]
+
+    def search(self, text):
+        """Sorted ids of every pattern contained in text"""
+        goto, fail, out = self._goto, self._fail, self._out
+        found = set()
+        node = 0
+        for ch in text:
+            while node and ch not in goto[node]:
+                node = fail[node]
+            node = goto[node].get(ch, 0)
+            if out[node]:
+                found.update(out[node])
+        return sorted(found)
+
+    def match(self, df):
+        """All (item, row) matches in a POS sheet, one row per match
+
+        Each distinct cell text is scanned once. Rows come back grouped by
+        category and item (in CATEGORIES order), then by sheet row.
+        """
+        items = df.iloc[:, ITEM_COLUMN]
+        valid = items.notna().to_numpy()
+        positions = np.flatnonzero(valid)
+        codes, uniques = pd.factorize(items[valid].astype(str))
+        hits = [self.search(text) for text in uniques]
+
+        counts = np.array([len(h) for h in hits], dtype=int)[codes] if len(codes) else np.zeros(0, dtype=int)
+        rows = np.repeat(positions, counts)
+        pids = np.fromiter((pid for code in codes for pid in hits[code]), dtype=int, count=int(counts.sum()))
+        order = np.lexsort((rows, pids))
+        rows, pids = rows[order], pids[order]
+
+        qty = pd.to_numeric(df.iloc[:, QTY_COLUMN], errors='coerce').fillna(0).to_numpy(dtype=float)
+        multipliers = np.array([p[2] for p in self.patterns], dtype=float)
+        qty_sold = qty[rows]
+        return pd.DataFrame({
+            'category': [self.patterns[p][0] for p in pids],
+            'item_name': [self.patterns[p][1] for p in pids],
+            'qty_sold': qty_sold,
+            'multiplier': [self.patterns[p][2] for p in pids],
+            'total': qty_sold * multipliers[pids],
+            'row': rows,
+        }, columns=MATCH_COLUMNS)
+
+
+def summarize(matches, categories=CATEGORIES, inventory=None):
+    """Totals, weight conversions and cases for every category at once
+
+    Returns a frame indexed by category with total_items, total_oz and
+    total_lbs (NaN for count-based categories), cases_required,
+    cases_rounded, inventory and total_required. inventory maps
+    category -> cases on hand.
+    """
+    names = list(categories)
+    totals = matches.groupby('category', sort=False)['total'].sum().reindex(names, fill_value=0.0)
+    found = matches.groupby('category', sort=False).size().reindex(names, fill_value=0)
+
+    case_qty = np.array([categories[n]['case_quantity'] for n in names], dtype=float)
+    weight_based = np.array([bool(categories[n].get('is_weight_based')) for n in names])
+    oz_per_piece = np.array([categories[n].get('oz_per_piece') or np.nan for n in names], dtype=float)
+    on_hand = np.array([(inventory or {}).get(n, 0.0) for n in names], dtype=float)
+
+    total_items = totals.to_numpy(dtype=float)
+    total_oz = np.where(weight_based, total_items * oz_per_piece, np.nan)
+    total_lbs = total_oz / 16
+    cases_required = np.where(weight_based, total_lbs, total_items) / case_qty
+    cases_rounded = np.ceil(cases_required)
+
+    return pd.DataFrame({
+        'matches': found.to_numpy(),
+        'total_items': total_items,
+        'total_oz': total_oz,
+        'total_lbs': total_lbs,
+        'cases_required': cases_required,
+        'cases_rounded': cases_rounded.astype(int),
+        'inventory': on_hand,
+        'total_required': np.ceil(cases_rounded - on_hand).astype(int),
+    }, index=pd.Index(names, name='category'))
+
+
+def read_product_mix(path):
+    """Read a product-mix export's POS sheet"""
+    df = pd.read_excel(path, sheet_name=SHEET_NAME)
+    if df.shape[1] <= QTY_COLUMN:
+        raise ValueError("Excel file doesn't have enough columns!")
+    return df
+
+
+# ==================== BATCH / ORDER PLANNING ====================
+
+def _week_job(job):
+    """Worker: item totals per category for one export (runs in a child process)"""
+    path, categories = job
+    try:
+        matches = ItemMatcher(categories).match(read_product_mix(path))
+        return summarize(matches, categories)['total_items'], None
+    except Exception as e:
+        return None, f"{Path(path).name}: {e}"
+
+
+def order_plan(paths, categories=CATEGORIES, inventory=None, max_workers=None):
+    """Weekly usage per category across several exports, with cases to order
+
+    One row per category with a usage column per export (labelled by file
+    name), the weekly average and peak, and cases required for an average
+    week after subtracting inventory. Returns (plan, errors).
+    """
+    paths = [str(p) for p in paths]
+    jobs = [(path, categories) for path in paths]
+    if len(jobs) <= 1 or max_workers == 1:
+        outcomes = [_week_job(job) for job in jobs]
+    else:
+        with ProcessPoolExecutor(max_workers=max_workers or min(len(jobs), os.cpu_count() or 1)) as pool:
+            outcomes = list(pool.map(_week_job, jobs))
+
+    weeks, errors = {}, []
+    for path, (totals, error) in zip(paths, outcomes):
+        if error:
+            errors.append(error)
+        else:
+            weeks[Path(path).stem] = totals
+    if not weeks:
+        return pd.DataFrame(), errors
+
+    usage = pd.DataFrame(weeks)
+    average = usage.mean(axis=1)
+    # Cases for an average week reuse the single-week conversions
+    average_matches = pd.DataFrame({'category': average.index, 'total': average.to_numpy()})
+    cases = summarize(average_matches, categories, inventory)
+
+    plan = usage.round(2)
+    plan['Weekly Average'] = average.round(2)
+    plan['Peak Week'] = usage.max(axis=1).round(2)
+    plan['Avg Lbs'] = cases['total_lbs'].round(2)
+    plan['Cases Required'] = cases['cases_required'].round(2)
+    plan['Cases Round Up'] = cases['cases_rounded']
+    plan['Inventory'] = cases['inventory']
+    plan['Total Required'] = cases['total_required']
+    plan.index.name = 'Category'
+    return plan.reset_index(), errors
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Product mix order planning across several weeks')
+    parser.add_argument('files', nargs='*', help='Product mix Excel exports')
+    parser.add_argument('--folder', help='Use every .xlsx/.xls export in this folder')
+    parser.add_argument('--out', help='Write the order-planning table to this CSV')
+    parser.add_argument('--workers', type=int, default=None, help='Worker processes')
+    args = parser.parse_args(argv)
+
+    paths = [os.path.expanduser(p) for p in args.files]
+    if args.folder:
+        folder = os.path.expanduser(args.folder)
+        paths += sorted(os.path.join(folder, name) for name in os.listdir(folder)
+                        if name.lower().endswith(('.xlsx', '.xls')) and not name.startswith('~$'))
+    if not paths:
+        parser.error('give export files or --folder')
+
+    plan, errors = order_plan(paths, max_workers=args.workers)
+    if not plan.empty:
+        print(plan.to_string(index=False))
+        if args.out:
+            plan.to_csv(args.out, index=False)
+            print(f"\nOrder plan saved to: {args.out}")
+    for error in errors:
+        print(f"❌ {error}")
+    return 1 if errors else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
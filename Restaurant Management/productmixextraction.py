@@ -4,6 +4,8 @@ import pandas as pd
 from pathlib import Path
 import math
 
+from product_mix import CATEGORIES, ItemMatcher, summarize, order_plan
+
 
 class ProductCategory:
     """Represents a single product category with its items and calculations"""
@@ -14,6 +16,12 @@ class ProductCategory:
         self.case_quantity = case_quantity
         self.is_weight_based = is_weight_based
         self.oz_per_piece = oz_per_piece
+        self.config = {self.category_name: {
+            "items": item_multipliers,
+            "case_quantity": case_quantity,
+            "is_weight_based": is_weight_based,
+            "oz_per_piece": oz_per_piece
+        }}
         self.item_inventory = 0.0
         self.results = []
         self.df = None
@@ -73,8 +81,12 @@ class ProductCategory:
         )
         self.summary_label.pack()
     
-    def process_data(self, df):
-        """Process the Excel data for this category"""
+    def process_data(self, df, matches=None):
+        """Process the Excel data for this category
+
+        matches is this category's rows from ItemMatcher.match(); when
+        omitted the sheet is matched for this category alone.
+        """
         self.df = df
         
         # Clear previous results
@@ -82,49 +94,29 @@ class ProductCategory:
             self.tree.delete(item)
         self.results = []
         
-        # Column H is index 7 (0-based), Column N is index 13
-        item_column = df.iloc[:, 7]  # Column H
-        qty_column = df.iloc[:, 13]  # Column N
-        
-        total_items = 0
-        
-        # Search for each item in the mapping
-        for item_name, multiplier in self.item_multipliers.items():
-            # Search for the item in column H
-            for idx, cell_value in enumerate(item_column):
-                if pd.notna(cell_value) and item_name in str(cell_value):
-                    # Get the quantity sold from column N
-                    qty_sold = qty_column.iloc[idx]
-                    
-                    # Handle non-numeric or NaN values
-                    if pd.isna(qty_sold):
-                        qty_sold = 0
-                    else:
-                        try:
-                            qty_sold = float(qty_sold)
-                        except:
-                            qty_sold = 0
-                    
-                    # Calculate total
-                    total = qty_sold * multiplier
-                    total_items += total
-                    
-                    # Store result
-                    result = {
-                        "item_name": item_name,
-                        "qty_sold": qty_sold,
-                        "multiplier": multiplier,
-                        "total": total
-                    }
-                    self.results.append(result)
-                    
-                    # Add to treeview
-                    self.tree.insert("", "end", values=(
-                        item_name,
-                        int(qty_sold) if qty_sold == int(qty_sold) else qty_sold,
-                        multiplier,
-                        int(total) if total == int(total) else total
-                    ))
+        if matches is None:
+            matches = ItemMatcher(self.config).match(df)
+        total_items = float(summarize(matches, self.config).loc[self.category_name, 'total_items'])
+        
+        for item_name, qty_sold, total in zip(matches['item_name'], matches['qty_sold'], matches['total']):
+            multiplier = self.item_multipliers[item_name]
+            
+            # Store result
+            result = {
+                "item_name": item_name,
+                "qty_sold": qty_sold,
+                "multiplier": multiplier,
+                "total": total
+            }
+            self.results.append(result)
+            
+            # Add to treeview
+            self.tree.insert("", "end", values=(
+                item_name,
+                int(qty_sold) if qty_sold == int(qty_sold) else qty_sold,
+                multiplier,
+                int(total) if total == int(total) else total
+            ))
         
         # Add summary rows to the table
         if self.results:
@@ -365,111 +357,9 @@ class ProductMixExtractor:
         self.root.title("Product Mix Extractor")
         self.root.geometry("950x750")
         
-        # Define product categories
-        self.categories = {
-            "Chicken Wings": {
-                "items": {
-                    "Side Kick Wings 5 Piece": 5,
-                    "6pc Wings w Fries": 6,
-                    "10pc Wings w Fries": 10,
-                    "16pc  Wings": 16,
-                    "SideKick of Wings": 5,
-                    "8 Wings & 8 O-Rings": 8,
-                    "10 Wings": 10,
-                    "15 Wings": 15,
-                    "20 Wings": 20
-                },
-                "case_quantity": 250
-            },
-            "Beef Cutlets": {
-                "items": {
-                    "Steak Finger Basket": 1,
-                    "Chicken Fried Steak": 1,
-                },
-                "case_quantity": 28
-            },
-            "Chicken Boneless": {
-                "items": {
-                    "6pc Boneless": 6,
-                    "12pc Boneless": 12,
-                    "Chicken Strip Basket (4)": 4,
-                    "Grilled Chicken Tater": 4,
-                    "Crispy Chicken Tater": 4,
-                    "Boneless Wing Tater": 4,
-                    "Chicken & Mushroom": 4,
-                    "Grilled Chicken Salad": 4,
-                    "Crispy Chicken Salad": 4,
-                    "Chicken Tacos": 4,
-                    "3PC Chicken Strips w Fries": 3,
-                    "6 Boneless Wings & Fries": 6,
-                    "Crispy Chicken Baked Potato": 4,
-                    "Grilled Chicken SALAD": 4,
-                    "Kid's Boneless": 4,
-                    "Kids Chicken Strip (3)": 3
-                },
-                "case_quantity": 40,  # 40 lbs per case
-                "is_weight_based": True,
-                "oz_per_piece": 1.3
-            },
-            "Chicken Breast 6oz": {
-                "items": {
-                    "Chicken Fried Chicken" :1,
-                    "Grilled Chicken Sandwich": 1,
-                    "Crispy Chicken Sandwich": 1,
-                    "Spicy Buffalo Chicken Sandwich": 1,
-                    "Deluxe Chicken Sandwich": 1,
-                    "Add Extra Chicken": 1
-                },
-                "case_quantity": 53
-            },
-            "Burger Patties": {
-                "items": {
-                    "Big House Burger": 1,
-                    "Double Burger": 2,
-                    "Triple Burger": 3,
-                    "Bigun' (4)": 4,
-                    "Burger A La Mexicana": 2,
-                    "Chili Cheese Burger": 1,
-                    "Green Chili Burger": 1,
-                    "Fire Burger": 2,
-                    "Brunch Burger": 2,
-                    "Deluxe Burger": 1,
-                    "Single Burger w Fries": 1,
-                    "Burger A La Mexicana -- Single": 1,
-                    "Chili Cheese Burger -- Single": 1,
-                    "Green Chili Burger -- Single": 1,
-                    "Fire Burger -- Single": 1,
-                    "Brunch Burger -- Single": 1,
-                    "Patty Melt": 1,
-                    "Hamburger Patty Solo": 1,
-                    "Taco Salad": 2,
-                    "Beef Tacos": 1,
-                    "Cheddar Jala Hamburger Steak": 2,
-                    "Mushroom Swiss Hamburger Steak": 2,
-                    "Jalapeno Cheddar HBS Lunch": 1.5,
-                    "Kid's Burger": .5,
-                },
-                "case_quantity": 40,  # 70 lbs per case
-                "is_weight_based": True,
-                "oz_per_piece": 5.28
-            },
-            "Ribeye Roll": {
-                "items": {
-                    "Ribeye Tater": 1,
-                    "Ribeye Salad": 1,
-                    "Ribeye Sandwich": 1,
-                    "Side of RIbeye": 1,
-                },
-                "case_quantity": 70,  # 70 lbs per case
-                "is_weight_based": True,
-                "oz_per_piece": 8
-            },
-            # Add more categories here as needed
-            # "Category Name": {
-            #     "items": {"Item 1": multiplier, "Item 2": multiplier},
-            #     "case_quantity": qty
-            # }
-        }
+        # Product categories live in product_mix.CATEGORIES
+        self.categories = CATEGORIES
+        self.matcher = ItemMatcher(self.categories)
         
         self.excel_file_path = None
         self.category_objects = {}
@@ -555,6 +445,19 @@ class ProductMixExtractor:
             pady=5
         )
         export_btn.pack(pady=10)
+        
+        # Batch button
+        plan_btn = tk.Button(
+            self.root,
+            text="Plan Orders from Several Weeks",
+            command=self.plan_orders,
+            bg="#9C27B0",
+            fg="white",
+            font=("Arial", 10, "bold"),
+            padx=10,
+            pady=5
+        )
+        plan_btn.pack(pady=(0, 10))
     
     def select_file(self):
         file_path = filedialog.askopenfilename(
@@ -580,10 +483,12 @@ class ProductMixExtractor:
                 messagebox.showerror("Error", "Excel file doesn't have enough columns!")
                 return
             
-            # Process data for each category
+            # Match every category's items in one pass, then fill each tab
+            matches = self.matcher.match(df)
+            by_category = dict(tuple(matches.groupby('category', sort=False)))
             total_found = 0
             for category_name, category_obj in self.category_objects.items():
-                found = category_obj.process_data(df)
+                found = category_obj.process_data(df, by_category.get(category_name, matches.iloc[0:0]))
                 total_found += found
             
             if total_found == 0:
@@ -594,6 +499,38 @@ class ProductMixExtractor:
         except Exception as e:
             messagebox.showerror("Error", f"An error occurred:\n{str(e)}")
     
+    def plan_orders(self):
+        """Build one order-planning table from several weeks of exports"""
+        file_paths = filedialog.askopenfilenames(
+            title="Select Weekly Product Mix Files",
+            filetypes=[("Excel Files", "*.xlsx *.xls"), ("All Files", "*.*")]
+        )
+        if not file_paths:
+            return
+        
+        try:
+            inventory = {name: obj.item_inventory for name, obj in self.category_objects.items()}
+            plan, errors = order_plan(file_paths, self.categories, inventory)
+            if plan.empty:
+                messagebox.showerror("Error", "No weeks could be processed:\n" + "\n".join(errors))
+                return
+            
+            file_path = filedialog.asksaveasfilename(
+                defaultextension=".csv",
+                filetypes=[("CSV Files", "*.csv"), ("All Files", "*.*")],
+                initialfile="order_plan.csv",
+                title="Save Order Plan As"
+            )
+            if file_path:
+                plan.to_csv(file_path, index=False)
+                message = f"Order plan for {len(file_paths) - len(errors)} week(s) saved to:\n{file_path}"
+                if errors:
+                    message += "\n\nSkipped:\n" + "\n".join(errors)
+                messagebox.showinfo("Success", message)
+        
+        except Exception as e:
+            messagebox.showerror("Error", f"Failed to plan orders:\n{str(e)}")
+    
     def export_results(self):
         """Export all category results to a single CSV file"""
         has_results = False
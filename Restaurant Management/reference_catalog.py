@@ -0,0 +1,173 @@
+#!/usr/bin/env python3
+"""
+Reference catalog service
+Loads reference_inventory.csv once per file version (size and mtime are
+checked on every request, the CSV is only re-read after it changes) and
+parses every package size in one vectorized pass into:
+    UPP        units per package ('4/5 LB' -> 4, '60 EA' -> 1)
+    pack_size  size of one unit   ('4/5 LB' -> 5.0, '60 EA' -> 60.0)
+    unit       unit of pack_size  ('4/5 LB' -> 'LB')
+A UPP already present in the file is kept; only blank cells are computed.
+
+The rows are kept as template-ready records plus an item-number index, so
+the root app's take_inventory, print_inventory and order_results pages and
+the inventory report all render from the same in-memory catalog.
+
+Shared by the root app.py and inventory_report.py (through
+inventory_snapshots.py).
+
+Batch usage:
+    python reference_catalog.py reference_inventory.csv
+    python reference_catalog.py --benchmark 5000
+"""
+import os
+import sys
+import time
+import argparse
+
+import numpy as np
+import pandas as pd
+
+REFERENCE_INVENTORY_FILE = 'reference_inventory.csv'
+
+# '4/5 LB' -> (4, 5, LB); '60 EA' -> (-, 60, EA). Only the 'N/size unit' form has a UPP above 1.
+PACKAGE_PATTERN = r'^\s*(?:(?P<upp>\d+)\s*/\s*)?(?P<size>[\d.]+)\s*(?P<unit>[a-zA-Z]+)'
+MISSING_UPP = ['', '-', 'nan', 'NaN']
+
+
+# ==================== PACKAGE SIZES ====================
+
+def parse_package_sizes(package_sizes):
+    """UPP, pack_size and unit for every package size (UPP 1 when there is no 'N/' count)"""
+    sizes = pd.Series(package_sizes, dtype=object)
+    text = sizes.where(sizes.map(lambda v: isinstance(v, str)), '').astype(str)
+    parts = text.str.extract(PACKAGE_PATTERN)
+    return pd.DataFrame({
+        'UPP': pd.to_numeric(parts['upp'], errors='coerce').fillna(1).astype('int64'),
+        'pack_size': pd.to_numeric(parts['size'], errors='coerce'),
+        'unit': parts['unit'].str.upper().astype(object).where(parts['unit'].notna(), None),
+    }, index=sizes.index)
+
+
+def calculate_upp(package_size):
+    """Units per package for one package size"""
+    return int(parse_package_sizes([package_size])['UPP'].iloc[0])
+
+
+# ==================== CATALOG ====================
+
+class ReferenceCatalog:
+    """Reference items with UPP / pack_size / unit columns, indexed by item number"""
+
+    def __init__(self, frame):
+        df = frame.copy()
+        sizes = df['package_size'] if 'package_size' in df.columns else pd.Series('', index=df.index, dtype=object)
+        parsed = parse_package_sizes(sizes)
+        if 'UPP' in df.columns:
+            missing = df['UPP'].isna() | df['UPP'].astype(str).str.strip().isin(MISSING_UPP)
+            df['UPP'] = df['UPP'].astype(object).where(~missing, parsed['UPP'])
+        else:
+            df['UPP'] = parsed['UPP']
+        for col in ('pack_size', 'unit'):
+            if col not in df.columns:
+                df[col] = parsed[col]
+        self.frame = df
+        self.items = df.to_dict(orient='records')
+        self.item_keys = (df['item_number'].fillna('').astype(str).str.strip()
+                          if 'item_number' in df.columns else pd.Series('', index=df.index, dtype=object))
+        self.description_keys = (df['description'].fillna('').astype(str).str.strip().str.lower()
+                                 if 'description' in df.columns else pd.Series('', index=df.index, dtype=object))
+        self.upp = pd.to_numeric(df['UPP'], errors='coerce').fillna(1).to_numpy(dtype=float)
+        # First row wins for a repeated item number
+        keys = self.item_keys.to_numpy()
+        self._positions = {key: i for i, key in reversed(list(enumerate(keys))) if key}
+        self._upp_by_item = pd.Series(self.upp, index=keys)[(keys != '') & ~pd.Index(keys).duplicated()]
+
+    def __len__(self):
+        return len(self.frame)
+
+    @classmethod
+    def load(cls, path=REFERENCE_INVENTORY_FILE):
+        return cls(pd.read_csv(path, dtype={'item_number': str}))
+
+    def lookup(self, item_number):
+        """Catalog record for an item number, or None"""
+        position = self._positions.get(str(item_number).strip())
+        return None if position is None else self.items[position]
+
+    def upp_for(self, item_numbers):
+        """UPP for each item number (NaN for items not in the catalog)"""
+        keys = pd.Series(item_numbers, dtype=object).map(lambda v: '' if pd.isna(v) else str(v).strip())
+        return pd.Series(keys.map(self._upp_by_item).to_numpy(dtype=float), index=keys.index)
+
+    def annotate_orders(self, orders, key='ProductNumber', qty='QtyShip'):
+        """Orders with the catalog's UPP and Units (cases shipped * UPP) for known products"""
+        upp = self.upp_for(orders[key]).to_numpy() if key in orders.columns else np.full(len(orders), np.nan)
+        cases = (pd.to_numeric(orders[qty], errors='coerce').to_numpy(dtype=float)
+                 if qty in orders.columns else np.full(len(orders), np.nan))
+        return orders.assign(UPP=upp, Units=cases * upp)
+
+
+_catalogs = {}
+
+
+def get_reference_catalog(path=REFERENCE_INVENTORY_FILE):
+    """Shared catalog for path (None if the file is missing), reloaded when the file changes"""
+    try:
+        st = os.stat(path)
+    except OSError:
+        return None
+    key = (st.st_size, st.st_mtime_ns)
+    entry = _catalogs.get(path)
+    if entry is None or entry[0] != key:
+        entry = _catalogs[path] = (key, ReferenceCatalog.load(path))
+    return entry[1]
+
+
+# ==================== BENCHMARK ====================
+
+def synthetic_catalog(rows, seed=0):
+    """Reference rows shaped like reference_inventory.csv"""
+    rng = np.random.default_rng(seed)
+    sizes = ['60 EA', '10 LB', '4/5 LB', '6/#10 CN', '12/32 OZ', '2/1 GAL', '25 LB', '1000 EA']
+    groups = ['Cooler Items', 'Freezer Items', 'Dry Goods', 'Paper', 'Chemicals']
+    return pd.DataFrame({
+        'product': '',
+        'description': [f"ITEM {i}, SYNTHETIC REFERENCE PRODUCT" for i in range(rows)],
+        'package_size': rng.choice(sizes, rows),
+        'brand': 'PACKER',
+        'cost': rng.uniform(1, 90, rows).round(2),
+        'item_number': [str(1000000 + i) for i in range(rows)],
+        'quantity': 0.0,
+        'group_name': rng.choice(groups, rows),
+        'timestamp': '2025-12-16 12:02:15',
+    })
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Load the reference catalog and report its package sizes')
+    parser.add_argument('path', nargs='?', default=REFERENCE_INVENTORY_FILE, help='Reference inventory CSV')
+    parser.add_argument('--benchmark', type=int, metavar='ROWS', help='Time loading a synthetic catalog of ROWS items')
+    args = parser.parse_args(argv)
+
+    if args.benchmark:
+        frame = synthetic_catalog(args.benchmark)
+        start = time.perf_counter()
+        catalog = ReferenceCatalog(frame)
+        elapsed = time.perf_counter() - start
+        print(f"{len(catalog):,} items indexed in {elapsed * 1000:.1f} ms")
+        return 0
+
+    catalog = get_reference_catalog(args.path)
+    if catalog is None:
+        print(f"No reference catalog at {args.path}")
+        return 1
+    print(f"{len(catalog):,} items, {int((catalog.upp > 1).sum()):,} multi-unit packages")
+    counts = catalog.frame['unit'].fillna('(unparsed)').value_counts()
+    for unit, count in counts.items():
+        print(f"  {unit:<12} {count:>6,}")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,318 @@
+#!/usr/bin/env python3
+"""
+Sales history loader
+Loads Toast "Sales by Day" exports for each location and shift (M = morning,
+N = night) into one normalized frame: Date parsed, rows sorted by date then
+shift, ready for aggregation and plotting.
+
+Each file is read once: the encoding is sniffed from a byte sample instead
+of re-parsing the file per candidate encoding, the date column and its
+format are detected from the same sample, and the CSV is parsed with
+explicit dtypes. The normalized frame is cached next to the export as
+Parquet, keyed by the source file's size and modification time, so later
+runs skip parsing entirely. Without a Parquet engine (pyarrow) nothing is
+cached; the cache is never pickled, since a pickle dropped into the data
+folder would run code when loaded.
+
+Shared by Excel/excelreader.py.
+
+Batch usage:
+    python sales_history.py "M=~/Desktop/By Shift/Kingsville Morning" "N=~/Desktop/By Shift/Kingsville Night"
+    python sales_history.py Kingsville:M=... Kingsville:N=... Alice:M=... Alice:N=... --out combined.csv --plot bars.png
+"""
+import io
+import os
+import sys
+import time
+import codecs
+import argparse
+
+import pandas as pd
+
+try:
+    import pyarrow  # noqa: F401  (pandas' Parquet engine)
+    HAVE_PARQUET = True
+except ImportError:  # Optional; exports are then parsed on every load
+    HAVE_PARQUET = False
+
+CACHE_SUFFIX = ".parquet"
+
+CACHE_VERSION = 1
+SALES_FILENAME = "Sales by Day.csv"
+SAMPLE_BYTES = 64 * 1024
+
+# Date column: exact names first, then any header mentioning date / day / yyyy
+DATE_CANDIDATES = ['yyyyMMdd', 'YYYYMMDD', 'Date', 'date', 'DAY', 'Day', 'day']
+DATE_FORMATS = ['%Y%m%d', '%Y-%m-%d', '%m/%d/%Y', '%m/%d/%y', '%Y/%m/%d']
+
+# Explicit dtypes for the Toast export's measure columns (matched case-insensitively)
+MEASURE_DTYPES = {
+    'net sales': 'float64', 'gross sales': 'float64', 'discounts': 'float64',
+    'refunds': 'float64', 'voids': 'float64', 'tax': 'float64', 'tips': 'float64',
+    'total orders': 'Int64', 'total guests': 'Int64',
+}
+
+NET_CANDIDATES = ['Net Sales', 'NetSales', 'Net_Sales', 'Net Amount', 'NetAmount', 'Net', 'Sales', 'Total']
+PERIOD_ORDER = {'M': 0, 'N': 1}
+
+
+# ==================== SNIFFING ====================
+
+def sniff_encoding(sample):
+    """Encoding for a byte sample: UTF-8 (with or without BOM), else cp1252, else latin-1"""
+    if sample.startswith(codecs.BOM_UTF8):
+        return 'utf-8-sig'
+    try:
+        # Incremental so a character cut off at the end of the sample is not an error
+        codecs.getincrementaldecoder('utf-8')().decode(sample, final=False)
+        return 'utf-8'
+    except UnicodeDecodeError:
+        pass
+    try:
+        sample.decode('cp1252')
+        return 'cp1252'
+    except UnicodeDecodeError:
+        return 'latin-1'
+
+
+def find_date_column(columns):
+    """The date column of a sales export, or None"""
+    column = next((c for c in columns if c in DATE_CANDIDATES), None)
+    if column is None:
+        column = next((c for c in columns if any(k in str(c).lower() for k in ('date', 'day', 'yyyy'))), None)
+    return column
+
+
+def sniff_date_format(values):
+    """First format in DATE_FORMATS that parses every sample value (None = let pandas infer)"""
+    values = [v for v in values if v]
+    if not values:
+        return None
+    for fmt in DATE_FORMATS:
+        if not pd.to_datetime(pd.Series(values), format=fmt, errors='coerce').isna().any():
+            return fmt
+    return None
+
+
+def _clean_dates(values):
+    """Date cells as text without the trailing '.0' Excel adds to yyyyMMdd numbers"""
+    return values.astype(str).str.replace(r'\.0$', '', regex=True)
+
+
+# ==================== READING ====================
+
+def read_sales(path):
+    """One sales export as a frame with a parsed Date column (NaT where unparseable)"""
+    with open(path, 'rb') as f:
+        sample = f.read(SAMPLE_BYTES)
+    encoding = sniff_encoding(sample)
+    text = sample.decode(encoding, errors='ignore')
+    header = pd.read_csv(io.StringIO(text), nrows=50, dtype=str, keep_default_na=False)
+
+    date_col = find_date_column(header.columns)
+    dtypes = {c: MEASURE_DTYPES[str(c).strip().lower()] for c in header.columns
+              if str(c).strip().lower() in MEASURE_DTYPES}
+    if date_col is not None:
+        dtypes[date_col] = str
+    try:
+        df = pd.read_csv(path, encoding=encoding, dtype=dtypes)
+    except UnicodeDecodeError:  # Undecodable bytes past the sample; latin-1 maps every byte
+        encoding = 'latin-1'
+        df = pd.read_csv(path, encoding=encoding, dtype=dtypes)
+    except (ValueError, TypeError):  # A summary row or odd cell in a measure column
+        df = pd.read_csv(path, encoding=encoding, dtype={date_col: str} if date_col is not None else None)
+
+    if date_col is None:
+        if 'Date' not in df.columns:
+            df['Date'] = pd.NaT
+        return df
+    cleaned = _clean_dates(df[date_col])
+    fmt = sniff_date_format(_clean_dates(header[date_col]).tolist())
+    parsed = pd.to_datetime(cleaned, format=fmt, errors='coerce') if fmt else None
+    if parsed is None or parsed.isna().all():
+        parsed = pd.to_datetime(cleaned, errors='coerce', format='mixed')
+    df['Date'] = parsed
+    return df
+
+
+# ==================== CACHE ====================
+
+def _cache_path(path):
+    folder, name = os.path.split(path)
+    return os.path.join(folder, f".{os.path.splitext(name)[0]}.sales{CACHE_SUFFIX}")
+
+
+def _read_cache(cache, key):
+    if not HAVE_PARQUET:
+        return None
+    try:
+        df = pd.read_parquet(cache)
+    except Exception:  # Missing, partial or from another pandas version
+        return None
+    return df if df.attrs.get('source') == key else None
+
+
+def _write_cache(cache, df, key):
+    if not HAVE_PARQUET:
+        return
+    tmp = f"{cache}.{os.getpid()}.tmp"
+    df = df.copy()
+    df.attrs['source'] = key
+    try:
+        df.to_parquet(tmp, index=False)
+        os.replace(tmp, cache)
+    except OSError:
+        pass  # Read-only folder: the frame is still correct, just not remembered
+
+
+def load_sales(path, rebuild=False):
+    """Normalized frame for one export, from the cache when the file is unchanged
+
+    Returns (df, cached).
+    """
+    st = os.stat(path)
+    key = {'version': CACHE_VERSION, 'size': st.st_size, 'mtime_ns': st.st_mtime_ns}
+    cache = _cache_path(path)
+    df = None if rebuild else _read_cache(cache, key)
+    if df is not None:
+        df.attrs.clear()
+        return df, True
+    df = read_sales(path)
+    _write_cache(cache, df, key)
+    return df, False
+
+
+def load_history(sources, filename=SALES_FILENAME, rebuild=False):
+    """Combined history for several shifts (and locations)
+
+    sources is a list of (location, period, folder); location may be None
+    for a single-location history, in which case no Location column is
+    added. Rows are sorted by Date, then period (M before N), keeping file
+    order otherwise. Returns (df, stats) where stats counts files read,
+    served from the cache and missing.
+    """
+    frames = []
+    stats = {'files': 0, 'read': 0, 'cached': 0, 'missing': []}
+    for location, period, folder in sources:
+        path = os.path.join(os.path.expanduser(folder), filename)
+        if not os.path.exists(path):
+            stats['missing'].append(path)
+            continue
+        df, cached = load_sales(path, rebuild=rebuild)
+        stats['files'] += 1
+        stats['cached' if cached else 'read'] += 1
+        if location is not None:
+            df.insert(0, 'Location', location)
+        # Period before Date, the column order the combined CSV has always had
+        frames.append(df.assign(Period=period)[[c for c in df.columns if c != 'Date'] + ['Period', 'Date']])
+    if not frames:
+        return pd.DataFrame(), stats
+
+    combined = pd.concat(frames, ignore_index=True)
+    combined['Period'] = combined['Period'].astype(str)
+    order = combined['Period'].map(PERIOD_ORDER).fillna(2).astype(int)
+    keys = combined[['Date']].assign(_p=order)
+    combined = combined.loc[keys.sort_values(['Date', '_p'], kind='stable').index].reset_index(drop=True)
+    return combined, stats
+
+
+# ==================== AGGREGATION & PLOTTING ====================
+
+def net_sales_column(df):
+    """The net sales column of a history (or the first other numeric column), or None"""
+    lower_map = {str(c).lower(): c for c in df.columns}
+    for cand in NET_CANDIDATES:
+        if cand.lower() in lower_map:
+            return lower_map[cand.lower()]
+    numeric_cols = df.select_dtypes(include='number').columns.tolist()
+    fallback_cols = [c for c in numeric_cols if str(c).lower() not in ('qtyship', 'qty', 'item qty', 'units')]
+    return fallback_cols[0] if fallback_cols else (numeric_cols[0] if numeric_cols else None)
+
+
+def net_sales_by_shift(df, net_col=None):
+    """Date x Period table of summed net sales (M and N columns always present)"""
+    net_col = net_col or net_sales_column(df)
+    if net_col is None or 'Date' not in df.columns:
+        return None
+    rows = df.dropna(subset=['Date'])
+    values = pd.to_numeric(rows[net_col], errors='coerce').fillna(0)
+    pivot = values.groupby([rows['Date'].dt.date, rows['Period']]).sum().unstack(fill_value=0)
+    for col in ['M', 'N']:
+        if col not in pivot.columns:
+            pivot[col] = 0
+    pivot = pivot[['M', 'N'] + [c for c in pivot.columns if c not in ('M', 'N')]]
+    pivot.index.name = 'Date'
+    return pivot.sort_index()
+
+
+def plot_net_sales(pivot, plot_path, show=False):
+    """Side-by-side M / N bars per day with dollar labels, saved to plot_path"""
+    import matplotlib.pyplot as plt
+
+    ax = pivot.plot(kind='bar', figsize=(12, 6), width=0.8)
+    ax.set_xlabel('')
+    ax.set_ylabel('Net Sales')
+    ax.set_title('Net Sales by shift')
+    plt.xticks(rotation=45, ha='right')
+    plt.legend(title='Shift')
+    for container in ax.containers:
+        labels = ['${:,.2f}'.format(h) if h else '' for h in (rect.get_height() for rect in container)]
+        ax.bar_label(container, labels=labels, padding=3, fontsize=8)
+    plt.tight_layout()
+    plt.savefig(plot_path)
+    if show:
+        try:
+            plt.show()
+        except Exception:  # Headless
+            pass
+    plt.close()
+    return plot_path
+
+
+def parse_source(spec):
+    """'[LOCATION:]PERIOD=FOLDER' -> (location or None, period, folder)"""
+    target, sep, folder = spec.partition('=')
+    if not sep:
+        raise ValueError(f"expected [LOCATION:]PERIOD=FOLDER, got {spec!r}")
+    location, _, period = target.rpartition(':')
+    return location or None, period, folder
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Load and combine "Sales by Day" shift histories')
+    parser.add_argument('sources', nargs='+', metavar='[LOCATION:]PERIOD=FOLDER',
+                        help='Shift export folder, e.g. Kingsville:M=~/Desktop/By Shift/Kingsville Morning')
+    parser.add_argument('--filename', default=SALES_FILENAME, help='Export file name inside each folder')
+    parser.add_argument('--out', help='Write the combined history here (CSV)')
+    parser.add_argument('--plot', help='Save the net sales by shift bar chart here (PNG)')
+    parser.add_argument('--rebuild', action='store_true', help='Ignore the caches and re-parse every file')
+    args = parser.parse_args(argv)
+
+    try:
+        sources = [parse_source(spec) for spec in args.sources]
+    except ValueError as e:
+        parser.error(str(e))
+
+    start = time.perf_counter()
+    combined, stats = load_history(sources, args.filename, rebuild=args.rebuild)
+    elapsed = time.perf_counter() - start
+    for path in stats['missing']:
+        print(f"File not found: {path}")
+    print(f"{len(combined):,} rows from {stats['files']} files ({stats['read']} parsed, "
+          f"{stats['cached']} cached) in {elapsed * 1000:.1f} ms")
+    if combined.empty:
+        return 1
+    if args.out:
+        combined.to_csv(args.out, index=False)
+        print(f"Combined history saved to {args.out}")
+    if args.plot:
+        pivot = net_sales_by_shift(combined)
+        if pivot is None or pivot.empty:
+            print("No dated net sales to plot.")
+        else:
+            print(f"Bar chart saved to {plot_net_sales(pivot, args.plot)}")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,266 @@
+#!/usr/bin/env python3
+"""
+Multi-process storage coordination
+Lets several worker processes of one web app (gunicorn -w N) share the
+same data files without losing writes or serving stale state:
+
+    FileLock          exclusive or shared lock on <path>.lock, held across
+                      processes (flock on Linux/macOS, msvcrt on Windows)
+    atomic_write      write to a temp file in the same folder, fsync, then
+                      rename over the target, so readers see the old file or
+                      the new one, never half of one
+    write_json / write_csv / append_csv_rows
+                      the same, for the formats the apps store
+    SharedState       per-name change counters in a small SQLite file. Each
+                      worker remembers the counters it loaded; refresh()
+                      (one SELECT, run before each request) reloads whatever
+                      another worker changed. writer is the lock a worker
+                      holds around a read-modify-write of shared data.
+    shared_secret_key one Flask SECRET_KEY for every worker, created once
+
+Shared by Inventory Control 2, the Manager App web version and dexter.
+
+Batch usage:
+    python shared_storage.py status data/shared_state.db
+"""
+import os
+import csv
+import sys
+import json
+import secrets
+import sqlite3
+import argparse
+import tempfile
+import threading
+from contextlib import contextmanager
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+    import msvcrt
+
+
+# ==================== FILE LOCKS ====================
+
+class FileLock:
+    """Cross-process lock on <path>.lock
+
+    Every acquire opens its own descriptor, so threads of one process
+    exclude each other as well. Windows has no shared mode; shared
+    acquires are exclusive there.
+    """
+
+    def __init__(self, path):
+        self.path = f"{path}.lock"
+        self._local = threading.local()
+
+    def acquire(self, shared=False):
+        fd = os.open(self.path, os.O_RDWR | os.O_CREAT, 0o644)
+        try:
+            if fcntl is not None:
+                fcntl.flock(fd, fcntl.LOCK_SH if shared else fcntl.LOCK_EX)
+            else:
+                msvcrt.locking(fd, msvcrt.LK_LOCK, 1)
+        except BaseException:
+            os.close(fd)
+            raise
+        self._held().append(fd)
+
+    def release(self):
+        fd = self._held().pop()
+        try:
+            if fcntl is not None:
+                fcntl.flock(fd, fcntl.LOCK_UN)
+            else:
+                os.lseek(fd, 0, os.SEEK_SET)
+                msvcrt.locking(fd, msvcrt.LK_UNLCK, 1)
+        finally:
+            os.close(fd)
+
+    def _held(self):
+        if not hasattr(self._local, 'fds'):
+            self._local.fds = []
+        return self._local.fds
+
+    @contextmanager
+    def __call__(self, shared=False):
+        self.acquire(shared)
+        try:
+            yield self
+        finally:
+            self.release()
+
+    def __enter__(self):
+        self.acquire()
+        return self
+
+    def __exit__(self, *exc):
+        self.release()
+
+
+# ==================== ATOMIC WRITES ====================
+
+@contextmanager
+def atomic_write(path, mode='w', **open_kw):
+    """File object for a temp copy of path, renamed over path on success"""
+    folder = os.path.dirname(os.path.abspath(path))
+    fd, tmp = tempfile.mkstemp(prefix=f".{os.path.basename(path)}.", suffix='.tmp', dir=folder)
+    try:
+        with os.fdopen(fd, mode, **open_kw) as f:
+            yield f
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp, path)
+    except BaseException:
+        try:
+            os.remove(tmp)
+        except OSError:
+            pass
+        raise
+
+
+def write_json(path, data, **dump_kw):
+    with atomic_write(path) as f:
+        json.dump(data, f, **dump_kw)
+
+
+def write_csv(path, rows, **open_kw):
+    with atomic_write(path, newline='', **open_kw) as f:
+        csv.writer(f).writerows(rows)
+
+
+def append_csv_rows(path, rows, **open_kw):
+    """Append rows under the file's lock, so concurrent appends never interleave"""
+    with FileLock(path):
+        with open(path, 'a', newline='', **open_kw) as f:
+            csv.writer(f).writerows(rows)
+            f.flush()
+            os.fsync(f.fileno())
+
+
+# ==================== SHARED STATE ====================
+
+class SharedState:
+    """Change counters shared by every worker, plus the reloads they trigger"""
+
+    def __init__(self, db_path):
+        self.db_path = db_path
+        self.writer = FileLock(db_path)
+        self._reloaders = {}    # name -> function reloading that data in this process
+        self._seen = {}         # name -> counter this process has loaded
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        with self.writer:
+            conn = self.get_connection()
+            conn.execute('PRAGMA journal_mode=WAL')
+            conn.execute('''
+                CREATE TABLE IF NOT EXISTS generations (
+                    name TEXT PRIMARY KEY,
+                    generation INTEGER NOT NULL DEFAULT 0
+                )
+            ''')
+
+    def get_connection(self):
+        """Per-thread autocommit connection"""
+        # Keyed by process too: a connection inherited through fork is never reused
+        pid, conn = getattr(self._local, 'conn', (None, None))
+        if pid != os.getpid():
+            conn = sqlite3.connect(self.db_path, timeout=30.0, isolation_level=None)
+            conn.execute('PRAGMA busy_timeout=30000')
+            self._local.conn = (os.getpid(), conn)
+        return conn
+
+    def generations(self):
+        return dict(self.get_connection().execute('SELECT name, generation FROM generations'))
+
+    def start(self, name, generation):
+        """Create name's counter at generation unless it exists; returns the counter"""
+        conn = self.get_connection()
+        conn.execute('INSERT OR IGNORE INTO generations (name, generation) VALUES (?, ?)', (name, generation))
+        return conn.execute('SELECT generation FROM generations WHERE name = ?', (name,)).fetchone()[0]
+
+    def register(self, name, reload):
+        """Call reload() in this process whenever another process changes name"""
+        self._reloaders[name] = reload
+
+    def mark_loaded(self):
+        """This process has just loaded everything from disk"""
+        with self._lock:
+            self._seen = self.generations()
+
+    def changed(self, name):
+        """Record that this process has written name; returns the new counter"""
+        generation = self.bump(name)
+        with self._lock:
+            # Only skip our own reload if nobody else wrote in between
+            if self._seen.get(name, 0) == generation - 1:
+                self._seen[name] = generation
+        return generation
+
+    def bump(self, name):
+        """Add one to name's counter and return it (no reload bookkeeping; safe inside a reload)"""
+        conn = self.get_connection()
+        conn.execute('BEGIN IMMEDIATE')
+        try:
+            conn.execute('''
+                INSERT INTO generations (name, generation) VALUES (?, 1)
+                ON CONFLICT(name) DO UPDATE SET generation = generation + 1
+            ''', (name,))
+            generation = conn.execute('SELECT generation FROM generations WHERE name = ?', (name,)).fetchone()[0]
+            conn.execute('COMMIT')
+        except BaseException:
+            conn.execute('ROLLBACK')
+            raise
+        return generation
+
+    def refresh(self):
+        """Reload whatever other processes changed since this one loaded it; returns the names"""
+        current = self.generations()
+        with self._lock:
+            stale = [name for name in self._reloaders if current.get(name, 0) != self._seen.get(name, 0)]
+            for name in stale:
+                self._reloaders[name]()
+                self._seen[name] = current.get(name, 0)
+        return stale
+
+
+def shared_secret_key(path):
+    """Secret key stored at path (created once, readable only by this user)"""
+    try:
+        with open(path, 'r') as f:
+            key = f.read().strip()
+        if key:
+            return key
+    except OSError:
+        pass
+    with FileLock(path):
+        if os.path.exists(path) and os.path.getsize(path):
+            with open(path, 'r') as f:
+                return f.read().strip()
+        key = secrets.token_hex(32)
+        with atomic_write(path) as f:
+            f.write(key)
+        os.chmod(path, 0o600)
+        return key
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Inspect a shared state database')
+    parser.add_argument('command', choices=['status'])
+    parser.add_argument('db', help='Path of the shared state SQLite file')
+    args = parser.parse_args(argv)
+
+    if not os.path.exists(args.db):
+        print(f"No shared state at {args.db}")
+        return 1
+    generations = SharedState(args.db).generations()
+    if not generations:
+        print("Nothing has been written yet")
+    for name, generation in sorted(generations.items()):
+        print(f"  {name:<20} {generation:>8,}")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
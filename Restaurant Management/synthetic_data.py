@@ -0,0 +1,419 @@
+#!/usr/bin/env python3
+"""
+Seeded synthetic data
+Writes realistic, reproducible fixtures for the benchmark suite (and for
+trying the apps without real data). The same seed always gives the same
+data; every data set draws from its own random stream, so changing the
+size of one leaves the others as they were.
+
+    companies     companies, locations and employee rosters
+    daily logs    Manager App daily log CSVs (the layout daily_logs.save_daily_log writes)
+    POS exports   Toast-style sales summary workbooks (what pos_import.parse_excel_file reads)
+    catalog       Inventory Control 2 product list CSV
+    inventories   Inventory Control 2 counts and orders (inventory_database.json /
+                  orders_database.json), simulated from daily usage and deliveries
+    invoices      US Foods InvoiceDetails CSVs
+    payroll       Toast PayrollExport CSVs
+    file tree     nested folders of spreadsheets, a share of them byte-identical copies
+
+SCALES holds the sizes the benchmark suite runs at.
+
+Shared by benchmark_suite.py.
+
+Batch usage:
+    python synthetic_data.py ~/fixture
+    python synthetic_data.py ~/fixture --scale medium --seed 7
+"""
+import os
+import csv
+import sys
+import json
+import argparse
+from datetime import date, datetime, timedelta
+
+import numpy as np
+import pandas as pd
+
+SCALES = {
+    'small': {'locations': 2, 'employees': 20, 'days': 60, 'products': 200, 'invoices': 10,
+              'invoice_lines': 80, 'pos_exports': 10, 'payroll_employees': 40, 'files': 200},
+    'medium': {'locations': 2, 'employees': 40, 'days': 365, 'products': 1000, 'invoices': 50,
+               'invoice_lines': 150, 'pos_exports': 30, 'payroll_employees': 150, 'files': 1000},
+    'large': {'locations': 3, 'employees': 80, 'days': 3 * 365, 'products': 3000, 'invoices': 200,
+              'invoice_lines': 300, 'pos_exports': 60, 'payroll_employees': 500, 'files': 4000},
+}
+START_DATE = date(2024, 1, 1)
+
+FIRST_NAMES = ['Maria', 'Jose', 'Ana', 'Luis', 'Carmen', 'Juan', 'Rosa', 'Carlos', 'Elena', 'Miguel',
+               'Sofia', 'David', 'Laura', 'Daniel', 'Lucia', 'Jorge', 'Paula', 'Pedro', 'Marta', 'Diego']
+LAST_NAMES = ['Garcia', 'Martinez', 'Lopez', 'Gonzalez', 'Rodriguez', 'Perez', 'Sanchez', 'Ramirez',
+              'Torres', 'Flores', 'Rivera', 'Gomez', 'Diaz', 'Cruz', 'Morales', 'Reyes', 'Ortiz', 'Castillo']
+JOB_TITLES = ['Server', 'Server', 'Server', 'Bartender', 'Cook', 'Host', 'Busser', 'MANAGER']
+AREAS = ['Bar', 'Dining', 'Patio', 'Togo']
+GROUPS = ['Cooler Items', 'Freezer Items', 'Dry Goods', 'Paper', 'Chemicals', 'Produce', 'Beverages']
+PACK_SIZES = ['6/4 LB', '4/1 GAL', '12/32 OZ', '6/#10 CN', '1/25 LB', '2/5 LB', '24/12 OZ', '1/1000 EA']
+BRANDS = ['PACKER', 'MONARCH', 'CROSS VALLEY', 'GLENVIEW FARMS', 'HILLTOP HEARTH', 'ROSELI']
+SPREADSHEET_EXTENSIONS = ['.csv', '.xlsx', '.xls', '.xlsm']
+
+# Streams: one per data set, so each is reproducible on its own
+STREAMS = {'companies': 1, 'daily_logs': 2, 'pos_exports': 3, 'catalog': 4, 'inventories': 5,
+           'invoices': 6, 'payroll': 7, 'file_tree': 8}
+
+
+def rng_for(seed, stream):
+    return np.random.default_rng([seed, STREAMS[stream]])
+
+
+def _names(rng, count):
+    """count distinct 'First Last' names"""
+    names, n = [], 0
+    while len(names) < count:
+        first, last = rng.choice(FIRST_NAMES), rng.choice(LAST_NAMES)
+        name = f"{first} {last}" + (f" {n // 300 + 1}" if n >= 300 else '')
+        if name not in names:
+            names.append(name)
+        n += 1
+    return names
+
+
+# ==================== COMPANIES ====================
+
+def make_companies(rng, companies=1, locations=2, employees=20):
+    """[{'name', 'locations': [{'name', 'employees': [names]}]}]"""
+    result = []
+    for c in range(companies):
+        result.append({
+            'name': f"Synthetic Restaurants {c + 1}",
+            'locations': [{'name': f"Location {c + 1}-{l + 1}", 'employees': _names(rng, employees)}
+                          for l in range(locations)],
+        })
+    return result
+
+
+# ==================== DAILY LOGS ====================
+
+def daily_log_data(rng, day, shift, roster):
+    """One daily log in the log_data shape save_daily_log takes"""
+    busy = 1.4 if day.weekday() >= 4 else 1.0
+    staff = rng.choice(roster, size=min(len(roster), int(rng.integers(6, 14))), replace=False)
+    employees = []
+    for name in staff:
+        food, beer, liquor, wine = (rng.gamma(4, 120 * busy), rng.gamma(2, 40 * busy),
+                                    rng.gamma(2, 50 * busy), rng.gamma(1.5, 30 * busy))
+        visa, mc, amex, disc = (rng.gamma(3, 90 * busy), rng.gamma(2, 60 * busy),
+                                rng.gamma(1.5, 40 * busy), rng.gamma(1, 15 * busy))
+        employees.append({
+            'name': str(name), 'shift': shift, 'area': str(rng.choice(AREAS)),
+            'cash': round(rng.gamma(2, 80 * busy), 2), 'cc_tips': round((visa + mc + amex + disc) * 0.18, 2),
+            'cash_diff': round(rng.normal(0, 2), 2), 'visa': round(visa, 2), 'mastercard': round(mc, 2),
+            'amex': round(amex, 2), 'discover': round(disc, 2), 'credit': round(visa + mc + amex + disc, 2),
+            'beer': round(beer, 2), 'liquor': round(liquor, 2), 'wine': round(wine, 2), 'food': round(food, 2),
+            'voids': round(rng.exponential(8), 2),
+        })
+    deductions = [round(rng.uniform(5, 60), 2) for _ in range(int(rng.integers(0, 3)))]
+    drawer = round(sum(e['cash'] for e in employees), 2)
+    return {
+        'date': day.isoformat(), 'shift': shift, 'notes': '',
+        'employees': employees,
+        'drawer_total': drawer,
+        'deduction_descs': [f"Supplies {i + 1}" for i in range(len(deductions))],
+        'deduction_locations': ['Store'] * len(deductions),
+        'deduction_amounts': deductions,
+        'deposit_amount': round(drawer - sum(deductions), 2),
+    }
+
+
+def write_daily_log(folder, log_data):
+    """Write one log as <YYYYMMDD>_<shift>.csv (same rows as daily_logs.save_daily_log)"""
+    shift = log_data.get('shift', 'Day')
+    path = os.path.join(folder, f"{log_data['date'].replace('-', '')}_{shift}.csv")
+    with open(path, 'w', newline='') as f:
+        writer = csv.writer(f)
+        writer.writerow(['Date', log_data['date']])
+        writer.writerow(['Shift', shift])
+        writer.writerow(['Notes', log_data.get('notes', '')])
+        writer.writerow([])
+        writer.writerow(['Employee Entries'])
+        writer.writerow(['Name', 'Shift', 'Area', 'Cash', 'C.C. Tips', 'Cash Diff', 'Visa', 'Mastercard', 'Amex',
+                         'Discover', 'Credit Total', 'Beer', 'Liquor', 'Wine', 'Food', 'Voids'])
+        for e in log_data['employees']:
+            writer.writerow([e['name'], e['shift'], e['area'], e['cash'], e['cc_tips'], e['cash_diff'], e['visa'],
+                             e['mastercard'], e['amex'], e['discover'], e['credit'], e['beer'], e['liquor'],
+                             e['wine'], e['food'], e['voids']])
+        writer.writerow([])
+        writer.writerow(['Cash Drawer Count'])
+        for coin in ['Pennies', 'Nickels', 'Dimes', 'Quarters', 'Ones', 'Fives', 'Tens', 'Twenties', 'Fifties',
+                     'Hundreds']:
+            writer.writerow([coin, 0])
+        writer.writerow(['Drawer Total', log_data['drawer_total']])
+        writer.writerow([])
+        writer.writerow(['Cash Deductions'])
+        for desc, loc, amount in zip(log_data['deduction_descs'], log_data['deduction_locations'],
+                                     log_data['deduction_amounts']):
+            writer.writerow([desc, loc, amount])
+        writer.writerow([])
+        writer.writerow(['Deposit Summary'])
+        writer.writerow(['Cash Adjustments', sum(log_data['deduction_amounts'])])
+        writer.writerow(['Cash in Drawer', log_data['drawer_total']])
+        writer.writerow(['DEPOSIT AMOUNT', log_data['deposit_amount']])
+    return path
+
+
+def write_daily_logs(folder, rng, roster, days, start=START_DATE, shifts=('Day', 'Night')):
+    """A Day and a Night log for every day; returns the paths"""
+    os.makedirs(folder, exist_ok=True)
+    return [write_daily_log(folder, daily_log_data(rng, start + timedelta(days=d), shift, roster))
+            for d in range(days) for shift in shifts]
+
+
+# ==================== POS EXPORTS ====================
+
+def write_pos_export(path, rng):
+    """Toast-style sales summary workbook with the sheets pos_import parses"""
+    import openpyxl
+
+    workbook = openpyxl.Workbook()
+    cash_sheet = workbook.active
+    cash_sheet.title = 'Cash activity'
+    cash_sheet.append(['Total cash payments', 'Cash adjustments', 'Credit/non-cash tips'])
+    cash_sheet.append([round(rng.gamma(4, 200), 2), 0, -round(rng.gamma(4, 60), 2)])
+
+    payments = workbook.create_sheet('Payment summary')
+    payments.append(['Payment type', 'Payment sub type', 'Count', 'Amount', 'Tips', 'Grat'])
+    cards = {card: round(rng.gamma(3, 300), 2) for card in ('Visa', 'Mastercard', 'Amex', 'Discover')}
+    tips = round(sum(cards.values()) * 0.18, 2)
+    for card, amount in cards.items():
+        payments.append(['Credit/debit', card, int(rng.integers(5, 80)), amount, round(amount * 0.18, 2), 0])
+    payments.append(['Credit/debit', None, 0, round(sum(cards.values()), 2), tips, 0])
+    payments.append(['Cash', None, int(rng.integers(5, 40)), cash_sheet['A2'].value, 0, 0])
+
+    all_data = workbook.create_sheet('All data')
+    all_data.append(['Sales summary'])
+    all_data.append([])
+    all_data.append(['Sales category summary'])
+    all_data.append(['Sales category', 'Items', 'Net sales', 'Discounts'])
+    for category, scale in (('Food', 900), ('Beer', 250), ('Liquor', 300), ('Wine', 150)):
+        all_data.append([category, int(rng.integers(10, 200)), round(rng.gamma(4, scale / 4), 2), 0])
+    all_data.append(['Total', None, None, None])
+    all_data.append([])
+    all_data.append(['Void summary'])
+    all_data.append(['Void amount', round(rng.exponential(40), 2)])
+    # Fixed document times keep the same seed's workbooks comparable
+    workbook.properties.created = workbook.properties.modified = datetime(2024, 1, 1)
+    workbook.save(path)
+    return path
+
+
+def write_pos_exports(folder, rng, count, start=START_DATE):
+    """SalesSummary_<date>_<date>.xlsx (Day) and SalesSummaryN_... (Night) exports; returns the paths"""
+    os.makedirs(folder, exist_ok=True)
+    paths = []
+    for i in range(count):
+        day = (start + timedelta(days=i // 2)).isoformat()
+        prefix = 'SalesSummary' if i % 2 == 0 else 'SalesSummaryN'
+        paths.append(write_pos_export(os.path.join(folder, f"{prefix}_{day}_{day}.xlsx"), rng))
+    return paths
+
+
+# ==================== CATALOG AND INVENTORIES ====================
+
+def product_catalog(rng, products):
+    """Inventory Control 2 product rows"""
+    return [{
+        'Product Number': str(1000000 + i * 7),
+        'Product Description': f"SYNTHETIC PRODUCT {i}",
+        'Product Brand': str(rng.choice(BRANDS)),
+        'Product Package Size': str(rng.choice(PACK_SIZES)),
+        'Group Name': str(rng.choice(GROUPS)),
+        'Case Count Type': 'Yes' if rng.random() < 0.05 else 'No',
+    } for i in range(products)]
+
+
+def write_catalog(path, catalog):
+    pd.DataFrame(catalog).to_csv(path, index=False)
+    return path
+
+
+def inventory_history(rng, catalog, days, start=START_DATE, count_every=2, delivery_weekdays=(0, 3)):
+    """(inventories, orders) for one location: {date: {product: qty}}
+
+    Stock is simulated day by day for every product at once: usage follows a
+    weekly pattern, deliveries on delivery_weekdays top stock back up to two
+    weeks of usage, and a count is recorded every count_every days (zero
+    counts left out, as the app stores them).
+    """
+    numbers = np.array([p['Product Number'] for p in catalog])
+    rate = rng.gamma(1.2, 3.0, len(numbers))
+    weekly = np.array([0.8, 0.8, 0.9, 1.0, 1.3, 1.5, 1.2])
+    stock = np.round(rate * 10)
+    inventories, orders = {}, {}
+    for d in range(days):
+        day = start + timedelta(days=d)
+        if day.weekday() in delivery_weekdays:
+            delivered = np.clip(np.round(rate * 14 - stock), 0, None)
+            stock += delivered
+            received = delivered > 0
+            orders[day.isoformat()] = dict(zip(numbers[received].tolist(), delivered[received].tolist()))
+        stock = np.clip(stock - rng.poisson(rate * weekly[day.weekday()]), 0, None)
+        if d % count_every == 0:
+            counted = stock > 0
+            inventories[day.isoformat()] = dict(zip(numbers[counted].tolist(), stock[counted].tolist()))
+    return inventories, orders
+
+
+# ==================== INVOICES ====================
+
+def write_invoices(folder, rng, catalog, count, lines, start=START_DATE):
+    """InvoiceDetails_<n>.csv files, lines drawn from the catalog; returns the paths"""
+    os.makedirs(folder, exist_ok=True)
+    frame = pd.DataFrame(catalog)
+    paths = []
+    for i in range(count):
+        picked = frame.iloc[rng.choice(len(frame), size=min(lines, len(frame)), replace=False)]
+        qty = rng.integers(1, 8, len(picked))
+        invoice = pd.DataFrame({
+            'InvoiceNumber': 9000000 + i,
+            'InvoiceDate': (start + timedelta(days=i * 3)).strftime('%m/%d/%Y'),
+            'ProductNumber': picked['Product Number'].values,
+            'ProductDescription': picked['Product Description'].values,
+            'ProductLabel': picked['Product Brand'].values,
+            'PackingSize': picked['Product Package Size'].values,
+            'PricingUnit': np.where(rng.random(len(picked)) < 0.9, 'CS', 'EA'),
+            'QtyShip': qty,
+            'ExtendedPrice': (qty * rng.uniform(8, 120, len(picked))).round(2),
+        })
+        path = os.path.join(folder, f"InvoiceDetails_{9000000 + i}.csv")
+        invoice.to_csv(path, index=False)
+        paths.append(path)
+    return paths
+
+
+# ==================== PAYROLL ====================
+
+def write_payroll_export(path, rng, employees):
+    """Toast PayrollExport CSV with 'Last, First' names"""
+    names = _names(rng, employees)
+    regular = rng.uniform(8, 40, employees).round(2)
+    tips = rng.gamma(2, 150, employees).round(2)
+    pd.DataFrame({
+        'Employee': [f"{n.split(' ', 1)[1]}, {n.split(' ', 1)[0]}" for n in names],
+        'Employee Id': [f"E{10000 + i}" for i in range(employees)],
+        'Job Title': rng.choice(JOB_TITLES, employees),
+        'Regular Hours': regular,
+        'Overtime Hours': np.where(rng.random(employees) < 0.2, rng.uniform(0.5, 10, employees), 0).round(2),
+        'Declared Tips': (tips * 0.3).round(2),
+        'Non-Cash Tips': (tips * 0.7).round(2),
+        'Total Tips': tips,
+    }).to_csv(path, index=False)
+    return path
+
+
+# ==================== FILE TREES ====================
+
+def write_file_tree(folder, rng, files, depth=3, duplicate_share=0.2):
+    """files spreadsheets spread over nested folders, duplicate_share of them copies of earlier ones
+
+    Returns the number of files that are copies.
+    """
+    contents, copies = [], 0
+    for i in range(files):
+        parts = [f"folder_{int(rng.integers(0, 6))}" for _ in range(int(rng.integers(0, depth + 1)))]
+        target = os.path.join(folder, *parts)
+        os.makedirs(target, exist_ok=True)
+        if contents and rng.random() < duplicate_share:
+            data = contents[int(rng.integers(0, len(contents)))]
+            copies += 1
+        else:
+            data = rng.bytes(int(rng.integers(1_000, 40_000)))
+            contents.append(data)
+        ext = rng.choice(SPREADSHEET_EXTENSIONS)
+        with open(os.path.join(target, f"report_{i:05d}{ext}"), 'wb') as f:
+            f.write(data)
+    return copies
+
+
+# ==================== WHOLE FIXTURE ====================
+
+def generate(folder, scale='small', seed=0):
+    """Write every data set for a scale under folder; returns a manifest of what is where
+
+    Paths in the manifest (also saved as manifest.json) are relative to folder.
+    """
+    size = SCALES[scale]
+    companies = make_companies(rng_for(seed, 'companies'), 1, size['locations'], size['employees'])
+
+    log_rng = rng_for(seed, 'daily_logs')
+    log_dirs = []
+    for l, location in enumerate(companies[0]['locations']):
+        log_dir = os.path.join(folder, 'daily_logs', f"location_{l + 1}")
+        write_daily_logs(log_dir, log_rng, location['employees'], size['days'])
+        log_dirs.append(log_dir)
+
+    pos_dir = os.path.join(folder, 'pos_exports')
+    write_pos_exports(pos_dir, rng_for(seed, 'pos_exports'), size['pos_exports'])
+
+    inventory_dir = os.path.join(folder, 'inventory')
+    os.makedirs(inventory_dir, exist_ok=True)
+    catalog = product_catalog(rng_for(seed, 'catalog'), size['products'])
+    write_catalog(os.path.join(inventory_dir, 'products.csv'), catalog)
+    inventory_rng = rng_for(seed, 'inventories')
+    inventories, orders = {}, {}
+    for location in companies[0]['locations']:
+        inventories[location['name']], orders[location['name']] = inventory_history(
+            inventory_rng, catalog, size['days'])
+    with open(os.path.join(inventory_dir, 'inventory_database.json'), 'w') as f:
+        json.dump(inventories, f)
+    with open(os.path.join(inventory_dir, 'orders_database.json'), 'w') as f:
+        json.dump(orders, f)
+
+    invoice_dir = os.path.join(folder, 'invoices')
+    write_invoices(invoice_dir, rng_for(seed, 'invoices'), catalog, size['invoices'], size['invoice_lines'])
+
+    payroll_dir = os.path.join(folder, 'payroll')
+    os.makedirs(payroll_dir, exist_ok=True)
+    payroll_path = write_payroll_export(os.path.join(payroll_dir, 'PayrollExport_2024_01_07_1.csv'),
+                                        rng_for(seed, 'payroll'), size['payroll_employees'])
+
+    tree_dir = os.path.join(folder, 'file_tree')
+    copies = write_file_tree(tree_dir, rng_for(seed, 'file_tree'), size['files'])
+
+    def rel(path):
+        return os.path.relpath(path, folder)
+
+    manifest = {
+        'scale': scale, 'seed': seed, 'size': size,
+        'companies': companies,
+        'daily_log_dirs': [rel(d) for d in log_dirs],
+        'pos_dir': rel(pos_dir),
+        'inventory_dir': rel(inventory_dir),
+        'locations': [location['name'] for location in companies[0]['locations']],
+        'invoice_dir': rel(invoice_dir),
+        'payroll_csv': rel(payroll_path),
+        'file_tree': rel(tree_dir),
+        'duplicate_files': copies,
+    }
+    with open(os.path.join(folder, 'manifest.json'), 'w') as f:
+        json.dump(manifest, f, indent=2)
+    return manifest
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Write a seeded synthetic data set')
+    parser.add_argument('folder', help='Output folder (created if missing)')
+    parser.add_argument('--scale', choices=sorted(SCALES), default='small')
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args(argv)
+
+    os.makedirs(args.folder, exist_ok=True)
+    manifest = generate(args.folder, args.scale, args.seed)
+    size = manifest['size']
+    print(f"Wrote the {args.scale} data set (seed {args.seed}) to {args.folder}:")
+    print(f"  {size['locations']} locations x {size['days']} days of Day/Night daily logs")
+    print(f"  {size['pos_exports']} POS exports, {size['invoices']} invoices x {size['invoice_lines']} lines")
+    print(f"  {size['products']} products with counts and orders, {size['payroll_employees']} payroll rows")
+    print(f"  {size['files']} files in the file tree ({manifest['duplicate_files']} duplicates)")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -1,39 +1,15 @@
 # --- Custom Expense Category Breakdown ---
-# Define category mapping
-CATEGORY_MAP = {
-    "Food Expense": [
-        "Big House Burgers Kingsville", "CC Produce", "Corpus Christi Produce",
-        "M&M Ramos Distribution", "MCM Bread and Sweets", "US Foods",
-        "Cash & Carry", "Pepsi Cola", "Pepsi-Cola"
-    ],
-    "Beer Expense": [
-        "Andrew’s Distributors", "L&F Distributors"
-    ],
-    "Liquor Expenses": [
-        "The Jigger", "Jigger", "Discount Liquor"
-    ],
-    "Payroll Expense": [
-        "Hourly Regular", "Hourly OT", "Manager Salary", "Assistant Manager",
-        "Admin", "Vacation", "Bonus"
-    ],
-    "Utility Expense": [
-        "Centerpoint", "Center Point", "Constellation", "Directv", "Jim Wells",
-        "Jim wells County Appraisal District", "NuCo2", "STGR", "Spectrum",
-        "Toast", "Easy", "City of Kingsville"
-    ]
-}
-
-def get_expense_category(name, type_):
-    for category, keywords in CATEGORY_MAP.items():
-        for keyword in keywords:
-            if (isinstance(name, str) and keyword.lower() in name.lower()) or \
-               (isinstance(type_, str) and keyword.lower() in type_.lower()):
-                return category
-    return None
+# Category mapping lives in Restaurant Management/category_map.csv
+import os
+import sys
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "Restaurant Management"))
+from expense_categories import load_category_map, categorize_frame
+
+CATEGORY_MAP = load_category_map()
 
 # Filter and categorize
 if 'Name' in df.columns and 'Type' in df.columns:
-    df['Expense Category'] = df.apply(lambda row: get_expense_category(row['Name'], row['Type']), axis=1)
+    df['Expense Category'] = categorize_frame(df, 'Name', 'Type', CATEGORY_MAP)
     categorized = df[df['Expense Category'].notnull()].copy()
     categorized = categorized.sort_values(['Expense Category', 'Name'])
     # Save to a new sheet in the Excel file
@@ -9,117 +9,50 @@ from PySide6.QtWidgets import (
 from PySide6.QtCore import Qt
 from PySide6.QtGui import QStandardItemModel, QStandardItem
 
-CATEGORY_MAP = {
-    "Food Expense": [
-        "Big House Burgers Kingsville", "CC Produce", "Corpus Christi Produce",
-        "M&M Ramos Distribution", "MCM Bread and Sweets", "US Foods",
-        "Cash & Carry", "Pepsi Cola", "Pepsi-Cola"
-    ],
-    "Beer Expense": [
-        "Andrew’s Distributors", "L&F Distributors"
-    ],
-    "Liquor Expenses": [
-        "The Jigger", "Jigger", "Discount Liquor"
-    ],
-    "Payroll Expense": [
-        "Hourly Regular", "Hourly OT", "Manager Salary", "Assistant Manager",
-        "Admin", "Vacation", "Bonus"
-    ],
-    "Utility Expense": [
-        "Centerpoint", "Center Point", "Constellation", "Directv", "Jim Wells",
-        "Jim wells County Appraisal District", "NuCo2", "STGR", "Spectrum",
-        "Toast", "Easy", "City of Kingsville"
-    ],
-    "Maintenance": [
-        "Repair", "Maintenance", "Service Call", "Plumbing", "HVAC", "Electrical"
-    ],
-    "Tax & Licenses": [
-        "Tax", "License", "Permit", "Registration", "State Comptroller", "IRS"
-    ],
-    "Insurance": [
-        "Insurance", "Policy", "Premium"
-    ],
-    "Advertising": [
-        "Ad", "Advertising", "Marketing", "Promotion"
-    ],
-    "Office Supplies": [
-        "Office", "Supplies", "Stationery", "Printer", "Ink"
-    ],
-    "Bank Fees": [
-        "Bank Fee", "Service Charge", "Overdraft", "Wire Fee"
-    ],
-    "Miscellaneous": [
-        "Misc", "Other", "Uncategorized"
-    ],
-    "Reimbursement": [
-        "Reimburse", "Reimbursement", "Refund", "Repayment"
-    ],
-    "Employee Check Tip": [
-        "Tip", "Employee Tip", "Check Tip"
-    ]
-}
-
-ASSIGNMENTS_CSV = "assigned_expense_names.csv"
-CATEGORY_MAP_CSV = "category_map.csv"
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "Restaurant Management"))
+from expense_categories import (
+    DEFAULT_CATEGORY_MAP, CATEGORY_MAP_CSV, get_matcher,
+    load_category_map as read_category_map, save_category_map as write_category_map
+)
+from budget_reconcile import ASSIGNMENTS_CSV, MATCH_COLUMN, load_confirmed_matches, reconcile, write_assignments
+
+CATEGORY_MAP = {cat: list(keywords) for cat, keywords in DEFAULT_CATEGORY_MAP.items()}
 
 ASSIGNED_NAMES = {}
 
 def save_category_map():
     """Save CATEGORY_MAP to CSV file"""
-    with open(CATEGORY_MAP_CSV, "w", newline="") as f:
-        writer = csv.writer(f)
-        writer.writerow(["Category", "Keywords"])
-        for cat, keywords in CATEGORY_MAP.items():
-            # Join keywords with semicolon to allow commas in keywords
-            writer.writerow([cat, ";".join(keywords)])
+    write_category_map(CATEGORY_MAP, CATEGORY_MAP_CSV)
 
 def load_category_map():
     """Load CATEGORY_MAP from CSV file if it exists"""
     global CATEGORY_MAP, ASSIGNED_NAMES
-    if not os.path.exists(CATEGORY_MAP_CSV):
-        # Initialize ASSIGNED_NAMES with default categories
-        ASSIGNED_NAMES = {cat: set() for cat in CATEGORY_MAP}
-        return
-    temp_map = {}
-    with open(CATEGORY_MAP_CSV, "r", newline="") as f:
-        reader = csv.DictReader(f)
-        for row in reader:
-            cat = row["Category"]
-            keywords_str = row["Keywords"]
-            # Split by semicolon and filter empty strings
-            keywords = [k.strip() for k in keywords_str.split(";") if k.strip()]
-            temp_map[cat] = keywords
-    if temp_map:
-        CATEGORY_MAP = temp_map
+    CATEGORY_MAP = read_category_map(CATEGORY_MAP_CSV, default=CATEGORY_MAP)
     # Reinitialize ASSIGNED_NAMES with loaded categories
     ASSIGNED_NAMES = {cat: set() for cat in CATEGORY_MAP}
 
 def save_assignments_to_csv():
-    with open(ASSIGNMENTS_CSV, "w", newline="") as f:
-        writer = csv.writer(f)
-        writer.writerow(["Category", "Name"])
-        for cat, names in ASSIGNED_NAMES.items():
-            for name in names:
-                writer.writerow([cat, name])
+    # Keep the budget reconciliation's matches stored in the same file
+    matches = load_confirmed_matches(ASSIGNMENTS_CSV)
+    with open(ASSIGNMENTS_CSV, "w", newline="", encoding="utf-8") as f:
+        assignments = [(cat, name) for cat, names in ASSIGNED_NAMES.items() for name in names]
+        write_assignments(csv.writer(f), assignments, matches)
 
 def load_assignments_from_csv():
     if not os.path.exists(ASSIGNMENTS_CSV):
         return
-    with open(ASSIGNMENTS_CSV, "r", newline="") as f:
+    with open(ASSIGNMENTS_CSV, "r", newline="", encoding="utf-8") as f:
         reader = csv.DictReader(f)
         for row in reader:
+            if row.get(MATCH_COLUMN):
+                continue  # Budget match, not a category assignment
             cat = row["Category"]
             name = row["Name"]
             if cat in ASSIGNED_NAMES:
                 ASSIGNED_NAMES[cat].add(name)
 
 def get_expense_category(name, type_):
-    for category, keywords in CATEGORY_MAP.items():
-        for keyword in keywords:
-            if (isinstance(name, str) and keyword.lower() in name.lower()) or \
-               (isinstance(type_, str) and keyword.lower() in type_.lower()):
-                return category
-    return None
+    return get_matcher(CATEGORY_MAP)(name, type_)
 
 class DataFrameModel(QStandardItemModel):
     def __init__(self, df=pd.DataFrame()):
@@ -361,20 +294,16 @@ class MainWindow(QMainWindow):
         # Auto-apply saved assignments to matching names
         if 'ManualCategory' not in self.df.columns:
             self.df['ManualCategory'] = None
-        for cat, names in ASSIGNED_NAMES.items():
-            for name in names:
-                mask = self.df['Name'] == name
-                self.df.loc[mask, 'ManualCategory'] = cat
-        # Categorize all expenses, using manual override if present
+        assigned = {name: cat for cat, names in ASSIGNED_NAMES.items() for name in names}
+        manual = self.df['Name'].map(assigned)
+        self.df['ManualCategory'] = manual.where(manual.notna(), self.df['ManualCategory'])
+        # Categorize all expenses in one pass, using manual override if present
         df_categorized = self.df.copy()
-        if 'ManualCategory' in df_categorized.columns:
-            df_categorized['Category'] = df_categorized['ManualCategory'].combine_first(
-                df_categorized.apply(lambda row: get_expense_category(row['Name'], row['Type']), axis=1)
-            )
-        elif 'Name' in df_categorized.columns and 'Type' in df_categorized.columns:
-            df_categorized['Category'] = df_categorized.apply(lambda row: get_expense_category(row['Name'], row['Type']), axis=1)
+        if 'Name' in df_categorized.columns and 'Type' in df_categorized.columns:
+            matched = get_matcher(CATEGORY_MAP).categorize(df_categorized['Name'], df_categorized['Type'])
+            df_categorized['Category'] = df_categorized['ManualCategory'].combine_first(matched)
         else:
-            df_categorized['Category'] = None
+            df_categorized['Category'] = df_categorized['ManualCategory']
         df_categorized = df_categorized[df_categorized['Category'].notnull()].copy()
         # For each category, show each expense (Name) and its total, then a total row for the category
         rows = []
@@ -551,6 +480,7 @@ class MainWindow(QMainWindow):
         # Build comparison dataframe - compare loaded budget CSV with actual weekly expenses
         comparison_rows = []
         unmatched_budget_items = []
+        budget_lines = []
         
         for _, budget_row in self.budget_csv_df.iterrows():
             budget_name = str(budget_row.get('Name', '')).strip()
@@ -571,19 +501,16 @@ class MainWindow(QMainWindow):
                 budget_amount = float(budget_str) if budget_str else 0.0
             except Exception:
                 budget_amount = 0.0
-            
-            # Try to find matching actual expense (case-insensitive exact match first)
-            actual_data = None
-            budget_name_lower = budget_name.lower()
-            
-            if budget_name_lower in actual_expenses:
-                actual_data = actual_expenses[budget_name_lower]
-            else:
-                # Try partial matching - check if budget name is in actual or actual is in budget
-                for actual_name_lower, data in actual_expenses.items():
-                    if budget_name_lower in actual_name_lower or actual_name_lower in budget_name_lower:
-                        actual_data = data
-                        break
+            budget_lines.append((budget_name, category, budget_amount, budget_period))
+        
+        # Match every budget line to at most one actual expense in one pass (cached matches first)
+        actual_keys = list(actual_expenses)
+        match, _scores = reconcile([line[0] for line in budget_lines],
+                                   [actual_expenses[k]['display_name'] for k in actual_keys],
+                                   [line[1] for line in budget_lines], cache_path=ASSIGNMENTS_CSV)
+        
+        for (budget_name, category, budget_amount, budget_period), j in zip(budget_lines, match):
+            actual_data = actual_expenses[actual_keys[j]] if j >= 0 else None
             
             if actual_data:
                 actual_amount = actual_data['amount']
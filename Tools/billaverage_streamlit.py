@@ -1,52 +1,15 @@
 import streamlit as st
 import pandas as pd
-from collections import defaultdict
 import io
+import os
+import sys
 
-# Category mapping
-CATEGORY_MAP = {
-    "Food Expense": [
-        "Big House Burgers Kingsville", "CC Produce", "Corpus Christi Produce",
-        "M&M Ramos Distribution", "MCM Bread and Sweets", "US Foods",
-        "Cash & Carry", "Pepsi Cola", "Pepsi-Cola"
-    ],
-    "Beer Expense": [
-        "Andrew's Distributors", "L&F Distributors"
-    ],
-    "Liquor Expenses": [
-        "The Jigger", "Jigger", "Discount Liquor"
-    ],
-    "Payroll Expense": [
-        "Hourly Regular", "Hourly OT", "Manager Salary", "Assistant Manager",
-        "Admin", "Vacation", "Bonus"
-    ],
-    "Utility Expense": [
-        "Centerpoint", "Center Point", "Constellation", "Directv", "Jim Wells",
-        "Jim wells County Appraisal District", "NuCo2", "STGR", "Spectrum",
-        "Toast", "Easy", "City of Kingsville", "City of Alice"
-    ],
-    "Maintenance": [
-        "Repair", "Maintenance", "Service Call", "Plumbing", "HVAC", "Electrical"
-    ],
-    "Tax & Licenses": [
-        "Tax", "License", "Permit", "Registration", "State Comptroller", "IRS"
-    ],
-    "Insurance": [
-        "Insurance", "Policy", "Premium"
-    ],
-    "Advertising": [
-        "Ad", "Advertising", "Marketing", "Promotion"
-    ],
-    "Office Supplies": [
-        "Office", "Supplies", "Stationery", "Printer", "Ink"
-    ],
-    "Bank Fees": [
-        "Bank Fee", "Service Charge", "Overdraft", "Wire Fee"
-    ],
-    "Entertainment": [
-        "Entertainment", "Music", "DJ", "Band"
-    ]
-}
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "Restaurant Management"))
+from expense_categories import load_category_map, get_matcher
+from budget_reconcile import ASSIGNMENTS_CSV, reconcile
+
+# Category mapping (Restaurant Management/category_map.csv)
+CATEGORY_MAP = load_category_map()
 
 # Payroll mapping
 PAYROLL_MAP = {
@@ -61,40 +24,32 @@ PAYROLL_MAP = {
 
 def get_category(name, payroll_name):
     """Determine category based on name or payroll name"""
-    for category, keywords in CATEGORY_MAP.items():
-        for keyword in keywords:
-            if keyword.lower() in (str(name) or '').lower() or keyword.lower() in (str(payroll_name) or '').lower():
-                return category
-    return "Other"
+    return get_matcher(CATEGORY_MAP)(name, payroll_name, default="Other")
 
 def get_payroll_category(payroll_type):
     """Determine payroll category"""
-    for category, keywords in PAYROLL_MAP.items():
-        for keyword in keywords:
-            if keyword.lower() in (str(payroll_type) or '').lower():
-                return category
-    return "Other Payroll"
+    return get_matcher(PAYROLL_MAP)(payroll_type, default="Other Payroll")
 
 def process_excel_file(df):
-    """Process the uploaded Excel file and generate all data"""
+    """Process the uploaded Excel file and generate all data
+
+    Every row is categorized once up front; the summary, payroll, sorted and
+    budget tables are then group-bys over those columns.
+    """
     # Find header row
-    header_row_idx = None
-    for i, row in df.iterrows():
-        if 'Type' in row.values or 'Name' in row.values:
-            header_row_idx = i
-            break
-    
-    if header_row_idx is None:
+    is_header = df.isin(['Type', 'Name']).any(axis=1).to_numpy()
+    if not is_header.any():
         return None, None, None, None
-    
+    header_row_idx = is_header.argmax()
+
     # Set header
     df.columns = df.iloc[header_row_idx]
     df = df.iloc[header_row_idx + 1:].reset_index(drop=True)
-    
+
     # Get column names
     name_col = 'Name' if 'Name' in df.columns else df.columns[-1]
     payroll_col = 'Type' if 'Type' in df.columns else df.columns[0]
-    
+
     # Find amount column
     amount_col = None
     for col in df.columns:
@@ -103,79 +58,53 @@ def process_excel_file(df):
             break
     if not amount_col:
         amount_col = df.columns[-2]
-    
+
+    names = df[name_col]
+    payroll_names = df[payroll_col]
+    amounts = pd.to_numeric(df[amount_col], errors='coerce').fillna(0.0).astype(float)
+    category = get_matcher(CATEGORY_MAP).categorize(names, payroll_names, default="Other")
+    payroll_category = get_matcher(PAYROLL_MAP).categorize(payroll_names, default="Other Payroll")
+
     # Generate summary
-    summary_data = defaultdict(float)
-    for _, row in df.iterrows():
-        name = row.get(name_col, '')
-        payroll_name = row.get(payroll_col, '')
-        try:
-            amount = float(row.get(amount_col, 0) or 0)
-        except:
-            amount = 0
-        category = get_category(name, payroll_name)
-        summary_data[name] += amount
-    
-    summary_df = pd.DataFrame([
-        {'Name': name, 'Amount': f"${amount:,.2f}"}
-        for name, amount in summary_data.items()
-    ])
-    
+    summary_data = amounts.groupby(names, sort=False, dropna=False).sum()
+    summary_df = pd.DataFrame({
+        'Name': summary_data.index,
+        'Amount': [f"${amount:,.2f}" for amount in summary_data.to_numpy()]
+    })
+
     # Generate payroll summary
-    payroll_data = defaultdict(float)
-    for _, row in df.iterrows():
-        payroll_type = row.get(payroll_col, '')
-        try:
-            amount = float(row.get(amount_col, 0) or 0)
-        except:
-            amount = 0
-        payroll_cat = get_payroll_category(payroll_type)
-        if payroll_cat != "Other Payroll":
-            payroll_data[payroll_cat] += amount
-    
-    payroll_df = pd.DataFrame([
-        {'Payroll Type': cat, 'Amount': f"${amount:,.2f}"}
-        for cat, amount in payroll_data.items()
-    ])
-    
+    is_payroll = payroll_category != "Other Payroll"
+    payroll_data = amounts[is_payroll].groupby(payroll_category[is_payroll], sort=False).sum()
+    payroll_df = pd.DataFrame({
+        'Payroll Type': payroll_data.index,
+        'Amount': [f"${amount:,.2f}" for amount in payroll_data.to_numpy()]
+    })
+
     # Generate sorted by category
-    categories = ["Food Expense", "Beer Expense", "Liquor Expenses", "Utility Expense", 
+    categories = ["Food Expense", "Beer Expense", "Liquor Expenses", "Utility Expense",
                   "Maintenance", "Entertainment"]
     rows = []
     for cat in categories:
-        cat_df = df[df.apply(lambda row: get_category(row.get(name_col, ''), 
-                                                       row.get(payroll_col, '')) == cat, axis=1)]
-        if not cat_df.empty:
-            rows.append({'Category': f"{cat} (Expense)", 'Name': '', 'Amount': ''})
-            for _, row in cat_df.iterrows():
-                name = row.get(name_col, '')
-                try:
-                    amount = float(row.get(amount_col, 0) or 0)
-                except:
-                    amount = 0
-                rows.append({'Category': '', 'Name': name, 'Amount': f"${amount:,.2f}"})
-            total = sum([float(r['Amount'].replace('$','').replace(',','')) 
-                        for r in rows if r['Category'] == '' and r['Amount'] != ''])
-            rows.append({'Category': '', 'Name': f"Total {cat} Expense", 'Amount': f"${total:,.2f}"})
-    
+        in_cat = (category == cat).to_numpy()
+        if not in_cat.any():
+            continue
+        cat_amounts = amounts[in_cat]
+        rows.append({'Category': f"{cat} (Expense)", 'Name': '', 'Amount': ''})
+        rows.extend({'Category': '', 'Name': name, 'Amount': f"${amount:,.2f}"}
+                    for name, amount in zip(names[in_cat], cat_amounts))
+        rows.append({'Category': '', 'Name': f"Total {cat} Expense", 'Amount': f"${cat_amounts.sum():,.2f}"})
+
     sorted_df = pd.DataFrame(rows)
-    
+
     # Generate budget table (group by Name and Category, sum annual expense)
-    budget_data = []
-    for _, row in df.iterrows():
-        name = str(row.get(name_col, '')).strip()
-        payroll_name = str(row.get(payroll_col, '')).strip()
-        try:
-            amount = float(row.get(amount_col, 0) or 0)
-        except:
-            amount = 0.0
-        category = get_category(name, payroll_name)
-        if name and amount != 0 and category in categories:
-            budget_data.append({'Name': name, 'Category': category, 'Annual Expense': amount})
-
-    # Group by Name and Category, sum annual expense
-    if budget_data:
-        budget_df_raw = pd.DataFrame(budget_data)
+    budget_names = names.astype(str).str.strip()
+    in_budget = (budget_names != '') & (amounts != 0) & category.isin(categories)
+    if in_budget.any():
+        budget_df_raw = pd.DataFrame({
+            'Name': budget_names[in_budget],
+            'Category': category[in_budget],
+            'Annual Expense': amounts[in_budget]
+        })
         budget_df_grouped = budget_df_raw.groupby(['Name', 'Category'], as_index=False).agg({'Annual Expense': 'sum'})
         budget_df_grouped['Monthly Budget'] = budget_df_grouped['Annual Expense'] / 12
         budget_df_grouped['Weekly Budget'] = budget_df_grouped['Annual Expense'] / 52
@@ -194,12 +123,6 @@ def compare_budget(budget_csv_df, budget_tab_df):
     if budget_csv_df.empty or budget_tab_df.empty:
         return pd.DataFrame()
 
-    # Try to import fuzzywuzzy for fuzzy matching, fallback if not available
-    try:
-        from fuzzywuzzy import process as fuzzy_process
-    except ImportError:
-        fuzzy_process = None
-
     # Extract actual expenses from budget tab
     actual_expenses = {}
     for _, row in budget_tab_df.iterrows():
@@ -218,8 +141,8 @@ def compare_budget(budget_csv_df, budget_tab_df):
         except:
             pass
 
-    matched_actuals = set()
-    comparison_rows = []
+    # Budget lines, then match them all against the actuals in one pass
+    budget_lines = []
     for _, budget_row in budget_csv_df.iterrows():
         budget_name = str(budget_row.get('Name', '')).strip()
         category = str(budget_row.get('Category', '')).strip()
@@ -236,27 +159,18 @@ def compare_budget(budget_csv_df, budget_tab_df):
             budget_amount = float(budget_str) if budget_str else 0.0
         except:
             budget_amount = 0.0
-        # Find matching actual expense (case-insensitive, trimmed, fuzzy if available)
-        budget_name_key = budget_name.strip().lower()
-        actual_data = None
-        match_name = None
-        if budget_name_key in actual_expenses:
-            actual_data = actual_expenses[budget_name_key]
-            match_name = budget_name_key
-        elif fuzzy_process:
-            # Use fuzzy matching with a threshold
-            choices = list(actual_expenses.keys())
-            match, score = fuzzy_process.extractOne(budget_name_key, choices)
-            if score >= 90:
-                actual_data = actual_expenses[match]
-                match_name = match
-        else:
-            # fallback: substring match
-            for actual_name in actual_expenses:
-                if budget_name_key in actual_name or actual_name in budget_name_key:
-                    actual_data = actual_expenses[actual_name]
-                    match_name = actual_name
-                    break
+        budget_lines.append((budget_name, category, budget_amount, budget_period))
+
+    actual_keys = list(actual_expenses)
+    match, _scores = reconcile([line[0] for line in budget_lines],
+                               [actual_expenses[k]['display_name'] for k in actual_keys],
+                               [line[1] for line in budget_lines], cache_path=ASSIGNMENTS_CSV)
+
+    matched_actuals = set()
+    comparison_rows = []
+    for (budget_name, category, budget_amount, budget_period), j in zip(budget_lines, match):
+        match_name = actual_keys[j] if j >= 0 else None
+        actual_data = actual_expenses[match_name] if match_name else None
         if actual_data:
             actual_amount = actual_data['amount']
             actual_display_name = actual_data['display_name']
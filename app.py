@@ -5,8 +5,14 @@ from wtforms.validators import DataRequired
 from werkzeug.utils import secure_filename
 import pandas as pd
 import os
+import sys
 from datetime import datetime
 
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "Restaurant Management"))
+from invoice_aggregator import aggregate_folder
+from inventory_snapshots import read_cached
+from reference_catalog import ReferenceCatalog, get_reference_catalog
+
 app = Flask(__name__)
 app.config['SECRET_KEY'] = 'your_secret_key_here'
 app.config['UPLOAD_FOLDER'] = 'uploads/'
@@ -41,89 +47,47 @@ app.register_blueprint(report_bp)
 # --- US Foods Orders Merge Route ---
 @app.route('/merge_usfoodorders', methods=['GET'])
 def merge_usfoodorders():
-    import os
-    import pandas as pd
     folder_path = '/Users/arnoldoramirezjr/Downloads/AliceInvoice'
-    all_data = []
-    for filename in os.listdir(folder_path):
-        if filename.endswith('.csv'):
-            file_path = os.path.join(folder_path, filename)
-            df = pd.read_csv(file_path)
-            all_data.append(df)
-    if not all_data:
+    rebuild = request.args.get('rebuild') == '1'
+    sorted_data, stats = aggregate_folder(folder_path, rebuild=rebuild)
+    if sorted_data.empty:
         flash('No CSV files found in AliceInvoice folder.', 'danger')
         return redirect(url_for('index'))
-    combined_data = pd.concat(all_data, ignore_index=True)
-    selected_columns = combined_data[['ProductNumber', 'ProductDescription', 'QtyShip']]
-    grouped_data = selected_columns.groupby(['ProductNumber', 'ProductDescription'], as_index=False)['QtyShip'].sum()
-    sorted_data = grouped_data.sort_values(by='ProductNumber')
+    for error in stats['errors']:
+        flash(f'Skipped {error}', 'warning')
+    sorted_data = sorted_data[['ProductNumber', 'ProductDescription', 'QtyShip']]
     output_csv_file_path = os.path.join(os.getcwd(), 'Sorted_InvoiceDetails.csv')
     sorted_data.to_csv(output_csv_file_path, index=False)
     return send_file(output_csv_file_path, as_attachment=True)
 
 @app.route('/take_inventory', methods=['GET', 'POST'])
 def take_inventory():
-    inventory_on_hand = []
-    reference_items = []
-    if os.path.exists(REFERENCE_INVENTORY_FILE):
-        df = pd.read_csv(REFERENCE_INVENTORY_FILE)
-        reference_items = df.to_dict(orient='records')
-        # Ensure UPP is present for all reference_items
-        import re
-        def calculate_upp(package_size):
-            if not isinstance(package_size, str):
-                return 1
-            package_size = package_size.strip()
-            match = re.match(r'^(\d+)\s*/\s*([\d.]+)\s*([a-zA-Z]+)', package_size)
-            if match:
-                try:
-                    return int(match.group(1))
-                except Exception:
-                    return 1
-            return 1
-        for item in reference_items:
-            if 'UPP' not in item or item['UPP'] in [None, '', '-', 'nan', 'NaN']:
-                item['UPP'] = calculate_upp(item.get('package_size', ''))
+    # Cached catalog: UPP is already computed for every item
+    catalog = get_reference_catalog(REFERENCE_INVENTORY_FILE) or ReferenceCatalog(pd.DataFrame())
+    reference_items = catalog.items
     default_date = request.form.get('inventory_date') or request.args.get('inventory_date') or datetime.now().strftime('%Y-%m-%d')
     loaded_inventory = None
     loaded_date = default_date
     # Try to load the inventory file for the selected date
     filename = f'daily_inventory_{default_date}.csv'
     if os.path.exists(filename):
-        loaded_inventory = pd.read_csv(filename).to_dict(orient='records')
+        loaded_inventory = read_cached(filename).to_dict(orient='records')
     if request.method == 'POST':
         date_str = request.form.get('inventory_date', default_date)
-        def calculate_upp(package_size):
-            # If package_size is like '4/5 LB', UPP = 4
-            import re
-            if not isinstance(package_size, str):
-                return 1
-            package_size = package_size.strip()
-            match = re.match(r'^(\d+)\s*/\s*([\d.]+)\s*([a-zA-Z]+)', package_size)
-            if match:
-                try:
-                    return int(match.group(1))
-                except Exception:
-                    return 1
-            # If package_size is like '60 ea', '10 lb', '3 lb', UPP = 1
-            return 1
-
-        for idx, item in enumerate(reference_items):
+        quantities = []
+        for idx in range(len(reference_items)):
             qty = request.form.get(f'qty_{idx}', '')
             try:
                 qty = float(qty)
             except Exception:
                 qty = 0
-            package_size = item.get('package_size', '')
-            upp = calculate_upp(package_size)
-            inventory_on_hand.append({
-                'description': item.get('description', ''),
-                'package_size': package_size,
-                'quantity_on_hand': qty,
-                'UPP': upp
-            })
+            quantities.append(qty)
+        # Item number first so the inventory report can match counts to the catalog by number
+        inventory_on_hand = catalog.frame.reindex(columns=['description', 'package_size']).assign(
+            quantity_on_hand=quantities, UPP=catalog.frame['UPP'])
+        inventory_on_hand.insert(0, 'item_number', catalog.item_keys)
         filename = f'daily_inventory_{date_str}.csv'
-        pd.DataFrame(inventory_on_hand).to_csv(filename, index=False)
+        inventory_on_hand.to_csv(filename, index=False)
         flash(f'Daily inventory saved for {date_str}!', 'success')
         # Redirect to the same page with the date as a query parameter
         return redirect(url_for('take_inventory', inventory_date=date_str))
@@ -133,30 +97,22 @@ def take_inventory():
 # Printable inventory sheet route
 @app.route('/print_inventory')
 def print_inventory():
-    reference_items = []
-    if os.path.exists(REFERENCE_INVENTORY_FILE):
-        df = pd.read_csv(REFERENCE_INVENTORY_FILE)
-        reference_items = df.to_dict(orient='records')
-        # Ensure UPP is present for all reference_items
-        import re
-        def calculate_upp(package_size):
-            if not isinstance(package_size, str):
-                return 1
-            package_size = package_size.strip()
-            match = re.match(r'^(\d+)\s*/\s*([\d.]+)\s*([a-zA-Z]+)', package_size)
-            if match:
-                try:
-                    return int(match.group(1))
-                except Exception:
-                    return 1
-            return 1
-        for item in reference_items:
-            if 'UPP' not in item or item['UPP'] in [None, '', '-', 'nan', 'NaN']:
-                item['UPP'] = calculate_upp(item.get('package_size', ''))
-        # No sorting, preserve file order
+    # Cached catalog in file order, UPP already computed
+    catalog = get_reference_catalog(REFERENCE_INVENTORY_FILE)
+    reference_items = catalog.items if catalog is not None else []
     date_str = datetime.now().strftime('%Y-%m-%d')
     return render_template('print_inventory.html', reference_items=reference_items, date=date_str)
 
+def order_records(df):
+    """Order rows for the template, with UPP and Units from the cached catalog where the product is known"""
+    catalog = get_reference_catalog(REFERENCE_INVENTORY_FILE)
+    if catalog is None or 'ProductNumber' not in df.columns:
+        return df.to_dict(orient='records')
+    df = catalog.annotate_orders(df)
+    for col in ('UPP', 'Units'):
+        df[col] = df[col].astype(object).where(df[col].notna(), None)
+    return df.to_dict(orient='records')
+
 # Route to display order results after invoice upload, with end date filtering and save option
 @app.route('/order_results', methods=['GET', 'POST'])
 def order_results():
@@ -200,9 +156,9 @@ def order_results():
                     # After deletion, show only the remaining orders
                     orders = []
                     return render_template('order_results.html', orders=orders, end_date=end_date)
-                orders = filtered_df.to_dict(orient='records')
+                orders = order_records(filtered_df)
             else:
-                orders = df.to_dict(orient='records')
+                orders = order_records(df)
         else:
             orders = []
     return render_template('order_results.html', orders=orders, end_date=end_date)
@@ -0,0 +1,209 @@
+#!/usr/bin/env python3
+"""
+Concurrent writer throughput test for the multi-worker storage layer
+Starts N separate processes (as gunicorn -w N would), each importing the
+app the way a worker does, and has them write to one scratch data folder
+at the same time:
+
+    counts      Inventory Control PATCH /api/inventory/.../counts/<product>;
+                every worker counts the same products, sending the version it
+                last saw, so some saves conflict and are retried
+    inventories Inventory Control POST /api/inventory/save, one date per
+                worker and round (whole-inventory saves under the writer lock)
+    deductions  Manager App cash deductions appended to one day's CSV
+    daily logs  Manager App daily log saves to one file while the other
+                workers read it back
+
+Afterwards the folder is reloaded from disk and checked: no lost or torn
+writes, every count at the version its saves add up to. Prints throughput
+per scenario and exits 1 if a check fails.
+
+Usage:
+    python benchmark_concurrent_writers.py
+    python benchmark_concurrent_writers.py --workers 8 --ops 500
+"""
+import os
+import sys
+import csv
+import time
+import argparse
+import tempfile
+import multiprocessing
+
+ROOT = os.path.dirname(os.path.abspath(__file__))
+INVENTORY_APP = os.path.join(ROOT, "Restaurant Management", "Inventory Control 2")
+MANAGER_APP = os.path.join(ROOT, "Restaurant Management", "Manager App")
+
+LOCATION = 'Bench'
+COUNT_DATE = '2026-01-01'
+
+
+# ==================== WORKERS ====================
+
+def _inventory_client(folder):
+    os.environ['INVENTORY_DATA_DIR'] = folder
+    sys.path.insert(0, INVENTORY_APP)
+    from app import app, init_storage
+    init_storage()  # Opens the store in the (empty) benchmark folder; nothing to load yet
+    app.config.update(TESTING=True)
+    return app.test_client()
+
+
+def count_worker(folder, worker, ops, products, start):
+    """PATCH counts; on a conflict take the server's version and try again
+
+    Returns (saves, conflicts, products written).
+    """
+    client = _inventory_client(folder)
+    versions, saved, conflicts = {}, 0, 0
+    start.wait()
+    for i in range(ops):
+        product = products[(worker + i) % len(products)]
+        while True:
+            body = {'quantity': worker * 1000 + i + 1}
+            if product in versions:
+                body['version'] = versions[product]
+            response = client.patch(f'/api/inventory/{LOCATION}/{COUNT_DATE}/counts/{product}', json=body)
+            result = response.get_json()
+            versions[product] = result['version']
+            if response.status_code == 200:
+                saved += 1
+                break
+            conflicts += 1
+    return saved, conflicts, set(versions)
+
+
+def inventory_worker(folder, worker, ops, start):
+    """Whole-inventory saves, one date per (worker, round)"""
+    client = _inventory_client(folder)
+    start.wait()
+    for i in range(ops):
+        client.post('/api/inventory/save', json={
+            'location': LOCATION, 'date': f'w{worker:02d}-{i:04d}', 'inventory': {'P1': i + 1, 'P2': worker + 1}})
+    return ops, 0
+
+
+def _manager_app(folder):
+    os.environ['HOME'] = folder  # Keeps the app database in the scratch folder
+    os.chdir(folder)
+    sys.path.insert(0, MANAGER_APP)
+    import manager_app
+    return manager_app
+
+
+def deduction_worker(folder, worker, ops, start):
+    manager_app = _manager_app(folder)
+    start.wait()
+    for i in range(ops):
+        manager_app.save_cash_deduction('bench', {'date': '2026-01-01', 'description': f'w{worker}-{i}', 'amount': 1})
+    return ops, 0
+
+
+def daily_log_worker(folder, worker, ops, start):
+    """Save the same daily log, then read it back; every read must be a whole file"""
+    manager_app = _manager_app(folder)
+    from daily_logs import load_daily_log
+    start.wait()
+    torn = 0
+    for i in range(ops):
+        manager_app.save_daily_log('bench', {
+            'date': '2026-01-02', 'shift': 'Day', 'notes': f'w{worker}-{i}',
+            'employees': [{'name': f'Server {n}', 'cash': n} for n in range(20)],
+            'deduction_descs': [], 'deduction_amounts': [], 'drawer_total': 0, 'deposit_amount': 0})
+        log = load_daily_log('bench', '2026-01-02')
+        if log is None or len(log['employees']) != 20:
+            torn += 1
+    return ops, torn
+
+
+# ==================== CHECKS ====================
+
+def check_counts(folder, results):
+    sys.path.insert(0, INVENTORY_APP)
+    from count_store import CountStore
+    store = CountStore(folder)
+    store.load()
+    saved = sum(r[0] for r in results)
+    versions = store.versions(LOCATION, COUNT_DATE)
+    counts = store.data.get(LOCATION, {}).get(COUNT_DATE, {})
+    problems = []
+    if sum(versions.values()) != saved:
+        problems.append(f"{saved} saves but versions add up to {sum(versions.values())}")
+    # Only the products some worker wrote; fewer workers x ops than products leave the rest uncounted
+    written = set().union(*(r[2] for r in results))
+    if set(counts) != written:
+        problems.append(f"{len(counts)} of the {len(written)} products written have a count")
+    return problems
+
+
+def check_inventories(folder, results, workers, ops):
+    import json
+    with open(os.path.join(folder, 'inventory_database.json')) as f:
+        dates = json.load(f).get(LOCATION, {})
+    missing = workers * ops - len([d for d in dates if d.startswith('w')])
+    return [f"{missing} whole-inventory saves lost"] if missing else []
+
+
+def check_deductions(folder, results, workers, ops):
+    path = os.path.join(folder, 'company_data', 'bench', 'daily_logs', '20260101_CashDeductions.csv')
+    with open(path, newline='') as f:
+        rows = [row for row in csv.reader(f) if row]
+    problems = []
+    if len(rows) != workers * ops:
+        problems.append(f"{workers * ops} deductions appended, {len(rows)} rows on disk")
+    if any(len(row) != 3 for row in rows):
+        problems.append("interleaved deduction rows")
+    return problems
+
+
+def check_daily_logs(folder, results, workers, ops):
+    torn = sum(r[1] for r in results)
+    return [f"{torn} reads saw a partial daily log"] if torn else []
+
+
+# ==================== RUN ====================
+
+def run(ctx, target, folder, workers, args):
+    start = ctx.Manager().Event()
+    with ctx.Pool(workers) as pool:
+        pending = [pool.apply_async(target, (folder, w, *args, start)) for w in range(workers)]
+        time.sleep(0.5)  # Every worker imported and waiting
+        began = time.perf_counter()
+        start.set()
+        results = [p.get() for p in pending]
+        elapsed = time.perf_counter() - began
+    return results, elapsed
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Concurrent writers across worker processes')
+    parser.add_argument('--workers', type=int, default=4, help='Worker processes')
+    parser.add_argument('--ops', type=int, default=200, help='Writes per worker per scenario')
+    parser.add_argument('--products', type=int, default=50, help='Products the count workers share')
+    args = parser.parse_args(argv)
+
+    ctx = multiprocessing.get_context('spawn')
+    products = [str(1000000 + i) for i in range(args.products)]
+    print(f"{args.workers} worker processes, {args.ops} writes each")
+    print(f"{'Scenario':<14} {'writes':>8} {'seconds':>9} {'writes/s':>10} {'retries':>8}  check")
+    failed = False
+    scenarios = [
+        ('counts', count_worker, (args.ops, products), check_counts),
+        ('inventories', inventory_worker, (args.ops,), lambda f, r: check_inventories(f, r, args.workers, args.ops)),
+        ('deductions', deduction_worker, (args.ops,), lambda f, r: check_deductions(f, r, args.workers, args.ops)),
+        ('daily logs', daily_log_worker, (args.ops,), lambda f, r: check_daily_logs(f, r, args.workers, args.ops)),
+    ]
+    for name, target, extra, check in scenarios:
+        with tempfile.TemporaryDirectory() as folder:
+            results, elapsed = run(ctx, target, folder, args.workers, extra)
+            writes = sum(r[0] for r in results)
+            retries = sum(r[1] for r in results) if name == 'counts' else 0
+            problems = check(folder, results)
+        failed = failed or bool(problems)
+        status = 'ok' if not problems else 'FAILED: ' + '; '.join(problems)
+        print(f"{name:<14} {writes:>8,} {elapsed:>9.2f} {writes / elapsed:>10,.0f} {retries:>8,}  {status}")
+    return 1 if failed else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,100 @@
+#!/usr/bin/env python3
+"""
+Page render benchmark for the root inventory app
+Builds a synthetic reference catalog (5,000 items by default), a few daily
+inventory counts and an order file in a scratch folder, then times the
+take_inventory, print_inventory, order_results and inventory_report pages
+through Flask's test client: the first (cold) request, which loads the
+catalog, and the median / p95 of the warm requests that reuse it.
+
+Usage:
+    python benchmark_inventory_pages.py
+    python benchmark_inventory_pages.py --items 20000 --runs 50
+"""
+import os
+import sys
+import time
+import argparse
+import tempfile
+import statistics
+
+import numpy as np
+import pandas as pd
+
+ROOT = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.join(ROOT, "Restaurant Management"))
+from reference_catalog import synthetic_catalog
+
+
+def build_fixture(folder, items, orders, seed=0):
+    """reference_inventory.csv, two weeks of counts, order invoices and Sorted_InvoiceDetails.csv"""
+    rng = np.random.default_rng(seed)
+    catalog = synthetic_catalog(items, seed)
+    catalog.to_csv(os.path.join(folder, 'reference_inventory.csv'), index=False)
+    for day in range(1, 15):
+        pd.DataFrame({
+            'item_number': catalog['item_number'],
+            'description': catalog['description'],
+            'package_size': catalog['package_size'],
+            'quantity_on_hand': rng.integers(0, 30, items).astype(float),
+            'UPP': 1,
+        }).to_csv(os.path.join(folder, f'daily_inventory_2025-12-{day:02d}.csv'), index=False)
+    invoice_dir = os.path.join(folder, 'OrderInvoices')
+    os.makedirs(invoice_dir, exist_ok=True)
+    order_rows = pd.DataFrame({
+        'ProductNumber': rng.choice(catalog['item_number'], orders),
+        'ProductDescription': 'SYNTHETIC ORDER LINE',
+        'QtyShip': rng.integers(1, 6, orders),
+    })
+    for day in (3, 7, 10):
+        order_rows.to_csv(os.path.join(invoice_dir, f'Order_Invoice_2025-12-{day:02d}.csv'), index=False)
+    order_rows.to_csv(os.path.join(folder, 'Sorted_InvoiceDetails.csv'), index=False)
+
+
+def time_request(client, method, url, data, runs):
+    """(cold ms, warm median ms, warm p95 ms, status) for one page"""
+    timings = []
+    status = None
+    for _ in range(runs + 1):
+        start = time.perf_counter()
+        response = client.open(url, method=method, data=data)
+        timings.append((time.perf_counter() - start) * 1000)
+        status = response.status_code
+    warm = sorted(timings[1:])
+    p95 = warm[min(len(warm) - 1, int(round(0.95 * (len(warm) - 1))))]
+    return timings[0], statistics.median(warm), p95, status
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Time the inventory pages against a synthetic catalog')
+    parser.add_argument('--items', type=int, default=5000, help='Reference catalog size')
+    parser.add_argument('--orders', type=int, default=500, help='Order lines per invoice file')
+    parser.add_argument('--runs', type=int, default=20, help='Warm requests per page')
+    args = parser.parse_args(argv)
+
+    pages = [
+        ('GET', '/take_inventory?inventory_date=2025-12-14', None),
+        ('GET', '/print_inventory', None),
+        ('GET', '/order_results', None),
+        ('POST', '/inventory_report', {'begin_date': '2025-12-01', 'end_date': '2025-12-14'}),
+    ]
+    with tempfile.TemporaryDirectory() as folder:
+        build_fixture(folder, args.items, args.orders)
+        os.chdir(folder)
+        sys.path.insert(0, ROOT)
+        from app import app
+        app.config.update(TESTING=True, WTF_CSRF_ENABLED=False)
+        client = app.test_client()
+
+        print(f"{args.items:,} catalog items, {args.runs} warm requests per page")
+        print(f"{'Page':<46} {'cold ms':>9} {'median ms':>10} {'p95 ms':>9}")
+        for method, url, data in pages:
+            cold, median, p95, status = time_request(client, method, url, data, args.runs)
+            flag = '' if status == 200 else f"  (HTTP {status})"
+            print(f"{method + ' ' + url:<46} {cold:>9.1f} {median:>10.1f} {p95:>9.1f}{flag}")
+        os.chdir(ROOT)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
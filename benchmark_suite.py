@@ -0,0 +1,297 @@
+#!/usr/bin/env python3
+"""
+Benchmark suite for the main entry points
+Writes the seeded synthetic data set (Restaurant Management/synthetic_data.py)
+for each scale into a scratch folder, then times:
+
+    daily_summary         Manager App GET /api/reports/daily-summary over every log
+                          (test client with a signed-in user)
+    employee_performance  analytics.PerformanceReport over every log: totals,
+                          ranking and daily totals
+    pos_import            pos_import.parse_excel_file over every POS export
+    invoice_import        invoice_aggregator.aggregate_folder (cold: full rebuild,
+                          warm: nothing changed)
+    order_calculation     Inventory Control 2 forecast: usage matrix plus
+                          full-catalog suggestions (warm: cached matrix, what-if
+                          lead times)
+    duplicate_scan        Sorting App scan_excel_duplicates over the file tree
+    payroll_export        payroll_export.export_location to a workbook
+
+Each case runs in its own process (the apps' modules share names) and
+reports its first (cold) run and the median of the warm runs. Warm medians
+are compared with benchmark_baselines.json: one more than --tolerance
+(and --min-ms) slower than its baseline is a regression, and the run
+exits 1. Baselines
+are only comparable on the machine that recorded them; --save-baseline
+records this machine's numbers for the scales run.
+
+Runs offline; needs pandas, numpy, openpyxl and Flask (with the Manager App's
+requirements for daily_summary).
+
+Usage:
+    python benchmark_suite.py
+    python benchmark_suite.py --scale small medium --runs 5
+    python benchmark_suite.py --scale small --save-baseline
+    python benchmark_suite.py --case order_calculation invoice_import
+"""
+import os
+import sys
+import json
+import time
+import argparse
+import platform
+import tempfile
+import statistics
+import contextlib
+import multiprocessing
+
+ROOT = os.path.dirname(os.path.abspath(__file__))
+RESTAURANT = os.path.join(ROOT, "Restaurant Management")
+MANAGER_APP = os.path.join(RESTAURANT, "Manager App")
+INVENTORY_APP = os.path.join(RESTAURANT, "Inventory Control 2")
+SORTING_APP = os.path.join(ROOT, "Sorting App")
+BASELINE_FILE = os.path.join(ROOT, "benchmark_baselines.json")
+
+sys.path.insert(0, RESTAURANT)
+from synthetic_data import SCALES, generate
+
+
+def _quiet():
+    """Silence the apps' debug prints while timing (they still run)"""
+    devnull = open(os.devnull, 'w')
+    stack = contextlib.ExitStack()
+    stack.enter_context(devnull)
+    stack.enter_context(contextlib.redirect_stdout(devnull))
+    stack.enter_context(contextlib.redirect_stderr(devnull))
+    return stack
+
+
+def _time_runs(cold, warm, runs):
+    """ms timings: cold() once, then warm() runs times"""
+    timings = []
+    with _quiet():
+        for i in range(runs + 1):
+            start = time.perf_counter()
+            (cold if i == 0 else warm)()
+            timings.append((time.perf_counter() - start) * 1000)
+    return timings
+
+
+# ==================== CASES ====================
+# Each runs in a fresh child process: (folder, manifest, runs) -> ms timings
+
+def case_daily_summary(folder, manifest, runs):
+    home = os.path.join(folder, 'home')
+    os.makedirs(home, exist_ok=True)
+    os.environ['HOME'] = home  # Keeps the app database in the scratch folder
+    os.chdir(folder)           # Daily logs live under ./company_data
+    sys.path.insert(0, MANAGER_APP)
+    with _quiet():
+        import manager_app
+    db = manager_app.db
+    user_id, _token = db.create_user('bench', 'bench@example.com', 'BenchPass1', full_name='Bench User')
+    company_id = db.create_company('Synthetic Restaurants', user_id)
+    os.makedirs(os.path.join('company_data', company_id), exist_ok=True)
+    os.symlink(os.path.join(folder, manifest['daily_log_dirs'][0]),
+               os.path.join('company_data', company_id, 'daily_logs'))
+
+    client = manager_app.app.test_client()
+    with client.session_transaction() as session:
+        session['_user_id'] = user_id
+        session['_fresh'] = True
+        session['current_company_id'] = company_id
+
+    def request():
+        response = client.get('/api/reports/daily-summary?shift_filter=Full')
+        if response.status_code != 200 or not (response.get_json() or {}).get('data'):
+            raise RuntimeError(f"daily summary failed: {response.status_code}")
+
+    return _time_runs(request, request, runs)
+
+
+def case_employee_performance(folder, manifest, runs):
+    sys.path.insert(0, MANAGER_APP)
+    import analytics
+    log_dir = os.path.join(folder, manifest['daily_log_dirs'][0])
+
+    def report():
+        performance = analytics.PerformanceReport.from_logs(log_dir)
+        performance.totals()
+        performance.rank('total_sales', top=10)
+        performance.daily()
+
+    return _time_runs(report, report, runs)
+
+
+def case_pos_import(folder, manifest, runs):
+    sys.path.insert(0, MANAGER_APP)
+    from pos_import import parse_excel_file
+    pos_dir = os.path.join(folder, manifest['pos_dir'])
+    paths = sorted(os.path.join(pos_dir, name) for name in os.listdir(pos_dir))
+
+    def parse_all():
+        for path in paths:
+            parse_excel_file(path)
+
+    return _time_runs(parse_all, parse_all, runs)
+
+
+def case_invoice_import(folder, manifest, runs):
+    from invoice_aggregator import aggregate_folder
+    invoice_dir = os.path.join(folder, manifest['invoice_dir'])
+    return _time_runs(lambda: aggregate_folder(invoice_dir, rebuild=True), lambda: aggregate_folder(invoice_dir), runs)
+
+
+def case_order_calculation(folder, manifest, runs):
+    sys.path.insert(0, INVENTORY_APP)
+    import pandas as pd
+    import forecast
+    inventory_dir = os.path.join(folder, manifest['inventory_dir'])
+    with open(os.path.join(inventory_dir, 'inventory_database.json')) as f:
+        inventories = json.load(f)
+    with open(os.path.join(inventory_dir, 'orders_database.json')) as f:
+        orders = json.load(f)
+    catalog = pd.read_csv(os.path.join(inventory_dir, 'products.csv'), dtype=str).fillna('').to_dict('records')
+    location = manifest['locations'][0]
+    cache = forecast.ForecastCache()
+    lead_times = iter(range(1, 1000))
+
+    def suggest():
+        matrix = cache.get(location, 1, lambda: forecast.UsageMatrix(inventories[location], orders[location], catalog))
+        forecast.suggestion_rows(matrix.suggest(lead_time=next(lead_times) % 7))
+
+    return _time_runs(suggest, suggest, runs)
+
+
+def case_duplicate_scan(folder, manifest, runs):
+    sys.path.insert(0, SORTING_APP)
+    from file_organizer_web import scan_excel_duplicates
+    tree = os.path.join(folder, manifest['file_tree'])
+
+    def scan():
+        found = scan_excel_duplicates(tree)
+        if not found['duplicates'] and manifest['duplicate_files']:
+            raise RuntimeError("duplicate scan found nothing")
+
+    return _time_runs(scan, scan, runs)
+
+
+def case_payroll_export(folder, manifest, runs):
+    from payroll_export import export_location
+    csv_path = os.path.join(folder, manifest['payroll_csv'])
+    out_path = os.path.join(folder, 'payroll', 'BHB_Bench_sorted.xlsx')
+
+    def export():
+        export_location('Bench', csv_path, out_path)
+
+    return _time_runs(export, export, runs)
+
+
+CASES = {
+    'daily_summary': case_daily_summary,
+    'employee_performance': case_employee_performance,
+    'pos_import': case_pos_import,
+    'invoice_import': case_invoice_import,
+    'order_calculation': case_order_calculation,
+    'duplicate_scan': case_duplicate_scan,
+    'payroll_export': case_payroll_export,
+}
+
+
+def _run_case(name, folder, manifest, runs):
+    """Child process entry: (timings, error)"""
+    try:
+        return CASES[name](folder, manifest, runs), None
+    except Exception as e:
+        return None, f"{type(e).__name__}: {e}"
+
+
+# ==================== BASELINES ====================
+
+def machine():
+    return {'platform': platform.platform(), 'processor': platform.processor() or platform.machine(),
+            'cpus': os.cpu_count(), 'python': platform.python_version()}
+
+
+def load_baselines(path=BASELINE_FILE):
+    if not os.path.exists(path):
+        return {}
+    with open(path, 'r') as f:
+        return json.load(f)
+
+
+def save_baselines(results, runs, path=BASELINE_FILE):
+    """Merge this run's numbers into the baseline file (per scale and case)"""
+    baselines = load_baselines(path)
+    baselines['machine'] = machine()
+    baselines['runs'] = runs
+    stored = baselines.setdefault('results', {})
+    for scale, cases in results.items():
+        stored.setdefault(scale, {}).update(cases)
+    with open(path, 'w') as f:
+        json.dump(baselines, f, indent=2, sort_keys=True)
+        f.write('\n')
+
+
+def compare(result, baseline, tolerance, min_ms=0):
+    """'' when within tolerance (or no baseline), otherwise how much slower
+
+    A case has to be min_ms slower as well, so a few milliseconds of noise
+    on the quick cases is not reported.
+    """
+    if not baseline:
+        return ''
+    ratio = result['warm_ms'] / max(baseline['warm_ms'], 1e-6)
+    slower = result['warm_ms'] - baseline['warm_ms']
+    return f"{ratio:.2f}x baseline" if ratio > 1 + tolerance and slower > min_ms else ''
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Time the main entry points on seeded synthetic data')
+    parser.add_argument('--scale', nargs='+', choices=list(SCALES), default=['small'], help='Data set sizes')
+    parser.add_argument('--case', nargs='+', choices=list(CASES), default=list(CASES), help='Cases to run')
+    parser.add_argument('--runs', type=int, default=5, help='Warm runs per case')
+    parser.add_argument('--seed', type=int, default=0, help='Synthetic data seed')
+    parser.add_argument('--tolerance', type=float, default=0.5, help='Allowed slowdown before a regression (0.5 = 50%%)')
+    parser.add_argument('--min-ms', type=float, default=10, help='Slowdowns smaller than this are never regressions')
+    parser.add_argument('--save-baseline', action='store_true', help='Record these results as the baselines')
+    parser.add_argument('--baselines', default=BASELINE_FILE, help='Baseline file')
+    args = parser.parse_args(argv)
+
+    ctx = multiprocessing.get_context('spawn')
+    baselines = load_baselines(args.baselines)
+    if baselines and baselines.get('machine', {}).get('cpus') != os.cpu_count():
+        print("Note: the baselines were recorded on a different machine\n")
+
+    results, failed = {}, False
+    for scale in args.scale:
+        with tempfile.TemporaryDirectory() as folder:
+            start = time.perf_counter()
+            manifest = generate(folder, scale, args.seed)
+            print(f"{scale}: data set written in {time.perf_counter() - start:.1f} s (seed {args.seed})")
+            print(f"  {'Case':<22} {'cold ms':>10} {'warm ms':>10} {'baseline':>10}  status")
+            for name in args.case:
+                with ctx.Pool(1) as pool:
+                    timings, error = pool.apply(_run_case, (name, folder, manifest, args.runs))
+                if error:
+                    failed = True
+                    print(f"  {name:<22} {'':>10} {'':>10} {'':>10}  ERROR {error}")
+                    continue
+                result = {'cold_ms': round(timings[0], 2), 'warm_ms': round(statistics.median(timings[1:]), 2)}
+                results.setdefault(scale, {})[name] = result
+                baseline = baselines.get('results', {}).get(scale, {}).get(name)
+                regression = compare(result, baseline, args.tolerance, args.min_ms)
+                failed = failed or bool(regression)
+                print(f"  {name:<22} {result['cold_ms']:>10,.1f} {result['warm_ms']:>10,.1f} "
+                      f"{baseline['warm_ms'] if baseline else '-':>10}  {'REGRESSION ' + regression if regression else 'ok'}")
+        print()
+
+    if args.save_baseline:
+        save_baselines(results, args.runs, args.baselines)
+        print(f"Baselines saved to {args.baselines}")
+        return 0
+    return 1 if failed else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
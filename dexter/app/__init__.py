@@ -3,8 +3,11 @@ from flask_sqlalchemy import SQLAlchemy
 from flask_login import LoginManager
 from flask_limiter import Limiter
 from flask_limiter.util import get_remote_address
+from sqlalchemy import event
 import os
 
+from .file_lock import file_lock
+
 # Initialize plugins
 db = SQLAlchemy()
 login_manager = LoginManager()
@@ -17,6 +20,8 @@ def create_app():
     app.config['SECRET_KEY'] = os.environ.get('SECRET_KEY') or 'dev_key'
     app.config['SQLALCHEMY_DATABASE_URI'] = os.environ.get('DATABASE_URL') or 'sqlite:///dexter.db'
     app.config['SQLALCHEMY_TRACK_MODIFICATIONS'] = False
+    # Rate limit counters are per process unless this points at shared storage (e.g. redis://)
+    app.config['RATELIMIT_STORAGE_URI'] = os.environ.get('RATELIMIT_STORAGE_URI', 'memory://')
 
     # Initialize plugins
     db.init_app(app)
@@ -35,7 +40,18 @@ def create_app():
 
     # Create Database Tables
     with app.app_context():
-        db.create_all()
+        if db.engine.url.get_backend_name() == 'sqlite':
+            # Several workers share the file: readers don't block the writer, writers wait their turn
+            @event.listens_for(db.engine, 'connect')
+            def set_sqlite_pragmas(dbapi_conn, _record):
+                cursor = dbapi_conn.cursor()
+                cursor.execute('PRAGMA journal_mode=WAL')
+                cursor.execute('PRAGMA busy_timeout=30000')
+                cursor.close()
+        # Only one worker at a time creates the tables
+        os.makedirs(app.instance_path, exist_ok=True)
+        with file_lock(os.path.join(app.instance_path, 'create_all')):
+            db.create_all()
 
     return app
 
@@ -0,0 +1,11 @@
+"""
+Production entry point for dexter
+
+    gunicorn -w 4 --threads 4 -b 0.0.0.0:5001 wsgi:app
+
+Workers share the SQLite database in WAL mode. Set RATELIMIT_STORAGE_URI
+(e.g. redis://localhost:6379) so rate limits are counted across workers.
+"""
+from app import create_app
+
+app = create_app()